@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:36
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0005_quote_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollReconciliationWeek',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('week_start', models.DateField(help_text='Monday of the JM week', unique=True)),
+                ('pay_run_fingerprint', models.CharField(help_text='Hash of the pay run ids and Xero modified times reconciled', max_length=64)),
+                ('data', models.JSONField(help_text='Reconciled week as returned by the report')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-week_start'],
+            },
+        ),
+    ]
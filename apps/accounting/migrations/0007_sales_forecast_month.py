@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:40
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0006_payroll_reconciliation_week'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesForecastMonth',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('month', models.DateField(help_text='First day of the month', unique=True)),
+                ('xero_sales', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('jm_sales', models.DecimalField(decimal_places=6, max_digits=20)),
+                ('has_data', models.BooleanField(default=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['month'],
+            },
+        ),
+    ]
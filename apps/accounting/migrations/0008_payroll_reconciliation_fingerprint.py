@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0007_sales_forecast_month'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='payrollreconciliationweek',
+            old_name='pay_run_fingerprint',
+            new_name='fingerprint',
+        ),
+        migrations.AlterField(
+            model_name='payrollreconciliationweek',
+            name='fingerprint',
+            field=models.CharField(help_text='Hash of the pay runs, staff and time entries reconciled', max_length=64),
+        ),
+    ]
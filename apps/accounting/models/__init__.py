@@ -10,7 +10,9 @@ from .invoice import (
     Invoice,
     InvoiceLineItem,
 )
+from .payroll_reconciliation import PayrollReconciliationWeek
 from .quote import Quote
+from .sales_forecast_month import SalesForecastMonth
 
 __all__ = [
     "BaseLineItem",
@@ -21,5 +23,7 @@ __all__ = [
     "CreditNoteLineItem",
     "Invoice",
     "InvoiceLineItem",
+    "PayrollReconciliationWeek",
     "Quote",
+    "SalesForecastMonth",
 ]
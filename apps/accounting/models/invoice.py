@@ -4,7 +4,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 
 if TYPE_CHECKING:
@@ -121,16 +121,41 @@ class Invoice(BaseXeroInvoiceDocument):
     def get_line_items(self) -> QuerySet["InvoiceLineItem"]:
         return self.line_items.all()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded date so a re-dated invoice refreshes both months
+        instance._loaded_date = instance.__dict__.get("date")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate_sales_forecast()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_sales_forecast()
+        return result
+
+    def _invalidate_sales_forecast(self):
+        from apps.accounting.services.sales_forecast_service import (
+            invalidate_sales_forecast_months,
+        )
+
+        invalidate_sales_forecast_months(self.date, getattr(self, "_loaded_date", None))
+        self._loaded_date = self.date
+
     @property
     def paid(self) -> bool:
         """
-        Computes whether this invoice was already paid based on the amount due value.
+        Whether this invoice has been paid: nothing left due on a non-zero total.
         """
-        return (
-            (self.amount_due == self.total_incl_tax and self.total_incl_tax > 0)
-            or (self.amount_due == self.total_excl_tax and self.total_incl_tax == 0)
-            or (self.amount_due == self.total_amount)
-        )
+        return self.total_incl_tax > 0 and self.amount_due == 0
+
+    @staticmethod
+    def paid_q() -> Q:
+        """SQL equivalent of the paid property, for filtering invoice querysets."""
+        return Q(amount_due=0, total_incl_tax__gt=0)
 
 
 class Bill(BaseXeroInvoiceDocument):
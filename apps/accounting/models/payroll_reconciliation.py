@@ -0,0 +1,30 @@
+import uuid
+
+from django.db import models
+
+
+class PayrollReconciliationWeek(models.Model):
+    """
+    Persisted reconciliation of one week against its posted Xero pay runs.
+
+    Rebuilt when anything it was computed from changes: the week's pay runs,
+    the staff names and Xero ids, or its time CostLines (all tracked by
+    fingerprint). Also deleted when a time CostLine in the week is saved or
+    deleted.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    week_start = models.DateField(unique=True, help_text="Monday of the JM week")
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="Hash of the pay runs, staff and time entries reconciled",
+    )
+    data = models.JSONField(help_text="Reconciled week as returned by the report")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-week_start"]
+
+    def __str__(self) -> str:
+        return f"Payroll reconciliation for week of {self.week_start}"
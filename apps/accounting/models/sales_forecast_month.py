@@ -0,0 +1,27 @@
+import uuid
+
+from django.db import models
+
+
+class SalesForecastMonth(models.Model):
+    """
+    Xero and JM sales totals for one closed month of the sales forecast.
+
+    Maintained by SalesForecastService: deleted in the same transaction as
+    any Invoice or CostLine save/delete in the month, and recomputed on the
+    next read.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    month = models.DateField(unique=True, help_text="First day of the month")
+    xero_sales = models.DecimalField(max_digits=14, decimal_places=2)
+    jm_sales = models.DecimalField(max_digits=20, decimal_places=6)
+    # False when the month has neither invoices nor cost lines
+    has_data = models.BooleanField(default=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["month"]
+
+    def __str__(self) -> str:
+        return f"Sales forecast {self.month:%Y-%m}"
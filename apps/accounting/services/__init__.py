@@ -7,6 +7,12 @@ try:
     if apps.ready:
         from .core import JobAgingService, KPIService, StaffPerformanceService
         from .payroll_reconciliation_service import PayrollReconciliationService
+        from .sales_forecast_service import (
+            SalesForecastService,
+            actual_cost_lines,
+            invalidate_sales_forecast_months,
+            sellable_invoices,
+        )
 except (ImportError, RuntimeError):
     # Django not ready or circular import, skip conditional imports
     pass
@@ -15,5 +21,9 @@ __all__ = [
     "JobAgingService",
     "KPIService",
     "PayrollReconciliationService",
+    "SalesForecastService",
     "StaffPerformanceService",
+    "actual_cost_lines",
+    "invalidate_sales_forecast_months",
+    "sellable_invoices",
 ]
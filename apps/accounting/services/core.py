@@ -55,9 +55,7 @@ class KPIService:
         """
         logger.info("Retrieving company thresholds for KPI calculations")
         try:
-            company_defaults: CompanyDefaults = CompanyDefaults.objects.first()
-            if not company_defaults:
-                raise ValueError("No company defaults found")
+            company_defaults: CompanyDefaults = CompanyDefaults.get_cached()
             thresholds = {
                 "kpi_daily_billable_hours_green": float(
                     company_defaults.kpi_daily_billable_hours_green
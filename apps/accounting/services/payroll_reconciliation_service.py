@@ -1,13 +1,20 @@
+import hashlib
 import logging
 from collections import defaultdict
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, Iterable
 
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, Sum
+from django.db.models.fields.json import KT
+from django.db.models.functions import TruncWeek
+
+from apps.accounting.models import PayrollReconciliationWeek
 from apps.accounts.models import Staff
 from apps.job.models import CostLine
 from apps.workflow.exceptions import AlreadyLoggedException
-from apps.workflow.models.xero_payroll import XeroPayRun
+from apps.workflow.models.xero_payroll import XeroPayRun, XeroPaySlip
 
 from .core import _persist_and_raise
 
@@ -28,6 +35,12 @@ class PayrollReconciliationService:
         cross-compares.  Weeks that exist only on one side are included
         with the missing side showing zeros / null dates.
 
+        Weeks with posted pay runs are served from PayrollReconciliationWeek
+        snapshots while their pay runs, the staff names and Xero ids, and the
+        week's time entries are unchanged.  The remaining weeks are
+        reconciled from one grouped payslip query and one grouped CostLine
+        query, so the query count does not grow with the range.
+
         Args:
             start_date: Inclusive start of the reporting window.
             end_date: Inclusive end of the reporting window.
@@ -36,22 +49,16 @@ class PayrollReconciliationService:
             Dict matching PayrollReconciliationResponseSerializer shape.
         """
         try:
-            staff_map = _build_staff_xero_map()
-
             # --- Discover Xero weeks ---
             # Filter by overlap: Xero periods start on Sunday while JM
             # weeks are Monday-based, so requiring period_start >= start
             # would miss the first week when the caller passes an aligned
             # Monday.
-            pay_runs = (
-                XeroPayRun.objects.filter(
-                    pay_run_status="Posted",
-                    period_end_date__gte=start_date,
-                    period_start_date__lte=end_date,
-                )
-                .prefetch_related("pay_slips")
-                .order_by("period_start_date")
-            )
+            pay_runs = XeroPayRun.objects.filter(
+                pay_run_status="Posted",
+                period_end_date__gte=start_date,
+                period_start_date__lte=end_date,
+            ).order_by("period_start_date")
 
             xero_weeks: dict[date, list[XeroPayRun]] = defaultdict(list)
             for pr in pay_runs:
@@ -59,30 +66,49 @@ class PayrollReconciliationService:
                 xero_weeks[monday].append(pr)
 
             # --- Discover JM weeks ---
-            jm_time_dates = (
-                CostLine.objects.filter(
-                    kind="time",
-                    cost_set__kind="actual",
-                    accounting_date__gte=start_date,
-                    accounting_date__lte=end_date,
-                )
-                .values_list("accounting_date", flat=True)
-                .distinct()
-            )
-            jm_mondays: set[date] = {_get_monday(d) for d in jm_time_dates}
+            jm_weeks = _jm_week_states(start_date, end_date)
 
             # --- Union ---
-            all_mondays = sorted(set(xero_weeks.keys()) | jm_mondays)
-
-            # --- Reconcile each Monday ---
-            weeks = [
-                _reconcile_week(
-                    monday,
-                    xero_weeks.get(monday),
-                    staff_map,
+            all_mondays = sorted(set(xero_weeks.keys()) | set(jm_weeks))
+
+            # --- Reuse snapshots for weeks whose inputs are unchanged ---
+            staff = list(Staff.objects.all())
+            staff_state = _staff_state(staff)
+            fingerprints = {
+                monday: _week_fingerprint(runs, staff_state, jm_weeks.get(monday, ""))
+                for monday, runs in xero_weeks.items()
+            }
+            reconciled: dict[date, dict[str, Any]] = {
+                snapshot.week_start: snapshot.data
+                for snapshot in PayrollReconciliationWeek.objects.filter(
+                    week_start__in=list(fingerprints)
                 )
-                for monday in all_mondays
-            ]
+                if snapshot.fingerprint == fingerprints[snapshot.week_start]
+            }
+
+            # --- Reconcile the remaining weeks ---
+            pending = [m for m in all_mondays if m not in reconciled]
+            if pending:
+                xero_data = _get_xero_data(
+                    [pr for m in pending for pr in xero_weeks.get(m, [])], staff
+                )
+                jm_data = _get_jm_data(pending, staff)
+                fresh = {
+                    monday: _reconcile_week(
+                        monday,
+                        xero_weeks.get(monday),
+                        xero_data.get(monday, {}),
+                        jm_data.get(monday, {}),
+                    )
+                    for monday in pending
+                }
+                _store_snapshots(
+                    {m: week for m, week in fresh.items() if m in fingerprints},
+                    fingerprints,
+                )
+                reconciled.update(fresh)
+
+            weeks = [reconciled[monday] for monday in all_mondays]
 
             grand_xero = sum(w["totals"]["xero_gross"] for w in weeks)
             grand_jm = sum(w["totals"]["jm_cost"] for w in weeks)
@@ -108,6 +134,13 @@ class PayrollReconciliationService:
                 additional_context={"operation": "payroll_reconciliation"},
             )
 
+    @staticmethod
+    def invalidate_weeks(*dates: date | None) -> None:
+        """Drop the reconciliation snapshots covering the given dates."""
+        mondays = {_get_monday(d) for d in dates if d}
+        if mondays:
+            PayrollReconciliationWeek.objects.filter(week_start__in=mondays).delete()
+
     @staticmethod
     def get_aligned_date_range(start_date: date, end_date: date) -> dict[str, date]:
         """Snap arbitrary dates to pay-period-aligned week boundaries.
@@ -132,89 +165,184 @@ def _get_monday(d: date) -> date:
     return d - timedelta(days=d.weekday())
 
 
-def _build_staff_xero_map() -> dict[str, Staff]:
-    """Map xero_employee_id (str) -> Staff object."""
-    return {
-        s.xero_user_id: s
-        for s in Staff.objects.exclude(xero_user_id__isnull=True).exclude(
-            xero_user_id=""
+def _actual_time_lines():
+    return CostLine.objects.filter(kind="time", cost_set__kind="actual")
+
+
+def _jm_week_states(start_date: date, end_date: date) -> dict[date, str]:
+    """
+    Summary of the actual time entries in each week that has any, from one
+    grouped query.  Any added, removed or edited entry changes it, including
+    bulk updates that skip CostLine.save().
+    """
+    rows = (
+        _actual_time_lines()
+        .filter(accounting_date__gte=start_date, accounting_date__lte=end_date)
+        .annotate(week=TruncWeek("accounting_date"))
+        .values("week")
+        .annotate(
+            lines=Count("id"),
+            changed=Max("updated_at"),
+            hours=Sum("quantity"),
+            cost=Sum(
+                F("quantity") * F("unit_cost"),
+                output_field=DecimalField(max_digits=20, decimal_places=5),
+            ),
         )
-    }
+        .order_by()
+    )
+    states = {}
+    for row in rows:
+        week = row["week"]
+        # TruncWeek yields a datetime on some backends
+        week = week.date() if hasattr(week, "date") else week
+        states[week] = (
+            f"{row['lines']}:{row['changed'].isoformat()}:"
+            f"{row['hours']}:{row['cost']}"
+        )
+    return states
 
 
-def _get_xero_week_data(
-    pay_runs: list[XeroPayRun], staff_map: dict[str, Staff]
-) -> dict[str, dict[str, Any]]:
-    """Xero payslip data summed across all pay runs for one week."""
-    result: dict[str, dict[str, Any]] = {}
-    for pay_run in pay_runs:
-        for slip in pay_run.pay_slips.all():
-            emp_id = str(slip.xero_employee_id)
-            staff = staff_map.get(emp_id)
-            name = staff.get_display_name() if staff else slip.employee_name
-            if name not in result:
-                result[name] = {
-                    "xero_name": slip.employee_name,
-                    "hours": 0.0,
-                    "timesheet_hours": 0.0,
-                    "leave_hours": 0.0,
-                    "gross": 0.0,
-                }
-            result[name]["hours"] += float(slip.timesheet_hours + slip.leave_hours)
-            result[name]["timesheet_hours"] += float(slip.timesheet_hours)
-            result[name]["leave_hours"] += float(slip.leave_hours)
-            result[name]["gross"] += float(slip.gross_earnings)
-    return result
+def _staff_state(staff: Iterable[Staff]) -> str:
+    """The staff fields the report matches and labels rows by."""
+    return "|".join(
+        sorted(f"{s.id}:{s.get_display_name()}:{s.xero_user_id or ''}" for s in staff)
+    )
 
 
-def _get_jm_week_data(week_start: date, week_end: date) -> dict[str, dict[str, float]]:
-    """JM CostLine time data for one week, keyed by staff display name."""
-    lines = CostLine.objects.filter(
-        kind="time",
-        cost_set__kind="actual",
-        accounting_date__gte=week_start,
-        accounting_date__lte=week_end,
+def _week_fingerprint(
+    pay_runs: Iterable[XeroPayRun], staff_state: str, jm_state: str
+) -> str:
+    """Identify every input a week was reconciled from."""
+    parts = sorted(
+        f"{pr.xero_id}:{pr.xero_last_modified.isoformat()}" for pr in pay_runs
     )
+    parts += [staff_state, jm_state]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _store_snapshots(
+    weeks: dict[date, dict[str, Any]], fingerprints: dict[date, str]
+) -> None:
+    if not weeks:
+        return
+    with transaction.atomic():
+        PayrollReconciliationWeek.objects.filter(week_start__in=list(weeks)).delete()
+        PayrollReconciliationWeek.objects.bulk_create(
+            [
+                PayrollReconciliationWeek(
+                    week_start=monday,
+                    fingerprint=fingerprints[monday],
+                    data=week,
+                )
+                for monday, week in weeks.items()
+            ],
+            ignore_conflicts=True,
+        )
 
-    staff_by_id = {str(s.id): s for s in Staff.objects.all()}
 
-    by_name: dict[str, dict[str, Decimal]] = defaultdict(
-        lambda: {"hours": ZERO, "cost": ZERO}
+def _get_xero_data(
+    pay_runs: list[XeroPayRun], staff: list[Staff]
+) -> dict[date, dict[str, dict[str, Any]]]:
+    """Xero payslip totals by week and staff name, from one grouped query."""
+    staff_by_xero_id = {s.xero_user_id: s for s in staff if s.xero_user_id}
+    monday_by_pay_run = {
+        pr.id: _get_monday(pr.period_start_date + timedelta(days=1)) for pr in pay_runs
+    }
+    slips = (
+        XeroPaySlip.objects.filter(pay_run_id__in=list(monday_by_pay_run))
+        .values("pay_run_id", "xero_employee_id", "employee_name")
+        .annotate(
+            timesheet_hours=Sum("timesheet_hours"),
+            leave_hours=Sum("leave_hours"),
+            gross=Sum("gross_earnings"),
+        )
+        .order_by()
     )
-    for line in lines:
-        meta = line.meta or {}
-        staff_id = meta.get("staff_id")
-        if not staff_id:
-            continue
-        staff = staff_by_id.get(staff_id)
-        if not staff:
+
+    result: dict[date, dict[str, dict[str, Any]]] = defaultdict(dict)
+    for slip in slips:
+        week = result[monday_by_pay_run[slip["pay_run_id"]]]
+        staff_member = staff_by_xero_id.get(str(slip["xero_employee_id"]))
+        name = (
+            staff_member.get_display_name() if staff_member else slip["employee_name"]
+        )
+        if name not in week:
+            week[name] = {
+                "xero_name": slip["employee_name"],
+                "hours": 0.0,
+                "timesheet_hours": 0.0,
+                "leave_hours": 0.0,
+                "gross": 0.0,
+            }
+        week[name]["hours"] += float(slip["timesheet_hours"] + slip["leave_hours"])
+        week[name]["timesheet_hours"] += float(slip["timesheet_hours"])
+        week[name]["leave_hours"] += float(slip["leave_hours"])
+        week[name]["gross"] += float(slip["gross"])
+    return result
+
+
+def _get_jm_data(
+    mondays: list[date], staff: list[Staff]
+) -> dict[date, dict[str, dict[str, float]]]:
+    """JM time hours and cost by week and staff name, from one grouped query."""
+    staff_by_id = {str(s.id): s for s in staff}
+    rows = (
+        _actual_time_lines()
+        .filter(
+            accounting_date__gte=min(mondays),
+            accounting_date__lte=max(mondays) + timedelta(days=6),
+        )
+        .annotate(week=TruncWeek("accounting_date"), staff_id=KT("meta__staff_id"))
+        .values("week", "staff_id")
+        .annotate(
+            hours=Sum("quantity"),
+            cost=Sum(
+                F("quantity") * F("unit_cost"),
+                output_field=DecimalField(max_digits=20, decimal_places=5),
+            ),
+        )
+        .order_by()
+    )
+
+    wanted = set(mondays)
+    by_week: dict[date, dict[str, dict[str, Decimal]]] = defaultdict(
+        lambda: defaultdict(lambda: {"hours": ZERO, "cost": ZERO})
+    )
+    for row in rows:
+        week = row["week"]
+        # TruncWeek yields a datetime on some backends
+        week = week.date() if hasattr(week, "date") else week
+        staff_member = staff_by_id.get(row["staff_id"] or "")
+        if week not in wanted or not staff_member:
             continue
-        name = staff.get_display_name()
-        by_name[name]["hours"] += line.quantity or ZERO
-        by_name[name]["cost"] += line.total_cost or ZERO
+        totals = by_week[week][staff_member.get_display_name()]
+        totals["hours"] += row["hours"] or ZERO
+        totals["cost"] += row["cost"] or ZERO
 
     return {
-        k: {"hours": float(v["hours"]), "cost": float(v["cost"])}
-        for k, v in by_name.items()
+        week: {
+            name: {"hours": float(v["hours"]), "cost": float(v["cost"])}
+            for name, v in names.items()
+        }
+        for week, names in by_week.items()
     }
 
 
 def _reconcile_week(
     monday: date,
     xero_pay_runs: list[XeroPayRun] | None,
-    staff_map: dict[str, Staff],
+    xero_data: dict[str, dict[str, Any]],
+    jm_data: dict[str, dict[str, float]],
 ) -> dict[str, Any]:
     """Reconcile one week.  Xero pay runs may be None for JM-only weeks."""
     jm_week_start = monday
-    jm_week_end = monday + timedelta(days=6)
 
-    xero_data: dict[str, dict[str, Any]] = {}
     xero_period_start: str | None = None
     xero_period_end: str | None = None
     payment_date: str | None = None
 
     if xero_pay_runs:
-        xero_data = _get_xero_week_data(xero_pay_runs, staff_map)
         # Use the earliest period start / latest period end across pay runs
         xero_period_start = min(
             pr.period_start_date for pr in xero_pay_runs
@@ -222,8 +350,6 @@ def _reconcile_week(
         xero_period_end = max(pr.period_end_date for pr in xero_pay_runs).isoformat()
         payment_date = max(pr.payment_date for pr in xero_pay_runs).isoformat()
 
-    jm_data = _get_jm_week_data(jm_week_start, jm_week_end)
-
     all_names = sorted(set(xero_data.keys()) | set(jm_data.keys()))
 
     staff_rows: list[dict[str, Any]] = []
@@ -0,0 +1,253 @@
+"""
+Sales Forecast Service
+
+Monthly Xero vs Job Manager sales totals for the sales forecast report,
+aggregated in SQL with TruncMonth.
+
+Closed months (before the current month) rarely change, so their totals are
+kept in SalesForecastMonth rows. CostLine and Invoice saves/deletes delete
+the row for the month they touch in the same transaction, so every process
+sees the change; open months are always computed live.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import DecimalField, F, Max, Min, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.accounting.models import Invoice, SalesForecastMonth
+from apps.job.models import CostLine
+
+logger = logging.getLogger(__name__)
+
+# We started using the app in April 2025; earlier months are not reported
+FORECAST_START = date(2025, 4, 1)
+EXCLUDED_INVOICE_STATUSES = ["DRAFT", "DELETED", "VOIDED"]
+# Rollup rows older than this are recomputed. A safety net for writes that
+# bypass save()/delete() (e.g. a cascade delete) and for a read that
+# computed a month just before a write to it committed.
+ROLLUP_MAX_AGE = timedelta(hours=1)
+
+LINE_REVENUE = Sum(
+    F("quantity") * F("unit_rev"),
+    output_field=DecimalField(max_digits=20, decimal_places=6),
+)
+
+
+def _month_key(month: date) -> str:
+    return month.strftime("%Y-%m")
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def invalidate_sales_forecast_months(*values) -> None:
+    """
+    Drop the closed-month rollups for the months of the given dates.
+
+    Call it inside the transaction that writes the invoices or cost lines,
+    so the rollup can never outlive the change.
+    """
+    current_month = timezone.localdate().replace(day=1)
+    months = {
+        day.replace(day=1)
+        for day in (_as_date(value) for value in values)
+        if day is not None and day < current_month
+    }
+    if months:
+        SalesForecastMonth.objects.filter(month__in=months).delete()
+
+
+def sellable_invoices():
+    return Invoice.objects.exclude(status__in=EXCLUDED_INVOICE_STATUSES)
+
+
+def actual_cost_lines():
+    return CostLine.objects.filter(cost_set__kind="actual")
+
+
+class SalesForecastService:
+    """Monthly sales aggregates for the sales forecast report."""
+
+    @staticmethod
+    def _aggregate_months(
+        start: date, end: Optional[date] = None
+    ) -> Dict[date, Dict[str, Decimal]]:
+        """
+        Xero and JM totals per month for dates >= start (and < end if given).
+
+        Months with no invoices and no cost lines are omitted.
+        """
+        date_filter = {"date__gte": start}
+        line_filter = {"accounting_date__gte": start}
+        if end is not None:
+            date_filter["date__lt"] = end
+            line_filter["accounting_date__lt"] = end
+
+        months: Dict[date, Dict[str, Decimal]] = {}
+
+        def month_totals(month):
+            return months.setdefault(
+                _as_date(month), {"xero": Decimal("0"), "jm": Decimal("0")}
+            )
+
+        xero_rows = (
+            sellable_invoices()
+            .filter(**date_filter)
+            .annotate(month=TruncMonth("date"))
+            .values("month")
+            .annotate(total=Sum("total_incl_tax"))
+        )
+        for row in xero_rows:
+            month_totals(row["month"])["xero"] += row["total"] or Decimal("0")
+
+        jm_rows = (
+            actual_cost_lines()
+            .filter(**line_filter)
+            .annotate(month=TruncMonth("accounting_date"))
+            .values("month")
+            .annotate(total=LINE_REVENUE)
+        )
+        for row in jm_rows:
+            month_totals(row["month"])["jm"] += row["total"] or Decimal("0")
+
+        return months
+
+    @staticmethod
+    def _closed_months(current_month: date) -> List[date]:
+        months = []
+        month = FORECAST_START
+        while month < current_month:
+            months.append(month)
+            month += relativedelta(months=1)
+        return months
+
+    @staticmethod
+    def get_monthly_sales() -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Xero and JM sales per 'YYYY-MM' from FORECAST_START onwards.
+
+        Returns:
+            Dict mapping month key to (xero_sales, jm_sales), only for months
+            that have data from either source
+        """
+        current_month = timezone.localdate().replace(day=1)
+        closed_months = SalesForecastService._closed_months(current_month)
+
+        rollups = {
+            row.month: row
+            for row in SalesForecastMonth.objects.filter(
+                month__in=closed_months,
+                computed_at__gte=timezone.now() - ROLLUP_MAX_AGE,
+            )
+        }
+        missing = [month for month in closed_months if month not in rollups]
+        if missing:
+            rollups.update(SalesForecastService._refresh_months(missing))
+
+        result: Dict[str, Tuple[Decimal, Decimal]] = {}
+        for month in closed_months:
+            row = rollups[month]
+            if row.has_data:
+                result[_month_key(month)] = (row.xero_sales, row.jm_sales)
+
+        for month, totals in SalesForecastService._aggregate_months(
+            current_month
+        ).items():
+            result[_month_key(month)] = (totals["xero"], totals["jm"])
+
+        return result
+
+    @staticmethod
+    def _refresh_months(months: List[date]) -> Dict[date, SalesForecastMonth]:
+        """Recompute and store the rollups for closed months."""
+        computed = SalesForecastService._aggregate_months(
+            months[0], months[-1] + relativedelta(months=1)
+        )
+        # Months without data get a row too, so they are not recomputed
+        rows = {
+            month: SalesForecastMonth(
+                month=month,
+                xero_sales=computed.get(month, {}).get("xero", Decimal("0")),
+                jm_sales=computed.get(month, {}).get("jm", Decimal("0")),
+                has_data=month in computed,
+            )
+            for month in months
+        }
+        with transaction.atomic():
+            SalesForecastMonth.objects.filter(month__in=months).delete()
+            # A concurrent read may have stored the same months meanwhile
+            SalesForecastMonth.objects.bulk_create(rows.values(), ignore_conflicts=True)
+        logger.debug(f"Recomputed sales forecast for {len(months)} closed months")
+        return rows
+
+    @staticmethod
+    def get_job_revenue_for_month(year: int, month: int) -> Dict[str, Decimal]:
+        """Actual revenue per job id for the month, excluding zero totals."""
+        rows = (
+            actual_cost_lines()
+            .filter(accounting_date__year=year, accounting_date__month=month)
+            .values("cost_set__job_id")
+            .annotate(total=LINE_REVENUE)
+        )
+        return {
+            str(row["cost_set__job_id"]): row["total"] for row in rows if row["total"]
+        }
+
+    @staticmethod
+    def get_invoiced_totals(job_ids: Iterable) -> Dict[str, Decimal]:
+        """All-time invoiced total per job id, in one grouped query."""
+        rows = (
+            sellable_invoices()
+            .filter(job_id__in=list(job_ids))
+            .values("job_id")
+            .annotate(total=Sum("total_incl_tax"))
+        )
+        return {str(row["job_id"]): row["total"] or Decimal("0") for row in rows}
+
+    @staticmethod
+    def get_latest_actual_stats(jobs) -> Dict[str, dict]:
+        """
+        Revenue and first/last accounting dates of each job's latest actual
+        CostSet, in one grouped query.
+        """
+        jobs = list(jobs)
+        job_by_cost_set = {
+            job.latest_actual_id: str(job.id) for job in jobs if job.latest_actual_id
+        }
+        rows = (
+            CostLine.objects.filter(cost_set_id__in=list(job_by_cost_set))
+            .values("cost_set_id")
+            .annotate(
+                revenue=LINE_REVENUE,
+                start_date=Min("accounting_date"),
+                end_date=Max("accounting_date"),
+            )
+        )
+        stats = {
+            str(job.id): {"revenue": Decimal("0"), "start_date": None, "end_date": None}
+            for job in jobs
+        }
+        for row in rows:
+            stats[job_by_cost_set[row["cost_set_id"]]] = {
+                "revenue": row["revenue"] or Decimal("0"),
+                "start_date": row["start_date"],
+                "end_date": row["end_date"],
+            }
+        return stats
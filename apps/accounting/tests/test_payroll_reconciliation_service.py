@@ -0,0 +1,178 @@
+"""Tests for grouped payroll reconciliation and the weekly snapshots."""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounting.models import PayrollReconciliationWeek
+from apps.accounting.services.payroll_reconciliation_service import (
+    PayrollReconciliationService,
+)
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import Job
+from apps.job.models.costing import CostLine
+from apps.testing import BaseTestCase
+from apps.workflow.models import XeroPayItem
+from apps.workflow.models.xero_payroll import XeroPayRun, XeroPaySlip
+
+MONDAY = date(2026, 3, 2)
+
+
+class TestPayrollReconciliationService(BaseTestCase):
+    def setUp(self):
+        self.staff = Staff.objects.create_user(
+            email="welder@example.com",
+            password="x",
+            first_name="Wanda",
+            last_name="Welder",
+            xero_user_id=str(uuid.uuid4()),
+        )
+        client = Client.objects.create(
+            name="Payroll Client", xero_last_modified=timezone.now()
+        )
+        self.job = Job.objects.create(client=client, name="Payroll Job")
+        self.pay_item = XeroPayItem.get_ordinary_time()
+
+    def _pay_run(self, monday, gross, hours):
+        pay_run = XeroPayRun.objects.create(
+            xero_id=uuid.uuid4(),
+            xero_tenant_id="tenant",
+            period_start_date=monday - timedelta(days=1),
+            period_end_date=monday + timedelta(days=5),
+            payment_date=monday + timedelta(days=8),
+            pay_run_status="Posted",
+            raw_json={},
+            xero_last_modified=timezone.now(),
+        )
+        XeroPaySlip.objects.create(
+            xero_id=uuid.uuid4(),
+            xero_tenant_id="tenant",
+            pay_run=pay_run,
+            xero_employee_id=self.staff.xero_user_id,
+            employee_name="Wanda Welder",
+            gross_earnings=Decimal(gross),
+            timesheet_hours=Decimal(hours),
+            leave_hours=Decimal("0"),
+            raw_json={},
+            xero_last_modified=timezone.now(),
+        )
+        return pay_run
+
+    def _time(self, day, hours, rate="30.00"):
+        return CostLine.objects.create(
+            cost_set=self.job.latest_actual,
+            kind="time",
+            desc="Work",
+            quantity=Decimal(hours),
+            unit_cost=Decimal(rate),
+            accounting_date=day,
+            meta={"staff_id": str(self.staff.id)},
+            xero_pay_item=self.pay_item,
+        )
+
+    def _report(self, weeks=4):
+        return PayrollReconciliationService.get_reconciliation_data(
+            MONDAY, MONDAY + timedelta(weeks=weeks, days=-1)
+        )
+
+    def test_weeks_are_reconciled_per_staff(self):
+        self._pay_run(MONDAY, "300.00", "10")
+        self._time(MONDAY, "6")
+        self._time(MONDAY + timedelta(days=2), "4")
+        self._time(MONDAY + timedelta(weeks=1), "2")
+
+        report = self._report()
+
+        first, second = report["weeks"]
+        self.assertEqual(first["week_start"], MONDAY.isoformat())
+        self.assertEqual(first["staff"][0]["name"], "Wanda")
+        self.assertEqual(first["staff"][0]["jm_hours"], 10.0)
+        self.assertEqual(first["staff"][0]["jm_cost"], 300.0)
+        self.assertEqual(first["staff"][0]["xero_gross"], 300.0)
+        self.assertEqual(first["staff"][0]["status"], "ok")
+        self.assertEqual(second["staff"][0]["status"], "jm_only")
+        self.assertEqual(report["grand_totals"]["diff"], 60.0)
+
+    def test_query_count_does_not_grow_with_weeks(self):
+        self._pay_run(MONDAY, "300.00", "10")
+        self._time(MONDAY, "10")
+        with CaptureQueriesContext(connection) as one_week:
+            self._report(weeks=1)
+        PayrollReconciliationWeek.objects.all().delete()
+
+        for week in range(1, 8):
+            self._pay_run(MONDAY + timedelta(weeks=week), "300.00", "10")
+            self._time(MONDAY + timedelta(weeks=week), "10")
+        with CaptureQueriesContext(connection) as eight_weeks:
+            report = self._report(weeks=8)
+
+        self.assertEqual(len(report["weeks"]), 8)
+        self.assertEqual(len(eight_weeks), len(one_week))
+
+    def test_posted_weeks_are_served_from_snapshot(self):
+        self._pay_run(MONDAY, "300.00", "10")
+        self._time(MONDAY, "10")
+        first = self._report(weeks=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self._report(weeks=1)
+
+        self.assertEqual(first, second)
+        self.assertEqual(PayrollReconciliationWeek.objects.count(), 1)
+        self.assertFalse(
+            any("workflow_xeropayslip" in q["sql"] for q in queries.captured_queries)
+        )
+
+    def test_time_entry_change_invalidates_its_week(self):
+        self._pay_run(MONDAY, "300.00", "10")
+        line = self._time(MONDAY, "10")
+        self._report(weeks=1)
+
+        line.quantity = Decimal("12")
+        line.save()
+
+        self.assertFalse(PayrollReconciliationWeek.objects.exists())
+        week = self._report(weeks=1)["weeks"][0]
+        self.assertEqual(week["staff"][0]["jm_hours"], 12.0)
+
+    def test_staff_rename_rebuilds_snapshot(self):
+        self._pay_run(MONDAY, "300.00", "10")
+        self._time(MONDAY, "10")
+        self._report(weeks=1)
+
+        self.staff.first_name = "Wendy"
+        self.staff.save()
+
+        week = self._report(weeks=1)["weeks"][0]
+        self.assertEqual([row["name"] for row in week["staff"]], ["Wendy"])
+
+    def test_bulk_time_entry_change_rebuilds_snapshot(self):
+        self._pay_run(MONDAY, "300.00", "10")
+        self._time(MONDAY, "10")
+        self._report(weeks=1)
+
+        # queryset.update() skips CostLine.save() and its invalidation
+        CostLine.objects.update(quantity=Decimal("12"))
+
+        week = self._report(weeks=1)["weeks"][0]
+        self.assertEqual(week["staff"][0]["jm_hours"], 12.0)
+
+    def test_pay_run_change_rebuilds_snapshot(self):
+        pay_run = self._pay_run(MONDAY, "300.00", "10")
+        self._time(MONDAY, "10")
+        self._report(weeks=1)
+
+        slip = pay_run.pay_slips.get()
+        slip.gross_earnings = Decimal("320.00")
+        slip.save()
+        pay_run.xero_last_modified = timezone.now() + timedelta(minutes=1)
+        pay_run.save()
+
+        week = self._report(weeks=1)["weeks"][0]
+        self.assertEqual(week["staff"][0]["xero_gross"], 320.0)
+        self.assertEqual(week["staff"][0]["status"], "mismatch")
@@ -0,0 +1,137 @@
+"""Tests for SQL-side sales forecast aggregation and the closed-month rollup."""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounting.models import Invoice, SalesForecastMonth
+from apps.accounting.services.sales_forecast_service import (
+    ROLLUP_MAX_AGE,
+    SalesForecastService,
+)
+from apps.client.models import Client
+from apps.job.models import Job
+from apps.job.models.costing import CostLine
+from apps.testing import BaseTestCase
+
+TODAY = date(2025, 7, 15)
+TODAY_PATH = "apps.accounting.services.sales_forecast_service.timezone.localdate"
+
+
+class TestSalesForecastService(BaseTestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(
+            name="Forecast Client",
+            xero_last_modified=timezone.now(),
+        )
+        patcher = patch(TODAY_PATH, return_value=TODAY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _invoice(self, amount, invoice_date, job=None, status="AUTHORISED"):
+        return Invoice.objects.create(
+            client=self.client_obj,
+            job=job,
+            xero_id=uuid.uuid4(),
+            number=f"INV-{uuid.uuid4().hex[:8]}",
+            status=status,
+            total_excl_tax=amount,
+            tax=Decimal("0.00"),
+            total_incl_tax=amount,
+            amount_due=Decimal("0.00"),
+            date=invoice_date,
+            xero_last_modified=timezone.now(),
+            raw_json={},
+        )
+
+    def test_invoices_grouped_by_month(self):
+        self._invoice(Decimal("100.00"), date(2025, 5, 2))
+        self._invoice(Decimal("50.00"), date(2025, 5, 28))
+        self._invoice(Decimal("999.00"), date(2025, 5, 10), status="VOIDED")
+        self._invoice(Decimal("70.00"), date(2025, 7, 1))
+
+        sales = SalesForecastService.get_monthly_sales()
+
+        self.assertEqual(sales["2025-05"], (Decimal("150.00"), Decimal("0")))
+        self.assertEqual(sales["2025-07"], (Decimal("70.00"), Decimal("0")))
+        self.assertNotIn("2025-04", sales)
+        self.assertNotIn("2025-06", sales)
+
+    def test_closed_months_served_from_rollup(self):
+        self._invoice(Decimal("100.00"), date(2025, 5, 2))
+        SalesForecastService.get_monthly_sales()
+
+        with CaptureQueriesContext(connection) as queries:
+            sales = SalesForecastService.get_monthly_sales()
+
+        # One rollup read; only the open month is recomputed (one invoice and
+        # one cost line query)
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(sales["2025-05"][0], Decimal("100.00"))
+        self.assertEqual(
+            list(SalesForecastMonth.objects.values_list("month", "has_data")),
+            [
+                (date(2025, 4, 1), False),
+                (date(2025, 5, 1), True),
+                (date(2025, 6, 1), False),
+            ],
+        )
+
+    def test_invoice_change_refreshes_its_month(self):
+        invoice = self._invoice(Decimal("100.00"), date(2025, 5, 2))
+        SalesForecastService.get_monthly_sales()
+
+        invoice.date = date(2025, 6, 3)
+        invoice.save()
+
+        # Dropped in the database, so every process recomputes them
+        self.assertFalse(
+            SalesForecastMonth.objects.filter(
+                month__in=[date(2025, 5, 1), date(2025, 6, 1)]
+            ).exists()
+        )
+        sales = SalesForecastService.get_monthly_sales()
+        self.assertNotIn("2025-05", sales)
+        self.assertEqual(sales["2025-06"][0], Decimal("100.00"))
+
+    def test_old_rollups_are_recomputed(self):
+        self._invoice(Decimal("100.00"), date(2025, 5, 2))
+        SalesForecastService.get_monthly_sales()
+        # A write that bypassed save(), e.g. a queryset update
+        Invoice.objects.update(total_incl_tax=Decimal("40.00"))
+
+        self.assertEqual(
+            SalesForecastService.get_monthly_sales()["2025-05"][0], Decimal("100.00")
+        )
+        SalesForecastMonth.objects.update(computed_at=timezone.now() - ROLLUP_MAX_AGE)
+        self.assertEqual(
+            SalesForecastService.get_monthly_sales()["2025-05"][0], Decimal("40.00")
+        )
+
+    def test_cost_line_revenue_grouped_by_month(self):
+        job = Job.objects.create(client=self.client_obj, name="Forecast Job")
+        for day, revenue in ((date(2025, 5, 3), "80"), (date(2025, 5, 20), "20")):
+            CostLine.objects.create(
+                cost_set=job.latest_actual,
+                kind="adjust",
+                desc="Revenue",
+                quantity=Decimal("1.000"),
+                unit_cost=Decimal("0.00"),
+                unit_rev=Decimal(revenue),
+                accounting_date=day,
+            )
+        self._invoice(Decimal("100.00"), date(2025, 5, 2), job=job)
+
+        sales = SalesForecastService.get_monthly_sales()
+        invoiced = SalesForecastService.get_invoiced_totals([job.id])
+        stats = SalesForecastService.get_latest_actual_stats([job])
+
+        self.assertEqual(sales["2025-05"], (Decimal("100.00"), Decimal("100")))
+        self.assertEqual(invoiced, {str(job.id): Decimal("100.00")})
+        self.assertEqual(stats[str(job.id)]["start_date"], date(2025, 5, 3))
+        self.assertEqual(stats[str(job.id)]["end_date"], date(2025, 5, 20))
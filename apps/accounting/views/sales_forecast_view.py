@@ -10,7 +10,6 @@ from decimal import Decimal
 from logging import getLogger
 from typing import Any, Dict, List, Optional
 
-from django.db.models import Q, Sum
 from django.views.generic import TemplateView
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
@@ -19,7 +18,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounting.models import Invoice
-from apps.job.models import CostLine, Job
+from apps.accounting.services.sales_forecast_service import (
+    SalesForecastService,
+    sellable_invoices,
+)
+from apps.job.models import Job
 
 logger = getLogger(__name__)
 
@@ -87,29 +90,17 @@ class SalesForecastAPIView(APIView):
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Get monthly sales comparison data"""
         try:
-            # Get Xero sales by month (from Invoice.date)
-            xero_sales_by_month = self._get_xero_sales_by_month()
-
-            # Get JM sales by month (from CostLine.accounting_date)
-            jm_sales_by_month = self._get_jm_sales_by_month()
-
-            # Combine all months that have data from either source (newest first)
-            # Filter out months before April 2025 (when we started using the app)
-            all_months = sorted(
-                [
-                    m
-                    for m in set(xero_sales_by_month.keys())
-                    | set(jm_sales_by_month.keys())
-                    if m >= "2025-04"
-                ],
-                reverse=True,
-            )
+            # Xero sales (Invoice.date) and JM sales (CostLine.accounting_date)
+            # per month, from April 2025 (when we started using the app)
+            monthly_sales = SalesForecastService.get_monthly_sales()
+            all_months = sorted(monthly_sales.keys(), reverse=True)
 
             # Build response data
             result: List[Dict[str, Any]] = []
             for month_key in all_months:
-                xero_sales = float(xero_sales_by_month.get(month_key, Decimal("0")))
-                jm_sales = float(jm_sales_by_month.get(month_key, Decimal("0")))
+                xero_total, jm_total = monthly_sales[month_key]
+                xero_sales = float(xero_total)
+                jm_sales = float(jm_total)
                 variance = xero_sales - jm_sales
                 variance_pct = (variance / xero_sales * 100) if xero_sales != 0 else 0.0
 
@@ -137,53 +128,6 @@ class SalesForecastAPIView(APIView):
                 {"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _get_xero_sales_by_month(self) -> Dict[str, Decimal]:
-        """
-        Get total invoice amounts grouped by month from Xero invoices.
-
-        Returns:
-            Dict mapping 'YYYY-MM' to total invoice amount
-        """
-        # Query all invoices, excluding DRAFT, DELETED, and VOIDED
-        invoices = (
-            Invoice.objects.filter(
-                ~Q(status__in=["DRAFT", "DELETED", "VOIDED"]),
-                date__isnull=False,
-            )
-            .values("date")
-            .annotate(total=Sum("total_incl_tax"))
-        )
-
-        sales_by_month: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for invoice in invoices:
-            invoice_date = invoice["date"]
-            month_key = invoice_date.strftime("%Y-%m")
-            sales_by_month[month_key] += invoice["total"] or Decimal("0")
-
-        return dict(sales_by_month)
-
-    def _get_jm_sales_by_month(self) -> Dict[str, Decimal]:
-        """
-        Get total revenue grouped by month from Job Manager cost lines.
-
-        Revenue is calculated from CostLine.total_rev using accounting_date.
-
-        Returns:
-            Dict mapping 'YYYY-MM' to total revenue
-        """
-        # Query actual cost lines only (not estimates or quotes)
-        cost_lines = CostLine.objects.filter(
-            cost_set__kind="actual",
-            accounting_date__isnull=False,
-        )
-
-        sales_by_month: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for line in cost_lines:
-            month_key = line.accounting_date.strftime("%Y-%m")
-            sales_by_month[month_key] += line.total_rev
-
-        return dict(sales_by_month)
-
 
 class SalesForecastMonthDetailAPIView(APIView):
     """
@@ -307,28 +251,42 @@ class SalesForecastMonthDetailAPIView(APIView):
         rows: List[Dict[str, Any]] = []
 
         # Get invoices for this month
-        invoices = Invoice.objects.filter(
-            ~Q(status__in=["DRAFT", "DELETED", "VOIDED"]),
-            date__year=year,
-            date__month=month,
-        ).select_related("client", "job", "job__client")
+        invoices = (
+            sellable_invoices()
+            .filter(
+                date__year=year,
+                date__month=month,
+            )
+            .select_related("client")
+        )
 
         # Get jobs with actual revenue in this month
-        jobs_with_revenue = self._get_jobs_with_revenue(year, month)
+        jobs_with_revenue = SalesForecastService.get_job_revenue_for_month(year, month)
 
         # Group invoices by job_id (None for unlinked invoices)
         invoices_by_job: Dict[str, List[Invoice]] = defaultdict(list)
         unlinked_invoices: List[Invoice] = []
 
         for invoice in invoices:
-            if invoice.job:
-                invoices_by_job[str(invoice.job.id)].append(invoice)
+            if invoice.job_id:
+                invoices_by_job[str(invoice.job_id)].append(invoice)
             else:
                 unlinked_invoices.append(invoice)
 
         # Track all job IDs that have invoices
         jobs_with_invoices = set(invoices_by_job.keys())
 
+        # Load every job once, then fetch all-time totals and activity dates
+        # for all of them with grouped queries
+        jobs = {
+            str(job.id): job
+            for job in Job.objects.filter(
+                id__in=jobs_with_invoices | set(jobs_with_revenue)
+            ).select_related("client")
+        }
+        invoiced_totals = SalesForecastService.get_invoiced_totals(jobs.keys())
+        actual_stats = SalesForecastService.get_latest_actual_stats(jobs.values())
+
         def build_row(
             row_date: str,
             client_name: str,
@@ -368,8 +326,8 @@ class SalesForecastMonthDetailAPIView(APIView):
             if job and job.shop_job:
                 return "Shop job"
             if job:
-                start = job.start_date
-                end = job.last_financial_activity_date
+                start = actual_stats[str(job.id)]["start_date"]
+                end = actual_stats[str(job.id)]["end_date"]
                 if start and end and (start.year, start.month) != (end.year, end.month):
                     return "Multi-month"
             if match_type == "xero_only":
@@ -380,12 +338,12 @@ class SalesForecastMonthDetailAPIView(APIView):
 
         # Build rows for jobs with invoices (matched)
         for job_id, job_invoices in invoices_by_job.items():
-            job = job_invoices[0].job
+            job = jobs[job_id]
             monthly_revenue = float(jobs_with_revenue.get(job_id, Decimal("0")))
-            start_date = job.start_date
+            start_date = actual_stats[job_id]["start_date"]
             # All-time totals for job
-            total_xero = self._get_total_invoiced_for_job(job)
-            total_jm = float(job.latest_actual.total_revenue)
+            total_xero = float(invoiced_totals.get(job_id, 0))
+            total_jm = float(actual_stats[job_id]["revenue"])
             rows.append(
                 build_row(
                     row_date=job_invoices[0].date.isoformat(),
@@ -425,13 +383,13 @@ class SalesForecastMonthDetailAPIView(APIView):
         for job_id in jobs_with_revenue.keys():
             if job_id in jobs_with_invoices:
                 continue
-            job = Job.objects.select_related("client").get(id=job_id)
+            job = jobs[job_id]
             monthly_revenue = float(jobs_with_revenue[job_id])
-            start_date = job.start_date
-            completion = job.last_financial_activity_date
+            start_date = actual_stats[job_id]["start_date"]
+            completion = actual_stats[job_id]["end_date"]
             # All-time totals for job
-            total_xero = self._get_total_invoiced_for_job(job)
-            total_jm = float(job.latest_actual.total_revenue)
+            total_xero = float(invoiced_totals.get(job_id, 0))
+            total_jm = float(actual_stats[job_id]["revenue"])
             rows.append(
                 build_row(
                     row_date=completion.isoformat() if completion else None,
@@ -452,27 +410,3 @@ class SalesForecastMonthDetailAPIView(APIView):
         rows.sort(key=lambda r: r["date"] or "")
 
         return rows
-
-    def _get_jobs_with_revenue(self, year: int, month: int) -> Dict[str, Decimal]:
-        """Get jobs that have actual revenue in the given month."""
-        cost_lines = CostLine.objects.filter(
-            cost_set__kind="actual",
-            accounting_date__year=year,
-            accounting_date__month=month,
-        ).select_related("cost_set__job")
-
-        jobs_revenue: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-        for line in cost_lines:
-            job_id = str(line.cost_set.job.id)
-            jobs_revenue[job_id] += line.total_rev
-
-        # Only return jobs with non-zero revenue
-        return {k: v for k, v in jobs_revenue.items() if v != 0}
-
-    def _get_total_invoiced_for_job(self, job: Job) -> float:
-        """Get total of all invoices linked to a job (all time)."""
-        total = Invoice.objects.filter(
-            ~Q(status__in=["DRAFT", "DELETED", "VOIDED"]),
-            job=job,
-        ).aggregate(total=Sum("total_incl_tax"))["total"]
-        return float(total or 0)
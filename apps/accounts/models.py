@@ -169,6 +169,19 @@ class Staff(AbstractBaseUser, PermissionsMixin):
 
         super().save(*args, **kwargs)
 
+        # Cached auth identities carry date_left/password_needs_reset etc.
+        from jobs_manager.authentication import invalidate_cached_user
+
+        invalidate_cached_user(self.pk)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Any:
+        from jobs_manager.authentication import invalidate_cached_user
+
+        staff_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_cached_user(staff_id)
+        return result
+
     def _compute_wage_rate(self) -> None:
         """Set wage_rate = base_wage_rate * (1 + annual_leave_loading/100)."""
         if not self.base_wage_rate:
@@ -177,7 +190,7 @@ class Staff(AbstractBaseUser, PermissionsMixin):
         from apps.workflow.models import CompanyDefaults
 
         try:
-            loading = CompanyDefaults.get_instance().annual_leave_loading
+            loading = CompanyDefaults.get_cached().annual_leave_loading
         except CompanyDefaults.DoesNotExist:
             loading = Decimal("8.00")
         multiplier = Decimal("1") + loading / Decimal("100")
@@ -2,7 +2,7 @@
 Shared staff anonymization profiles and utilities.
 
 Used by:
-- apps/workflow/management/commands/backport_data_backup.py
+- apps/workflow/services/data_backup_service.py
 - scripts/anonymize_staff.py
 """
 
@@ -8,7 +8,14 @@ try:
     from django.apps import apps
 
     if apps.ready:
-        from .models import Client, ClientContact, Supplier, SupplierPickupAddress
+        from .models import (
+            Client,
+            ClientContact,
+            GeocodeCacheEntry,
+            Supplier,
+            SupplierAlias,
+            SupplierPickupAddress,
+        )
         from .serializers import (
             ClientContactSerializer,
             ClientCreateResponseSerializer,
@@ -53,10 +60,12 @@ __all__ = [
     "ClientSerializer",
     "ClientUpdateResponseSerializer",
     "ClientUpdateSerializer",
+    "GeocodeCacheEntry",
     "JobContactResponseSerializer",
     "JobContactUpdateSerializer",
     "StandardErrorSerializer",
     "Supplier",
+    "SupplierAlias",
     "SupplierPickupAddress",
     "SupplierPickupAddressSerializer",
     "date_to_datetime",
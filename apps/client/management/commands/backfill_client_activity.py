@@ -0,0 +1,36 @@
+"""
+Rebuild the client activity rollups (last invoice date, total spend,
+open jobs, last job date) from invoices and jobs.
+
+Usage:
+    python manage.py backfill_client_activity
+    python manage.py backfill_client_activity --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.client.models import Client
+from apps.client.services.client_activity_service import ClientActivityService
+
+
+class Command(BaseCommand):
+    help = "Rebuild denormalised client activity rollups from invoices and jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of clients to recompute per query batch",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total = Client.objects.count()
+        self.stdout.write(f"Recomputing activity rollups for {total} clients")
+
+        updated = ClientActivityService.refresh_all(batch_size=batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated rollups for {updated} of {total} clients")
+        )
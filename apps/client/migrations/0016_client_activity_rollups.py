@@ -0,0 +1,65 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:54
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0015_populate_xero_addresses"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="client",
+            name="last_invoice_date",
+            field=models.DateField(
+                blank=True,
+                editable=False,
+                help_text="Date of the most recent invoice (rollup)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="client",
+            name="last_job_date",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Creation time of the most recent job (rollup)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="client",
+            name="open_job_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of jobs not yet completed (rollup)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="client",
+            name="total_spend",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=Decimal("0.00"),
+                editable=False,
+                help_text="Sum of invoice totals excluding tax (rollup)",
+                max_digits=12,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["total_spend"], name="client_total_spend_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(
+                fields=["last_invoice_date"], name="client_last_invoice_date_idx"
+            ),
+        ),
+    ]
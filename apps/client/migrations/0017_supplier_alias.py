@@ -0,0 +1,67 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:43
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0016_client_activity_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SupplierAlias",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "alias",
+                    models.CharField(help_text="Name as it appeared", max_length=255),
+                ),
+                (
+                    "normalized_alias",
+                    models.CharField(
+                        help_text="Normalised form used for matching",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("confirmed", "Confirmed by user"),
+                            ("import", "Created by import"),
+                        ],
+                        default="confirmed",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="supplier_aliases",
+                        to="client.client",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Supplier aliases",
+                "ordering": ["normalized_alias"],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:02
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0017_supplier_alias'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCacheEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('normalized_address', models.CharField(help_text='Normalised address text used as the cache key', max_length=500, unique=True)),
+                ('address', models.TextField(help_text='Address as first submitted')),
+                ('status', models.CharField(choices=[('ok', 'Geocoded'), ('no_result', 'No result'), ('pending', 'Pending')], max_length=20)),
+                ('result', models.JSONField(blank=True, help_text='Parsed geocoding result', null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'client_geocode_cache',
+                'ordering': ['normalized_address'],
+                'indexes': [models.Index(fields=['status'], name='client_geoc_status_1018cb_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 import logging
 import uuid
+from decimal import Decimal
 
 from django.db import models
 from django.utils import timezone
@@ -20,6 +21,10 @@ class Client(models.Model):
     #   7. ClientDetailResponseSerializer in apps/client/serializers.py
     #   8. ClientSearchResultSerializer in apps/client/serializers.py (subset for lists)
     #
+    # Activity rollups (last_invoice_date, total_spend, open_job_count,
+    # last_job_date) are derived, not direct fields - they are maintained by
+    # ClientActivityService in apps/client/services/client_activity_service.py.
+    #
     # Direct scalar model fields (not related objects, not properties).
     CLIENT_DIRECT_FIELDS = [
         "name",
@@ -101,13 +106,78 @@ class Client(models.Model):
         help_text="The client this was merged into",
     )
 
+    # Denormalised activity rollups so the client list can sort on indexed
+    # columns instead of aggregating invoices per page.
+    last_invoice_date = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Date of the most recent invoice (rollup)",
+    )
+    total_spend = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        editable=False,
+        help_text="Sum of invoice totals excluding tax (rollup)",
+    )
+    open_job_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of jobs not yet completed (rollup)",
+    )
+    last_job_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Creation time of the most recent job (rollup)",
+    )
+
     class Meta:
         ordering = ["name"]
         db_table = "workflow_client"
+        indexes = [
+            models.Index(fields=["total_spend"], name="client_total_spend_idx"),
+            models.Index(
+                fields=["last_invoice_date"], name="client_last_invoice_date_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    # Fields that change which supplier a name resolves to
+    SUPPLIER_INDEX_FIELDS = ("name", "xero_archived", "merged_into_id")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_index_values = tuple(
+            instance.__dict__.get(field) for field in cls.SUPPLIER_INDEX_FIELDS
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        index_values = tuple(
+            getattr(self, field) for field in self.SUPPLIER_INDEX_FIELDS
+        )
+        if index_values != getattr(self, "_loaded_index_values", None):
+            self._invalidate_supplier_index()
+        self._loaded_index_values = index_values
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_supplier_index()
+        return result
+
+    def _invalidate_supplier_index(self):
+        from apps.client.services.supplier_matching_service import (
+            invalidate_supplier_index,
+        )
+
+        invalidate_supplier_index()
+
     def validate_for_xero(self):
         """
         Validate if the client data is sufficient to sync to Xero.
@@ -118,21 +188,6 @@ class Client(models.Model):
             return False
         return True
 
-    def get_last_invoice_date(self):
-        """
-        Get the date of the client's most recent invoice.
-        """
-        last_invoice = self.invoice_set.order_by("-date").first()
-        return last_invoice.date if last_invoice else None
-
-    def get_total_spend(self):
-        """
-        Calculate the total amount spent by the client (sum of all invoice totals).
-        """
-        return (
-            self.invoice_set.aggregate(total=models.Sum("total_excl_tax"))["total"] or 0
-        )
-
     def get_client_for_xero(self):
         """
         Return the client data in a format suitable for syncing to Xero.
@@ -198,7 +253,7 @@ class Client(models.Model):
                 f"singleton violated!"
             )
 
-        company_defaults = CompanyDefaults.objects.get()
+        company_defaults = CompanyDefaults.get_cached()
 
         # Require explicit shop_client_name configuration
         if not company_defaults.shop_client_name:
@@ -358,6 +413,43 @@ class Supplier(Client):
         proxy = True
 
 
+class SupplierAlias(models.Model):
+    """
+    A supplier name confirmed to mean a specific client.
+
+    Recorded when a user confirms the supplier for an imported quote or price
+    list, so the same spelling resolves directly next time.
+    """
+
+    SOURCE_CHOICES = [
+        ("confirmed", "Confirmed by user"),
+        ("import", "Created by import"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    alias = models.CharField(max_length=255, help_text="Name as it appeared")
+    normalized_alias = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Normalised form used for matching",
+    )
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name="supplier_aliases"
+    )
+    source = models.CharField(
+        max_length=20, choices=SOURCE_CHOICES, default="confirmed"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["normalized_alias"]
+        verbose_name_plural = "Supplier aliases"
+
+    def __str__(self):
+        return f"{self.alias} -> {self.client.name}"
+
+
 class SupplierPickupAddress(models.Model):
     """
     Represents a pickup/delivery address for a supplier or client.
@@ -525,3 +617,43 @@ class SupplierPickupAddress(models.Model):
 
 # Alias for SupplierPickupAddress - can be used for any client, not just suppliers
 ClientDeliveryAddress = SupplierPickupAddress
+
+
+class GeocodeCacheEntry(models.Model):
+    """
+    A Google Address Validation result, keyed by normalised address text.
+
+    Lets the same address be geocoded once however many clients or pickup
+    addresses share it. Addresses waiting for the batch geocoding job are
+    stored as "pending" entries with no result.
+    """
+
+    STATUS_CHOICES = [
+        ("ok", "Geocoded"),
+        ("no_result", "No result"),
+        ("pending", "Pending"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    normalized_address = models.CharField(
+        max_length=500,
+        unique=True,
+        help_text="Normalised address text used as the cache key",
+    )
+    address = models.TextField(help_text="Address as first submitted")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    result = models.JSONField(
+        null=True, blank=True, help_text="Parsed geocoding result"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "client_geocode_cache"
+        ordering = ["normalized_address"]
+        indexes = [models.Index(fields=["status"])]
+
+    def __str__(self):
+        return f"{self.normalized_address} ({self.status})"
@@ -5,23 +5,73 @@ try:
     from django.apps import apps
 
     if apps.ready:
+        from .client_activity_service import ClientActivityService
         from .client_rest_service import ClientRestService
+        from .geocoding_batch_service import (
+            GeocodingBatchResult,
+            GeocodingBatchService,
+            _Lookup,
+            apply_geocode,
+            pickup_address_text,
+        )
         from .geocoding_service import (
+            GeocodingAccessError,
+            GeocodingAddressRejectedError,
+            GeocodingClient,
             GeocodingError,
             GeocodingNotConfiguredError,
             GeocodingResult,
+            GeocodingRetryableError,
+            GoogleAddressValidationClient,
+            cached_result,
             geocode_address,
             get_api_key,
+            get_cached_geocode,
+            get_geocode_entry,
+            normalize_address,
+            request_geocode,
+            store_geocode,
+            validate_address,
+        )
+        from .supplier_matching_service import (
+            SupplierMatch,
+            SupplierMatcher,
+            _SupplierIndex,
+            invalidate_supplier_index,
+            normalize_supplier_name,
         )
 except (ImportError, RuntimeError):
     # Django not ready or circular import, skip conditional imports
     pass
 
 __all__ = [
+    "ClientActivityService",
     "ClientRestService",
+    "GeocodingAccessError",
+    "GeocodingAddressRejectedError",
+    "GeocodingBatchResult",
+    "GeocodingBatchService",
+    "GeocodingClient",
     "GeocodingError",
     "GeocodingNotConfiguredError",
     "GeocodingResult",
+    "GeocodingRetryableError",
+    "GoogleAddressValidationClient",
+    "SupplierMatch",
+    "SupplierMatcher",
+    "_Lookup",
+    "_SupplierIndex",
+    "apply_geocode",
+    "cached_result",
     "geocode_address",
     "get_api_key",
+    "get_cached_geocode",
+    "get_geocode_entry",
+    "invalidate_supplier_index",
+    "normalize_address",
+    "normalize_supplier_name",
+    "pickup_address_text",
+    "request_geocode",
+    "store_geocode",
+    "validate_address",
 ]
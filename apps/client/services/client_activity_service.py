@@ -0,0 +1,108 @@
+"""
+Client Activity Service
+
+Maintains the denormalised activity rollups stored on Client
+(last_invoice_date, total_spend, open_job_count, last_job_date).
+
+Rollups are recomputed for the affected clients only, with one grouped
+query per source table, whenever invoices sync or a job is created or
+changes status/client. The full table can be rebuilt with the
+``backfill_client_activity`` management command.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Iterable
+
+from django.db.models import Count, Max, Q, Sum
+
+from apps.client.models import Client
+
+logger = logging.getLogger(__name__)
+
+# Job statuses that count towards a client's open jobs
+OPEN_JOB_STATUSES = [
+    "draft",
+    "awaiting_approval",
+    "approved",
+    "in_progress",
+    "unusual",
+]
+
+ROLLUP_FIELDS = ["last_invoice_date", "total_spend", "open_job_count", "last_job_date"]
+
+
+class ClientActivityService:
+    """Recompute client activity rollups from invoices and jobs."""
+
+    @staticmethod
+    def refresh_clients(client_ids: Iterable, batch_size: int = 500) -> int:
+        """
+        Recompute rollups for the given clients.
+
+        Args:
+            client_ids: Client IDs to refresh (None values are ignored)
+            batch_size: Clients per query batch
+
+        Returns:
+            Number of clients updated
+        """
+        ids = list({client_id for client_id in client_ids if client_id})
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            updated += ClientActivityService._refresh_batch(
+                ids[start : start + batch_size]
+            )
+        return updated
+
+    @staticmethod
+    def refresh_all(batch_size: int = 500) -> int:
+        """Recompute rollups for every client."""
+        client_ids = Client.objects.values_list("id", flat=True).order_by("id")
+        return ClientActivityService.refresh_clients(
+            client_ids.iterator(chunk_size=batch_size), batch_size=batch_size
+        )
+
+    @staticmethod
+    def _refresh_batch(client_ids: list) -> int:
+        # Imported here to avoid circular imports (both apps import Client)
+        from apps.accounting.models import Invoice
+        from apps.job.models import Job
+
+        invoice_rollups = {
+            row["client_id"]: row
+            for row in Invoice.objects.filter(client_id__in=client_ids)
+            .values("client_id")
+            .annotate(last_invoice_date=Max("date"), total_spend=Sum("total_excl_tax"))
+        }
+        job_rollups = {
+            row["client_id"]: row
+            for row in Job.objects.filter(client_id__in=client_ids)
+            .values("client_id")
+            .annotate(
+                open_job_count=Count("id", filter=Q(status__in=OPEN_JOB_STATUSES)),
+                last_job_date=Max("created_at"),
+            )
+        }
+
+        changed = []
+        for client in Client.objects.filter(id__in=client_ids).only(
+            "id", *ROLLUP_FIELDS
+        ):
+            invoices = invoice_rollups.get(client.id, {})
+            jobs = job_rollups.get(client.id, {})
+            values = {
+                "last_invoice_date": invoices.get("last_invoice_date"),
+                "total_spend": invoices.get("total_spend") or Decimal("0.00"),
+                "open_job_count": jobs.get("open_job_count", 0),
+                "last_job_date": jobs.get("last_job_date"),
+            }
+            if any(getattr(client, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(client, field, value)
+                changed.append(client)
+
+        if changed:
+            Client.objects.bulk_update(changed, ROLLUP_FIELDS)
+            logger.debug(f"Refreshed activity rollups for {len(changed)} clients")
+        return len(changed)
@@ -6,13 +6,10 @@ All business logic for Client REST operations should be implemented here.
 """
 
 import logging
-from decimal import Decimal
 from typing import Any, Dict, List
 from uuid import UUID
 
 from django.db import transaction
-from django.db.models import DecimalField, Max, Sum, Value
-from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from xero_python.accounting import AccountingApi
@@ -129,17 +126,9 @@ class ClientRestService:
             if sort_dir.lower() == "desc":
                 sort_field = f"-{sort_field}"
 
-            # Annotate computed fields for sorting capability
-            # Note: mirrors Client.get_last_invoice_date() and get_total_spend()
-            output = DecimalField(max_digits=12, decimal_places=2)
-            queryset = Client.objects.annotate(
-                last_invoice_date=Max("invoice__date"),
-                total_spend=Coalesce(
-                    Sum("invoice__total_excl_tax", output_field=output),
-                    Value(Decimal("0.00")),
-                    output_field=output,
-                ),
-            ).defer("raw_json")
+            # last_invoice_date/total_spend are indexed rollup columns
+            # maintained by ClientActivityService, so sorting needs no joins
+            queryset = Client.objects.defer("raw_json")
 
             # Apply search filter if query provided
             if query:
@@ -517,26 +506,12 @@ class ClientRestService:
     @staticmethod
     def _execute_client_search(query: str, limit: int):
         """
-        Executes client search with appropriate filters and annotations.
+        Executes client search with appropriate filters.
         """
-        output = DecimalField(max_digits=12, decimal_places=2)
-
         return (
             Client.objects.filter(
                 name__icontains=query
             )  # Case insensitive substring search
-            .annotate(
-                last_invoice_date=Max("invoice__date"),
-                total_spend=Coalesce(
-                    Sum(
-                        "invoice__total_excl_tax",
-                        output_field=output,
-                    ),
-                    Value(Decimal("0.00")),
-                    output_field=output,
-                ),
-            )
-            .defer("raw_json")  # Not needed for search results
             .only(
                 "id",
                 "name",
@@ -544,7 +519,10 @@ class ClientRestService:
                 "phone",
                 "address",
                 "is_account_customer",
+                "is_supplier",
                 "xero_contact_id",
+                "last_invoice_date",
+                "total_spend",
             )
             .order_by("name")[:limit]
         )
@@ -554,14 +532,6 @@ class ClientRestService:
         """
         Formats a single client summary for list/search responses.
         """
-        # Use annotated values if available (from search queries), else use model methods
-        last_invoice_date = (
-            getattr(client, "last_invoice_date", None) or client.get_last_invoice_date()
-        )
-        total_spend = getattr(client, "total_spend", None)
-        if total_spend is None:
-            total_spend = client.get_total_spend()
-
         return {
             "id": str(client.id),
             "name": client.name,
@@ -571,8 +541,8 @@ class ClientRestService:
             "is_account_customer": client.is_account_customer,
             "is_supplier": client.is_supplier,
             "xero_contact_id": client.xero_contact_id or "",
-            "last_invoice_date": date_to_datetime(last_invoice_date),
-            "total_spend": f"${total_spend:,.2f}",
+            "last_invoice_date": date_to_datetime(client.last_invoice_date),
+            "total_spend": f"${client.total_spend:,.2f}",
         }
 
     @staticmethod
@@ -608,8 +578,8 @@ class ClientRestService:
             "merged_into": str(client.merged_into.id) if client.merged_into else None,
             "django_created_at": client.django_created_at,
             "django_updated_at": client.django_updated_at,
-            "last_invoice_date": date_to_datetime(client.get_last_invoice_date()),
-            "total_spend": f"${client.get_total_spend():,.2f}",
+            "last_invoice_date": date_to_datetime(client.last_invoice_date),
+            "total_spend": f"${client.total_spend:,.2f}",
         }
 
     @staticmethod
@@ -0,0 +1,317 @@
+"""
+Geocoding Batch Service
+
+Works through addresses that have no coordinates yet: active pickup
+addresses missing latitude/longitude, and addresses queued by views as
+"pending" cache entries.
+
+Each distinct normalised address is looked up once. Cached results are
+reused, the rest are sent to the geocoding client on a bounded thread pool,
+with exponential backoff for rate limits and other transient errors.
+Results are written to the cache and applied to the pickup addresses from
+the calling thread.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from apps.client.models import GeocodeCacheEntry, SupplierPickupAddress
+from apps.client.services.geocoding_service import (
+    GeocodingAccessError,
+    GeocodingAddressRejectedError,
+    GeocodingClient,
+    GeocodingError,
+    GeocodingNotConfiguredError,
+    GeocodingResult,
+    GeocodingRetryableError,
+    GoogleAddressValidationClient,
+    cached_result,
+    normalize_address,
+    validate_address,
+)
+from apps.workflow.services.error_persistence import persist_app_error
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 4
+MAX_ATTEMPTS = 4
+BACKOFF_SECONDS = 1.0
+BATCH_LOCK_KEY = "geocoding_batch_running"
+BATCH_LOCK_TIMEOUT = 60 * 30
+
+ADDRESS_UPDATE_FIELDS = [
+    "latitude",
+    "longitude",
+    "google_place_id",
+    "suburb",
+    "postal_code",
+    "updated_at",
+]
+
+
+def pickup_address_text(address: SupplierPickupAddress) -> str:
+    """Build a freetext address string from address components."""
+    parts = [
+        address.street,
+        address.suburb,
+        address.city,
+        address.postal_code,
+        address.country,
+    ]
+    return ", ".join(p for p in parts if p)
+
+
+def apply_geocode(address: SupplierPickupAddress, result: GeocodingResult) -> None:
+    """Copy coordinates onto a pickup address, filling empty suburb/postcode."""
+    address.latitude = _coordinate(result.latitude)
+    address.longitude = _coordinate(result.longitude)
+    address.google_place_id = result.google_place_id
+    if not address.suburb and result.suburb:
+        address.suburb = result.suburb
+    if not address.postal_code and result.postal_code:
+        address.postal_code = result.postal_code
+
+
+def _coordinate(value: Optional[float]) -> Optional[Decimal]:
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(Decimal("0.0000001"))
+
+
+@dataclass
+class _Lookup:
+    key: str
+    text: str
+    result: Optional[GeocodingResult] = None
+    error: Optional[str] = None
+    # Google rejected the address itself, so retrying cannot help
+    rejected: bool = False
+
+
+@dataclass
+class GeocodingBatchResult:
+    """Outcome of a batch geocoding run."""
+
+    addresses_found: int = 0
+    cache_hits: int = 0
+    looked_up: int = 0
+    no_result: int = 0
+    addresses_updated: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+class GeocodingBatchService:
+    """Geocode every address that is missing coordinates."""
+
+    def __init__(
+        self,
+        client: Optional[GeocodingClient] = None,
+        max_workers: int = MAX_WORKERS,
+        max_attempts: int = MAX_ATTEMPTS,
+        backoff_seconds: float = BACKOFF_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._client = client
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.sleep = sleep
+
+    @property
+    def client(self) -> GeocodingClient:
+        if self._client is None:
+            self._client = GoogleAddressValidationClient()
+        return self._client
+
+    def run(
+        self, limit: Optional[int] = None, refresh: bool = False, dry_run: bool = False
+    ) -> GeocodingBatchResult:
+        """
+        Geocode pending addresses and apply the coordinates to pickup addresses.
+
+        Args:
+            limit: Maximum number of pickup addresses to process
+            refresh: Re-geocode every active pickup address, ignoring the cache
+            dry_run: Report what would be looked up without calling Google
+
+        Raises:
+            GeocodingNotConfiguredError: If lookups are needed and no API key is set
+            GeocodingAccessError: If Google refuses the API key or its quota;
+                nothing from the run is cached and pending addresses stay queued
+        """
+        addresses = SupplierPickupAddress.objects.filter(is_active=True)
+        if not refresh:
+            addresses = addresses.filter(latitude__isnull=True)
+        addresses = list(addresses.order_by("created_at")[:limit])
+
+        texts: Dict[str, str] = {}
+        for entry in GeocodeCacheEntry.objects.filter(status="pending"):
+            texts[entry.normalized_address] = entry.address
+        by_key: Dict[str, List[SupplierPickupAddress]] = {}
+        for address in addresses:
+            text = pickup_address_text(address)
+            key = normalize_address(text)
+            if key:
+                texts.setdefault(key, text)
+                by_key.setdefault(key, []).append(address)
+
+        result = GeocodingBatchResult(addresses_found=len(addresses))
+        found: Dict[str, Optional[GeocodingResult]] = {}
+        if not refresh:
+            for entry in GeocodeCacheEntry.objects.filter(
+                normalized_address__in=list(texts)
+            ).exclude(status="pending"):
+                found[entry.normalized_address] = cached_result(entry)
+            result.cache_hits = len(found)
+
+        pending = [(key, text) for key, text in texts.items() if key not in found]
+        if dry_run:
+            result.looked_up = len(pending)
+            return result
+
+        if pending:
+            client = self.client
+            workers = max(1, min(self.max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                lookups = list(
+                    executor.map(lambda item: self._lookup(client, *item), pending)
+                )
+            self._store(lookups, result)
+            for lookup in lookups:
+                if lookup.error is None:
+                    found[lookup.key] = lookup.result
+
+        now = timezone.now()
+        changed = []
+        for key, key_addresses in by_key.items():
+            geocoded = found.get(key)
+            if geocoded is None or geocoded.latitude is None:
+                continue
+            for address in key_addresses:
+                apply_geocode(address, geocoded)
+                # bulk_update skips auto_now
+                address.updated_at = now
+                changed.append(address)
+        SupplierPickupAddress.objects.bulk_update(
+            changed, ADDRESS_UPDATE_FIELDS, batch_size=500
+        )
+        result.addresses_updated = len(changed)
+
+        logger.info(
+            f"Geocoding batch: {result.looked_up} looked up, {result.cache_hits} "
+            f"cached, {result.addresses_updated} addresses updated, "
+            f"{len(result.failed)} failed"
+        )
+        return result
+
+    def _lookup(self, client: GeocodingClient, key: str, text: str) -> _Lookup:
+        """
+        Geocode one address, backing off on transient errors. Runs on a worker.
+
+        GeocodingAccessError is raised: it would fail every other address too.
+        """
+        lookup = _Lookup(key, text)
+        for attempt in range(self.max_attempts):
+            try:
+                lookup.result = validate_address(text, client)
+                lookup.error = None
+                return lookup
+            except GeocodingRetryableError as exc:
+                lookup.error = str(exc)
+                if attempt < self.max_attempts - 1:
+                    delay = self.backoff_seconds * 2**attempt
+                    logger.info(f"Geocoding '{text}' failed ({exc}); retry in {delay}s")
+                    self.sleep(delay)
+            except GeocodingAddressRejectedError as exc:
+                lookup.error, lookup.rejected = str(exc), True
+                return lookup
+            except GeocodingAccessError:
+                raise
+            except GeocodingError as exc:
+                lookup.error = str(exc)
+                return lookup
+        return lookup
+
+    def _store(self, lookups: List[_Lookup], result: GeocodingBatchResult) -> None:
+        """Write lookup outcomes to the cache with one read and bulk writes."""
+        existing = {
+            entry.normalized_address: entry
+            for entry in GeocodeCacheEntry.objects.filter(
+                normalized_address__in=[lookup.key for lookup in lookups]
+            )
+        }
+        now = timezone.now()
+        to_create = []
+        for lookup in lookups:
+            entry = existing.get(lookup.key) or GeocodeCacheEntry(
+                normalized_address=lookup.key, address=lookup.text
+            )
+            entry.attempts += 1
+            entry.updated_at = now
+            entry.last_error = lookup.error or ""
+            if lookup.error is not None:
+                result.failed[lookup.text] = lookup.error
+                # Rejected addresses are cached as having no result; every
+                # other failure stays queued for the next run
+                entry.status = "no_result" if lookup.rejected else "pending"
+                entry.result = None
+            else:
+                result.looked_up += 1
+                if lookup.result is None:
+                    result.no_result += 1
+                entry.status = "ok" if lookup.result else "no_result"
+                entry.result = asdict(lookup.result) if lookup.result else None
+            if lookup.key not in existing:
+                to_create.append(entry)
+        GeocodeCacheEntry.objects.bulk_update(
+            list(existing.values()),
+            ["status", "result", "attempts", "last_error", "updated_at"],
+        )
+        GeocodeCacheEntry.objects.bulk_create(to_create, ignore_conflicts=True)
+
+    @classmethod
+    def run_in_background(cls) -> bool:
+        """Start a batch run on a daemon thread unless one is already running."""
+        if not cache.add(BATCH_LOCK_KEY, True, timeout=BATCH_LOCK_TIMEOUT):
+            logger.debug("Geocoding batch already running")
+            return False
+        thread = threading.Thread(target=cls._run_background, daemon=True)
+        thread.start()
+        return True
+
+    @staticmethod
+    def record_run_failure(exc: Exception) -> int:
+        """
+        Note an error that stopped a whole run (e.g. Google refusing the API
+        key) on every queued address, so views can report it.
+        """
+        return GeocodeCacheEntry.objects.filter(status="pending").update(
+            attempts=F("attempts") + 1,
+            last_error=str(exc),
+            updated_at=timezone.now(),
+        )
+
+    @classmethod
+    def _run_background(cls) -> None:
+        try:
+            cls().run()
+        except GeocodingNotConfiguredError as exc:
+            logger.warning("GOOGLE_MAPS_API_KEY not configured; geocoding skipped")
+            cls.record_run_failure(exc)
+        except Exception as exc:
+            logger.exception("Background geocoding batch failed")
+            persist_app_error(exc)
+            cls.record_run_failure(exc)
+        finally:
+            cache.delete(BATCH_LOCK_KEY)
+            close_old_connections()
@@ -2,16 +2,30 @@
 Geocoding Service
 
 Provides address validation and geocoding using Google Address Validation API.
+
+Results are persisted in GeocodeCacheEntry keyed by normalised address text,
+so each distinct address is sent to Google once. The HTTP call goes through
+a client object (GoogleAddressValidationClient by default) which tests can
+replace with a local fake.
 """
 
 import logging
 import os
-from dataclasses import dataclass
+import re
+from dataclasses import asdict, dataclass
+from typing import Protocol
 
 import requests
+from django.db import IntegrityError, transaction
+
+from apps.client.models import GeocodeCacheEntry
 
 logger = logging.getLogger(__name__)
 
+ADDRESS_VALIDATION_URL = "https://addressvalidation.googleapis.com/v1:validateAddress"
+
+_ADDRESS_SEPARATORS = re.compile(r"[,;.\s]+")
+
 
 @dataclass
 class GeocodingResult:
@@ -37,6 +51,18 @@ class GeocodingNotConfiguredError(GeocodingError):
     """Raised when Google API key is not configured."""
 
 
+class GeocodingRetryableError(GeocodingError):
+    """Raised for transient failures (network errors, rate limits, 5xx)."""
+
+
+class GeocodingAccessError(GeocodingError):
+    """Raised when Google refuses the API key or its quota (401/403)."""
+
+
+class GeocodingAddressRejectedError(GeocodingError):
+    """Raised when Google rejects the address itself (400)."""
+
+
 def get_api_key() -> str:
     """Get the Google Maps API key from environment."""
     api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
@@ -45,52 +71,192 @@ def get_api_key() -> str:
     return api_key
 
 
-def geocode_address(address: str, api_key: str | None = None) -> GeocodingResult | None:
+def normalize_address(address: str | None) -> str:
+    """
+    Normalise address text for use as a cache key.
+
+    Lower-cases, treats commas, semicolons and full stops as spaces and
+    collapses whitespace, so "12 Main St, Wellington" and
+    "12 main st wellington" share a cache entry.
+    """
+    if not address:
+        return ""
+    return " ".join(_ADDRESS_SEPARATORS.split(address.lower())).strip()[:500]
+
+
+class GeocodingClient(Protocol):
+    """Performs the address validation HTTP call."""
+
+    def validate(self, address: str) -> dict:
+        """Return the raw Address Validation API response for an address."""
+
+
+class GoogleAddressValidationClient:
+    """GeocodingClient backed by Google Address Validation API."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        session: requests.Session | None = None,
+        timeout: int = 10,
+    ):
+        self.api_key = api_key or get_api_key()
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def validate(self, address: str) -> dict:
+        payload = {
+            "address": {
+                "addressLines": [address],
+                "regionCode": "NZ",  # Default to New Zealand
+            },
+            "enableUspsCass": False,
+        }
+
+        try:
+            response = self.session.post(
+                ADDRESS_VALIDATION_URL,
+                json=payload,
+                params={"key": self.api_key},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as exc:
+            raise GeocodingRetryableError(f"Network error: {exc}") from exc
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise GeocodingRetryableError(f"Google API returned {response.status_code}")
+        if response.status_code != 200:
+            logger.error(
+                f"Google Address Validation API error: {response.status_code} - {response.text}"
+            )
+            if response.status_code == 400:
+                raise GeocodingAddressRejectedError("Google API returned 400")
+            if response.status_code in (401, 403):
+                raise GeocodingAccessError(
+                    f"Google API returned {response.status_code}"
+                )
+            raise GeocodingError(f"Google API returned {response.status_code}")
+
+        return response.json()
+
+
+def get_cached_geocode(address: str) -> GeocodeCacheEntry | None:
+    """
+    Return the completed cache entry for an address, or None on a miss.
+
+    A hit with status "no_result" means Google found nothing for the address.
+    """
+    normalized = normalize_address(address)
+    if not normalized:
+        return None
+    return (
+        GeocodeCacheEntry.objects.filter(normalized_address=normalized)
+        .exclude(status="pending")
+        .first()
+    )
+
+
+def get_geocode_entry(address: str) -> GeocodeCacheEntry | None:
+    """
+    Return the cache entry for an address whatever its status, or None.
+
+    A "pending" entry with last_error set has been tried and failed.
+    """
+    normalized = normalize_address(address)
+    if not normalized:
+        return None
+    return GeocodeCacheEntry.objects.filter(normalized_address=normalized).first()
+
+
+def cached_result(entry: GeocodeCacheEntry) -> GeocodingResult | None:
+    """Rebuild the GeocodingResult stored on a cache entry."""
+    if entry.status != "ok" or not entry.result:
+        return None
+    return GeocodingResult(**entry.result)
+
+
+def store_geocode(address: str, result: GeocodingResult | None) -> GeocodeCacheEntry:
+    """Record a lookup result (None meaning no result) for an address."""
+    entry, _ = GeocodeCacheEntry.objects.update_or_create(
+        normalized_address=normalize_address(address),
+        defaults={
+            "address": address,
+            "status": "ok" if result else "no_result",
+            "result": asdict(result) if result else None,
+            "last_error": "",
+        },
+    )
+    return entry
+
+
+def request_geocode(address: str) -> None:
+    """
+    Queue an address for the batch geocoding job without waiting for Google.
+
+    The job is started in the background if it is not already running.
+    """
+    # Imported here to avoid a circular import (the batch service imports this module)
+    from apps.client.services.geocoding_batch_service import GeocodingBatchService
+
+    normalized = normalize_address(address)
+    if not normalized:
+        return
+    try:
+        with transaction.atomic():
+            GeocodeCacheEntry.objects.get_or_create(
+                normalized_address=normalized,
+                defaults={"address": address, "status": "pending"},
+            )
+    except IntegrityError:
+        pass  # Queued concurrently by another request
+    GeocodingBatchService.run_in_background()
+
+
+def geocode_address(
+    address: str,
+    api_key: str | None = None,
+    client: GeocodingClient | None = None,
+    use_cache: bool = True,
+) -> GeocodingResult | None:
     """
     Geocode a freetext address using Google Address Validation API.
 
+    Cached results are returned without calling Google; fresh results
+    (including "no result" and addresses Google rejects) are stored in the
+    cache. Failed calls are never cached.
+
     Args:
         address: Freetext address string to geocode
         api_key: Optional API key (uses environment variable if not provided)
+        client: Optional GeocodingClient (defaults to Google)
+        use_cache: If False, always call Google and refresh the cache
 
     Returns:
         GeocodingResult with structured address data, or None if no result
 
     Raises:
         GeocodingNotConfiguredError: If API key not available
+        GeocodingAccessError: If Google refuses the API key or its quota
         GeocodingError: If API call fails
     """
-    if not api_key:
-        api_key = get_api_key()
+    if use_cache:
+        entry = get_cached_geocode(address)
+        if entry is not None:
+            return cached_result(entry)
 
-    url = "https://addressvalidation.googleapis.com/v1:validateAddress"
+    if client is None:
+        client = GoogleAddressValidationClient(api_key)
+    try:
+        result = validate_address(address, client)
+    except GeocodingAddressRejectedError:
+        result = None
+    store_geocode(address, result)
+    return result
 
-    payload = {
-        "address": {
-            "addressLines": [address],
-            "regionCode": "NZ",  # Default to New Zealand
-        },
-        "enableUspsCass": False,
-    }
 
-    try:
-        response = requests.post(
-            url,
-            json=payload,
-            params={"key": api_key},
-            timeout=10,
-        )
-    except requests.RequestException as exc:
-        raise GeocodingError(f"Network error: {exc}") from exc
-
-    if response.status_code != 200:
-        logger.error(
-            f"Google Address Validation API error: {response.status_code} - {response.text}"
-        )
-        raise GeocodingError(f"Google API returned {response.status_code}")
-
-    data = response.json()
-    return _parse_validation_result(data)
+def validate_address(address: str, client: GeocodingClient) -> GeocodingResult | None:
+    """Call the geocoding client for an address, bypassing the cache."""
+    return _parse_validation_result(client.validate(address))
 
 
 def _parse_validation_result(data: dict) -> GeocodingResult | None:
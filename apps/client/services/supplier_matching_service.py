@@ -0,0 +1,263 @@
+"""
+Supplier Matching Service
+
+Resolves supplier names from quotes and price lists to Client records.
+
+Every importer shares one ``supplier_matcher``. It keeps an in-process index
+of normalised client names and learned aliases (SupplierAlias), so most
+lookups are a dict hit; unknown names fall back to rapidfuzz against the
+precomputed normalised names. The index is rebuilt lazily when a version
+token in the shared cache changes, which happens whenever a client's name,
+archived flag or merge target changes, or an alias is learned. Processes
+that cannot see each other's version changes (a per-process LocMemCache)
+still rebuild at least every INDEX_MAX_AGE_SECONDS.
+"""
+
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rapidfuzz import fuzz, process
+
+from apps.client.models import Client, SupplierAlias
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION_KEY = "supplier_match_index_version"
+# Backstop for version changes made in another process's cache
+INDEX_MAX_AGE_SECONDS = 60
+FUZZY_MATCH_THRESHOLD = 85
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_LEGAL_SUFFIXES = {"ltd", "limited", "pty", "inc", "llc"}
+
+
+def normalize_supplier_name(name: Optional[str]) -> str:
+    """
+    Normalise a supplier name for matching.
+
+    Lower-cases, treats '&' as 'and', drops punctuation and trailing legal
+    suffixes ("Ltd", "Limited", ...), and collapses whitespace, so
+    "Steel & Tube Ltd." and "steel and tube" normalise identically.
+    """
+    if not name:
+        return ""
+    tokens = _PUNCTUATION.sub(" ", name.lower().replace("&", " and ")).split()
+    while len(tokens) > 1 and tokens[-1] in _LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def invalidate_supplier_index() -> None:
+    """Mark every process's supplier index as stale."""
+    cache.set(INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+@dataclass(frozen=True)
+class SupplierMatch:
+    """A resolved supplier name."""
+
+    client_id: str
+    client_name: str
+    score: float
+    method: str  # "name", "alias" or "fuzzy"
+
+
+@dataclass
+class _SupplierIndex:
+    version: str
+    by_name: Dict[str, Tuple[str, str]]
+    by_alias: Dict[str, Tuple[str, str]]
+    choices: List[str]
+    built_at: float
+
+    def is_current(self, version: str) -> bool:
+        return (
+            self.version == version
+            and time.monotonic() - self.built_at < INDEX_MAX_AGE_SECONDS
+        )
+
+
+class SupplierMatcher:
+    """Shared, cache-versioned supplier name index."""
+
+    def __init__(self, threshold: int = FUZZY_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._index: Optional[_SupplierIndex] = None
+        self._lock = threading.Lock()
+
+    def match(self, supplier_name: Optional[str]) -> Optional[SupplierMatch]:
+        """
+        Resolve a supplier name without touching the database.
+
+        Checks exact normalised names, then learned aliases, then the best
+        fuzzy match scoring at least ``threshold``.
+        """
+        normalized = normalize_supplier_name(supplier_name)
+        if not normalized:
+            return None
+
+        index = self._current_index()
+        if normalized in index.by_name:
+            client_id, name = index.by_name[normalized]
+            return SupplierMatch(client_id, name, 100.0, "name")
+        if normalized in index.by_alias:
+            client_id, name = index.by_alias[normalized]
+            return SupplierMatch(client_id, name, 100.0, "alias")
+        if not index.choices:
+            return None
+
+        best = process.extractOne(
+            normalized,
+            index.choices,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=self.threshold,
+        )
+        if not best:
+            return None
+        client_id, name = index.by_name[best[0]]
+        return SupplierMatch(client_id, name, best[1], "fuzzy")
+
+    def find(self, supplier_name: Optional[str]) -> Optional[Client]:
+        """Resolve a supplier name to its Client, or None."""
+        found = self.match(supplier_name)
+        if not found:
+            return None
+        client = Client.objects.filter(pk=found.client_id).first()
+        if client is None:
+            # Deleted since the index was built; rebuild and try once more
+            invalidate_supplier_index()
+            found = self.match(supplier_name)
+            if not found:
+                return None
+            client = Client.objects.filter(pk=found.client_id).first()
+            if client is None:
+                return None
+        logger.info(
+            f"Matched supplier '{supplier_name}' -> '{client.name}' "
+            f"({found.method}, score: {found.score})"
+        )
+        return client
+
+    def get_or_create_supplier(self, supplier_name: str) -> Tuple[Client, bool]:
+        """
+        Resolve a supplier name, creating the supplier only when nothing matches.
+
+        Before creating, the name is looked up in the database: the index can
+        lag a client created by another process by up to INDEX_MAX_AGE_SECONDS.
+
+        Returns:
+            Tuple of (Client instance, was_created boolean)
+        """
+        existing = self.find(supplier_name)
+        if existing:
+            return existing, False
+
+        name = supplier_name.strip()
+        existing = (
+            Client.objects.filter(name__iexact=name)
+            .select_related("merged_into")
+            .order_by(
+                F("merged_into").asc(nulls_first=True), "xero_archived", "-is_supplier"
+            )
+            .first()
+        )
+        if existing:
+            invalidate_supplier_index()
+            return existing.merged_into or existing, False
+
+        supplier = Client.objects.create(
+            name=name,
+            is_supplier=True,
+            xero_last_modified=timezone.now(),
+        )
+        return supplier, True
+
+    def confirm(
+        self, supplier_name: Optional[str], client: Client, source: str = "confirmed"
+    ) -> Optional[SupplierAlias]:
+        """
+        Record that ``supplier_name`` means ``client``.
+
+        Names that already resolve to the client by its own name are not
+        stored. Returns the alias, or None when nothing needed recording.
+        """
+        normalized = normalize_supplier_name(supplier_name)
+        if not normalized or normalized == normalize_supplier_name(client.name):
+            return None
+
+        try:
+            with transaction.atomic():
+                alias, _ = SupplierAlias.objects.update_or_create(
+                    normalized_alias=normalized,
+                    defaults={
+                        "alias": supplier_name.strip(),
+                        "client": client,
+                        "source": source,
+                    },
+                )
+        except IntegrityError:
+            # Recorded concurrently by another request
+            alias = SupplierAlias.objects.get(normalized_alias=normalized)
+        invalidate_supplier_index()
+        logger.info(f"Learned supplier alias '{supplier_name}' -> '{client.name}'")
+        return alias
+
+    def _current_index(self) -> _SupplierIndex:
+        version = cache.get(INDEX_VERSION_KEY)
+        if version is None:
+            # Never set or evicted: start a new version so every process rebuilds
+            cache.add(INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(INDEX_VERSION_KEY)
+        index = self._index
+        if index is not None and index.is_current(version):
+            return index
+        with self._lock:
+            if self._index is None or not self._index.is_current(version):
+                self._index = self._build_index(version)
+            return self._index
+
+    @staticmethod
+    def _build_index(version: str) -> _SupplierIndex:
+        # The version was read before loading, so a change that lands
+        # meanwhile replaces it again and the next lookup rebuilds
+        built_at = time.monotonic()
+        by_name: Dict[str, Tuple[str, str]] = {}
+        clients = Client.objects.order_by(
+            F("merged_into").asc(nulls_first=True),
+            "xero_archived",
+            "-is_supplier",
+            "name",
+        ).values_list("id", "name", "merged_into_id", "merged_into__name")
+        # Active suppliers win when several clients share a normalised name;
+        # a merged client's name resolves to the client it was merged into
+        for client_id, name, merged_id, merged_name in clients:
+            normalized = normalize_supplier_name(name)
+            if normalized:
+                target = (merged_id, merged_name) if merged_id else (client_id, name)
+                by_name.setdefault(normalized, (str(target[0]), target[1]))
+
+        by_alias = {
+            normalized: (str(client_id), name)
+            for normalized, client_id, name in SupplierAlias.objects.values_list(
+                "normalized_alias", "client_id", "client__name"
+            )
+        }
+        return _SupplierIndex(
+            version=version,
+            by_name=by_name,
+            by_alias=by_alias,
+            choices=list(by_name),
+            built_at=built_at,
+        )
+
+
+supplier_matcher = SupplierMatcher()
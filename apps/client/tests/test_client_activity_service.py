@@ -0,0 +1,66 @@
+"""Tests for the client activity rollups maintained by ClientActivityService."""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.accounting.models.invoice import Invoice
+from apps.client.models import Client
+from apps.client.services.client_activity_service import ClientActivityService
+from apps.job.models import Job
+from apps.testing import BaseTestCase
+
+
+class TestClientActivityService(BaseTestCase):
+    """Tests for ClientActivityService.refresh_clients() and the Job save hook."""
+
+    def setUp(self):
+        self.client_obj = Client.objects.create(
+            name="Rollup Client",
+            xero_last_modified=timezone.now(),
+        )
+
+    def _create_invoice(self, amount, invoice_date):
+        return Invoice.objects.create(
+            client=self.client_obj,
+            xero_id=uuid.uuid4(),
+            number=f"INV-{uuid.uuid4().hex[:8]}",
+            status="AUTHORISED",
+            total_excl_tax=amount,
+            tax=Decimal("0.00"),
+            total_incl_tax=amount,
+            amount_due=Decimal("0.00"),
+            date=invoice_date,
+            xero_last_modified=timezone.now(),
+            raw_json={},
+        )
+
+    def test_refresh_rolls_up_invoices(self):
+        self._create_invoice(Decimal("100.00"), date(2026, 1, 5))
+        self._create_invoice(Decimal("250.50"), date(2026, 3, 1))
+
+        ClientActivityService.refresh_clients([self.client_obj.id])
+
+        self.client_obj.refresh_from_db()
+        self.assertEqual(self.client_obj.total_spend, Decimal("350.50"))
+        self.assertEqual(self.client_obj.last_invoice_date, date(2026, 3, 1))
+
+    def test_refresh_skips_unchanged_clients(self):
+        ClientActivityService.refresh_clients([self.client_obj.id])
+
+        self.assertEqual(ClientActivityService.refresh_clients([self.client_obj.id]), 0)
+
+    def test_job_save_updates_open_job_count(self):
+        job = Job.objects.create(client=self.client_obj, name="Rollup Job")
+
+        self.client_obj.refresh_from_db()
+        self.assertEqual(self.client_obj.open_job_count, 1)
+        self.assertIsNotNone(self.client_obj.last_job_date)
+
+        job.status = "archived"
+        job.save()
+
+        self.client_obj.refresh_from_db()
+        self.assertEqual(self.client_obj.open_job_count, 0)
@@ -0,0 +1,304 @@
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Staff
+from apps.client.models import Client, GeocodeCacheEntry, SupplierPickupAddress
+from apps.client.services.geocoding_batch_service import GeocodingBatchService
+from apps.client.services.geocoding_service import (
+    GeocodingAccessError,
+    GeocodingAddressRejectedError,
+    GeocodingError,
+    GeocodingRetryableError,
+    GoogleAddressValidationClient,
+    geocode_address,
+    normalize_address,
+)
+from apps.testing import BaseTestCase
+
+
+def validation_response(street, lat, lng):
+    return {
+        "result": {
+            "address": {
+                "formattedAddress": f"{street}, Wellington 6011, New Zealand",
+                "addressComponents": [
+                    {"componentType": "route", "componentName": {"text": street}},
+                    {
+                        "componentType": "postal_code",
+                        "componentName": {"text": "6011"},
+                    },
+                ],
+            },
+            "geocode": {
+                "placeId": f"place-{street}",
+                "location": {"latitude": lat, "longitude": lng},
+            },
+        }
+    }
+
+
+class FakeGeocodingClient:
+    """Local stand-in for Google Address Validation."""
+
+    def __init__(self, transient_failures=0, rejected=(), failing=(), denied=False):
+        self.transient_failures = transient_failures
+        self.rejected = set(rejected)
+        self.failing = set(failing)
+        self.denied = denied
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def validate(self, address):
+        with self._lock:
+            self.calls.append(address)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.transient_failures > 0
+            if fail:
+                self.transient_failures -= 1
+        try:
+            time.sleep(0.01)
+            if fail:
+                raise GeocodingRetryableError("Google API returned 429")
+            if self.denied:
+                raise GeocodingAccessError("Google API returned 403")
+            if address in self.rejected:
+                raise GeocodingAddressRejectedError("Google API returned 400")
+            if address in self.failing:
+                raise GeocodingError("Google API returned 404")
+            return validation_response(address.split(",")[0], -41.28, 174.77)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class GeocodingCacheTests(BaseTestCase):
+    def test_normalized_address_ignores_case_and_punctuation(self):
+        self.assertEqual(
+            normalize_address("12 Main St,  Wellington."),
+            normalize_address("12 main st wellington"),
+        )
+
+    def test_repeat_lookups_are_served_from_the_cache(self):
+        fake = FakeGeocodingClient()
+
+        first = geocode_address("12 Main St, Wellington", client=fake)
+        second = geocode_address("12 MAIN ST WELLINGTON", client=fake)
+
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(second, first)
+        self.assertEqual(GeocodeCacheEntry.objects.get().status, "ok")
+
+    def test_only_rejected_addresses_are_cached_as_no_result(self):
+        rejected = "Nowhere Rd"
+        fake = FakeGeocodingClient(rejected={rejected})
+
+        self.assertIsNone(geocode_address(rejected, client=fake))
+        self.assertIsNone(geocode_address(rejected, client=fake))
+
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(GeocodeCacheEntry.objects.get().status, "no_result")
+        with self.assertRaises(GeocodingAccessError):
+            geocode_address("3 Quay St", client=FakeGeocodingClient(denied=True))
+        self.assertEqual(GeocodeCacheEntry.objects.count(), 1)
+
+    def test_http_errors_map_to_error_types(self):
+        cases = {
+            400: GeocodingAddressRejectedError,
+            401: GeocodingAccessError,
+            403: GeocodingAccessError,
+            404: GeocodingError,
+            429: GeocodingRetryableError,
+            503: GeocodingRetryableError,
+        }
+        for status_code, error in cases.items():
+            session = Mock()
+            session.post.return_value = Mock(status_code=status_code, text="")
+            client = GoogleAddressValidationClient(api_key="test", session=session)
+            with self.subTest(status_code=status_code):
+                with self.assertRaises(error) as raised:
+                    client.validate("12 Main St")
+                self.assertIs(type(raised.exception), error)
+
+
+class GeocodingBatchServiceTests(BaseTestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(
+            name="Depot Owner", xero_last_modified=timezone.now()
+        )
+        self.sleeps = []
+
+    def _address(self, name, street):
+        return SupplierPickupAddress.objects.create(
+            client=self.client_obj, name=name, street=street, city="Wellington"
+        )
+
+    def _service(self, fake, **kwargs):
+        return GeocodingBatchService(client=fake, sleep=self.sleeps.append, **kwargs)
+
+    def test_batch_geocodes_each_distinct_address_once_with_bounded_concurrency(self):
+        for n in range(12):
+            self._address(f"Depot {n}", f"{n} Quay St")
+        self._address("Depot 0 rear", "0 Quay St")
+        fake = FakeGeocodingClient()
+
+        result = self._service(fake, max_workers=3).run()
+
+        self.assertEqual(len(fake.calls), 12)
+        self.assertLessEqual(fake.max_in_flight, 3)
+        self.assertEqual(result.addresses_updated, 13)
+        self.assertFalse(
+            SupplierPickupAddress.objects.filter(latitude__isnull=True).exists()
+        )
+        self.assertEqual(
+            SupplierPickupAddress.objects.get(name="Depot 3").latitude,
+            Decimal("-41.2800000"),
+        )
+
+        # Second run has nothing left to do
+        self.assertEqual(self._service(fake).run().looked_up, 0)
+        self.assertEqual(len(fake.calls), 12)
+
+    def test_transient_errors_back_off_and_retry(self):
+        self._address("Depot", "1 Quay St")
+        fake = FakeGeocodingClient(transient_failures=2)
+
+        result = self._service(fake, backoff_seconds=0.5).run()
+
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+        self.assertEqual(result.addresses_updated, 1)
+        self.assertEqual(result.failed, {})
+
+    def test_only_rejected_addresses_are_cached_as_failures(self):
+        self._address("Flaky", "1 Quay St")
+        self._address("Bad", "2 Quay St")
+        self._address("Broken", "3 Quay St")
+        fake = FakeGeocodingClient(
+            transient_failures=2,
+            rejected={"2 Quay St, Wellington, New Zealand"},
+            failing={"3 Quay St, Wellington, New Zealand"},
+        )
+
+        result = self._service(fake, max_workers=1, max_attempts=2).run()
+
+        self.assertEqual(len(result.failed), 3)
+        statuses = dict(GeocodeCacheEntry.objects.values_list("address", "status"))
+        self.assertEqual(
+            statuses,
+            {
+                "1 Quay St, Wellington, New Zealand": "pending",
+                "2 Quay St, Wellington, New Zealand": "no_result",
+                "3 Quay St, Wellington, New Zealand": "pending",
+            },
+        )
+
+        fake.failing.clear()
+        result = self._service(fake).run()
+
+        self.assertEqual(result.addresses_updated, 2)
+        self.assertEqual(
+            sorted(fake.calls[-2:]),
+            [
+                "1 Quay St, Wellington, New Zealand",
+                "3 Quay St, Wellington, New Zealand",
+            ],
+        )
+
+    def test_access_errors_stop_the_run_without_caching(self):
+        self._address("Depot", "1 Quay St")
+        GeocodeCacheEntry.objects.create(
+            normalized_address="4 quay st", address="4 Quay St", status="pending"
+        )
+
+        with self.assertRaises(GeocodingAccessError):
+            self._service(FakeGeocodingClient(denied=True)).run()
+
+        self.assertEqual(
+            list(GeocodeCacheEntry.objects.values_list("status", flat=True)),
+            ["pending"],
+        )
+
+    @patch.object(
+        GeocodingBatchService,
+        "run",
+        side_effect=GeocodingAccessError("Google API returned 403"),
+    )
+    def test_background_run_records_access_errors_on_queued_addresses(self, _):
+        GeocodeCacheEntry.objects.create(
+            normalized_address="4 quay st", address="4 Quay St", status="pending"
+        )
+
+        GeocodingBatchService._run_background()
+
+        entry = GeocodeCacheEntry.objects.get()
+        self.assertEqual(entry.status, "pending")
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.last_error, "Google API returned 403")
+
+
+class AddressValidateViewTests(BaseTestCase):
+    def setUp(self):
+        staff = Staff.objects.create_user(
+            email="geo@example.com",
+            password="x",
+            first_name="Geo",
+            last_name="User",
+            is_office_staff=True,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(staff)
+        self.url = reverse("clients:address_validate")
+
+    def test_cached_address_is_returned_without_calling_google(self):
+        geocode_address("5 Quay St, Wellington", client=FakeGeocodingClient())
+
+        with patch(
+            "apps.client.services.geocoding_service.requests.Session.post"
+        ) as post:
+            response = self.api.post(
+                self.url, {"address": "5 quay st wellington"}, format="json"
+            )
+
+        post.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["candidates"][0]["street"], "5 Quay St")
+
+    @patch.dict("os.environ", {"GOOGLE_MAPS_API_KEY": "test-key"})
+    @patch.object(GeocodingBatchService, "run_in_background")
+    def test_uncached_address_is_queued(self, run_in_background):
+        response = self.api.post(
+            self.url, {"address": "7 Quay St, Wellington"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()["pending"])
+        self.assertEqual(GeocodeCacheEntry.objects.get().status, "pending")
+        run_in_background.assert_called_once()
+
+    @patch.dict("os.environ", {"GOOGLE_MAPS_API_KEY": "test-key"})
+    @patch.object(GeocodingBatchService, "run_in_background")
+    def test_failed_lookup_returns_its_error(self, run_in_background):
+        GeocodeCacheEntry.objects.create(
+            normalized_address=normalize_address("7 Quay St, Wellington"),
+            address="7 Quay St, Wellington",
+            status="pending",
+            attempts=1,
+            last_error="Google API returned 403",
+        )
+
+        response = self.api.post(
+            self.url, {"address": "7 Quay St, Wellington"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Google API returned 403", response.json()["error"])
+        # Still queued, so it resolves once the key is fixed
+        run_in_background.assert_called_once()
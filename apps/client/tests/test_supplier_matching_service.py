@@ -0,0 +1,114 @@
+"""Tests for the shared supplier name matcher."""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.client.models import Client, SupplierAlias
+from apps.client.services.supplier_matching_service import (
+    INDEX_MAX_AGE_SECONDS,
+    SupplierMatcher,
+    normalize_supplier_name,
+)
+from apps.quoting.services.pdf_import_service import PDFImportService
+from apps.testing import BaseTestCase
+
+
+class TestSupplierMatcher(BaseTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.matcher = SupplierMatcher()
+        self.steel = self._client("Steel & Tube Ltd", is_supplier=True)
+
+    def _client(self, name, **fields):
+        return Client.objects.create(
+            name=name, xero_last_modified=timezone.now(), **fields
+        )
+
+    def test_normalize_ignores_case_punctuation_and_legal_suffix(self):
+        self.assertEqual(normalize_supplier_name("Steel & Tube Ltd."), "steel and tube")
+        self.assertEqual(
+            normalize_supplier_name("  STEEL and  tube "), "steel and tube"
+        )
+
+    def test_exact_normalised_name_matches(self):
+        match = self.matcher.match("steel and tube limited")
+
+        self.assertEqual(match.client_id, str(self.steel.id))
+        self.assertEqual(match.method, "name")
+
+    def test_fuzzy_match_and_threshold(self):
+        self.assertEqual(self.matcher.match("Steel and Tube NZ").method, "fuzzy")
+        self.assertIsNone(self.matcher.match("Aluminium Warehouse"))
+
+    def test_repeat_lookups_do_not_query(self):
+        self.matcher.match("Steel & Tube")
+
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(20):
+                self.matcher.match("steel and tube")
+                self.matcher.match("Nobody Supplies")
+
+        self.assertEqual(len(queries), 0)
+
+    def test_client_save_refreshes_index(self):
+        self.assertIsNone(self.matcher.match("Metals Direct"))
+
+        self._client("Metals Direct")
+
+        self.assertEqual(self.matcher.match("Metals Direct").method, "name")
+
+    def test_index_is_rebuilt_when_changes_are_not_seen_in_this_cache(self):
+        self.assertIsNone(self.matcher.match("Metals Direct"))
+        # bulk_create sends no signals, like a save in a process whose
+        # version change this process's cache never sees
+        Client.objects.bulk_create(
+            [Client(name="Metals Direct", xero_last_modified=timezone.now())]
+        )
+        self.assertIsNone(self.matcher.match("Metals Direct"))
+
+        self.matcher._index.built_at -= INDEX_MAX_AGE_SECONDS
+
+        self.assertEqual(self.matcher.match("Metals Direct").method, "name")
+
+    def test_supplier_missing_from_a_stale_index_is_not_created_again(self):
+        self.assertIsNone(self.matcher.match("Metals Direct"))
+        # Created by another process; this index has not been rebuilt yet
+        Client.objects.bulk_create(
+            [Client(name="Metals Direct", xero_last_modified=timezone.now())]
+        )
+
+        supplier, created = self.matcher.get_or_create_supplier("METALS DIRECT ")
+
+        self.assertFalse(created)
+        self.assertEqual(supplier.name, "Metals Direct")
+        self.assertEqual(Client.objects.filter(name__iexact="metals direct").count(), 1)
+
+    def test_confirmed_alias_is_learned(self):
+        self.assertIsNone(self.matcher.match("S&T Wellington Branch"))
+
+        self.matcher.confirm("S&T Wellington Branch", self.steel)
+
+        match = self.matcher.match("s&t wellington branch")
+        self.assertEqual(match.method, "alias")
+        self.assertEqual(match.client_id, str(self.steel.id))
+        self.assertEqual(SupplierAlias.objects.get().source, "confirmed")
+
+    def test_merged_client_name_resolves_to_survivor(self):
+        old = self._client("Old Metals Co")
+        survivor = self._client("New Metals Co")
+        old.merged_into = survivor
+        old.save()
+
+        self.assertEqual(self.matcher.find("Old Metals Co"), survivor)
+
+    def test_price_list_import_reuses_existing_supplier(self):
+        supplier, created = PDFImportService().create_or_get_supplier(
+            "STEEL & TUBE LIMITED"
+        )
+
+        self.assertFalse(created)
+        self.assertEqual(supplier, self.steel)
+        self.assertEqual(Client.objects.count(), 1)
@@ -2,6 +2,10 @@
 Address Validation Views
 
 Provides address cleaning/validation using Google Address Validation API.
+
+Views only read the geocode cache. Addresses that have not been geocoded yet
+are queued for the background batch job, so a request never waits on Google.
+Once a lookup has failed, its error is returned until a retry succeeds.
 """
 
 import logging
@@ -15,11 +19,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.client.services.geocoding_service import (
-    GeocodingError,
     GeocodingNotConfiguredError,
-    geocode_address,
+    cached_result,
+    get_api_key,
+    get_geocode_entry,
+    request_geocode,
 )
-from apps.workflow.services.error_persistence import persist_app_error
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +36,11 @@ class AddressValidateView(APIView):
     POST /api/clients/addresses/validate/
     Body: {"address": "123 Main St Melbourne"}
 
-    Returns candidate addresses with structured components.
+    Returns candidate addresses with structured components. Addresses not
+    yet in the geocode cache are queued and answered with 202 and
+    "pending": true; repeat the request to collect the result. If the last
+    lookup failed (e.g. Google refused the API key) the response is 503 with
+    that error, and the address stays queued for another attempt.
     """
 
     permission_classes = [IsAuthenticated]
@@ -73,8 +82,20 @@ class AddressValidateView(APIView):
                     },
                 },
             },
+            202: {
+                "type": "object",
+                "properties": {
+                    "candidates": {"type": "array", "items": {"type": "object"}},
+                    "pending": {"type": "boolean"},
+                },
+            },
             400: {"description": "Missing or invalid address"},
-            503: {"description": "Google API unavailable or not configured"},
+            503: {
+                "description": (
+                    "Google API unavailable, refused or not configured; "
+                    "includes the last lookup error"
+                )
+            },
         },
     )
     def post(self, request: Request) -> Response:
@@ -87,21 +108,30 @@ class AddressValidateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        entry = get_geocode_entry(address)
+        if entry is not None and entry.status != "pending":
+            result = cached_result(entry)
+            return Response({"candidates": [asdict(result)] if result else []})
+
         try:
-            result = geocode_address(address)
-            if result:
-                return Response({"candidates": [asdict(result)]})
-            return Response({"candidates": []})
+            get_api_key()
         except GeocodingNotConfiguredError:
             logger.warning("GOOGLE_MAPS_API_KEY not configured")
             return Response(
                 {"error": "Address validation service not configured"},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
-        except GeocodingError as exc:
-            persist_app_error(exc)
-            logger.exception("Address validation failed")
+
+        request_geocode(address)
+        if entry is not None and entry.last_error:
             return Response(
-                {"error": "Address validation failed"},
+                {
+                    "error": f"Address validation failed: {entry.last_error}",
+                    "candidates": [],
+                    "pending": True,
+                },
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
+        return Response(
+            {"candidates": [], "pending": True}, status=status.HTTP_202_ACCEPTED
+        )
@@ -6,6 +6,9 @@ Provides list, create, retrieve, update, partial_update, and destroy actions.
 
 These are delivery/pickup locations for suppliers (or any client).
 Despite the name, addresses can be created for any client, not just suppliers.
+
+Addresses saved without coordinates take them from the geocode cache, or are
+left for the background geocoding job; saving never waits on Google.
 """
 
 from drf_spectacular.types import OpenApiTypes
@@ -14,6 +17,16 @@ from rest_framework import permissions, viewsets
 
 from apps.client.models import SupplierPickupAddress
 from apps.client.serializers import SupplierPickupAddressSerializer
+from apps.client.services.geocoding_batch_service import (
+    ADDRESS_UPDATE_FIELDS,
+    GeocodingBatchService,
+    apply_geocode,
+    pickup_address_text,
+)
+from apps.client.services.geocoding_service import (
+    cached_result,
+    get_cached_geocode,
+)
 
 
 class SupplierPickupAddressViewSet(viewsets.ModelViewSet):
@@ -61,6 +74,31 @@ class SupplierPickupAddressViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(client_id=supplier_id)
         return queryset.order_by("-is_primary", "name")
 
+    def perform_create(self, serializer):
+        self._fill_coordinates(serializer.save())
+
+    def perform_update(self, serializer):
+        previous_text = pickup_address_text(serializer.instance)
+        address = serializer.save()
+        moved = pickup_address_text(address) != previous_text
+        if moved and "latitude" not in serializer.validated_data:
+            # Coordinates belonged to the old address
+            address.latitude = address.longitude = address.google_place_id = None
+            address.save(update_fields=["latitude", "longitude", "google_place_id"])
+        self._fill_coordinates(address)
+
+    def _fill_coordinates(self, address: SupplierPickupAddress) -> None:
+        if address.latitude is not None:
+            return
+        entry = get_cached_geocode(pickup_address_text(address))
+        if entry is None:
+            GeocodingBatchService.run_in_background()
+            return
+        result = cached_result(entry)
+        if result and result.latitude is not None:
+            apply_geocode(address, result)
+            address.save(update_fields=ADDRESS_UPDATE_FIELDS)
+
     def perform_destroy(self, instance):
         """
         Soft delete - set is_active=False instead of actually deleting.
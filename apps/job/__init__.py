@@ -11,7 +11,7 @@ try:
     if apps.ready:
         from .diff import DiffResult, apply_diff, diff_costset
         from .mixins import JobLookupMixin, JobNumberLookupMixin
-        from .permissions import IsOfficeStaff, IsStaffUser
+        from .permissions import IsOfficeStaff, IsStaffUser, IsSuperUser
         from .scheduler_jobs import auto_archive_completed_jobs, set_paid_flag_jobs
         from .utils import get_active_jobs, get_jobs_data
 except (ImportError, RuntimeError):
@@ -22,6 +22,7 @@ __all__ = [
     "DiffResult",
     "IsOfficeStaff",
     "IsStaffUser",
+    "IsSuperUser",
     "JobConfig",
     "JobLookupMixin",
     "JobNumberLookupMixin",
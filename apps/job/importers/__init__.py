@@ -13,6 +13,8 @@ try:
             export_sheet_as_xlsx,
             extract_file_id,
             fetch_sheet_df,
+            fetch_sheet_dfs,
+            get_file_revision,
             populate_sheet_from_costset,
         )
         from .quote_spreadsheet import (
@@ -48,7 +50,9 @@ __all__ = [
     "export_sheet_as_xlsx",
     "extract_file_id",
     "fetch_sheet_df",
+    "fetch_sheet_dfs",
     "find_validation_cells",
+    "get_file_revision",
     "parse_xlsx",
     "parse_xlsx_old",
     "parse_xlsx_with_summary",
@@ -11,6 +11,7 @@ Includes functions for:
 import logging
 import os
 import re
+import threading
 from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
@@ -33,6 +34,12 @@ SCOPES = [
 
 # Global credentials - initialized on first use
 CREDS: Optional[service_account.Credentials] = None
+_CREDS_LOCK = threading.Lock()
+
+# Per-thread pool of built service clients. googleapiclient resources wrap an
+# httplib2.Http instance, which is not thread-safe, so each thread keeps its own
+# long-lived client per (api, version) instead of rebuilding on every call.
+_SERVICE_POOL = threading.local()
 
 
 def _get_credentials() -> service_account.Credentials:
@@ -47,25 +54,26 @@ def _get_credentials() -> service_account.Credentials:
     """
     global CREDS
 
-    if CREDS is None:
-        try:
-            key_file = os.getenv("GCP_CREDENTIALS")
-            if not key_file:
-                raise RuntimeError("GCP_CREDENTIALS environment variable not set")
+    with _CREDS_LOCK:
+        if CREDS is None:
+            try:
+                key_file = os.getenv("GCP_CREDENTIALS")
+                if not key_file:
+                    raise RuntimeError("GCP_CREDENTIALS environment variable not set")
 
-            if not os.path.exists(key_file):
-                raise RuntimeError(
-                    f"Google service account key file not found: {key_file}"
-                )
+                if not os.path.exists(key_file):
+                    raise RuntimeError(
+                        f"Google service account key file not found: {key_file}"
+                    )
 
-            CREDS = service_account.Credentials.from_service_account_file(
-                key_file, scopes=SCOPES
-            )  # type: ignore[no-untyped-call]
+                CREDS = service_account.Credentials.from_service_account_file(
+                    key_file, scopes=SCOPES
+                )  # type: ignore[no-untyped-call]
 
-            logger.info(f"Google API credentials loaded from {key_file}")
+                logger.info(f"Google API credentials loaded from {key_file}")
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to load Google API credentials: {str(e)}")
+            except Exception as e:
+                raise RuntimeError(f"Failed to load Google API credentials: {str(e)}")
 
     assert CREDS is not None  # Should be set in the if block above
     return CREDS
@@ -73,7 +81,10 @@ def _get_credentials() -> service_account.Credentials:
 
 def _svc(api: str, version: str) -> Any:
     """
-    Create a Google API service client.
+    Get a Google API service client from the per-thread pool.
+
+    The client is built once per thread and reused for subsequent calls, so the
+    discovery document is not re-parsed on every request.
 
     Args:
         api: API name (e.g., 'drive', 'sheets')
@@ -85,9 +96,19 @@ def _svc(api: str, version: str) -> Any:
     Raises:
         RuntimeError: If service creation fails
     """
+    clients: Dict[tuple[str, str], Any] | None = getattr(_SERVICE_POOL, "clients", None)
+    if clients is None:
+        clients = {}
+        _SERVICE_POOL.clients = clients
+
+    service = clients.get((api, version))
+    if service is not None:
+        return service
+
     try:
         credentials = _get_credentials()
         service = build(api, version, credentials=credentials, cache_discovery=False)
+        clients[(api, version)] = service
         logger.debug(f"Created {api} {version} service client")
         return service
 
@@ -268,16 +289,72 @@ def _set_public_edit_permissions(file_id: str) -> None:
         # Don't raise - this is not critical for file functionality
 
 
-def fetch_sheet_df(sheet_id: str, sheet_range: str = "Primary Details") -> pd.DataFrame:
+def get_file_revision(file_id: str) -> str:
     """
-    Fetch data from a Google Sheet as a pandas DataFrame.
+    Get a revision marker for a Drive file using a cheap metadata call.
+
+    The marker combines the Drive ``version`` counter and ``modifiedTime``;
+    it changes whenever the file content changes, so it can be used to key
+    caches of data derived from the file.
+
+    Args:
+        file_id: Google Drive file ID
+
+    Returns:
+        str: Revision marker in the form "{version}:{modifiedTime}"
+
+    Raises:
+        RuntimeError: If the metadata lookup fails
+    """
+    try:
+        drive_service = _svc("drive", "v3")
+        metadata = (
+            drive_service.files()
+            .get(fileId=file_id, fields="version,modifiedTime", supportsAllDrives=True)
+            .execute()
+        )
+        return f"{metadata.get('version', '')}:{metadata.get('modifiedTime', '')}"
+
+    except HttpError as e:
+        raise RuntimeError(f"Failed to get revision for file {file_id}: {e.reason}")
+    except Exception as e:
+        raise RuntimeError(
+            f"Unexpected error getting revision for file {file_id}: {str(e)}"
+        )
+
+
+def _values_to_df(values: List[List[Any]]) -> pd.DataFrame:
+    """
+    Convert raw Sheets API row values into a DataFrame.
+
+    The first row is treated as the header. Data rows are padded or truncated
+    to match the header width, since the API omits trailing empty cells.
+    """
+    if not values:
+        return pd.DataFrame()
+
+    headers = values[0]
+    if len(values) == 1:
+        logger.info(f"📋 Only headers found: {headers}")
+        return pd.DataFrame(columns=headers)
+
+    width = len(headers)
+    normalized_rows = [
+        (list(row) + [""] * (width - len(row)))[:width] for row in values[1:]
+    ]
+    return pd.DataFrame(normalized_rows, columns=headers)
+
+
+def fetch_sheet_dfs(sheet_id: str, sheet_ranges: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch several ranges from a Google Sheet in a single batchGet request.
 
     Args:
         sheet_id: Google Sheets file ID
-        sheet_range: Sheet range to fetch (default: "Primary Details")
+        sheet_ranges: Sheet ranges to fetch (e.g. tab names)
 
     Returns:
-        pd.DataFrame: Sheet data
+        Dict[str, pd.DataFrame]: DataFrame per requested range
 
     Raises:
         RuntimeError: If data fetch fails
@@ -285,69 +362,35 @@ def fetch_sheet_df(sheet_id: str, sheet_range: str = "Primary Details") -> pd.Da
     try:
         sheets_service = _svc("sheets", "v4")
 
-        logger.info(f"🔍 Fetching sheet data for ID: {sheet_id}, range: {sheet_range}")
+        logger.info(
+            f"🔍 Fetching sheet data for ID: {sheet_id}, ranges: {sheet_ranges}"
+        )
 
-        # Fetch the data
         result = (
             sheets_service.spreadsheets()
             .values()
-            .get(spreadsheetId=sheet_id, range=sheet_range)
+            .batchGet(spreadsheetId=sheet_id, ranges=sheet_ranges)
             .execute()
         )
 
-        values = result.get("values", [])
-        logger.info(f"📊 Raw Google Sheets API response: {len(values)} rows")
-
-        # Log first few rows for debugging
-        for i, row in enumerate(values[:5]):  # Log first 5 rows
-            logger.info(f"    Row {i}: {row}")
-
-        if not values:
-            logger.warning(f"⚠️ No data found in sheet {sheet_id} range {sheet_range}")
-            return pd.DataFrame()
-
-        # Convert to DataFrame
-        # First row is typically headers
-        if len(values) > 1:
-            headers = values[0]
-            data_rows = values[1:]
-
-            logger.info(f"📋 Headers: {headers}")
-            logger.info(f"📝 Data rows count: {len(data_rows)}")
-
-            # Normalize data rows to match header count
-            # Some rows might have fewer columns than headers
-            normalized_rows = []
-            for i, row in enumerate(data_rows):
-                original_length = len(row)
-                # Pad row with empty strings if it has fewer columns than headers
-                while len(row) < len(headers):
-                    row.append("")
-                # Truncate row if it has more columns than headers
-                row = row[: len(headers)]
-
-                # Log first few normalized rows
-                if i < 3:
-                    logger.info(
-                        f"    Data row {i}: {row} (original length: {original_length})"
-                    )
-
-                normalized_rows.append(row)
-
-            df = pd.DataFrame(normalized_rows, columns=headers)
-        else:
-            # Only headers, no data
-            logger.info(f"📋 Only headers found: {values[0]}")
-            df = pd.DataFrame(columns=values[0])
-
-        logger.info(f"✅ Created DataFrame with shape: {df.shape}")
-        logger.info(f"📊 DataFrame columns: {list(df.columns)}")
-
-        # Log non-empty rows
-        non_empty_rows = df.dropna(how="all")
-        logger.info(f"🔢 Non-empty rows in DataFrame: {len(non_empty_rows)}")
+        # valueRanges are returned in the same order as the requested ranges
+        value_ranges = result.get("valueRanges", [])
+        frames: Dict[str, pd.DataFrame] = {}
+        for index, sheet_range in enumerate(sheet_ranges):
+            values = (
+                value_ranges[index].get("values", [])
+                if index < len(value_ranges)
+                else []
+            )
+            if not values:
+                logger.warning(
+                    f"⚠️ No data found in sheet {sheet_id} range {sheet_range}"
+                )
+            df = _values_to_df(values)
+            logger.info(f"✅ Range {sheet_range}: DataFrame with shape {df.shape}")
+            frames[sheet_range] = df
 
-        return df
+        return frames
 
     except HttpError as e:
         logger.error(f"❌ Google Sheets API error: {e.reason}")
@@ -357,6 +400,23 @@ def fetch_sheet_df(sheet_id: str, sheet_range: str = "Primary Details") -> pd.Da
         raise RuntimeError(f"Unexpected error fetching sheet data: {str(e)}")
 
 
+def fetch_sheet_df(sheet_id: str, sheet_range: str = "Primary Details") -> pd.DataFrame:
+    """
+    Fetch data from a Google Sheet as a pandas DataFrame.
+
+    Args:
+        sheet_id: Google Sheets file ID
+        sheet_range: Sheet range to fetch (default: "Primary Details")
+
+    Returns:
+        pd.DataFrame: Sheet data
+
+    Raises:
+        RuntimeError: If data fetch fails
+    """
+    return fetch_sheet_dfs(sheet_id, [sheet_range])[sheet_range]
+
+
 def copy_template_for_job(job: Job) -> tuple[str, str]:
     """
     Copy a quote template for a specific job.
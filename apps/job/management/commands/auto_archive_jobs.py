@@ -0,0 +1,52 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.job.services.auto_archive_service import AutoArchiveService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Archives recently completed jobs that are paid or rejected and 6+ days old"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be done without making any changes",
+        )
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Display detailed information about processed jobs",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        verbose = options["verbose"]
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING("Running in dry-run mode - no changes will be made")
+            )
+
+        result = AutoArchiveService.auto_archive_completed_jobs(
+            dry_run=dry_run, verbose=verbose
+        )
+
+        if dry_run or verbose:
+            for change in result.changes:
+                prefix = "Would archive" if dry_run else "Archived"
+                self.stdout.write(
+                    f"{prefix} job {change['job_number']} - {change['name']} "
+                    f"({change['reason']}; status: {change['old']} -> {change['new']})"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Would archive' if dry_run else 'Successfully archived'} "
+                f"{result.jobs_archived} jobs\n"
+                f"Operation completed in {result.duration_seconds:.2f} seconds"
+            )
+        )
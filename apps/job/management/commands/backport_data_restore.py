@@ -8,7 +8,12 @@ from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
 
 from apps.accounts.models import Staff
-from apps.job.models import JobFile
+from apps.job.models import JobFile, JobNumberSequence
+from apps.workflow.services.data_backup_service import (
+    CHUNK_SIZE,
+    BackupRestorer,
+    is_streaming_backup,
+)
 
 
 class Command(BaseCommand):
@@ -26,6 +31,18 @@ class Command(BaseCommand):
         parser.add_argument(
             "--skip-cleanup", action="store_true", help="Skip clearing existing data"
         )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted restore of a .ndjson backup "
+            "(implies --skip-cleanup)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"Records inserted per batch (default: {CHUNK_SIZE})",
+        )
 
     def handle(self, *args, **options):
         # Production safety check - absolutely prevent running in production
@@ -37,7 +54,11 @@ class Command(BaseCommand):
             )
 
         backup_file = options["backup_file"]
-        skip_cleanup = options["skip_cleanup"]
+        resume = options["resume"]
+        skip_cleanup = options["skip_cleanup"] or resume
+        streaming = is_streaming_backup(backup_file)
+        if resume and not streaming:
+            raise CommandError("--resume is only supported for .ndjson backups")
 
         if not skip_cleanup:
             self.stdout.write("Clearing existing data...")
@@ -47,6 +68,24 @@ class Command(BaseCommand):
             self.stdout.write("Loading essential company configuration...")
             call_command("loaddata", "apps/workflow/fixtures/company_defaults.json")
 
+        if streaming:
+            self.stdout.write(f"Streaming data from {backup_file}...")
+            restorer = BackupRestorer(
+                chunk_size=options["chunk_size"],
+                progress=lambda label, count: self.stdout.write(
+                    f"  {label}: {count} records"
+                ),
+            )
+            counts = restorer.restore(backup_file, resume=resume)
+            self.stdout.write(f"Restored {sum(counts.values())} records")
+        else:
+            self.load_legacy_backup(backup_file)
+
+        self.stdout.write("Running post-restore fixes...")
+        self.post_restore_fixes()
+
+    def load_legacy_backup(self, backup_file):
+        """Load a JSON-array backup written before backups were streamed."""
         # Handle compressed files
         if backup_file.endswith(".gz"):
             with tempfile.NamedTemporaryFile(
@@ -80,10 +119,11 @@ class Command(BaseCommand):
             self.stdout.write(f"Loading data from {backup_file}...")
             call_command("loaddata", backup_file)
 
-        self.stdout.write("Running post-restore fixes...")
-        self.post_restore_fixes()
-
     def post_restore_fixes(self):
+        # Jobs were loaded without save(), so the sequence does not know them
+        next_number = JobNumberSequence.reseed()
+        self.stdout.write(f"Next job number set to {next_number}")
+
         # Create dummy files for JobFile instances
         self.stdout.write("Creating dummy files for JobFile instances...")
         for job_file in JobFile.objects.filter(file_path__isnull=False).exclude(
@@ -34,17 +34,14 @@ class Command(BaseCommand):
         # Use the shared service
         result = PaidFlagService.update_paid_flags(dry_run=dry_run, verbose=verbose)
 
-        # Output verbose info to stdout for management command
-        if verbose:
-            for job in result.processed_jobs:
-                if dry_run:
-                    self.stdout.write(
-                        f"Would mark job {job.job_number} - {job.name} as paid"
-                    )
-                else:
-                    self.stdout.write(
-                        f"Marked job {job.job_number} - {job.name} as paid"
-                    )
+        # Output the per-job diff for dry runs and verbose runs
+        if dry_run or verbose:
+            for change in result.changes:
+                prefix = "Would mark" if dry_run else "Marked"
+                self.stdout.write(
+                    f"{prefix} job {change['job_number']} - {change['name']} as paid "
+                    f"(paid: {change['old']} -> {change['new']})"
+                )
 
         self.stdout.write(
             self.style.SUCCESS(
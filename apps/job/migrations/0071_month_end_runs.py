@@ -0,0 +1,125 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:14
+
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job", "0070_delete_safetydocument"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthEndRun",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("period", models.DateField(db_index=True)),
+                ("requested_job_count", models.PositiveIntegerField(default=0)),
+                ("processed_job_count", models.PositiveIntegerField(default=0)),
+                (
+                    "skipped_job_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Jobs already rolled over for this period"
+                    ),
+                ),
+                ("before_totals", models.JSONField(default=dict)),
+                ("after_totals", models.JSONField(default=dict)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                (
+                    "staff",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="month_end_runs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "job_monthendrun",
+                "ordering": ("-created_at",),
+            },
+        ),
+        migrations.CreateModel(
+            name="MonthEndRunJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("period", models.DateField()),
+                ("before_summary", models.JSONField(default=dict)),
+                ("after_summary", models.JSONField(default=dict)),
+                (
+                    "closed_cost_set",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="job.costset",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="month_end_rollovers",
+                        to="job.job",
+                    ),
+                ),
+                (
+                    "new_cost_set",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="job.costset",
+                    ),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="jobs",
+                        to="job.monthendrun",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "job_monthendrunjob",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job", "period"), name="unique_month_end_job_period"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:08
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job", "0071_month_end_runs"),
+        ("workflow", "0200_journal_monthly_rollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="costline",
+            name="stock_ref",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.fields.json.KeyTextTransform(
+                    "stock_id", "ext_refs"
+                ),
+                output_field=models.CharField(max_length=36, null=True),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="costline",
+            index=models.Index(
+                fields=["stock_ref"], name="job_costlin_stock_r_1d0a7e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+"""Add the job number sequence and seed it from the existing jobs."""
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seed_job_number_sequence(apps, schema_editor):
+    """Start the sequence after the highest job number (or starting_job_number)."""
+    Job = apps.get_model("job", "Job")
+    JobNumberSequence = apps.get_model("job", "JobNumberSequence")
+    CompanyDefaults = apps.get_model("workflow", "CompanyDefaults")
+
+    starting_number = (
+        CompanyDefaults.objects.values_list("starting_job_number", flat=True).first()
+        or 1
+    )
+    highest_job = Job.objects.aggregate(Max("job_number"))["job_number__max"] or 0
+    JobNumberSequence.objects.update_or_create(
+        pk=1, defaults={"next_number": max(starting_number, highest_job + 1)}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("job", "0072_costline_stock_ref"),
+        ("workflow", "0202_xero_submission"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobNumberSequence",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        default=1, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("next_number", models.PositiveIntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "job_jobnumbersequence",
+            },
+        ),
+        migrations.RunPython(seed_job_number_sequence, migrations.RunPython.noop),
+    ]
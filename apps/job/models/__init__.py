@@ -5,7 +5,9 @@ from .job import Job
 from .job_delta_rejection import JobDeltaRejection
 from .job_event import JobEvent
 from .job_file import JobFile
+from .job_number_sequence import JobNumberSequence
 from .job_quote_chat import JobQuoteChat
+from .month_end_run import MonthEndRun, MonthEndRunJob
 from .spreadsheet import QuoteSpreadsheet
 
 __all__ = [
@@ -15,6 +17,9 @@ __all__ = [
     "JobDeltaRejection",
     "JobEvent",
     "JobFile",
+    "JobNumberSequence",
     "JobQuoteChat",
+    "MonthEndRun",
+    "MonthEndRunJob",
     "QuoteSpreadsheet",
 ]
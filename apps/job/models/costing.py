@@ -4,6 +4,7 @@ from decimal import Decimal
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.fields.json import KT
 from django.utils import timezone
 
 from .costline_validators import (
@@ -197,6 +198,13 @@ class CostLine(models.Model):
         blank=True,
         help_text="Additional metadata - structure varies by kind (see class docstring)",
     )
+    # Indexed copy of ext_refs['stock_id'], maintained by the database so raw
+    # JSON updates (e.g. stock merges) keep it in sync
+    stock_ref = models.GeneratedField(
+        expression=KT("ext_refs__stock_id"),
+        output_field=models.CharField(max_length=36, null=True),
+        db_persist=True,
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -232,6 +240,7 @@ class CostLine(models.Model):
             models.Index(fields=["cost_set_id", "kind"]),
             models.Index(fields=["cost_set_id", "created_at"]),
             models.Index(fields=["cost_set_id", "kind", "created_at"]),
+            models.Index(fields=["stock_ref"]),
         ]
         ordering = ["-created_at", "-id"]
 
@@ -314,7 +323,60 @@ class CostLine(models.Model):
         self.full_clean()
         super().save(*args, **kwargs)
         self._update_cost_set_summary()
+        self._invalidate_payroll_reconciliation()
+        self._invalidate_sales_forecast()
 
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
         self._update_cost_set_summary()
+        self._invalidate_payroll_reconciliation()
+        self._invalidate_sales_forecast()
+
+    @classmethod
+    def delete_lines(cls, cost_lines) -> None:
+        """
+        Delete several cost lines with one query.
+
+        Runs the same hooks as delete(), but refreshes each affected cost set
+        summary once rather than once per line.
+        """
+        cost_lines = list(cost_lines)
+        if not cost_lines:
+            return
+        cls.objects.filter(pk__in=[line.pk for line in cost_lines]).delete()
+        refreshed = set()
+        for line in cost_lines:
+            if line.cost_set_id not in refreshed:
+                refreshed.add(line.cost_set_id)
+                line._update_cost_set_summary()
+            line._invalidate_payroll_reconciliation()
+            line._invalidate_sales_forecast()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded date so a moved line refreshes both months
+        instance._loaded_accounting_date = instance.__dict__.get("accounting_date")
+        return instance
+
+    def _invalidate_payroll_reconciliation(self):
+        if self.kind != "time" or self.cost_set.kind != "actual":
+            return
+
+        from apps.accounting.services.payroll_reconciliation_service import (
+            PayrollReconciliationService,
+        )
+
+        PayrollReconciliationService.invalidate_weeks(
+            self.accounting_date, getattr(self, "_loaded_accounting_date", None)
+        )
+
+    def _invalidate_sales_forecast(self):
+        from apps.accounting.services.sales_forecast_service import (
+            invalidate_sales_forecast_months,
+        )
+
+        invalidate_sales_forecast_months(
+            self.accounting_date, getattr(self, "_loaded_accounting_date", None)
+        )
+        self._loaded_accounting_date = self.accounting_date
@@ -15,6 +15,7 @@ from apps.workflow.models import CompanyDefaults, XeroPayItem
 
 from .costing import CostSet
 from .job_event import JobEvent
+from .job_number_sequence import JobNumberSequence
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ logger = logging.getLogger(__name__)
 class Job(models.Model):
     # CHECKLIST - when adding a new field or property to Job, check these locations:
     #   1. JOB_DIRECT_FIELDS below (if it's a model field)
-    #   2. _create_change_events() field_handlers dict in this file
+    #   2. _create_change_events() field_handlers dict and TRACKED_FIELDS in this file
     #   3. JobSerializer.Meta.fields in apps/job/serializers/job_serializer.py
     #   4. ClientJobHeaderSerializer in apps/client/serializers.py
     #   5. get_client_jobs() response dict in apps/client/services/client_rest_service.py
@@ -56,6 +57,31 @@ class Job(models.Model):
         "rejected_flag",
     ]
 
+    # Attnames diffed by _create_change_events(). Their values are captured
+    # when a job is loaded, so saving needs no extra read to detect changes.
+    TRACKED_FIELDS = frozenset(
+        {
+            "status",
+            "name",
+            "client_id",
+            "contact_id",
+            "order_number",
+            "description",
+            "notes",
+            "delivery_date",
+            "quote_acceptance_date",
+            "pricing_methodology",
+            "speed_quality_tradeoff",
+            "charge_out_rate",
+            "price_cap",
+            "priority",
+            "paid",
+            "collected",
+            "complex_job",
+            "default_xero_pay_item_id",
+        }
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100, null=False, blank=False)
     JOB_STATUS_CHOICES: List[tuple[str, str]] = [
@@ -406,34 +432,72 @@ class Job(models.Model):
         ]
 
     def generate_job_number(self) -> int:
-        company_defaults: CompanyDefaults = CompanyDefaults.get_instance()
-        starting_number: int = company_defaults.starting_job_number
-        highest_job: int = (
-            Job.objects.all().aggregate(Max("job_number"))["job_number__max"] or 0
-        )
-        next_job_number = max(starting_number, highest_job + 1)
-        return next_job_number
+        return JobNumberSequence.allocate()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in cls.TRACKED_FIELDS and value is not models.DEFERRED
+        }
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_tracked_values(fields)
+
+    def _remember_tracked_values(self, fields=None) -> None:
+        """Record the current tracked values as the stored ones."""
+        names = self.TRACKED_FIELDS
+        if fields is not None:
+            names = names & {self._meta.get_field(f).attname for f in fields}
+        deferred = self.get_deferred_fields()
+        loaded = getattr(self, "_loaded_values", {})
+        loaded.update({f: getattr(self, f) for f in names if f not in deferred})
+        self._loaded_values = loaded
+
+    def _original_values(self) -> dict:
+        """Tracked values as stored, read from the database only if not loaded."""
+        loaded = getattr(self, "_loaded_values", {})
+        missing = self.TRACKED_FIELDS - loaded.keys()
+        if not missing:
+            return loaded
+        stored = Job.objects.filter(pk=self.pk).values(*missing).first() or {}
+        return {**stored, **loaded}
 
     def save(self, *args, **kwargs):
 
         staff = kwargs.pop("staff", None)
 
         is_new = self._state.adding
-        original_job = None
+        update_fields = kwargs.get("update_fields")
+        # Saves of computed or denormalised fields only (latest_actual,
+        # updated_at, fully_invoiced, ...) cannot produce events or defaults
+        saves_tracked = (
+            is_new
+            or update_fields is None
+            or bool(
+                self.TRACKED_FIELDS
+                & {self._meta.get_field(f).attname for f in update_fields}
+            )
+        )
+        original_values = None
 
         # Track original values for change detection
-        if not is_new:
-            original_job = Job.objects.get(pk=self.pk)
+        if not is_new and saves_tracked:
+            original_values = self._original_values()
 
-        if (staff and is_new) or (not self.created_by and staff):
+        if (staff and is_new) or (not self.created_by_id and staff):
             self.created_by = staff
 
-        if self.charge_out_rate is None:
-            company_defaults = CompanyDefaults.objects.first()
+        if saves_tracked and self.charge_out_rate is None:
+            company_defaults = CompanyDefaults.get_cached()
             self.charge_out_rate = company_defaults.charge_out_rate
 
         # Default to "Ordinary Time" pay item if not specified
-        if self.default_xero_pay_item_id is None:
+        if saves_tracked and self.default_xero_pay_item_id is None:
             ordinary_time = XeroPayItem.get_ordinary_time()
             if not ordinary_time:
                 raise ValueError(
@@ -498,15 +562,37 @@ class Job(models.Model):
 
         else:
             # Dynamic change detection for existing jobs
-            if staff:
-                self._create_change_events(original_job, staff)
+            if staff and original_values is not None:
+                self._create_change_events(original_values, staff)
 
             # Save the job first
             super(Job, self).save(*args, **kwargs)
 
-    def _create_change_events(self, original_job, staff):
+        # Keep the client's open job count and last job date rollups current
+        if is_new or (
+            original_values is not None
+            and (
+                original_values.get("status") != self.status
+                or original_values.get("client_id") != self.client_id
+            )
+        ):
+            from apps.client.services.client_activity_service import (
+                ClientActivityService,
+            )
+
+            ClientActivityService.refresh_clients(
+                [
+                    self.client_id,
+                    original_values.get("client_id") if original_values else None,
+                ]
+            )
+
+        self._remember_tracked_values(None if is_new else update_fields)
+
+    def _create_change_events(self, original_values, staff):
         """
         Dynamically detect field changes and create appropriate events.
+        `original_values` maps each of TRACKED_FIELDS to its stored value.
         """
         # Store staff for use in handlers
         self._current_staff = staff
@@ -568,7 +654,7 @@ class Job(models.Model):
         }
 
         for field_name, handler in field_handlers.items():
-            old_value = getattr(original_job, field_name)
+            old_value = original_values.get(field_name)
             new_value = getattr(self, field_name)
 
             if old_value != new_value:
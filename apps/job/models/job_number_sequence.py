@@ -0,0 +1,79 @@
+from django.db import models, transaction
+from django.db.models import Max
+
+from apps.workflow.models import CompanyDefaults
+
+
+class JobNumberSequence(models.Model):
+    """
+    The next job number to hand out.
+
+    A single row that is locked while a number is taken, so concurrent job
+    creation never reads the same value and no longer scans the job table
+    for Max(job_number) on every insert.
+
+    A number is only burnt when allocate() commits on its own: if the caller
+    wraps allocate() and the job insert in one atomic() and it rolls back,
+    the sequence rolls back too and the number is handed out again. Either
+    way job_number is unique, so a number is never given to two jobs.
+    """
+
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(
+        primary_key=True, default=SINGLETON_ID, editable=False
+    )
+    next_number = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "job_jobnumbersequence"
+
+    def __str__(self) -> str:
+        return f"Next job number: {self.next_number}"
+
+    @staticmethod
+    def initial_number() -> int:
+        """First free number given the existing jobs and starting_job_number."""
+        # Imported here: job.py imports this module
+        from apps.job.models.job import Job
+
+        starting_number = CompanyDefaults.get_instance().starting_job_number
+        highest_job = Job.objects.aggregate(Max("job_number"))["job_number__max"]
+        return max(starting_number, (highest_job or 0) + 1)
+
+    @classmethod
+    def allocate(cls) -> int:
+        """
+        Take the next job number.
+
+        Raising starting_job_number above the sequence skips ahead to it.
+        The row is created from the existing jobs if it is missing, e.g.
+        after the database was flushed.
+        """
+        starting_number = CompanyDefaults.get_cached().starting_job_number
+        with transaction.atomic():
+            sequence = (
+                cls.objects.select_for_update().filter(pk=cls.SINGLETON_ID).first()
+            )
+            if sequence is None:
+                cls.objects.get_or_create(
+                    pk=cls.SINGLETON_ID,
+                    defaults={"next_number": cls.initial_number()},
+                )
+                sequence = cls.objects.select_for_update().get(pk=cls.SINGLETON_ID)
+
+            number = max(sequence.next_number, starting_number)
+            sequence.next_number = number + 1
+            sequence.save(update_fields=["next_number", "updated_at"])
+        return number
+
+    @classmethod
+    def reseed(cls) -> int:
+        """Reset the sequence after jobs were loaded without save(), e.g. a restore."""
+        with transaction.atomic():
+            sequence, _ = cls.objects.update_or_create(
+                pk=cls.SINGLETON_ID,
+                defaults={"next_number": cls.initial_number()},
+            )
+        return sequence.next_number
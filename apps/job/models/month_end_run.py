@@ -0,0 +1,82 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+from apps.accounts.models import Staff
+
+
+class MonthEndRun(models.Model):
+    """
+    One execution of month-end rollover.
+
+    Each run records the jobs it rolled over (MonthEndRunJob) with the totals
+    of the actual CostSet that was closed, so a month can be audited and a
+    re-run for the same period skips jobs that were already rolled over.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # First day of the month being closed
+    period = models.DateField(db_index=True)
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="month_end_runs",
+    )
+    requested_job_count = models.PositiveIntegerField(default=0)
+    processed_job_count = models.PositiveIntegerField(default=0)
+    skipped_job_count = models.PositiveIntegerField(
+        default=0, help_text="Jobs already rolled over for this period"
+    )
+    # Summed {"cost", "rev", "hours"} of the closed and the new actual CostSets
+    before_totals = models.JSONField(default=dict)
+    after_totals = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        db_table = "job_monthendrun"
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"Month-end {self.period:%Y-%m} ({self.processed_job_count} jobs)"
+
+
+class MonthEndRunJob(models.Model):
+    """A job rolled over by a MonthEndRun, with its before/after totals."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    run = models.ForeignKey(MonthEndRun, on_delete=models.CASCADE, related_name="jobs")
+    job = models.ForeignKey(
+        "job.Job", on_delete=models.CASCADE, related_name="month_end_rollovers"
+    )
+    # Denormalised from run so the (job, period) uniqueness can be enforced
+    period = models.DateField()
+    closed_cost_set = models.ForeignKey(
+        "job.CostSet",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    new_cost_set = models.ForeignKey(
+        "job.CostSet",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    before_summary = models.JSONField(default=dict)
+    after_summary = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = "job_monthendrunjob"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "period"], name="unique_month_end_job_period"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.job_id} rolled over for {self.period:%Y-%m}"
@@ -26,3 +26,13 @@ class IsStaffUser(BasePermission):
             return False
 
         return isinstance(user, Staff)
+
+
+class IsSuperUser(BasePermission):
+    """
+    Custom permission to only allow superusers (system administrators).
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(getattr(user, "is_authenticated", False) and user.is_superuser)
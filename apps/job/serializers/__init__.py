@@ -45,6 +45,7 @@ try:
         from .job_profitability_report_serializers import (
             CostSetMetricsSerializer,
             FiltersAppliedSerializer,
+            JobProfitabilityExportQuerySerializer,
             JobProfitabilityItemSerializer,
             JobProfitabilityQuerySerializer,
             JobProfitabilityReportResponseSerializer,
@@ -214,6 +215,7 @@ __all__ = [
     "JobHeaderResponseSerializer",
     "JobInvoicesResponseSerializer",
     "JobPatchSerializer",
+    "JobProfitabilityExportQuerySerializer",
     "JobProfitabilityItemSerializer",
     "JobProfitabilityQuerySerializer",
     "JobProfitabilityReportResponseSerializer",
@@ -28,6 +28,16 @@ class JobProfitabilityQuerySerializer(serializers.Serializer):
         required=False,
         help_text="Filter by pricing methodology",
     )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=1000,
+        required=False,
+        help_text="Page size; all matching jobs are returned if omitted",
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="next_cursor from the previous page",
+    )
 
     def validate(self, data):
         if data["start_date"] > data["end_date"]:
@@ -43,6 +53,18 @@ class JobProfitabilityQuerySerializer(serializers.Serializer):
         return data
 
 
+class JobProfitabilityExportQuerySerializer(JobProfitabilityQuerySerializer):
+    """Validates query parameters for the profitability report export."""
+
+    limit = None
+    cursor = None
+    file_format = serializers.ChoiceField(
+        choices=[("csv", "CSV"), ("xlsx", "Excel")],
+        default="csv",
+        help_text="Export file format",
+    )
+
+
 class CostSetMetricsSerializer(serializers.Serializer):
     """Revenue/cost/profit/margin/hours for a single cost set."""
 
@@ -125,3 +147,8 @@ class JobProfitabilityReportResponseSerializer(serializers.Serializer):
         help_text="Aggregate summary statistics"
     )
     filters_applied = FiltersAppliedSerializer(help_text="Echo of applied filters")
+    next_cursor = serializers.CharField(
+        allow_null=True,
+        required=False,
+        help_text="Cursor for the next page (null on the last page)",
+    )
@@ -645,6 +645,13 @@ class MonthEndPostSerializer(serializers.Serializer):
         child=serializers.UUIDField(),
         help_text="List of job IDs to process for month-end",
     )
+    period = serializers.DateField(
+        required=False,
+        help_text=(
+            "Any date in the month being closed. Defaults to the previous month "
+            "during the first days of a month, otherwise the current month"
+        ),
+    )
 
 
 class MonthEndPostResponseSerializer(serializers.Serializer):
@@ -654,6 +661,11 @@ class MonthEndPostResponseSerializer(serializers.Serializer):
         child=serializers.UUIDField(),
         help_text="List of successfully processed job IDs",
     )
+    skipped = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="List of job IDs already processed for the period",
+    )
+    period = serializers.DateField(help_text="First day of the month closed")
     errors = serializers.ListField(
         child=serializers.CharField(),
         help_text="List of error messages for failed processing",
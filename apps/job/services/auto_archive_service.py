@@ -3,15 +3,18 @@
 import logging
 from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import List
+from typing import Any, Dict, List
 
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from apps.job.models import Job, JobEvent
 
 logger = logging.getLogger(__name__)
 
+ARCHIVE_AFTER_DAYS = 6
+
 
 @dataclass
 class AutoArchiveResult:
@@ -20,6 +23,7 @@ class AutoArchiveResult:
     jobs_archived: int
     duration_seconds: float
     archived_jobs: List[Job] = field(default_factory=list)
+    changes: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class AutoArchiveService:
@@ -33,37 +37,36 @@ class AutoArchiveService:
         Archive recently_completed jobs that have been in that status for 6+ days
         and are either paid or rejected.
 
+        Eligible jobs are read in one query, archived with one UPDATE and
+        their audit events bulk created.
+
         Args:
             dry_run: If True, don't make any changes
             verbose: If True, log detailed information
 
         Returns:
-            AutoArchiveResult with operation details
+            AutoArchiveResult with operation details. changes lists the
+            per-job status changes that were (or, in dry-run, would be) made.
         """
         start_time = timezone.now()
-        threshold = timezone.now() - timedelta(days=6)
-
-        base_filter = dict(status="recently_completed", completed_at__lte=threshold)
-
-        paid_jobs = list(Job.objects.filter(**base_filter, paid=True))
-        rejected_jobs = list(Job.objects.filter(**base_filter, rejected_flag=True))
-
-        # Combine and deduplicate (a job could be both paid and rejected)
-        seen_ids = set()
-        eligible_jobs = []
-        for job in paid_jobs + rejected_jobs:
-            if job.pk not in seen_ids:
-                seen_ids.add(job.pk)
-                eligible_jobs.append(job)
+        threshold = timezone.now() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+        # A job can be both paid and rejected; one query returns it once
+        eligible_jobs = list(
+            Job.objects.filter(
+                Q(paid=True) | Q(rejected_flag=True),
+                status="recently_completed",
+                completed_at__lte=threshold,
+            ).order_by("job_number")
+        )
 
         if verbose:
             logger.info(
                 f"Found {len(eligible_jobs)} recently completed jobs "
-                f"(paid or rejected) older than 6 days"
+                f"(paid or rejected) older than {ARCHIVE_AFTER_DAYS} days"
             )
 
-        archived_jobs = []
-
+        changes = []
         for job in eligible_jobs:
             if verbose:
                 logger.info(
@@ -73,36 +76,56 @@ class AutoArchiveService:
                 )
             if dry_run:
                 logger.info(f"Would archive job {job.job_number} - {job.name}")
-            archived_jobs.append(job)
+            changes.append(
+                {
+                    "job_id": str(job.id),
+                    "job_number": job.job_number,
+                    "name": job.name,
+                    "field": "status",
+                    "old": job.status,
+                    "new": "archived",
+                    "reason": "rejected" if job.rejected_flag else "paid",
+                }
+            )
 
-        if not dry_run and archived_jobs:
-            with transaction.atomic():
-                for job in archived_jobs:
-                    job.status = "archived"
-                    job.save(update_fields=["status"])
+        if not dry_run and eligible_jobs:
+            AutoArchiveService._archive(eligible_jobs)
 
-                    if job.rejected_flag:
-                        reason = "rejected"
-                    else:
-                        reason = "paid"
+        end_time = timezone.now()
+        duration = (end_time - start_time).total_seconds()
 
-                    JobEvent.objects.create(
+        return AutoArchiveResult(
+            jobs_archived=len(eligible_jobs),
+            duration_seconds=duration,
+            archived_jobs=eligible_jobs,
+            changes=changes,
+        )
+
+    @staticmethod
+    def _archive(jobs: List[Job]) -> None:
+        with transaction.atomic():
+            Job.objects.filter(
+                pk__in=[job.pk for job in jobs], status="recently_completed"
+            ).update(status="archived")
+            for job in jobs:
+                job.status = "archived"
+            # A queryset update bypasses save(), so record history explicitly
+            Job.history.bulk_history_create(
+                jobs, update=True, default_change_reason="Auto-archived"
+            )
+            JobEvent.objects.bulk_create(
+                [
+                    JobEvent(
                         job=job,
                         event_type="status_changed",
                         description=(
-                            f"Auto-archived: job was recently completed, {reason}, "
-                            f"and 6+ days old."
+                            "Auto-archived: job was recently completed, "
+                            f"{'rejected' if job.rejected_flag else 'paid'}, "
+                            f"and {ARCHIVE_AFTER_DAYS}+ days old."
                         ),
                         staff=None,
                     )
-
-                    logger.info(f"Job {job.job_number} ({job.name}) auto-archived")
-
-        end_time = timezone.now()
-        duration = (end_time - start_time).total_seconds()
-
-        return AutoArchiveResult(
-            jobs_archived=len(archived_jobs),
-            duration_seconds=duration,
-            archived_jobs=archived_jobs,
-        )
+                    for job in jobs
+                ]
+            )
+        logger.info(f"Auto-archived {len(jobs)} jobs")
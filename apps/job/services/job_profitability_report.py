@@ -1,25 +1,105 @@
-"""Service for job profitability reporting."""
+"""Service for job profitability reporting.
 
+Revenue, cost, profit and the value/pricing filters are computed in SQL from
+the latest CostSet summaries, so the report never loads every job into
+Python. Rows are paged with a keyset cursor and can be streamed for export.
+"""
+
+import base64
+import binascii
 import logging
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
-
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, Coalesce, Round
+
+from apps.accounting.enums import InvoiceStatus
+from apps.accounting.models import Invoice
 from apps.client.models import Client
 from apps.job.models import Job
-from apps.job.services.job_service import get_job_total_value
 
 logger = logging.getLogger(__name__)
 
 _ZERO = Decimal("0.00")
-_EMPTY_SUMMARY = {"cost": 0.0, "rev": 0.0, "hours": 0.0}
-
-
-def _safe_decimal(value: Any) -> Decimal:
-    """Convert a JSON float to Decimal safely."""
-    if value is None:
-        return _ZERO
-    return Decimal(str(value))
+_CENT = Decimal("0.01")
+_AMOUNT = DecimalField(max_digits=20, decimal_places=6)
+_INVOICE_VALID_STATUSES = [
+    status
+    for (status, _) in InvoiceStatus.choices
+    if status not in ["VOIDED", "DELETED"]
+]
+_COST_SETS = {"est": "latest_estimate", "quote": "latest_quote", "act": "latest_actual"}
+_PRICING_DISPLAY = dict(Job.PRICING_METHODOLOGY_CHOICES)
+
+EXPORT_COLUMNS = [
+    ("job_number", "Job Number"),
+    ("job_name", "Job"),
+    ("client_name", "Client"),
+    ("pricing_type_display", "Pricing Type"),
+    ("completion_date", "Completed"),
+    ("revenue", "Revenue"),
+    ("actual.cost", "Actual Cost"),
+    ("actual.profit", "Actual Profit"),
+    ("actual.margin", "Actual Margin %"),
+    ("actual.hours", "Actual Hours"),
+    ("estimate.profit", "Estimate Profit"),
+    ("quote.profit", "Quote Profit"),
+    ("profit_variance", "Profit Variance"),
+    ("profit_variance_pct", "Profit Variance %"),
+]
+
+
+def _summary_value(cost_set: str, key: str):
+    """SQL expression for a numeric key of a latest_* CostSet summary."""
+    return Round(
+        Coalesce(
+            Cast(KeyTextTransform(key, f"{cost_set}__summary"), _AMOUNT),
+            Value(_ZERO, output_field=_AMOUNT),
+        ),
+        2,
+        output_field=_AMOUNT,
+    )
+
+
+def _pct(numerator: Decimal, denominator: Decimal) -> Decimal:
+    return ((numerator / denominator * 100) if denominator != 0 else _ZERO).quantize(
+        _CENT
+    )
+
+
+def _q(value: Optional[Decimal]) -> Decimal:
+    return (value or _ZERO).quantize(_CENT)
+
+
+def encode_cursor(completed_at: datetime, job_id) -> str:
+    """Opaque keyset cursor for the row after (completed_at, id)."""
+    raw = f"{completed_at.isoformat()}|{job_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError for a malformed cursor."""
+    try:
+        completed_at, job_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        )
+        return datetime.fromisoformat(completed_at), job_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
 
 
 class JobProfitabilityReportService:
@@ -39,11 +119,35 @@ class JobProfitabilityReportService:
         self.max_value = max_value
         self.pricing_type = pricing_type
 
-    def generate_report(self) -> Dict[str, Any]:
-        """Generate the profitability report."""
+    def generate_report(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the profitability report.
+
+        Args:
+            limit: Page size. All matching jobs are returned if omitted.
+            cursor: next_cursor from the previous page
+
+        Returns:
+            Report dict with jobs (this page), summary (all matching jobs),
+            filters_applied and next_cursor (None on the last page)
+        """
         jobs_qs = self._get_queryset()
-        job_rows = self._build_job_rows(jobs_qs)
-        summary = self._build_summary(job_rows)
+        summary = self._build_summary(jobs_qs)
+
+        page_qs = self._apply_cursor(jobs_qs, cursor)
+        if limit is not None:
+            page_qs = page_qs[: limit + 1]
+        job_rows = [self._compute_job_row(job) for job in page_qs]
+
+        next_cursor = None
+        if limit is not None and len(job_rows) > limit:
+            job_rows = job_rows[:limit]
+            last = job_rows[-1]
+            next_cursor = encode_cursor(last["_completed_at"], last["job_id"])
+        for row in job_rows:
+            row.pop("_completed_at")
 
         return {
             "jobs": job_rows,
@@ -59,10 +163,30 @@ class JobProfitabilityReportService:
                 ),
                 "pricing_type": self.pricing_type,
             },
+            "next_cursor": next_cursor,
         }
 
+    def iter_rows(self, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every report row without materialising the full list."""
+        for job in self._get_queryset().iterator(chunk_size=chunk_size):
+            row = self._compute_job_row(job)
+            row.pop("_completed_at")
+            yield row
+
+    def iter_export_rows(self, chunk_size: int = 500) -> Iterator[List[Any]]:
+        """Yield a header row, then one flat row per job, for CSV/XLSX export."""
+        yield [label for _, label in EXPORT_COLUMNS]
+        for row in self.iter_rows(chunk_size=chunk_size):
+            values = []
+            for key, _ in EXPORT_COLUMNS:
+                value = row
+                for part in key.split("."):
+                    value = value[part]
+                values.append(value)
+            yield values
+
     def _get_queryset(self):
-        """Build the base queryset for completed/archived jobs."""
+        """Build the annotated, filtered and keyset-ordered report queryset."""
         qs = Job.objects.filter(
             status__in=["recently_completed", "archived"],
             rejected_flag=False,
@@ -79,110 +203,116 @@ class JobProfitabilityReportService:
         if self.pricing_type:
             qs = qs.filter(pricing_methodology=self.pricing_type)
 
-        return qs.select_related(
-            "client", "latest_estimate", "latest_quote", "latest_actual"
+        metrics = {
+            f"{prefix}_{key}": _summary_value(cost_set, key)
+            for prefix, cost_set in _COST_SETS.items()
+            for key in ("rev", "cost", "hours")
+        }
+        invoiced = Subquery(
+            Invoice.objects.filter(
+                job_id=OuterRef("pk"), status__in=_INVOICE_VALID_STATUSES
+            )
+            .order_by()
+            .values("job_id")
+            .annotate(total=Sum("total_excl_tax"))
+            .values("total")[:1],
+            output_field=_AMOUNT,
+        )
+        is_fixed_price = Q(pricing_methodology="fixed_price")
+
+        # Same precedence as get_job_total_value: invoices, then quote (FP)
+        # or actual (T&M) revenue
+        qs = (
+            qs.annotate(
+                **metrics,
+                invoiced=Coalesce(invoiced, Value(_ZERO, output_field=_AMOUNT)),
+            )
+            .annotate(
+                revenue=Case(
+                    When(invoiced__gt=0, then=Round("invoiced", 2)),
+                    When(is_fixed_price, then=F("quote_rev")),
+                    default=F("act_rev"),
+                    output_field=_AMOUNT,
+                ),
+                baseline_profit=Case(
+                    When(is_fixed_price, then=F("quote_rev") - F("quote_cost")),
+                    default=F("est_rev") - F("est_cost"),
+                    output_field=_AMOUNT,
+                ),
+            )
+            .annotate(actual_profit=F("revenue") - F("act_cost"))
         )
 
-    def _build_job_rows(self, jobs_qs) -> List[Dict[str, Any]]:
-        """Build per-job profitability rows, applying value filters in Python."""
-        rows: List[Dict[str, Any]] = []
-
-        for job in jobs_qs:
-            revenue = get_job_total_value(job).quantize(Decimal("0.01"))
-
-            if self.min_value is not None and revenue < self.min_value:
-                continue
-            if self.max_value is not None and revenue > self.max_value:
-                continue
+        if self.min_value is not None:
+            qs = qs.filter(revenue__gte=self.min_value)
+        if self.max_value is not None:
+            qs = qs.filter(revenue__lte=self.max_value)
 
-            row = self._compute_job_row(job, revenue)
-            rows.append(row)
+        return qs.select_related("client").order_by("-completed_at", "-id")
 
-        return rows
+    @staticmethod
+    def _apply_cursor(qs, cursor: Optional[str]):
+        if not cursor:
+            return qs
+        completed_at, job_id = decode_cursor(cursor)
+        return qs.filter(
+            Q(completed_at__lt=completed_at)
+            | Q(completed_at=completed_at, id__lt=job_id)
+        )
 
     @staticmethod
-    def _extract_metrics(summary: dict) -> Dict[str, Decimal]:
-        """Extract rev/cost/profit/margin/hours from a CostSet summary dict."""
-        rev = _safe_decimal(summary.get("rev", 0))
-        cost = _safe_decimal(summary.get("cost", 0))
-        profit = rev - cost
-        margin = ((profit / rev * 100) if rev != 0 else _ZERO).quantize(Decimal("0.01"))
-        hours = _safe_decimal(summary.get("hours", 0))
+    def _metrics(revenue, cost, hours) -> Dict[str, str]:
+        revenue, cost = _q(revenue), _q(cost)
+        profit = revenue - cost
         return {
-            "revenue": rev.quantize(Decimal("0.01")),
-            "cost": cost.quantize(Decimal("0.01")),
-            "profit": profit.quantize(Decimal("0.01")),
-            "margin": margin,
-            "hours": hours.quantize(Decimal("0.01")),
+            "revenue": str(revenue),
+            "cost": str(cost),
+            "profit": str(profit),
+            "margin": str(_pct(profit, revenue)),
+            "hours": str(_q(hours)),
         }
 
-    @staticmethod
-    def _metrics_to_str(m: Dict[str, Decimal]) -> Dict[str, str]:
-        return {k: str(v) for k, v in m.items()}
-
-    def _compute_job_row(self, job: Job, revenue: Decimal) -> Dict[str, Any]:
-        """Compute profitability metrics for a single job."""
-        est_summary = (
-            job.latest_estimate.summary
-            if job.latest_estimate and job.latest_estimate.summary
-            else _EMPTY_SUMMARY
-        )
-        quote_summary = (
-            job.latest_quote.summary
-            if job.latest_quote and job.latest_quote.summary
-            else _EMPTY_SUMMARY
-        )
-        act_summary = (
-            job.latest_actual.summary
-            if job.latest_actual and job.latest_actual.summary
-            else _EMPTY_SUMMARY
-        )
-
-        estimate = self._extract_metrics(est_summary)
-        quote = self._extract_metrics(quote_summary)
-        actual = self._extract_metrics(act_summary)
-
-        # Override actual revenue with invoice-based revenue
-        actual["revenue"] = revenue
-        actual["profit"] = (revenue - actual["cost"]).quantize(Decimal("0.01"))
-        actual["margin"] = (
-            (actual["profit"] / revenue * 100) if revenue != 0 else _ZERO
-        ).quantize(Decimal("0.01"))
-
-        # Variance is against the relevant baseline: quote for FP, estimate for T&M
-        if job.pricing_methodology == "fixed_price":
-            baseline_profit = quote["profit"]
-        else:
-            baseline_profit = estimate["profit"]
-
-        profit_variance = actual["profit"] - baseline_profit
-        profit_variance_pct = (
-            (profit_variance / abs(baseline_profit) * 100)
-            if baseline_profit != 0
-            else _ZERO
-        ).quantize(Decimal("0.01"))
+    def _compute_job_row(self, job: Job) -> Dict[str, Any]:
+        """Format one annotated job as a report row."""
+        revenue = _q(job.revenue)
+        actual_profit = revenue - _q(job.act_cost)
+        baseline_profit = _q(job.baseline_profit)
+        profit_variance = actual_profit - baseline_profit
 
+        actual = self._metrics(revenue, job.act_cost, job.act_hours)
         return {
             "job_id": str(job.id),
             "job_number": job.job_number,
             "job_name": job.description or "",
             "client_name": job.client.name if job.client else "Unknown",
             "pricing_type": job.pricing_methodology,
-            "pricing_type_display": job.get_pricing_methodology_display(),
+            "pricing_type_display": _PRICING_DISPLAY.get(
+                job.pricing_methodology, job.pricing_methodology
+            ),
             "completion_date": (
                 job.completed_at.date().isoformat() if job.completed_at else None
             ),
             "revenue": str(revenue),
-            "estimate": self._metrics_to_str(estimate),
-            "quote": self._metrics_to_str(quote),
-            "actual": self._metrics_to_str(actual),
-            "profit_variance": str(profit_variance.quantize(Decimal("0.01"))),
-            "profit_variance_pct": str(profit_variance_pct),
+            "estimate": self._metrics(job.est_rev, job.est_cost, job.est_hours),
+            "quote": self._metrics(job.quote_rev, job.quote_cost, job.quote_hours),
+            "actual": actual,
+            "profit_variance": str(profit_variance),
+            "profit_variance_pct": str(_pct(profit_variance, abs(baseline_profit))),
+            "_completed_at": job.completed_at,
         }
 
-    def _build_summary(self, job_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Aggregate summary statistics across all job rows."""
-        total_jobs = len(job_rows)
+    def _build_summary(self, jobs_qs) -> Dict[str, Any]:
+        """Aggregate summary statistics across all matching jobs in SQL."""
+        totals = jobs_qs.order_by().aggregate(
+            total_jobs=Count("id"),
+            total_revenue=Sum("revenue"),
+            total_cost=Sum("act_cost"),
+            total_baseline_profit=Sum("baseline_profit"),
+            tm_jobs=Count("id", filter=Q(pricing_methodology="time_materials")),
+            fp_jobs=Count("id", filter=Q(pricing_methodology="fixed_price")),
+            profitable_jobs=Count("id", filter=Q(actual_profit__gt=0)),
+        )
+        total_jobs = totals["total_jobs"]
         if total_jobs == 0:
             return {
                 "total_jobs": 0,
@@ -199,43 +329,23 @@ class JobProfitabilityReportService:
                 "unprofitable_jobs": 0,
             }
 
-        total_revenue = sum(Decimal(r["revenue"]) for r in job_rows)
-        total_cost = sum(Decimal(r["actual"]["cost"]) for r in job_rows)
+        total_revenue = _q(totals["total_revenue"])
+        total_cost = _q(totals["total_cost"])
         total_profit = total_revenue - total_cost
-        overall_margin = (
-            (total_profit / total_revenue * 100) if total_revenue != 0 else _ZERO
-        ).quantize(Decimal("0.01"))
-        avg_profit = (total_profit / total_jobs).quantize(Decimal("0.01"))
-
         # Variance uses quote profit for FP, estimate profit for T&M
-        total_baseline_profit = sum(
-            (
-                Decimal(r["quote"]["profit"])
-                if r["pricing_type"] == "fixed_price"
-                else Decimal(r["estimate"]["profit"])
-            )
-            for r in job_rows
-        )
-        total_variance = total_profit - total_baseline_profit
-
-        tm_jobs = sum(1 for r in job_rows if r["pricing_type"] == "time_materials")
-        fp_jobs = sum(1 for r in job_rows if r["pricing_type"] == "fixed_price")
-        profitable = sum(1 for r in job_rows if Decimal(r["actual"]["profit"]) > 0)
-        unprofitable = total_jobs - profitable
+        total_baseline_profit = _q(totals["total_baseline_profit"])
 
         return {
             "total_jobs": total_jobs,
-            "total_revenue": str(total_revenue.quantize(Decimal("0.01"))),
-            "total_cost": str(total_cost.quantize(Decimal("0.01"))),
-            "total_profit": str(total_profit.quantize(Decimal("0.01"))),
-            "overall_margin": str(overall_margin),
-            "avg_profit_per_job": str(avg_profit),
-            "total_baseline_profit": str(
-                total_baseline_profit.quantize(Decimal("0.01"))
-            ),
-            "total_variance": str(total_variance.quantize(Decimal("0.01"))),
-            "tm_jobs": tm_jobs,
-            "fp_jobs": fp_jobs,
-            "profitable_jobs": profitable,
-            "unprofitable_jobs": unprofitable,
+            "total_revenue": str(total_revenue),
+            "total_cost": str(total_cost),
+            "total_profit": str(total_profit),
+            "overall_margin": str(_pct(total_profit, total_revenue)),
+            "avg_profit_per_job": str((total_profit / total_jobs).quantize(_CENT)),
+            "total_baseline_profit": str(total_baseline_profit),
+            "total_variance": str(total_profit - total_baseline_profit),
+            "tm_jobs": totals["tm_jobs"],
+            "fp_jobs": totals["fp_jobs"],
+            "profitable_jobs": totals["profitable_jobs"],
+            "unprofitable_jobs": total_jobs - totals["profitable_jobs"],
         }
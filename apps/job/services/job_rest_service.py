@@ -335,9 +335,7 @@ class JobRestService:
             estimate_costset = job.cost_sets.get(kind="estimate")
 
             # Get company defaults for calculations
-            company_defaults = CompanyDefaults.objects.first()
-            if not company_defaults:
-                raise ValueError("CompanyDefaults not found")
+            company_defaults = CompanyDefaults.get_cached()
 
             wage_rate = company_defaults.wage_rate.quantize(Decimal("0.01"))
             charge_out_rate = company_defaults.charge_out_rate.quantize(Decimal("0.01"))
@@ -1742,7 +1740,7 @@ class JobRestService:
         """
         from apps.workflow.models import CompanyDefaults
 
-        defaults = CompanyDefaults.get_instance()
+        defaults = CompanyDefaults.get_cached()
         return {
             "materials_markup": float(defaults.materials_markup),
             "time_markup": float(defaults.time_markup),
@@ -1,17 +1,48 @@
 import logging
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
 from decimal import Decimal
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from django.db import transaction
-from django.shortcuts import get_object_or_404
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
 
-from apps.job.models import CostSet, Job
+from apps.job.models import CostSet, Job, MonthEndRun, MonthEndRunJob
 from apps.purchasing.models import Stock
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_KEYS = ("cost", "rev", "hours")
+# Month-end run in the first days of a month closes the previous month
+MONTH_END_GRACE_DAYS = 7
+
+
+def _summary_decimal(summary: Optional[dict], key: str) -> Decimal:
+    return Decimal(str((summary or {}).get(key, 0)))
+
+
+def _sum_summaries(summaries) -> dict:
+    totals = {key: Decimal("0") for key in SUMMARY_KEYS}
+    for summary in summaries:
+        for key in SUMMARY_KEYS:
+            totals[key] += _summary_decimal(summary, key)
+    return {key: float(value) for key, value in totals.items()}
+
 
 class MonthEndService:
+    @staticmethod
+    def default_period(today: Optional[date] = None) -> date:
+        """
+        First day of the month being closed when no period is given: the
+        previous month during the first MONTH_END_GRACE_DAYS, else this month.
+        """
+        today = today or timezone.localdate()
+        if today.day <= MONTH_END_GRACE_DAYS:
+            return (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+        return today.replace(day=1)
+
     @staticmethod
     def _get_stock_job() -> Job:
         return Stock.get_stock_holding_job()
@@ -19,41 +50,51 @@ class MonthEndService:
     @staticmethod
     def get_special_jobs() -> List[Job]:
         stock_job = MonthEndService._get_stock_job()
-        return list(Job.objects.filter(status="special").exclude(id=stock_job.id))
+        return list(
+            Job.objects.filter(status="special")
+            .exclude(id=stock_job.id)
+            .select_related("client", "latest_actual")
+        )
 
     @staticmethod
-    def _build_job_history(job: Job) -> List[dict]:
-        history = []
-        for cs in (
-            job.cost_sets.filter(kind="actual")
-            .exclude(id=job.latest_actual_id)
-            .order_by("created")
-        ):
-            history.append(
-                {
-                    "date": cs.created,
-                    "total_hours": Decimal(str(cs.summary.get("hours", 0))),
-                    "total_dollars": Decimal(str(cs.summary.get("cost", 0))),
-                }
-            )
-        return history
+    def _history_entry(cs: CostSet) -> dict:
+        return {
+            "date": cs.created,
+            "total_hours": _summary_decimal(cs.summary, "hours"),
+            "total_dollars": _summary_decimal(cs.summary, "cost"),
+        }
 
     @staticmethod
     def get_special_jobs_data() -> List[dict]:
+        jobs = MonthEndService.get_special_jobs()
+
+        # One query for every job's closed actual CostSets
+        history_by_job = defaultdict(list)
+        closed_sets = (
+            CostSet.objects.filter(job__in=jobs, kind="actual")
+            .exclude(
+                id__in=[job.latest_actual_id for job in jobs if job.latest_actual_id]
+            )
+            .only("job_id", "summary", "created")
+            .order_by("created")
+        )
+        for cs in closed_sets:
+            history_by_job[cs.job_id].append(MonthEndService._history_entry(cs))
+
         data = []
-        for job in MonthEndService.get_special_jobs():
+        for job in jobs:
             actual = job.latest_actual
             data.append(
                 {
                     "job": job,
-                    "history": MonthEndService._build_job_history(job),
+                    "history": history_by_job[job.id],
                     "total_hours": (
-                        Decimal(str(actual.summary.get("hours", 0)))
+                        _summary_decimal(actual.summary, "hours")
                         if actual
                         else Decimal("0")
                     ),
                     "total_dollars": (
-                        Decimal(str(actual.summary.get("cost", 0)))
+                        _summary_decimal(actual.summary, "cost")
                         if actual
                         else Decimal("0")
                     ),
@@ -64,40 +105,163 @@ class MonthEndService:
     @staticmethod
     def get_stock_job_data() -> dict:
         job = MonthEndService._get_stock_job()
-        history = []
-        for cs in job.cost_sets.filter(kind="actual").order_by("created"):
-            material_lines = cs.cost_lines.filter(kind="material")
-            total_cost = sum(
-                (line.total_cost for line in material_lines),
-                Decimal("0"),
-            )
-            history.append(
-                {
-                    "date": cs.created,
-                    "material_line_count": material_lines.count(),
-                    "material_cost": total_cost,
-                }
+        material = Q(cost_lines__kind="material")
+        cost_sets = (
+            job.cost_sets.filter(kind="actual")
+            .annotate(
+                material_line_count=Count("cost_lines", filter=material),
+                material_cost=Sum(
+                    F("cost_lines__quantity") * F("cost_lines__unit_cost"),
+                    filter=material,
+                    output_field=DecimalField(max_digits=20, decimal_places=6),
+                ),
             )
+            .order_by("created")
+        )
+        history = [
+            {
+                "date": cs.created,
+                "material_line_count": cs.material_line_count,
+                "material_cost": cs.material_cost or Decimal("0"),
+            }
+            for cs in cost_sets
+        ]
         return {"job": job, "history": history}
 
     @staticmethod
-    def process_jobs(job_ids: List[str]) -> Tuple[List[Job], List[Tuple[str, str]]]:
-        processed_jobs: List[Job] = []
-        error_jobs: List[Tuple[str, str]] = []
+    def _resolve_jobs(job_ids: List[str]):
+        """Map requested ids to jobs, collecting errors for bad or unknown ids."""
+        errors: List[Tuple[str, str]] = []
+        parsed = {}
         for job_id in job_ids:
             try:
-                job = get_object_or_404(Job, id=job_id)
-                with transaction.atomic():
-                    rev = job.cost_sets.filter(kind="actual").count() + 1
-                    new_set = CostSet.objects.create(
-                        job=job,
-                        kind="actual",
-                        rev=rev,
-                        summary={"cost": 0, "rev": 0, "hours": 0},
-                    )
-                    job.set_latest("actual", new_set)
-                processed_jobs.append(job)
-            except Exception as e:
-                logger.exception("Error processing job %s", job_id)
-                error_jobs.append((job_id, str(e)))
-        return processed_jobs, error_jobs
+                parsed[uuid.UUID(str(job_id))] = job_id
+            except ValueError:
+                errors.append((job_id, f"'{job_id}' is not a valid UUID."))
+
+        jobs = {
+            job.id: job
+            for job in Job.objects.filter(id__in=parsed).select_related("latest_actual")
+        }
+        for job_uuid, job_id in parsed.items():
+            if job_uuid not in jobs:
+                errors.append((job_id, "No Job matches the given query."))
+        return jobs, errors
+
+    @staticmethod
+    def process_jobs(
+        job_ids: List[str], staff=None, period: Optional[date] = None
+    ) -> Tuple[List[Job], List[Job], List[Tuple[str, str]]]:
+        """
+        Roll every selected job over to a new, empty actual CostSet.
+
+        Revisions are computed with one grouped query, the new CostSets are
+        bulk-created and latest_actual is repointed in a single UPDATE. The
+        run is recorded as a MonthEndRun with per-job before/after totals.
+        Jobs already rolled over for the period are reported as skipped
+        without creating another CostSet, so re-running month-end is safe.
+
+        Args:
+            job_ids: Job IDs selected for rollover
+            staff: Staff member running month-end (recorded on the run)
+            period: Any date in the month being closed (defaults to
+                default_period())
+
+        Returns:
+            (processed jobs, skipped jobs, [(job_id, error message)])
+        """
+        period = (period or MonthEndService.default_period()).replace(day=1)
+        jobs, error_jobs = MonthEndService._resolve_jobs(job_ids)
+        if not jobs:
+            return [], [], error_jobs
+
+        try:
+            with transaction.atomic():
+                run, processed = MonthEndService._roll_over(
+                    jobs, staff, period, len(job_ids)
+                )
+        except Exception as e:
+            logger.exception("Error processing month-end for %s jobs", len(jobs))
+            return [], [], error_jobs + [(str(job_id), str(e)) for job_id in jobs]
+
+        logger.info(
+            f"Month-end {period:%Y-%m}: rolled over {run.processed_job_count} jobs, "
+            f"skipped {run.skipped_job_count} already processed"
+        )
+        skipped = [job for job in jobs.values() if job not in processed]
+        return processed, skipped, error_jobs
+
+    @staticmethod
+    def _roll_over(
+        jobs: dict, staff, period: date, requested: int
+    ) -> Tuple[MonthEndRun, List[Job]]:
+        """Roll over the jobs not yet done for the period; returns (run, those jobs)."""
+        # Lock the jobs so concurrent runs cannot allocate the same revision
+        list(Job.objects.select_for_update().filter(id__in=jobs).values_list("id"))
+
+        already_done = set(
+            MonthEndRunJob.objects.filter(job_id__in=jobs, period=period).values_list(
+                "job_id", flat=True
+            )
+        )
+        todo = [job for job_id, job in jobs.items() if job_id not in already_done]
+
+        max_revs = dict(
+            CostSet.objects.filter(job__in=todo, kind="actual")
+            .values("job_id")
+            .annotate(max_rev=Max("rev"))
+            .values_list("job_id", "max_rev")
+        )
+        empty_summary = {"cost": 0, "rev": 0, "hours": 0}
+        new_sets = CostSet.objects.bulk_create(
+            [
+                CostSet(
+                    job=job,
+                    kind="actual",
+                    rev=(max_revs.get(job.id) or 0) + 1,
+                    summary=dict(empty_summary),
+                )
+                for job in todo
+            ]
+        )
+
+        if todo:
+            Job.objects.filter(id__in=[job.id for job in todo]).update(
+                latest_actual=Subquery(
+                    CostSet.objects.filter(job_id=OuterRef("pk"), kind="actual")
+                    .order_by("-rev")
+                    .values("id")[:1]
+                )
+            )
+
+        run = MonthEndRun.objects.create(
+            period=period,
+            staff=staff,
+            requested_job_count=requested,
+            processed_job_count=len(todo),
+            skipped_job_count=len(already_done),
+            before_totals=_sum_summaries(
+                job.latest_actual.summary for job in todo if job.latest_actual
+            ),
+            after_totals=_sum_summaries(cs.summary for cs in new_sets),
+        )
+        MonthEndRunJob.objects.bulk_create(
+            [
+                MonthEndRunJob(
+                    run=run,
+                    job=job,
+                    period=period,
+                    closed_cost_set=job.latest_actual,
+                    new_cost_set=new_set,
+                    before_summary=(
+                        job.latest_actual.summary if job.latest_actual else {}
+                    ),
+                    after_summary=new_set.summary,
+                )
+                for job, new_set in zip(todo, new_sets)
+            ]
+        )
+
+        for job, new_set in zip(todo, new_sets):
+            job.latest_actual = new_set
+        return run, todo
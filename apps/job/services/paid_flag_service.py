@@ -1,16 +1,24 @@
 """Service for updating paid flags on completed jobs with paid invoices."""
 
 import logging
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
 
 from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from apps.job.models import Job
+from apps.accounting.models import Invoice
+from apps.job.models import Job, JobEvent
 
 logger = logging.getLogger(__name__)
 
+# Job statuses that count as completed work
+COMPLETED_STATUSES = ["recently_completed", "archived"]
+
+PAID_EVENT_DESCRIPTION = "Job marked as PAID. Payment has been received from client"
+
 
 @dataclass
 class PaidFlagResult:
@@ -21,11 +29,30 @@ class PaidFlagResult:
     missing_invoices: int
     duration_seconds: float
     processed_jobs: List[Job]
+    changes: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class PaidFlagService:
     """Service for updating paid flags on completed jobs."""
 
+    @staticmethod
+    def annotate_invoice_counts(jobs_qs):
+        """Annotate invoice_count and unpaid_invoice_count onto a job queryset."""
+        unpaid_counts = (
+            Invoice.objects.filter(job_id=OuterRef("pk"))
+            .exclude(Invoice.paid_q())
+            .order_by()
+            .values("job_id")
+            .annotate(count=Count("pk"))
+            .values("count")[:1]
+        )
+        return jobs_qs.annotate(
+            invoice_count=Count("invoices", distinct=True),
+            unpaid_invoice_count=Coalesce(
+                Subquery(unpaid_counts, output_field=IntegerField()), Value(0)
+            ),
+        )
+
     @staticmethod
     def update_paid_flags(
         dry_run: bool = False, verbose: bool = False
@@ -33,20 +60,29 @@ class PaidFlagService:
         """
         Update paid flags on completed jobs that have paid invoices.
 
+        Invoice counts for every candidate job come from one annotated query,
+        the flag is set with one UPDATE and the audit events are bulk created,
+        so the query count does not grow with the number of jobs.
+
         Args:
             dry_run: If True, don't make any changes
             verbose: If True, log detailed information
 
         Returns:
-            PaidFlagResult with operation details
+            PaidFlagResult with operation details. changes lists the
+            per-job flag changes that were (or, in dry-run, would be) made.
         """
         start_time = timezone.now()
 
-        completed_jobs = Job.objects.filter(status="completed", paid=False)
+        completed_jobs = list(
+            PaidFlagService.annotate_invoice_counts(
+                Job.objects.filter(status__in=COMPLETED_STATUSES, paid=False)
+            ).order_by("job_number")
+        )
 
         if verbose:
             logger.info(
-                f"Found {completed_jobs.count()} completed jobs not marked as paid"
+                f"Found {len(completed_jobs)} completed jobs not marked as paid"
             )
 
         jobs_to_update = []
@@ -54,44 +90,43 @@ class PaidFlagService:
         missing_invoices = 0
 
         for job in completed_jobs:
-            invoices = job.invoices.all()
-
-            if not invoices.exists():
+            if job.invoice_count == 0:
                 missing_invoices += 1
                 if verbose:
                     logger.info(
                         f"Job {job.job_number} - {job.name} has no associated invoices"
                     )
-                continue
-
-            # Check if all invoices are paid
-            paid_invoices = [invoice for invoice in invoices if invoice.paid]
-            unpaid_invoice_count = len(invoices) - len(paid_invoices)
-
-            if unpaid_invoice_count > 0:
-                unpaid_invoices += unpaid_invoice_count
+            elif job.unpaid_invoice_count > 0:
+                unpaid_invoices += job.unpaid_invoice_count
                 if verbose:
                     logger.info(
-                        f"Job {job.job_number} - {job.name} has {unpaid_invoice_count} unpaid invoice(s)"
+                        f"Job {job.job_number} - {job.name} has "
+                        f"{job.unpaid_invoice_count} unpaid invoice(s)"
                     )
             else:
-                # All invoices are paid
                 if verbose:
                     logger.info(
                         f"Job {job.job_number} - {job.name} has all invoices paid "
-                        f"({len(paid_invoices)} invoice(s))"
+                        f"({job.invoice_count} invoice(s))"
                     )
                 if dry_run:
                     logger.info(f"Would mark job {job.job_number} - {job.name} as paid")
-
                 jobs_to_update.append(job)
 
+        changes = [
+            {
+                "job_id": str(job.id),
+                "job_number": job.job_number,
+                "name": job.name,
+                "field": "paid",
+                "old": False,
+                "new": True,
+            }
+            for job in jobs_to_update
+        ]
+
         if not dry_run and jobs_to_update:
-            with transaction.atomic():
-                for job in jobs_to_update:
-                    job.paid = True
-                    job.save(update_fields=["paid"])
-                    logger.info(f"Job {job.job_number} ({job.name}) marked as paid")
+            PaidFlagService._mark_paid(jobs_to_update)
 
         end_time = timezone.now()
         duration = (end_time - start_time).total_seconds()
@@ -102,4 +137,30 @@ class PaidFlagService:
             missing_invoices=missing_invoices,
             duration_seconds=duration,
             processed_jobs=jobs_to_update,
+            changes=changes,
         )
+
+    @staticmethod
+    def _mark_paid(jobs: List[Job]) -> None:
+        with transaction.atomic():
+            Job.objects.filter(pk__in=[job.pk for job in jobs], paid=False).update(
+                paid=True
+            )
+            for job in jobs:
+                job.paid = True
+            # A queryset update bypasses save(), so record history explicitly
+            Job.history.bulk_history_create(
+                jobs, update=True, default_change_reason="Paid flag update"
+            )
+            JobEvent.objects.bulk_create(
+                [
+                    JobEvent(
+                        job=job,
+                        event_type="payment_received",
+                        description=PAID_EVENT_DESCRIPTION,
+                        staff=None,
+                    )
+                    for job in jobs
+                ]
+            )
+        logger.info(f"Marked {len(jobs)} jobs as paid")
@@ -9,16 +9,21 @@ Provides functionality to:
 - Preview and apply quote changes
 """
 
+import copy
+import hashlib
 import logging
+from decimal import Decimal, InvalidOperation
 
 import pandas as pd
+from django.core.cache import cache
 
 from apps.job.importers.google_sheets import (
     _svc,
     copy_file,
     create_folder,
     extract_file_id,
-    fetch_sheet_df,
+    fetch_sheet_dfs,
+    get_file_revision,
     populate_sheet_from_costset,
 )
 from apps.job.models import Job
@@ -31,6 +36,16 @@ from apps.workflow.models import CompanyDefaults
 
 logger = logging.getLogger(__name__)
 
+# Parsed sheet snapshots are keyed on the Drive revision, so a stale entry can
+# never be served; the timeout only bounds how long unused entries linger.
+SHEET_SNAPSHOT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _sheet_snapshot_cache_key(sheet_id: str, tab: str) -> str:
+    # Tab names may contain spaces, which are not valid in memcached keys
+    tab_digest = hashlib.sha1(tab.encode("utf-8")).hexdigest()
+    return f"quote_sheet_snapshot:{sheet_id}:{tab_digest}"
+
 
 def link_quote_sheet(job: Job, template_url: str | None = None) -> QuoteSpreadsheet:
     """
@@ -47,9 +62,7 @@ def link_quote_sheet(job: Job, template_url: str | None = None) -> QuoteSpreadsh
 
     try:
         # Get company defaults
-        company_defaults = CompanyDefaults.objects.first()
-        if not company_defaults:
-            raise RuntimeError("CompanyDefaults not configured")
+        company_defaults = CompanyDefaults.get_cached()
 
         # Determine template URL
         if not template_url:
@@ -166,9 +179,12 @@ def link_quote_sheet(job: Job, template_url: str | None = None) -> QuoteSpreadsh
 
 def _fetch_drafts(job: Job):
     """
-    Download the linked sheet as xlsx, parse using the same Excel parser,
-    and return DraftLine[].
-    WARNING: THIS CODE WAS WRITTEN BY AI
+    Fetch the linked sheet and return DraftLine[].
+
+    The parsed drafts are cached against the sheet's Drive revision. Each call
+    makes one cheap metadata request; if the sheet is unchanged since the last
+    fetch, the cached drafts are returned without reading the sheet values or
+    rebuilding the DataFrame.
     """
     logger.info(f"Fetching drafts for job {job.job_number}")
 
@@ -177,84 +193,107 @@ def _fetch_drafts(job: Job):
             raise RuntimeError(f"Job {job.job_number} has no linked quote sheet")
 
         quote_sheet = job.quote_sheet
-        sheet_id = quote_sheet.sheet_id
+        sheet_id = str(quote_sheet.sheet_id)
         tab = quote_sheet.tab or "Primary Details"
 
+        revision = get_file_revision(sheet_id)
+        cache_key = _sheet_snapshot_cache_key(sheet_id, tab)
+        snapshot = cache.get(cache_key)
+        if snapshot and snapshot["revision"] == revision:
+            logger.info(
+                f"Sheet {sheet_id} unchanged since last fetch (revision {revision}), "
+                "using cached drafts"
+            )
+            # Callers may mutate the drafts, so hand out a copy
+            return copy.deepcopy(snapshot["drafts"])
+
         # Download sheet data as DataFrame
         logger.info(f"About to fetch sheet data for job {job.job_number}")
-        df = fetch_sheet_df(str(sheet_id), tab)
+        df = fetch_sheet_dfs(sheet_id, [tab])[tab]
+        draft_lines = _drafts_from_df(df)
 
-        logger.info(f"Received DataFrame with shape: {df.shape}")
-        logger.info(f"DataFrame columns: {list(df.columns)}")
+        cache.set(
+            cache_key,
+            {"revision": revision, "drafts": draft_lines},
+            timeout=SHEET_SNAPSHOT_CACHE_TIMEOUT,
+        )
+        return copy.deepcopy(draft_lines)
 
-        if df.empty:
-            logger.warning(f"Empty data from sheet {sheet_id}")
-            return []
+    except Exception as e:
+        logger.error(f"Error fetching drafts for job {job.job_number}: {str(e)}")
+        raise RuntimeError(f"Failed to fetch drafts: {str(e)}") from e
+
+
+def _drafts_from_df(df: pd.DataFrame):
+    """
+    Parse a quote sheet DataFrame into DraftLine[].
+    WARNING: THIS CODE WAS WRITTEN BY AI
+    """
+    logger.info(f"Received DataFrame with shape: {df.shape}")
+    logger.info(f"DataFrame columns: {list(df.columns)}")
 
-        # Log sample of data
-        logger.info("Sample DataFrame data (first 3 rows):")
-        for i, row in df.head(3).iterrows():
-            logger.info(f"    Row {i}: {row.to_dict()}")
+    if df.empty:
+        logger.warning("Empty data from sheet")
+        return []
 
-        # Process DataFrame directly to create DraftLine objects
-        logger.info("Processing DataFrame to create draft lines...")
+    # Log sample of data
+    logger.info("Sample DataFrame data (first 3 rows):")
+    for i, row in df.head(3).iterrows():
+        logger.info(f"    Row {i}: {row.to_dict()}")
 
-        # Import DraftLine here to avoid circular imports
-        from apps.job.importers.draft import DraftLine, Kind
+    # Process DataFrame directly to create DraftLine objects
+    logger.info("Processing DataFrame to create draft lines...")
 
-        draft_lines = []
+    # Import DraftLine here to avoid circular imports
+    from apps.job.importers.draft import DraftLine
 
-        # Process each row in the DataFrame
-        for idx, row in df.iterrows():
-            try:
-                # Skip rows that don't have required data
-                if pd.isna(row.get("desc", "")) or row.get("desc", "").strip() == "":
-                    continue
+    draft_lines = []
 
-                # Extract values from row (adjust column names as needed)
-                desc = str(row.get("desc", "")).strip()
-                quantity = (
-                    float(row.get("quantity", 0))
-                    if pd.notna(row.get("quantity"))
-                    else 0
-                )
-                unit_cost = (
-                    float(row.get("unit_cost", 0))
-                    if pd.notna(row.get("unit_cost"))
-                    else 0
-                )
+    # Process each row in the DataFrame
+    for idx, row in df.iterrows():
+        try:
+            # Skip rows that don't have required data
+            if pd.isna(row.get("desc", "")) or row.get("desc", "").strip() == "":
+                continue
 
-                # Determine kind (labor vs material) - adjust logic as needed
-                kind_str = str(row.get("kind", "")).strip().lower()
-                if kind_str in ["labor", "labour"]:
-                    kind = Kind.LABOR
-                else:
-                    kind = Kind.MATERIAL
+            # Extract values from row (adjust column names as needed)
+            desc = str(row.get("desc", "")).strip()
+            quantity = (
+                Decimal(str(row.get("quantity") or 0))
+                if pd.notna(row.get("quantity"))
+                else Decimal("0")
+            )
+            unit_cost = (
+                Decimal(str(row.get("unit_cost") or 0))
+                if pd.notna(row.get("unit_cost"))
+                else Decimal("0")
+            )
 
-                # Create DraftLine
-                draft_line = DraftLine(
-                    kind=kind, desc=desc, quantity=quantity, unit_cost=unit_cost
-                )
+            # Determine kind (labor vs material) - adjust logic as needed
+            kind_str = str(row.get("kind", "")).strip().lower()
+            if kind_str in ["labor", "labour", "time"]:
+                kind = "time"
+            else:
+                kind = "material"
 
-                draft_lines.append(draft_line)
+            # Create DraftLine
+            draft_line = DraftLine(
+                kind=kind, desc=desc, quantity=quantity, unit_cost=unit_cost
+            )
 
-            except (ValueError, TypeError) as e:
-                logger.warning(f"⚠️ Skipping invalid row {idx}: {e}")
-                continue
+            draft_lines.append(draft_line)
 
-        logger.info(
-            f"✅ Created {len(draft_lines)} draft lines from Google Sheets data"
-        )
+        except (ValueError, TypeError, InvalidOperation) as e:
+            logger.warning(f"⚠️ Skipping invalid row {idx}: {e}")
+            continue
 
-        # Log sample of parsed lines
-        for i, line in enumerate(draft_lines[:3]):
-            logger.info(f"    Draft line {i}: {line}")
+    logger.info(f"✅ Created {len(draft_lines)} draft lines from Google Sheets data")
 
-        return draft_lines
+    # Log sample of parsed lines
+    for i, line in enumerate(draft_lines[:3]):
+        logger.info(f"    Draft line {i}: {line}")
 
-    except Exception as e:
-        logger.error(f"Error fetching drafts for job {job.job_number}: {str(e)}")
-        raise RuntimeError(f"Failed to fetch drafts: {str(e)}") from e
+    return draft_lines
 
 
 def preview_quote(job: Job):
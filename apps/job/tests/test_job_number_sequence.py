@@ -0,0 +1,102 @@
+import threading
+
+from django.db import connection
+from django.test import skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.client.models import Client
+from apps.job.models import Job, JobNumberSequence
+from apps.testing import BaseTestCase, BaseTransactionTestCase
+from apps.workflow.models import CompanyDefaults, XeroPayItem
+
+
+def create_ordinary_time():
+    XeroPayItem.objects.get_or_create(
+        name="Ordinary Time",
+        uses_leave_api=False,
+        defaults={"xero_id": "ordinary", "xero_tenant_id": "t", "multiplier": 1},
+    )
+
+
+class JobNumberSequenceTests(BaseTestCase):
+    def setUp(self):
+        create_ordinary_time()
+        self.client_record = Client.objects.create(
+            name="Sequence Client", xero_last_modified=timezone.now()
+        )
+
+    def _job(self, name="Bracket"):
+        return Job.objects.create(client=self.client_record, name=name)
+
+    def test_missing_sequence_starts_after_the_highest_job(self):
+        job = self._job()
+        Job.objects.filter(pk=job.pk).update(job_number=500)
+        JobNumberSequence.objects.all().delete()
+
+        self.assertEqual(self._job("Gate").job_number, 501)
+        self.assertEqual(self._job("Fence").job_number, 502)
+
+    def test_starting_job_number_moves_the_sequence_forward(self):
+        first = self._job()
+        defaults = CompanyDefaults.get_instance()
+        defaults.starting_job_number = first.job_number + 1000
+        defaults.save()
+
+        self.assertEqual(self._job("Gate").job_number, first.job_number + 1000)
+
+    def test_allocation_does_not_scan_the_job_table(self):
+        self._job()
+
+        with CaptureQueriesContext(connection) as ctx:
+            JobNumberSequence.allocate()
+
+        job_table = connection.ops.quote_name("workflow_job")
+        self.assertFalse([q for q in ctx.captured_queries if job_table in q["sql"]])
+
+    def test_reseed_picks_up_jobs_loaded_without_save(self):
+        job = self._job()
+        Job.objects.filter(pk=job.pk).update(job_number=9000)
+
+        self.assertEqual(JobNumberSequence.reseed(), 9001)
+        self.assertEqual(self._job("Gate").job_number, 9001)
+
+
+# Needs row locks and concurrent writers; SQLite serialises the whole database
+@skipUnlessDBFeature("has_select_for_update")
+class JobNumberConcurrencyTests(BaseTransactionTestCase):
+    THREADS = 8
+    JOBS_PER_THREAD = 25
+
+    def test_parallel_job_creation_gets_unique_numbers(self):
+        create_ordinary_time()
+        client = Client.objects.create(
+            name="Busy Client", xero_last_modified=timezone.now()
+        )
+        CompanyDefaults.get_cached()
+        start = threading.Barrier(self.THREADS)
+        errors = []
+
+        def create_jobs(thread_number):
+            try:
+                start.wait()
+                for n in range(self.JOBS_PER_THREAD):
+                    Job.objects.create(client=client, name=f"Job {thread_number}-{n}")
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=create_jobs, args=(i,)) for i in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        numbers = list(Job.objects.values_list("job_number", flat=True))
+        self.assertEqual(len(numbers), self.THREADS * self.JOBS_PER_THREAD)
+        self.assertEqual(len(set(numbers)), len(numbers))
+        self.assertEqual(JobNumberSequence.objects.get().next_number, max(numbers) + 1)
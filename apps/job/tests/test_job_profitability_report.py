@@ -0,0 +1,170 @@
+"""Tests for the SQL-backed job profitability report."""
+
+import csv
+import io
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounting.enums import InvoiceStatus
+from apps.accounting.models import Invoice
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import Job
+from apps.job.services.job_profitability_report import JobProfitabilityReportService
+from apps.testing import BaseTestCase
+
+START = date(2026, 3, 1)
+END = date(2026, 3, 31)
+
+
+class TestJobProfitabilityReport(BaseTestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(
+            name="Profit Client", xero_last_modified=timezone.now()
+        )
+        completed = datetime(2026, 3, 10, 12, tzinfo=dt_timezone.utc)
+        self.tm_job = self._job(
+            "T&M", "time_materials", completed, actual=(400, 600), estimate=(300, 500)
+        )
+        self.fp_job = self._job(
+            "Fixed", "fixed_price", completed, actual=(900, 0), quote=(800, 1000)
+        )
+        self.invoiced_job = self._job(
+            "Invoiced",
+            "time_materials",
+            completed - timedelta(days=1),
+            actual=(100, 150),
+        )
+        Invoice.objects.create(
+            client=self.client_obj,
+            job=self.invoiced_job,
+            xero_id=uuid.uuid4(),
+            number="INV-PROFIT",
+            status=InvoiceStatus.AUTHORISED,
+            total_excl_tax=Decimal("250.00"),
+            tax=Decimal("0.00"),
+            total_incl_tax=Decimal("250.00"),
+            amount_due=Decimal("0.00"),
+            date=START,
+            xero_last_modified=timezone.now(),
+            raw_json={},
+        )
+        # Outside the date range
+        self._job(
+            "Old",
+            "time_materials",
+            datetime(2026, 1, 5, tzinfo=dt_timezone.utc),
+            actual=(1, 2),
+        )
+
+    def _job(self, name, pricing, completed_at, actual, estimate=None, quote=None):
+        job = Job.objects.create(
+            client=self.client_obj,
+            name=name,
+            description=name,
+            pricing_methodology=pricing,
+        )
+        for cost_set, values in (
+            (job.latest_actual, actual),
+            (job.latest_estimate, estimate),
+            (job.latest_quote, quote),
+        ):
+            if values:
+                cost, rev = values
+                cost_set.summary = {"cost": cost, "rev": rev, "hours": 1.5}
+                cost_set.save()
+        Job.objects.filter(pk=job.pk).update(
+            status="recently_completed", completed_at=completed_at
+        )
+        return job
+
+    def _report(self, **kwargs):
+        return JobProfitabilityReportService(START, END, **kwargs)
+
+    def test_rows_and_summary_match_revenue_rules(self):
+        report = self._report().generate_report()
+
+        rows = {row["job_name"]: row for row in report["jobs"]}
+        self.assertEqual(set(rows), {"T&M", "Fixed", "Invoiced"})
+        # Invoices override, then quote revenue for FP, actual revenue for T&M
+        self.assertEqual(rows["Invoiced"]["revenue"], "250.00")
+        self.assertEqual(rows["Fixed"]["revenue"], "1000.00")
+        self.assertEqual(rows["T&M"]["revenue"], "600.00")
+        self.assertEqual(rows["T&M"]["actual"]["margin"], "33.33")
+        self.assertEqual(rows["Fixed"]["profit_variance"], "-100.00")
+        self.assertEqual(rows["T&M"]["profit_variance_pct"], "0.00")
+
+        summary = report["summary"]
+        self.assertEqual(summary["total_jobs"], 3)
+        self.assertEqual(summary["total_revenue"], "1850.00")
+        self.assertEqual(summary["total_cost"], "1400.00")
+        self.assertEqual(summary["total_baseline_profit"], "400.00")
+        self.assertEqual(summary["tm_jobs"], 2)
+        self.assertEqual(summary["fp_jobs"], 1)
+        self.assertEqual(summary["profitable_jobs"], 3)
+        self.assertIsNone(report["next_cursor"])
+
+    def test_value_filter_applies_to_invoiced_revenue(self):
+        report = self._report(min_value=Decimal("200"), max_value=Decimal("700"))
+
+        names = {row["job_name"] for row in report.generate_report()["jobs"]}
+
+        self.assertEqual(names, {"T&M", "Invoiced"})
+
+    def test_keyset_pages_cover_every_row_once(self):
+        service = self._report()
+        first = service.generate_report(limit=2)
+        second = service.generate_report(limit=2, cursor=first["next_cursor"])
+
+        self.assertEqual(len(first["jobs"]), 2)
+        self.assertIsNotNone(first["next_cursor"])
+        self.assertEqual([row["job_name"] for row in second["jobs"]], ["Invoiced"])
+        self.assertIsNone(second["next_cursor"])
+        self.assertEqual(second["summary"]["total_jobs"], 3)
+
+    def test_query_count_does_not_grow_with_jobs(self):
+        with CaptureQueriesContext(connection) as baseline:
+            self._report().generate_report()
+        for i in range(5):
+            self._job(
+                f"Extra {i}",
+                "time_materials",
+                datetime(2026, 3, 20, tzinfo=dt_timezone.utc),
+                actual=(10, 20),
+            )
+
+        with CaptureQueriesContext(connection) as grown:
+            report = self._report().generate_report()
+
+        self.assertEqual(report["summary"]["total_jobs"], 8)
+        self.assertEqual(len(grown), len(baseline))
+
+    def test_csv_export_streams_every_row(self):
+        staff = Staff.objects.create_user(
+            email="reports@example.com",
+            password="x",
+            first_name="Report",
+            last_name="User",
+            is_office_staff=True,
+        )
+        api = APIClient()
+        api.force_authenticate(staff)
+
+        response = api.get(
+            reverse("jobs:job_profitability_report_export"),
+            {"start_date": START, "end_date": END},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0][0], "Job Number")
+        self.assertEqual(len(rows), 4)
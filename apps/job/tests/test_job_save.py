@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import Job, JobEvent
+from apps.testing import BaseTestCase
+from apps.workflow.models import XeroPayItem
+
+
+def _job_sql(template):
+    """Fill the Job table name into SQL, quoted the way the backend quotes it."""
+    quote = connection.ops.quote_name
+    return template.format(table=quote("workflow_job"), id=quote("id"))
+
+
+class JobSaveQueryTests(BaseTestCase):
+    def setUp(self):
+        XeroPayItem.objects.get_or_create(
+            name="Ordinary Time",
+            uses_leave_api=False,
+            defaults={"xero_id": "ordinary", "xero_tenant_id": "t", "multiplier": 1},
+        )
+        self.staff = Staff.objects.create_user(
+            email="estimator@example.com",
+            password="x",
+            first_name="Ed",
+            last_name="Estimator",
+        )
+        client = Client.objects.create(
+            name="Save Path Client", xero_last_modified=timezone.now()
+        )
+        self.job_id = Job.objects.create(
+            client=client, name="Gate", created_by=self.staff
+        ).id
+        self.job = Job.objects.get(pk=self.job_id)
+
+    def _save(self, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            self.job.save(**kwargs)
+        return [q["sql"] for q in ctx.captured_queries]
+
+    @staticmethod
+    def _job_reads(queries):
+        return [
+            q
+            for q in queries
+            if q.startswith(_job_sql("SELECT {table}"))
+            and _job_sql("WHERE {table}.{id}") in q
+        ]
+
+    def test_denormalised_field_save_is_a_single_update(self):
+        queries = self._save(update_fields=["updated_at"])
+
+        job_writes = [q for q in queries if q.startswith(_job_sql("UPDATE {table}"))]
+        self.assertEqual(len(job_writes), 1)
+        self.assertFalse([q for q in queries if q.startswith("SELECT")])
+
+    def test_tracked_change_is_detected_without_reloading_the_job(self):
+        self.job.name = "Gate and fence"
+        queries = self._save(staff=self.staff)
+
+        self.assertEqual(self._job_reads(queries), [])
+        self.assertFalse([q for q in queries if "workflow_companydefaults" in q])
+        self.assertEqual(
+            len([q for q in queries if q.startswith(_job_sql("UPDATE {table}"))]), 1
+        )
+        event = JobEvent.objects.get(job=self.job, event_type="job_updated")
+        self.assertIn("'Gate' to 'Gate and fence'", event.description)
+
+    def test_saved_values_become_the_new_baseline(self):
+        self.job.name = "Gate and fence"
+        self.job.save(staff=self.staff)
+        self.job.save(staff=self.staff)
+
+        self.job.refresh_from_db()
+        self.job.notes = "Galvanise after welding"
+        self.job.save(staff=self.staff)
+
+        self.assertEqual(
+            JobEvent.objects.filter(job=self.job, event_type="job_updated").count(), 1
+        )
+        self.assertEqual(
+            JobEvent.objects.filter(job=self.job, event_type="notes_updated").count(),
+            1,
+        )
+
+    def test_deferred_fields_are_read_once_for_change_detection(self):
+        self.job = Job.objects.defer("status").get(pk=self.job_id)
+        self.job.status = "approved"
+
+        queries = self._save(update_fields=["status"], staff=self.staff)
+
+        self.assertEqual(len(self._job_reads(queries)), 1)
+        self.assertTrue(
+            JobEvent.objects.filter(job=self.job, event_type="status_changed").exists()
+        )
@@ -0,0 +1,156 @@
+"""Tests for set-based month-end rollover in MonthEndService."""
+
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import CostSet, Job, MonthEndRun, MonthEndRunJob
+from apps.job.services.month_end_service import MonthEndService
+from apps.testing import BaseAPITestCase, BaseTestCase
+
+PERIOD = date(2026, 3, 1)
+
+
+class TestMonthEndProcessJobs(BaseTestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(
+            name="Month End Client",
+            xero_last_modified=timezone.now(),
+        )
+        self.jobs = [
+            Job.objects.create(
+                client=self.client_obj, name=f"Special {i}", status="special"
+            )
+            for i in range(3)
+        ]
+        for job in self.jobs:
+            job.latest_actual.summary = {"cost": 100, "rev": 150, "hours": 2}
+            job.latest_actual.save()
+
+    def test_rolls_over_every_job(self):
+        processed, skipped, errors = MonthEndService.process_jobs(
+            [str(job.id) for job in self.jobs], period=PERIOD
+        )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(processed), 3)
+        self.assertEqual(skipped, [])
+        for job in self.jobs:
+            job.refresh_from_db()
+            self.assertEqual(job.latest_actual.rev, 2)
+            self.assertEqual(job.latest_actual.summary["cost"], 0)
+            self.assertEqual(CostSet.objects.filter(job=job, kind="actual").count(), 2)
+
+    def test_run_records_before_and_after_totals(self):
+        MonthEndService.process_jobs([str(job.id) for job in self.jobs], period=PERIOD)
+
+        run = MonthEndRun.objects.get()
+        self.assertEqual(run.period, PERIOD)
+        self.assertEqual(run.processed_job_count, 3)
+        self.assertEqual(run.before_totals, {"cost": 300.0, "rev": 450.0, "hours": 6.0})
+        self.assertEqual(run.after_totals, {"cost": 0.0, "rev": 0.0, "hours": 0.0})
+        rollover = run.jobs.get(job=self.jobs[0])
+        self.assertEqual(rollover.before_summary["hours"], 2)
+        self.assertEqual(rollover.closed_cost_set.rev, 1)
+        self.assertEqual(rollover.new_cost_set.rev, 2)
+
+    def test_rerun_for_same_period_is_idempotent(self):
+        job_ids = [str(job.id) for job in self.jobs]
+        MonthEndService.process_jobs(job_ids, period=PERIOD)
+
+        MonthEndService.process_jobs(job_ids[1:], period=date(2026, 4, 1))
+        processed, skipped, errors = MonthEndService.process_jobs(
+            job_ids, period=PERIOD
+        )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(processed, [])
+        self.assertEqual(len(skipped), 3)
+        self.assertEqual(MonthEndRunJob.objects.filter(period=PERIOD).count(), 3)
+        second_run = MonthEndRun.objects.order_by("-created_at").first()
+        self.assertEqual(second_run.skipped_job_count, 3)
+        self.jobs[0].refresh_from_db()
+        self.assertEqual(self.jobs[0].latest_actual.rev, 2)
+
+    def test_only_jobs_not_yet_closed_for_the_period_are_processed(self):
+        MonthEndService.process_jobs([str(self.jobs[0].id)], period=PERIOD)
+
+        processed, skipped, _ = MonthEndService.process_jobs(
+            [str(job.id) for job in self.jobs], period=PERIOD
+        )
+
+        self.assertEqual(skipped, [self.jobs[0]])
+        self.assertEqual(set(processed), set(self.jobs[1:]))
+
+    def test_unknown_and_invalid_ids_are_reported(self):
+        missing = "00000000-0000-0000-0000-000000000000"
+        processed, _, errors = MonthEndService.process_jobs(
+            [str(self.jobs[0].id), missing, "not-a-uuid"], period=PERIOD
+        )
+
+        self.assertEqual([job.id for job in processed], [self.jobs[0].id])
+        self.assertEqual({job_id for job_id, _ in errors}, {missing, "not-a-uuid"})
+
+    def test_query_count_does_not_grow_with_jobs(self):
+        extra = [
+            Job.objects.create(
+                client=self.client_obj, name=f"Extra {i}", status="special"
+            )
+            for i in range(5)
+        ]
+
+        with CaptureQueriesContext(connection) as few:
+            MonthEndService.process_jobs(
+                [str(job.id) for job in self.jobs], period=PERIOD
+            )
+        with CaptureQueriesContext(connection) as many:
+            MonthEndService.process_jobs([str(job.id) for job in extra], period=PERIOD)
+
+        self.assertEqual(len(few), len(many))
+
+
+class TestMonthEndPeriod(BaseAPITestCase):
+    def test_default_period_closes_previous_month_early_in_the_month(self):
+        self.assertEqual(
+            MonthEndService.default_period(date(2026, 1, 3)), date(2025, 12, 1)
+        )
+        self.assertEqual(
+            MonthEndService.default_period(date(2026, 3, 20)), date(2026, 3, 1)
+        )
+
+    def test_post_closes_the_requested_period(self):
+        office = Staff.objects.create_user(
+            email="office@example.com",
+            password="x",
+            first_name="Olive",
+            last_name="Office",
+            is_office_staff=True,
+        )
+        self.client.force_authenticate(office)
+        job = Job.objects.create(
+            client=Client.objects.create(
+                name="Month End Client", xero_last_modified=timezone.now()
+            ),
+            name="Special",
+            status="special",
+        )
+        url = reverse("jobs:month_end_rest")
+
+        first = self.client.post(
+            url, {"job_ids": [str(job.id)], "period": "2026-02-27"}, format="json"
+        )
+        again = self.client.post(
+            url, {"job_ids": [str(job.id)], "period": "2026-02-01"}, format="json"
+        )
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data["processed"], [str(job.id)])
+        self.assertEqual(first.data["period"], "2026-02-01")
+        self.assertEqual(again.data["processed"], [])
+        self.assertEqual(again.data["skipped"], [str(job.id)])
+        self.assertEqual(MonthEndRunJob.objects.get().period, date(2026, 2, 1))
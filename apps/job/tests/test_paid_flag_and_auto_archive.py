@@ -0,0 +1,165 @@
+"""Tests for the set-based paid flag and auto-archive passes."""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounting.enums import InvoiceStatus
+from apps.accounting.models import Invoice
+from apps.client.models import Client
+from apps.job.models import Job, JobEvent
+from apps.job.services.auto_archive_service import AutoArchiveService
+from apps.job.services.paid_flag_service import PaidFlagService
+from apps.testing import BaseTestCase
+from apps.workflow.models import XeroPayItem
+
+
+class PaidFlagTestMixin:
+    def setUp(self):
+        XeroPayItem.objects.get_or_create(
+            name="Ordinary Time",
+            uses_leave_api=False,
+            defaults={"xero_id": "ordinary", "xero_tenant_id": "t", "multiplier": 1},
+        )
+        self.client_obj = Client.objects.create(
+            name="Paid Client", xero_last_modified=timezone.now()
+        )
+
+    def _job(self, name, **fields):
+        job = Job.objects.create(client=self.client_obj, name=name)
+        fields.setdefault("status", "recently_completed")
+        fields.setdefault("completed_at", timezone.now() - timedelta(days=10))
+        Job.objects.filter(pk=job.pk).update(**fields)
+        job.refresh_from_db()
+        return job
+
+    def _invoice(self, job, amount_due):
+        return Invoice.objects.create(
+            client=self.client_obj,
+            job=job,
+            xero_id=uuid.uuid4(),
+            number=f"INV-{uuid.uuid4().hex[:8]}",
+            status=InvoiceStatus.AUTHORISED,
+            total_excl_tax=Decimal("100.00"),
+            tax=Decimal("15.00"),
+            total_incl_tax=Decimal("115.00"),
+            amount_due=amount_due,
+            date=date(2026, 3, 1),
+            xero_last_modified=timezone.now(),
+            raw_json={},
+        )
+
+
+class TestPaidFlagService(PaidFlagTestMixin, BaseTestCase):
+    def test_only_jobs_with_all_invoices_paid_are_flagged(self):
+        paid = self._job("All paid")
+        self._invoice(paid, Decimal("0.00"))
+        partly = self._job("Partly paid")
+        self._invoice(partly, Decimal("0.00"))
+        self._invoice(partly, Decimal("50.00"))
+        outstanding = self._job("Fully outstanding")
+        self._invoice(outstanding, Decimal("115.00"))
+        self._job("No invoices")
+
+        result = PaidFlagService.update_paid_flags()
+
+        self.assertEqual(result.jobs_updated, 1)
+        self.assertEqual(result.unpaid_invoices, 2)
+        self.assertEqual(result.missing_invoices, 1)
+        paid.refresh_from_db()
+        partly.refresh_from_db()
+        outstanding.refresh_from_db()
+        self.assertTrue(paid.paid)
+        self.assertFalse(partly.paid)
+        self.assertFalse(outstanding.paid)
+        self.assertEqual(
+            JobEvent.objects.filter(job=paid, event_type="payment_received").count(),
+            1,
+        )
+        self.assertEqual(paid.history.first().paid, True)
+
+    def test_dry_run_reports_diff_without_changes(self):
+        job = self._job("All paid")
+        self._invoice(job, Decimal("0.00"))
+
+        result = PaidFlagService.update_paid_flags(dry_run=True)
+
+        self.assertEqual(
+            [(c["job_number"], c["old"], c["new"]) for c in result.changes],
+            [(job.job_number, False, True)],
+        )
+        job.refresh_from_db()
+        self.assertFalse(job.paid)
+        self.assertFalse(JobEvent.objects.filter(job=job).exists())
+
+    def test_query_count_is_constant(self):
+        job = self._job("Paid 0")
+        self._invoice(job, Decimal("0.00"))
+        with CaptureQueriesContext(connection) as small:
+            PaidFlagService.update_paid_flags()
+
+        for i in range(1, 6):
+            job = self._job(f"Paid {i}")
+            self._invoice(job, Decimal("0.00"))
+        with CaptureQueriesContext(connection) as large:
+            result = PaidFlagService.update_paid_flags()
+
+        self.assertEqual(result.jobs_updated, 5)
+        self.assertEqual(len(large), len(small))
+
+
+class TestAutoArchiveService(PaidFlagTestMixin, BaseTestCase):
+    def test_archives_old_paid_or_rejected_jobs(self):
+        paid = self._job("Paid", paid=True)
+        rejected = self._job("Rejected", paid=True, rejected_flag=True)
+        recent = self._job("Recent", paid=True, completed_at=timezone.now())
+        unpaid = self._job("Unpaid")
+
+        result = AutoArchiveService.auto_archive_completed_jobs()
+
+        self.assertEqual(result.jobs_archived, 2)
+        statuses = dict(
+            Job.objects.filter(
+                pk__in=[paid.pk, rejected.pk, recent.pk, unpaid.pk]
+            ).values_list("name", "status")
+        )
+        self.assertEqual(
+            statuses,
+            {
+                "Paid": "archived",
+                "Rejected": "archived",
+                "Recent": "recently_completed",
+                "Unpaid": "recently_completed",
+            },
+        )
+        event = JobEvent.objects.get(job=rejected, event_type="status_changed")
+        self.assertIn("rejected", event.description)
+
+    def test_dry_run_reports_diff_without_changes(self):
+        job = self._job("Paid", paid=True)
+
+        result = AutoArchiveService.auto_archive_completed_jobs(dry_run=True)
+
+        self.assertEqual(
+            [(c["old"], c["new"], c["reason"]) for c in result.changes],
+            [("recently_completed", "archived", "paid")],
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, "recently_completed")
+
+    def test_query_count_is_constant(self):
+        self._job("Paid 0", paid=True)
+        with CaptureQueriesContext(connection) as small:
+            AutoArchiveService.auto_archive_completed_jobs()
+
+        for i in range(1, 6):
+            self._job(f"Paid {i}", paid=True)
+        with CaptureQueriesContext(connection) as large:
+            result = AutoArchiveService.auto_archive_completed_jobs()
+
+        self.assertEqual(result.jobs_archived, 5)
+        self.assertEqual(len(large), len(small))
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from django.core.cache import cache
+
+from apps.job.services import quote_sync_service
+
+SHEET_DF = pd.DataFrame(
+    [
+        ["Cut sheet", "2", "15.50", "material"],
+        ["Fold", "1.5", "0", "labour"],
+        ["", "", "", ""],
+    ],
+    columns=["desc", "quantity", "unit_cost", "kind"],
+)
+
+
+@pytest.fixture
+def job():
+    cache.clear()
+    quote_sheet = SimpleNamespace(sheet_id="sheet-123", tab="Primary Details")
+    yield SimpleNamespace(job_number=95001, quote_sheet=quote_sheet)
+    cache.clear()
+
+
+def test_unchanged_sheet_is_served_from_cache(job):
+    with (
+        patch.object(
+            quote_sync_service, "get_file_revision", return_value="7:2026-01-01"
+        ),
+        patch.object(
+            quote_sync_service,
+            "fetch_sheet_dfs",
+            return_value={"Primary Details": SHEET_DF},
+        ) as fetch,
+    ):
+        first = quote_sync_service._fetch_drafts(job)
+        second = quote_sync_service._fetch_drafts(job)
+
+    assert fetch.call_count == 1
+    assert first == second
+    assert [line.kind for line in first] == ["material", "time"]
+    assert first[0].quantity == Decimal("2")
+    assert first[0].unit_cost == Decimal("15.50")
+
+
+def test_changed_revision_refetches_sheet(job):
+    with (
+        patch.object(
+            quote_sync_service,
+            "get_file_revision",
+            side_effect=["7:2026-01-01", "8:2026-01-02"],
+        ),
+        patch.object(
+            quote_sync_service,
+            "fetch_sheet_dfs",
+            return_value={"Primary Details": SHEET_DF},
+        ) as fetch,
+    ):
+        quote_sync_service._fetch_drafts(job)
+        quote_sync_service._fetch_drafts(job)
+
+    assert fetch.call_count == 2
+
+
+def test_cached_drafts_are_not_shared_between_callers(job):
+    with (
+        patch.object(
+            quote_sync_service, "get_file_revision", return_value="7:2026-01-01"
+        ),
+        patch.object(
+            quote_sync_service,
+            "fetch_sheet_dfs",
+            return_value={"Primary Details": SHEET_DF},
+        ),
+    ):
+        first = quote_sync_service._fetch_drafts(job)
+        first[0].desc = "mutated"
+        second = quote_sync_service._fetch_drafts(job)
+
+    assert second[0].desc == "Cut sheet"
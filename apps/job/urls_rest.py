@@ -13,7 +13,10 @@ from apps.job.views.job_costline_views import (
 from apps.job.views.job_file_detail_view import JobFileDetailView
 from apps.job.views.job_file_thumbnail_view import JobFileThumbnailView
 from apps.job.views.job_files_collection_view import JobFilesCollectionView
-from apps.job.views.job_profitability_report_views import JobProfitabilityReportView
+from apps.job.views.job_profitability_report_views import (
+    JobProfitabilityReportExportView,
+    JobProfitabilityReportView,
+)
 from apps.job.views.job_quote_chat_api import JobQuoteChatInteractionView
 from apps.job.views.job_quote_chat_views import (
     JobQuoteChatHistoryView,
@@ -278,6 +281,11 @@ rest_urlpatterns = [
         JobProfitabilityReportView.as_view(),
         name="job_profitability_report",
     ),
+    path(
+        "rest/reports/job-profitability/export/",
+        JobProfitabilityReportExportView.as_view(),
+        name="job_profitability_report_export",
+    ),
     # Data Quality Reports
     path(
         "rest/data-quality/archived-jobs-compliance/",
@@ -18,7 +18,10 @@ from .job_costline_views import (
 from .job_file_detail_view import BinaryFileRenderer, JobFileDetailView
 from .job_file_thumbnail_view import JobFileThumbnailView
 from .job_files_collection_view import JobFilesCollectionView
-from .job_profitability_report_views import JobProfitabilityReportView
+from .job_profitability_report_views import (
+    JobProfitabilityReportExportView,
+    JobProfitabilityReportView,
+)
 from .job_quote_chat_views import (
     BaseJobQuoteChatView,
     JobQuoteChatHistoryView,
@@ -117,6 +120,7 @@ __all__ = [
     "JobFilesCollectionView",
     "JobHeaderRestView",
     "JobInvoicesRestView",
+    "JobProfitabilityReportExportView",
     "JobProfitabilityReportView",
     "JobQuoteAcceptRestView",
     "JobQuoteChatHistoryView",
@@ -1,8 +1,12 @@
 """Views for job profitability reporting."""
 
+import csv
 import logging
+import tempfile
 
+from django.http import FileResponse, StreamingHttpResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from openpyxl import Workbook
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -10,6 +14,7 @@ from rest_framework.views import APIView
 
 from apps.job.permissions import IsOfficeStaff
 from apps.job.serializers.job_profitability_report_serializers import (
+    JobProfitabilityExportQuerySerializer,
     JobProfitabilityQuerySerializer,
     JobProfitabilityReportResponseSerializer,
 )
@@ -35,6 +40,8 @@ class JobProfitabilityReportView(APIView):
             OpenApiParameter(name="min_value", type=str, required=False),
             OpenApiParameter(name="max_value", type=str, required=False),
             OpenApiParameter(name="pricing_type", type=str, required=False),
+            OpenApiParameter(name="limit", type=int, required=False),
+            OpenApiParameter(name="cursor", type=str, required=False),
         ],
         responses={
             200: JobProfitabilityReportResponseSerializer,
@@ -59,12 +66,16 @@ class JobProfitabilityReportView(APIView):
                 max_value=params.get("max_value"),
                 pricing_type=params.get("pricing_type"),
             )
-            result = service.generate_report()
+            result = service.generate_report(
+                limit=params.get("limit"), cursor=params.get("cursor")
+            )
 
             response_serializer = JobProfitabilityReportResponseSerializer(data=result)
             response_serializer.is_valid(raise_exception=True)
 
             return Response(response_serializer.data, status=status.HTTP_200_OK)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as exc:
             logger.error(
                 f"Error generating job profitability report: {exc}", exc_info=True
@@ -83,3 +94,119 @@ class JobProfitabilityReportView(APIView):
                     },
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
+
+
+class _Echo:
+    """File-like object that hands each written CSV line straight back."""
+
+    def write(self, value):
+        return value
+
+
+class JobProfitabilityReportExportView(APIView):
+    """Export the full job profitability report as CSV or Excel."""
+
+    permission_classes = [IsAuthenticated, IsOfficeStaff]
+
+    @extend_schema(
+        operation_id="job_profitability_report_export",
+        summary="Export job profitability report",
+        description=(
+            "Streams every matching job as CSV, or returns an Excel workbook. "
+            "Accepts the same filters as the report."
+        ),
+        parameters=[
+            OpenApiParameter(name="start_date", type=str, required=True),
+            OpenApiParameter(name="end_date", type=str, required=True),
+            OpenApiParameter(name="min_value", type=str, required=False),
+            OpenApiParameter(name="max_value", type=str, required=False),
+            OpenApiParameter(name="pricing_type", type=str, required=False),
+            OpenApiParameter(
+                name="file_format", type=str, required=False, enum=["csv", "xlsx"]
+            ),
+        ],
+        responses={
+            (200, "text/csv"): bytes,
+            (
+                200,
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            ): bytes,
+            400: dict,
+            500: dict,
+        },
+        tags=["Reports"],
+    )
+    def get(self, request):
+        """Export job profitability report."""
+        query_serializer = JobProfitabilityExportQuerySerializer(
+            data=request.query_params
+        )
+        if not query_serializer.is_valid():
+            return Response(query_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = query_serializer.validated_data
+        service = JobProfitabilityReportService(
+            start_date=params["start_date"],
+            end_date=params["end_date"],
+            min_value=params.get("min_value"),
+            max_value=params.get("max_value"),
+            pricing_type=params.get("pricing_type"),
+        )
+        filename = (
+            f"job-profitability-{params['start_date']:%Y%m%d}-"
+            f"{params['end_date']:%Y%m%d}.{params['file_format']}"
+        )
+
+        try:
+            if params["file_format"] == "xlsx":
+                return self._xlsx_response(service, filename)
+            return self._csv_response(service, filename)
+        except Exception as exc:
+            logger.error(
+                f"Error exporting job profitability report: {exc}", exc_info=True
+            )
+            try:
+                persist_and_raise(exc)
+            except AlreadyLoggedException as logged_exc:
+                return Response(
+                    {
+                        "error": f"Failed to export job profitability report: {str(exc)}",
+                        "error_id": (
+                            str(logged_exc.app_error_id)
+                            if logged_exc.app_error_id
+                            else None
+                        ),
+                    },
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+    @staticmethod
+    def _csv_response(service, filename):
+        writer = csv.writer(_Echo())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in service.iter_export_rows()),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def _xlsx_response(service, filename):
+        # xlsx is a zip archive and cannot be streamed, so rows are written
+        # in openpyxl's write-only mode to a temp file instead of held in memory
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Job Profitability")
+        for row in service.iter_export_rows():
+            sheet.append(row)
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type=(
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            ),
+        )
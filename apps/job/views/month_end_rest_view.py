@@ -106,11 +106,19 @@ class MonthEndRestView(APIView):
                 )
 
             job_ids = input_serializer.validated_data["job_ids"]
-            processed, errors = MonthEndService.process_jobs(job_ids)
+            period = (
+                input_serializer.validated_data.get("period")
+                or MonthEndService.default_period()
+            ).replace(day=1)
+            processed, skipped, errors = MonthEndService.process_jobs(
+                job_ids, staff=request.user, period=period
+            )
 
             response_data = {
                 "processed": [str(job.id) for job in processed],
+                "skipped": [str(job.id) for job in skipped],
                 "errors": errors,
+                "period": period,
             }
             response_serializer = MonthEndPostResponseSerializer(data=response_data)
             response_serializer.is_valid(raise_exception=True)
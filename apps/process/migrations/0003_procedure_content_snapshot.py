@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("process", "0002_formentry_staff_historicalformentry_staff_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="procedure",
+            name="content_checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the content snapshot was last validated against Google Drive",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="procedure",
+            name="content_revision",
+            field=models.CharField(
+                blank=True,
+                help_text="Google Drive revision the content snapshot was taken at",
+                max_length=100,
+            ),
+        ),
+        migrations.AddField(
+            model_name="procedure",
+            name="content_snapshot",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Parsed Google Doc content, cached for fast reads",
+            ),
+        ),
+    ]
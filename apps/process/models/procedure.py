@@ -15,7 +15,8 @@ class Procedure(models.Model):
     A written process document backed by Google Docs.
 
     Examples: SOPs, SWPs, JSAs, reference documents.
-    Content lives in Google Docs — this model stores metadata and the Doc reference.
+    Content lives in Google Docs — this model stores metadata, the Doc reference
+    and a parsed snapshot of the Doc content.
     """
 
     DOCUMENT_TYPES = [
@@ -82,11 +83,31 @@ class Procedure(models.Model):
         help_text="URL to edit the document in Google Docs",
     )
 
+    # Local snapshot of the parsed Google Doc, so reads don't wait on Google.
+    # Maintained by ProcedureContentService; excluded from history because it
+    # is derived from the Google Doc, which has its own revision history.
+    content_snapshot = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Parsed Google Doc content, cached for fast reads",
+    )
+    content_revision = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Google Drive revision the content snapshot was taken at",
+    )
+    content_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the content snapshot was last validated against Google Drive",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     history: HistoricalRecords = HistoricalRecords(
-        table_name="process_historicalprocedure"
+        table_name="process_historicalprocedure",
+        excluded_fields=["content_snapshot", "content_revision", "content_checked_at"],
     )
 
     class Meta:
@@ -11,6 +11,7 @@ try:
             GoogleDocsService,
             ProcessDocumentContent,
         )
+        from .procedure_content_service import ProcedureContentService
         from .procedure_service import ProcedureService
         from .safety_ai_service import SafetyAIService
 except (ImportError, RuntimeError):
@@ -21,6 +22,7 @@ __all__ = [
     "FormService",
     "GoogleDocResult",
     "GoogleDocsService",
+    "ProcedureContentService",
     "ProcedureService",
     "ProcessDocumentContent",
     "SafetyAIService",
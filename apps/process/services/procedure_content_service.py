@@ -0,0 +1,164 @@
+"""
+ProcedureContentService — Serves procedure content from a local snapshot.
+
+Reading a Google Doc means fetching the full document JSON and parsing it,
+which is too slow to do on every view. The parsed content is stored on the
+Procedure and:
+- served directly while it was validated recently;
+- revalidated against the Drive revision in the background once stale;
+- re-read as soon as the Google Doc is updated through the API;
+- still served when Google is slow or unavailable.
+
+Only a procedure that has never been read waits on Google.
+"""
+
+import logging
+import threading
+from dataclasses import asdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.job.importers.google_sheets import get_file_revision
+from apps.process.models import Procedure
+from apps.process.services.google_docs_service import (
+    GoogleDocsService,
+    ProcessDocumentContent,
+)
+from apps.workflow.services.error_persistence import persist_app_error
+
+logger = logging.getLogger(__name__)
+
+
+class ProcedureContentService:
+    """Read-through cache of Google Doc content for procedures."""
+
+    # How long a snapshot is served without checking the Drive revision
+    REVALIDATE_AFTER = timedelta(minutes=5)
+    # Guards against several requests refreshing the same procedure at once
+    REFRESH_LOCK_TIMEOUT = 120
+
+    def __init__(self, docs_service: GoogleDocsService | None = None):
+        self._docs_service = docs_service
+
+    @property
+    def docs_service(self) -> GoogleDocsService:
+        if self._docs_service is None:
+            self._docs_service = GoogleDocsService()
+        return self._docs_service
+
+    def get_content(self, procedure: Procedure) -> ProcessDocumentContent:
+        """
+        Return the procedure's content, preferring the local snapshot.
+
+        A stale snapshot is returned immediately and revalidated in the
+        background. Without a snapshot the Google Doc is read synchronously.
+
+        Raises:
+            RuntimeError: If there is no snapshot and Google cannot be read
+        """
+        if not procedure.content_snapshot:
+            return self.refresh(procedure)
+
+        if self._is_stale(procedure):
+            self.refresh_in_background(procedure.id)
+
+        return ProcessDocumentContent(**procedure.content_snapshot)
+
+    def refresh(self, procedure: Procedure) -> ProcessDocumentContent:
+        """
+        Revalidate the snapshot against Google Drive, re-reading if changed.
+
+        The Doc is only fetched and parsed when its Drive revision differs
+        from the snapshot's. If Google is unavailable the existing snapshot
+        is returned.
+
+        Raises:
+            RuntimeError: If there is no snapshot and Google cannot be read
+        """
+        try:
+            revision = get_file_revision(procedure.google_doc_id)
+            if procedure.content_snapshot and revision == procedure.content_revision:
+                self._mark_checked(procedure)
+                return ProcessDocumentContent(**procedure.content_snapshot)
+
+            content = self.docs_service.read_document(procedure.google_doc_id)
+        except RuntimeError:
+            if not procedure.content_snapshot:
+                raise
+            logger.warning(
+                f"Google Doc {procedure.google_doc_id} unavailable, "
+                f"serving stored content for procedure {procedure.id}"
+            )
+            return ProcessDocumentContent(**procedure.content_snapshot)
+
+        self._store_snapshot(procedure, content, revision)
+        return content
+
+    def refresh_after_update(self, procedure: Procedure) -> None:
+        """
+        Re-read the snapshot right after the Google Doc was written, so the
+        next read serves the new content. If the Doc cannot be read back, the
+        snapshot is marked unchecked and the next read revalidates it.
+        """
+        procedure.content_checked_at = None
+        Procedure.objects.filter(pk=procedure.pk).update(content_checked_at=None)
+        try:
+            self.refresh(procedure)
+        except RuntimeError:
+            logger.warning(
+                f"Could not re-read Google Doc {procedure.google_doc_id} "
+                f"after updating procedure {procedure.id}"
+            )
+
+    def refresh_in_background(self, procedure_id) -> None:
+        """Refresh a procedure's snapshot on a daemon thread."""
+        lock_key = f"procedure_content_refresh_{procedure_id}"
+        if not cache.add(lock_key, True, timeout=self.REFRESH_LOCK_TIMEOUT):
+            logger.debug(f"Content refresh already running for {procedure_id}")
+            return
+
+        thread = threading.Thread(
+            target=self._run_background_refresh,
+            args=[procedure_id, lock_key],
+            daemon=True,
+        )
+        thread.start()
+
+    def _run_background_refresh(self, procedure_id, lock_key: str) -> None:
+        try:
+            procedure = Procedure.objects.get(pk=procedure_id)
+            self.refresh(procedure)
+        except Exception as exc:
+            logger.exception(f"Background content refresh failed for {procedure_id}")
+            persist_app_error(exc)
+        finally:
+            cache.delete(lock_key)
+            close_old_connections()
+
+    def _is_stale(self, procedure: Procedure) -> bool:
+        if procedure.content_checked_at is None:
+            return True
+        return timezone.now() - procedure.content_checked_at > self.REVALIDATE_AFTER
+
+    def _mark_checked(self, procedure: Procedure) -> None:
+        # queryset update: skips auto_now/history, these are derived fields
+        procedure.content_checked_at = timezone.now()
+        Procedure.objects.filter(pk=procedure.pk).update(
+            content_checked_at=procedure.content_checked_at
+        )
+
+    def _store_snapshot(
+        self, procedure: Procedure, content: ProcessDocumentContent, revision: str
+    ) -> None:
+        procedure.content_snapshot = asdict(content)
+        procedure.content_revision = revision
+        procedure.content_checked_at = timezone.now()
+        Procedure.objects.filter(pk=procedure.pk).update(
+            content_snapshot=procedure.content_snapshot,
+            content_revision=procedure.content_revision,
+            content_checked_at=procedure.content_checked_at,
+        )
+        logger.info(f"Stored content snapshot for procedure {procedure.id}")
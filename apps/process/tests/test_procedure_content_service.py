@@ -0,0 +1,159 @@
+from dataclasses import asdict
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.utils import timezone
+
+from apps.process.models import Procedure
+from apps.process.services.google_docs_service import ProcessDocumentContent
+from apps.process.services.procedure_content_service import ProcedureContentService
+
+REVISION_PATH = "apps.process.services.procedure_content_service.get_file_revision"
+
+
+def _content(title="Grinder SWP"):
+    return ProcessDocumentContent(
+        title=title,
+        document_type="swp",
+        description="Using the bench grinder",
+        site_location="Workshop",
+        ppe_requirements=["Safety glasses"],
+        tasks=[{"step_number": 1, "description": "Check guard"}],
+        additional_notes="",
+        raw_text="Grinder SWP\nUsing the bench grinder",
+    )
+
+
+def _make_service(content=None):
+    docs_service = MagicMock()
+    docs_service.read_document.return_value = content or _content()
+    return ProcedureContentService(docs_service)
+
+
+@pytest.fixture
+def procedure(db):
+    return Procedure.objects.create(
+        document_type="procedure",
+        title="Grinder SWP",
+        tags=["safety", "swp"],
+        google_doc_id="doc-123",
+    )
+
+
+@pytest.mark.django_db
+class TestProcedureContentService:
+    def test_first_read_fetches_and_stores_snapshot(self, procedure):
+        service = _make_service()
+
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            content = service.get_content(procedure)
+
+        assert content.title == "Grinder SWP"
+        service.docs_service.read_document.assert_called_once_with("doc-123")
+        procedure.refresh_from_db()
+        assert procedure.content_snapshot["tasks"][0]["description"] == "Check guard"
+        assert procedure.content_revision == "3:2026-01-01"
+        assert procedure.content_checked_at is not None
+
+    def test_fresh_snapshot_does_not_call_google(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            service.get_content(procedure)
+
+        service = _make_service()
+        with patch(REVISION_PATH) as revision:
+            content = service.get_content(Procedure.objects.get(pk=procedure.pk))
+
+        assert content.title == "Grinder SWP"
+        revision.assert_not_called()
+        service.docs_service.read_document.assert_not_called()
+
+    def test_stale_snapshot_is_served_and_refreshed_in_background(self, procedure):
+        procedure.content_snapshot = {
+            **asdict(_content()),
+            "title": "Stored title",
+        }
+        procedure.content_checked_at = timezone.now() - timedelta(hours=1)
+        procedure.save()
+
+        service = _make_service()
+        with patch.object(service, "refresh_in_background") as background:
+            content = service.get_content(procedure)
+
+        assert content.title == "Stored title"
+        background.assert_called_once_with(procedure.id)
+        service.docs_service.read_document.assert_not_called()
+
+    def test_refresh_skips_read_when_revision_unchanged(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            service.refresh(procedure)
+            service.refresh(procedure)
+
+        service.docs_service.read_document.assert_called_once()
+
+    def test_refresh_rereads_when_revision_changes(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, side_effect=["3:2026-01-01", "4:2026-01-02"]):
+            service.refresh(procedure)
+            service.docs_service.read_document.return_value = _content("Renamed")
+            content = service.refresh(procedure)
+
+        assert content.title == "Renamed"
+        procedure.refresh_from_db()
+        assert procedure.content_snapshot["title"] == "Renamed"
+        assert procedure.content_revision == "4:2026-01-02"
+
+    def test_update_replaces_snapshot_before_next_read(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            service.refresh(procedure)
+
+        service.docs_service.read_document.return_value = _content("Renamed")
+        with patch(REVISION_PATH, return_value="4:2026-01-02"):
+            service.refresh_after_update(procedure)
+
+        with patch(REVISION_PATH) as revision:
+            content = service.get_content(Procedure.objects.get(pk=procedure.pk))
+        assert content.title == "Renamed"
+        revision.assert_not_called()
+
+    def test_update_marks_snapshot_stale_when_google_unavailable(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            service.refresh(procedure)
+
+        with patch(REVISION_PATH, side_effect=RuntimeError("Google down")):
+            service.refresh_after_update(procedure)
+
+        procedure.refresh_from_db()
+        assert procedure.content_checked_at is None
+        with patch.object(service, "refresh_in_background") as background:
+            service.get_content(procedure)
+        background.assert_called_once_with(procedure.id)
+
+    def test_snapshot_served_when_google_unavailable(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            service.refresh(procedure)
+
+        with patch(REVISION_PATH, side_effect=RuntimeError("Google down")):
+            content = service.refresh(procedure)
+
+        assert content.title == "Grinder SWP"
+
+    def test_google_unavailable_without_snapshot_raises(self, procedure):
+        service = _make_service()
+        with patch(REVISION_PATH, side_effect=RuntimeError("Google down")):
+            with pytest.raises(RuntimeError):
+                service.get_content(procedure)
+
+    def test_snapshot_changes_are_not_recorded_in_history(self, procedure):
+        history_count = procedure.history.count()
+        service = _make_service()
+
+        with patch(REVISION_PATH, return_value="3:2026-01-01"):
+            service.refresh(procedure)
+
+        assert procedure.history.count() == history_count
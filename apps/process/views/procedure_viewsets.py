@@ -238,8 +238,8 @@ class ProcedureContentView(APIView):
     """
     GET/PUT content for a procedure stored in Google Docs.
 
-    - GET: Fetch current content from Google Docs
-    - PUT: Push updated content to Google Docs
+    - GET: Return content from the local snapshot, revalidated against Google Docs
+    - PUT: Push updated content to Google Docs and refresh the snapshot
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -263,9 +263,11 @@ class ProcedureContentView(APIView):
         if error_response:
             return error_response
 
-        from apps.process.services.google_docs_service import GoogleDocsService
+        from apps.process.services.procedure_content_service import (
+            ProcedureContentService,
+        )
 
-        content = GoogleDocsService().read_document(doc.google_doc_id)
+        content = ProcedureContentService().get_content(doc)
         return Response(
             {
                 "title": content.title,
@@ -289,11 +291,16 @@ class ProcedureContentView(APIView):
             return error_response
 
         from apps.process.services.google_docs_service import GoogleDocsService
+        from apps.process.services.procedure_content_service import (
+            ProcedureContentService,
+        )
 
-        GoogleDocsService().update_document(doc.google_doc_id, request.data)
+        docs_service = GoogleDocsService()
+        docs_service.update_document(doc.google_doc_id, request.data)
         doc.title = request.data.get("title", doc.title)
         doc.site_location = request.data.get("site_location", doc.site_location)
         doc.save()
+        ProcedureContentService(docs_service).refresh_after_update(doc)
         return Response(ProcedureDetailSerializer(doc).data)
 
 
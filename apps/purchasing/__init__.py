@@ -18,6 +18,8 @@ try:
         )
         from .serializers import (
             AllJobsResponseSerializer,
+            AllocationBatchDeleteResponseSerializer,
+            AllocationBatchDeleteSerializer,
             AllocationDeleteResponseSerializer,
             AllocationDeleteSerializer,
             AllocationDetailsResponseSerializer,
@@ -70,6 +72,8 @@ except (ImportError, RuntimeError):
 
 __all__ = [
     "AllJobsResponseSerializer",
+    "AllocationBatchDeleteResponseSerializer",
+    "AllocationBatchDeleteSerializer",
     "AllocationDeleteResponseSerializer",
     "AllocationDeleteSerializer",
     "AllocationDetailsResponseSerializer",
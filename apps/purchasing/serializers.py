@@ -466,6 +466,21 @@ class AllocationDeleteResponseSerializer(serializers.Serializer):
     updated_received_quantity = serializers.FloatField(required=False)
 
 
+class AllocationBatchDeleteSerializer(serializers.Serializer):
+    """Serializer for deleting several allocations from a purchase order"""
+
+    allocations = AllocationDeleteSerializer(many=True, allow_empty=False)
+
+
+class AllocationBatchDeleteResponseSerializer(serializers.Serializer):
+    """Serializer for batch allocation deletion response"""
+
+    success = serializers.BooleanField()
+    message = serializers.CharField()
+    po_status = serializers.CharField(required=False)
+    deleted = AllocationDeleteResponseSerializer(many=True, required=False)
+
+
 class AllocationDetailsResponseSerializer(serializers.Serializer):
     """Serializer for allocation details response"""
 
@@ -1,11 +1,13 @@
 import logging
+import uuid
+from collections import defaultdict
 from dataclasses import asdict, dataclass
 from decimal import Decimal
-from typing import Dict, Literal, Tuple, Union
+from typing import Dict, Iterable, List, Literal, Tuple
 
 from django.db import models, transaction
-from django.db.models import F, Func, Sum, Value
-from django.db.models.functions import Coalesce, Greatest
+from django.db.models import Count, F, Func, Sum, Value
+from django.db.models.functions import Coalesce
 
 from apps.job.models import CostLine
 from apps.purchasing.models import PurchaseOrder, PurchaseOrderLine, Stock
@@ -49,7 +51,6 @@ class AllocationService:
             line_id: Purchase Order Line ID
             allocation_type: Type of allocation ('stock' or 'job')
             allocation_id: ID of the Stock item or CostLine to delete
-            user: User performing the deletion (for audit purposes)
 
         Returns:
             Dict with success status and details
@@ -62,36 +63,92 @@ class AllocationService:
             f"Starting allocation deletion - PO: {po_id}, Line: {line_id}, "
             f"Type: {allocation_type}, ID: {allocation_id}"
         )
+        result = AllocationService.delete_allocations(
+            po_id,
+            [{"allocation_type": allocation_type, "allocation_id": allocation_id}],
+        )
+        return result["deleted"][0]
 
-        try:
-            if allocation_type not in ("stock", "job"):
-                raise AllocationDeletionError(
-                    f"Invalid allocation type: {allocation_type}. Must be 'stock' or 'job'"
-                )
+    @staticmethod
+    def delete_allocations(
+        po_id: str, allocations: List[Dict[str, str]]
+    ) -> Dict[str, object]:
+        """
+        Delete several allocations from one purchase order in a single transaction.
 
-            with transaction.atomic():
-                po = AllocationService._get_po_or_error(po_id)
+        Rows are locked in a fixed order - the PO, then its lines, stock items
+        and cost lines, each ordered by id - matching process_delivery_receipt,
+        so concurrent receipts and deletions on the same PO queue up rather
+        than deadlock. Either every allocation is deleted or none is.
 
-                po_line, obj = AllocationService._resolve_allocation_or_error(
-                    po=po,
-                    allocation_type=allocation_type,
-                    allocation_id=allocation_id,
-                )
+        Args:
+            po_id: Purchase Order ID
+            allocations: Dicts with 'allocation_type' ('stock' or 'job') and
+                'allocation_id'
+
+        Returns:
+            Dict with success, message, the PO status and one DeletionResult
+            dict per allocation, in request order
 
-                po_line = PurchaseOrderLine.objects.select_for_update().get(
-                    id=po_line.id
+        Raises:
+            AllocationDeletionError: If any allocation fails validation
+        """
+        try:
+            requested = AllocationService._parse_allocations(allocations)
+            with transaction.atomic():
+                po = AllocationService._lock_po_or_error(po_id)
+                stock_items, cost_lines = AllocationService._lock_allocations_or_error(
+                    po, requested
                 )
+                AllocationService._check_stock_not_consumed(stock_items.values())
 
-                if allocation_type == "stock":
-                    obj = Stock.objects.select_for_update().get(id=obj.id)
-                    result = AllocationService._delete_stock_allocation(po_line, obj)  # type: ignore[arg-type]
-                else:
-                    obj = CostLine.objects.select_for_update().get(id=obj.id)
-                    result = AllocationService._delete_job_allocation(po_line, obj)  # type: ignore[arg-type]
+                lines = AllocationService._decrement_received_quantities(
+                    po, stock_items.values(), cost_lines.values()
+                )
 
+                stock_job_name = (
+                    Stock.get_stock_holding_job().name if stock_items else None
+                )
+                results = []
+                for allocation_type, allocation_id in requested:
+                    if allocation_type == "stock":
+                        stock_item = stock_items[allocation_id]
+                        results.append(
+                            AllocationService._stock_deletion_result(
+                                stock_item,
+                                lines[stock_item.source_purchase_order_line_id],
+                                stock_job_name,
+                            )
+                        )
+                    else:
+                        cost_line = cost_lines[allocation_id]
+                        results.append(
+                            AllocationService._job_deletion_result(
+                                cost_line,
+                                lines[
+                                    uuid.UUID(
+                                        cost_line.ext_refs["purchase_order_line_id"]
+                                    )
+                                ],
+                            )
+                        )
+
+                Stock.objects.filter(id__in=list(stock_items)).delete()
+                CostLine.delete_lines(cost_lines.values())
                 AllocationService._update_po_status(po)
 
-                return asdict(result)
+            logger.info(
+                "Deleted %s stock and %s job allocation(s) from PO %s",
+                len(stock_items),
+                len(cost_lines),
+                po.po_number,
+            )
+            return {
+                "success": True,
+                "message": f"Deleted {len(results)} allocation(s)",
+                "po_status": po.status,
+                "deleted": [asdict(result) for result in results],
+            }
         except AllocationDeletionError as exc:
             logger.error("Allocation deletion validation error: %s", exc)
             raise
@@ -103,9 +160,10 @@ class AllocationService:
                 exc,
                 additional_context={
                     "po_id": str(po_id),
-                    "line_id": str(line_id),
-                    "allocation_type": str(allocation_type),
-                    "allocation_id": str(allocation_id),
+                    "allocations": [
+                        {key: str(value) for key, value in allocation.items()}
+                        for allocation in allocations
+                    ],
                 },
             )
 
@@ -124,15 +182,7 @@ class AllocationService:
             if allocation_type == "stock":
                 stock_item = AllocationService._get_stock_or_error(po, allocation_id)
 
-                consuming_qs = CostLine.objects.annotate(
-                    stock_id=Func(
-                        F("ext_refs"),
-                        Value("$.stock_id"),
-                        function="JSON_UNQUOTE",
-                        template="JSON_UNQUOTE(JSON_EXTRACT(%(expressions)s))",
-                        output_field=models.CharField(),
-                    )
-                ).filter(stock_id=str(stock_item.id))
+                consuming_qs = CostLine.objects.filter(stock_ref=str(stock_item.id))
 
                 return {
                     "type": "stock",
@@ -234,112 +284,166 @@ class AllocationService:
         return line
 
     @staticmethod
-    def _resolve_allocation_or_error(
-        po: PurchaseOrder,
-        allocation_type: AllocationType,
-        allocation_id: str,
-    ) -> Tuple[PurchaseOrderLine, Union[Stock, CostLine]]:
-        if allocation_type == "stock":
-            stock = AllocationService._get_stock_or_error(po, allocation_id)
-            return stock.source_purchase_order_line, stock
+    def _parse_allocations(
+        allocations: List[Dict[str, str]],
+    ) -> List[Tuple[AllocationType, str]]:
+        if not allocations:
+            raise AllocationDeletionError("No allocations given")
+        requested = []
+        for allocation in allocations:
+            allocation_type = allocation.get("allocation_type")
+            if allocation_type not in ("stock", "job"):
+                raise AllocationDeletionError(
+                    f"Invalid allocation type: {allocation_type}. Must be 'stock' or 'job'"
+                )
+            try:
+                allocation_id = str(uuid.UUID(str(allocation.get("allocation_id"))))
+            except ValueError:
+                raise AllocationDeletionError(
+                    f"Invalid allocation id: {allocation.get('allocation_id')}"
+                )
+            requested.append((allocation_type, allocation_id))
+        if len(set(requested)) != len(requested):
+            raise AllocationDeletionError("Duplicate allocations given")
+        return requested
 
-        line = AllocationService._get_costline_or_error(po, allocation_id)
+    @staticmethod
+    def _lock_po_or_error(po_id: str) -> PurchaseOrder:
         try:
-            po_line = PurchaseOrderLine.objects.get(
-                id=line.ext_refs["purchase_order_line_id"], purchase_order=po
+            return PurchaseOrder.objects.select_for_update().get(id=po_id)
+        except PurchaseOrder.DoesNotExist:
+            raise AllocationDeletionError(f"Purchase Order {po_id} not found")
+
+    @staticmethod
+    def _lock_allocations_or_error(
+        po: PurchaseOrder, requested: List[Tuple[AllocationType, str]]
+    ) -> Tuple[Dict[str, Stock], Dict[str, CostLine]]:
+        """Lock the requested Stock items and CostLines, checking they belong to the PO."""
+        stock_ids = [a_id for a_type, a_id in requested if a_type == "stock"]
+        cost_line_ids = [a_id for a_type, a_id in requested if a_type == "job"]
+
+        stock_items = {
+            str(stock.id): stock
+            for stock in Stock.objects.select_for_update()
+            .filter(
+                id__in=stock_ids,
+                source="purchase_order",
+                source_purchase_order_line__purchase_order=po,
             )
-        except PurchaseOrderLine.DoesNotExist:
+            .order_by("id")
+        }
+        missing = [stock_id for stock_id in stock_ids if stock_id not in stock_items]
+        if missing:
             raise AllocationDeletionError(
-                f"Purchase Order Line referenced by allocation {allocation_id} not found"
+                f"Stock allocation {', '.join(missing)} not found or not from PO {po.id}"
             )
-        return po_line, line
 
-    @staticmethod
-    def _delete_stock_allocation(
-        po_line: PurchaseOrderLine,
-        stock_item: Stock,
-    ) -> DeletionResult:
-        stock_id = Func(
-            Func(F("ext_refs"), Value("$.stock_id"), function="JSON_EXTRACT"),
-            function="JSON_UNQUOTE",
-            output_field=models.CharField(),
-        )
+        cost_lines = {
+            str(line.id): line
+            for line in CostLine.objects.select_for_update()
+            .prefetch_related("cost_set__job")
+            .filter(id__in=cost_line_ids, ext_refs__purchase_order_id=str(po.id))
+            .order_by("id")
+        }
+        missing = [line_id for line_id in cost_line_ids if line_id not in cost_lines]
+        if missing:
+            raise AllocationDeletionError(
+                f"Job allocation {', '.join(missing)} not found or not from PO {po.id}"
+            )
+        for line in cost_lines.values():
+            if not line.ext_refs.get("purchase_order_line_id"):
+                raise AllocationDeletionError(
+                    f"Cost line {line.id} missing purchase_order_line_id in ext_refs"
+                )
+        return stock_items, cost_lines
 
-        consuming_qs = CostLine.objects.annotate(stock_id=stock_id).filter(
-            stock_id=str(stock_item.id)
+    @staticmethod
+    def _check_stock_not_consumed(stock_items: Iterable[Stock]) -> None:
+        """Reject the batch if any stock item has been consumed by a job."""
+        consumed = dict(
+            CostLine.objects.filter(stock_ref__in=[str(s.id) for s in stock_items])
+            .values("stock_ref")
+            .annotate(count=Count("id"))
+            .values_list("stock_ref", "count")
         )
-
-        consumed_count = consuming_qs.count()
-        if consumed_count:
+        if consumed:
             raise AllocationDeletionError(
                 "Cannot delete stock allocation - stock has been consumed by "
-                f"{consumed_count} job(s)"
+                f"{sum(consumed.values())} job(s)"
             )
 
-        deleted_qty = Decimal(stock_item.quantity or 0)
-        desc = stock_item.description
-
-        # decrement received_quantity atomically and clamp to 0 in DB
-        (
-            PurchaseOrderLine.objects.filter(id=po_line.id).update(
-                received_quantity=Greatest(
-                    Value(Decimal("0")), F("received_quantity") - Value(deleted_qty)
-                )
+    @staticmethod
+    def _decrement_received_quantities(
+        po: PurchaseOrder,
+        stock_items: Iterable[Stock],
+        cost_lines: Iterable[CostLine],
+    ) -> Dict[uuid.UUID, PurchaseOrderLine]:
+        """Lock the affected PO lines and take the deleted quantities off them."""
+        deltas: Dict[uuid.UUID, Decimal] = defaultdict(Decimal)
+        for stock_item in stock_items:
+            deltas[stock_item.source_purchase_order_line_id] += Decimal(
+                stock_item.quantity or 0
             )
-        )
-        po_line.refresh_from_db(fields=["received_quantity"])
-
-        stock_item.delete()
+        for cost_line in cost_lines:
+            line_id = uuid.UUID(cost_line.ext_refs["purchase_order_line_id"])
+            deltas[line_id] += Decimal(cost_line.quantity or 0)
+
+        lines = {
+            line.id: line
+            for line in PurchaseOrderLine.objects.select_for_update()
+            .filter(id__in=list(deltas), purchase_order=po)
+            .order_by("id")
+        }
+        missing = set(deltas) - set(lines)
+        if missing:
+            raise AllocationDeletionError(
+                "Purchase Order Line referenced by allocation not found: "
+                f"{', '.join(str(line_id) for line_id in missing)}"
+            )
+        for line_id, line in lines.items():
+            # Clamp at zero, as received quantities may have been edited by hand
+            line.received_quantity = max(
+                Decimal("0"), line.received_quantity - deltas[line_id]
+            )
+        PurchaseOrderLine.objects.bulk_update(lines.values(), ["received_quantity"])
+        return lines
 
+    @staticmethod
+    def _stock_deletion_result(
+        stock_item: Stock, po_line: PurchaseOrderLine, job_name: str
+    ) -> DeletionResult:
         logger.info(
-            "Deleted stock allocation: %s, qty=%s, PO line received now=%ss",
-            desc,
-            deleted_qty,
+            "Deleting stock allocation: %s, qty=%s, PO line received now=%s",
+            stock_item.description,
+            stock_item.quantity,
             po_line.received_quantity,
         )
-
         return DeletionResult(
             success=True,
             message="Stock allocation deleted successfully",
-            deleted_quantity=float(deleted_qty),
-            description=desc,
+            deleted_quantity=float(stock_item.quantity or 0),
+            description=stock_item.description,
             updated_received_quantity=float(po_line.received_quantity),
-            job_name=Stock.get_stock_holding_job().name,
+            job_name=job_name,
         )
 
     @staticmethod
-    def _delete_job_allocation(
-        po_line: PurchaseOrderLine,
-        cost_line: CostLine,
+    def _job_deletion_result(
+        cost_line: CostLine, po_line: PurchaseOrderLine
     ) -> DeletionResult:
-        deleted_qty = Decimal(cost_line.quantity or 0)
-        desc = cost_line.desc
         job_name = cost_line.cost_set.job.name
-
-        (
-            PurchaseOrderLine.objects.filter(id=po_line.id).update(
-                received_quantity=Greatest(
-                    Value(Decimal("0")), F("received_quantity") - Value(deleted_qty)
-                )
-            )
-        )
-        po_line.refresh_from_db(fields=["received_quantity"])
-
-        cost_line.delete()
-
         logger.info(
-            "Deleted job allocation: %s, qty=%s, job=%s, PO line received now=%s",
-            desc,
-            deleted_qty,
+            "Deleting job allocation: %s, qty=%s, job=%s, PO line received now=%s",
+            cost_line.desc,
+            cost_line.quantity,
             job_name,
             po_line.received_quantity,
         )
-
         return DeletionResult(
             success=True,
             message="Job allocation deleted successfully",
-            deleted_quantity=float(deleted_qty),
-            description=desc,
+            deleted_quantity=float(cost_line.quantity or 0),
+            description=cost_line.desc,
             updated_received_quantity=float(po_line.received_quantity),
             job_name=job_name,
         )
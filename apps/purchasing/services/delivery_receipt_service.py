@@ -55,9 +55,13 @@ def _load_po_and_lines(
 
     requested_ids = set(line_allocations.keys())
     # Lock each referenced PO line as well to prevent double submissions running
-    # in parallel and recreating the same stock entries.
-    line_qs = PurchaseOrderLine.objects.select_for_update().filter(
-        id__in=requested_ids, purchase_order=po
+    # in parallel and recreating the same stock entries. Lines are locked in id
+    # order, as AllocationService.delete_allocations does, so the two can't
+    # deadlock on each other.
+    line_qs = (
+        PurchaseOrderLine.objects.select_for_update()
+        .filter(id__in=requested_ids, purchase_order=po)
+        .order_by("id")
     )
     lines = {str(line.id): line for line in line_qs}
     if len(lines) != len(requested_ids):
@@ -114,7 +118,7 @@ def _validate_and_prepare_allocations(
             )
 
         try:
-            defaults = CompanyDefaults.get_instance()
+            defaults = CompanyDefaults.get_cached()
             default_retail_rate_pct = defaults.materials_markup * 100
         except Exception as e:
             raise DeliveryReceiptValidationError(
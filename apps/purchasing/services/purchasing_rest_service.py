@@ -15,11 +15,17 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
 from apps.client.models import Supplier, SupplierPickupAddress
+from apps.client.services.supplier_matching_service import supplier_matcher
 from apps.job.models.costing import CostLine
 from apps.job.models.job import Job
 from apps.purchasing.etag import generate_po_etag, normalize_etag
 from apps.purchasing.exceptions import PreconditionFailedError
-from apps.purchasing.models import PurchaseOrder, PurchaseOrderLine, Stock
+from apps.purchasing.models import (
+    PurchaseOrder,
+    PurchaseOrderLine,
+    PurchaseOrderSupplierQuote,
+    Stock,
+)
 from apps.purchasing.services.delivery_receipt_service import (
     _create_costline_from_allocation,
     _create_stock_from_allocation,
@@ -81,10 +87,20 @@ class PurchasingRestService:
             supplier = Supplier.objects.get(id=supplier_id)
             po.supplier = supplier
             logger.info(f"Updated supplier for PO {po.id} to {supplier.name}")
+            PurchasingRestService._learn_quote_supplier_alias(po, supplier)
         except Supplier.DoesNotExist:
             logger.error(f"Invalid supplier_id {supplier_id} for PO {po.id}")
             raise
 
+    @staticmethod
+    def _learn_quote_supplier_alias(po: PurchaseOrder, supplier: Supplier) -> None:
+        """Remember the supplier chosen for a PO as the match for its quote's name."""
+        quote = PurchaseOrderSupplierQuote.objects.filter(purchase_order=po).first()
+        extracted = (quote.extracted_data or {}) if quote else {}
+        supplier_data = extracted.get("supplier")
+        if isinstance(supplier_data, dict) and supplier_data.get("name"):
+            supplier_matcher.confirm(supplier_data["name"], supplier)
+
     @staticmethod
     def _update_pickup_address(
         pickup_address_id: str | None, po: PurchaseOrder
@@ -178,7 +194,7 @@ class PurchasingRestService:
             f"Allocating lines automatically for PO {po.po_number}, line: {line}"
         )
         stock_job = Stock.get_stock_holding_job()
-        defaults = CompanyDefaults.get_instance()
+        defaults = CompanyDefaults.get_cached()
         retail_rate_pct = defaults.materials_markup * 100
 
         # Handle stock allocation first
@@ -325,7 +341,7 @@ class PurchasingRestService:
 
     @staticmethod
     def get_last_purchase_order_number() -> str | None:
-        defaults = CompanyDefaults.get_instance()
+        defaults = CompanyDefaults.get_cached()
         po_prefix = defaults.po_prefix or ""
         prefix_len = len(po_prefix)
 
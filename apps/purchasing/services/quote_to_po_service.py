@@ -8,9 +8,8 @@ import pdfplumber
 import requests
 from django.conf import settings
 from google import genai
-from rapidfuzz import fuzz, process
 
-from apps.client.models import Client
+from apps.client.services.supplier_matching_service import supplier_matcher
 from apps.job.enums import MetalType
 from apps.purchasing.models import (
     PurchaseOrder,
@@ -37,7 +36,7 @@ def normalize(s):
 
 def fuzzy_find_supplier(supplier_name):
     """
-    Find a supplier in the database using fuzzy matching.
+    Find a supplier in the database using the shared supplier matcher.
 
     Args:
         supplier_name (str): The supplier name to match
@@ -48,41 +47,9 @@ def fuzzy_find_supplier(supplier_name):
     if not supplier_name:
         return None, supplier_name
 
-    # Get all suppliers
-    suppliers = Client.objects.all()
-
-    # Extract supplier names and create a mapping from name to supplier object
-    supplier_names = [s.name for s in suppliers]
-    supplier_map = {s.name: s for s in suppliers}
-
-    # Build a map from normalized -> original so we can return the true supplier name
-    norm_map = {normalize(name): name for name in supplier_names}
-    norm_names = list(norm_map.keys())
-
-    # Normalize the input supplier name
-    norm_supplier = normalize(supplier_name)
-
-    # Find the best match
-    if not norm_names:
-        # No suppliers in database
-        logger.warning(f"No suppliers in database to match against: {supplier_name}")
-        return None, supplier_name
-
-    match, score, _ = process.extractOne(
-        norm_supplier, norm_names, scorer=fuzz.token_set_ratio
-    )
-
-    # Use a threshold to ensure the match is good enough
-    if score < 85:
-        # Score too low
+    matched_supplier = supplier_matcher.find(supplier_name)
+    if not matched_supplier:
         logger.warning(f"No supplier match found for: {supplier_name}")
-        return None, supplier_name
-
-    original_name = norm_map[match]
-    matched_supplier = supplier_map[original_name]
-    logger.info(
-        f"Found fuzzy supplier match: '{supplier_name}' -> '{original_name}' (score: {score})"
-    )
     return matched_supplier, supplier_name
 
 
@@ -351,24 +318,7 @@ def extract_data_from_supplier_quote(
         quote_data = json.loads(json_text)
 
         # Process supplier data if it exists in the expected format
-        try:
-            supplier_name_from_quote = quote_data["supplier"]["name"]
-            matched_supplier, original_name = fuzzy_find_supplier(
-                supplier_name_from_quote
-            )
-
-            # Add original and matched supplier info
-            quote_data["supplier"]["original_name"] = original_name
-            quote_data["matched_supplier"] = None
-
-            if matched_supplier:
-                quote_data["matched_supplier"] = {
-                    "id": str(matched_supplier.id),
-                    "name": matched_supplier.name,
-                    "xero_id": getattr(matched_supplier, "xero_id", None),
-                }
-        except (KeyError, TypeError):
-            logging.warning("Supplier name not found in quote JSON")
+        quote_data = process_supplier_data(quote_data)
 
         # Return the extracted data
         return quote_data, None
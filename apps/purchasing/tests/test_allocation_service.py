@@ -0,0 +1,215 @@
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import close_old_connections
+from django.test import skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import CostLine, Job
+from apps.purchasing.models import PurchaseOrder, PurchaseOrderLine, Stock
+from apps.purchasing.services.allocation_service import (
+    AllocationDeletionError,
+    AllocationService,
+)
+from apps.purchasing.services.delivery_receipt_service import (
+    process_delivery_receipt,
+)
+from apps.testing import BaseTestCase, BaseTransactionTestCase
+
+
+class ReceivedPurchaseOrderMixin:
+    """Builds a two-line PO and receives it into a job and into stock."""
+
+    def setUp(self):
+        Stock._stock_holding_job = None
+        self.addCleanup(setattr, Stock, "_stock_holding_job", None)
+        client = Client.objects.create(
+            name="Steel Supplier", xero_last_modified=timezone.now()
+        )
+        self.stock_job = Job.objects.create(
+            client=client, name=Stock.STOCK_HOLDING_JOB_NAME
+        )
+        self.job = Job.objects.create(client=client, name="Gate Job")
+        self.po = PurchaseOrder.objects.create(
+            supplier=client, po_number="PO-ALLOC-1", status="submitted"
+        )
+        self.flat_bar = PurchaseOrderLine.objects.create(
+            purchase_order=self.po,
+            description="Flat bar",
+            quantity=Decimal("8"),
+            unit_cost=Decimal("10.00"),
+        )
+        self.box_section = PurchaseOrderLine.objects.create(
+            purchase_order=self.po,
+            description="Box section",
+            quantity=Decimal("4"),
+            unit_cost=Decimal("20.00"),
+        )
+
+    def receive(self, to_job, to_stock, box_section=Decimal("0")):
+        allocations = [
+            {"job_id": str(self.job.id), "quantity": str(to_job)},
+            {"job_id": str(self.stock_job.id), "quantity": str(to_stock)},
+        ]
+        line_allocations = {
+            str(self.flat_bar.id): {
+                "total_received": str(to_job + to_stock),
+                "allocations": allocations,
+            }
+        }
+        if box_section:
+            line_allocations[str(self.box_section.id)] = {
+                "total_received": str(box_section),
+                "allocations": [
+                    {"job_id": str(self.job.id), "quantity": str(box_section)}
+                ],
+            }
+        with patch("apps.quoting.services.stock_parser.auto_parse_stock_item"):
+            return process_delivery_receipt(str(self.po.id), line_allocations)
+
+
+class AllocationServiceTests(ReceivedPurchaseOrderMixin, BaseTestCase):
+    def _allocations(self):
+        stock = Stock.objects.get(source_purchase_order_line=self.flat_bar)
+        cost_lines = {
+            line.ext_refs["purchase_order_line_id"]: line
+            for line in CostLine.objects.filter(cost_set__job=self.job)
+        }
+        return (
+            stock,
+            cost_lines[str(self.flat_bar.id)],
+            cost_lines[str(self.box_section.id)],
+        )
+
+    def test_batch_delete_unwinds_the_whole_receipt(self):
+        self.receive(Decimal("5"), Decimal("3"), box_section=Decimal("4"))
+        stock, flat_bar_line, box_section_line = self._allocations()
+
+        result = AllocationService.delete_allocations(
+            str(self.po.id),
+            [
+                {"allocation_type": "stock", "allocation_id": str(stock.id)},
+                {"allocation_type": "job", "allocation_id": str(flat_bar_line.id)},
+                {"allocation_type": "job", "allocation_id": str(box_section_line.id)},
+            ],
+        )
+
+        self.assertEqual(len(result["deleted"]), 3)
+        self.assertEqual(result["po_status"], "submitted")
+        self.assertEqual(
+            [entry["deleted_quantity"] for entry in result["deleted"]],
+            [3.0, 5.0, 4.0],
+        )
+        self.flat_bar.refresh_from_db()
+        self.box_section.refresh_from_db()
+        self.assertEqual(self.flat_bar.received_quantity, Decimal("0"))
+        self.assertEqual(self.box_section.received_quantity, Decimal("0"))
+        self.assertFalse(Stock.objects.filter(id=stock.id).exists())
+        self.assertFalse(CostLine.objects.filter(cost_set__job=self.job).exists())
+        self.job.latest_actual.refresh_from_db()
+        self.assertEqual(self.job.latest_actual.summary["cost"], 0.0)
+
+    def test_consumed_stock_blocks_the_whole_batch(self):
+        self.receive(Decimal("5"), Decimal("3"))
+        stock = Stock.objects.get(source_purchase_order_line=self.flat_bar)
+        flat_bar_line = CostLine.objects.get(cost_set__job=self.job)
+        CostLine.objects.create(
+            cost_set=self.job.latest_actual,
+            kind="material",
+            desc="Consumed flat bar",
+            quantity=Decimal("1"),
+            accounting_date=timezone.now().date(),
+            ext_refs={"stock_id": str(stock.id)},
+        )
+        self.assertTrue(CostLine.objects.filter(stock_ref=str(stock.id)).exists())
+
+        with self.assertRaises(AllocationDeletionError):
+            AllocationService.delete_allocations(
+                str(self.po.id),
+                [
+                    {"allocation_type": "job", "allocation_id": str(flat_bar_line.id)},
+                    {"allocation_type": "stock", "allocation_id": str(stock.id)},
+                ],
+            )
+
+        self.flat_bar.refresh_from_db()
+        self.assertEqual(self.flat_bar.received_quantity, Decimal("8"))
+        self.assertTrue(CostLine.objects.filter(id=flat_bar_line.id).exists())
+        details = AllocationService.get_allocation_details(
+            str(self.po.id), "stock", str(stock.id)
+        )
+        self.assertFalse(details["can_delete"])
+
+    def test_single_delete_updates_line_and_status(self):
+        self.receive(Decimal("5"), Decimal("3"))
+        stock = Stock.objects.get(source_purchase_order_line=self.flat_bar)
+
+        result = AllocationService.delete_allocation(
+            str(self.po.id), str(self.flat_bar.id), "stock", str(stock.id)
+        )
+
+        self.assertEqual(result["updated_received_quantity"], 5.0)
+        self.po.refresh_from_db()
+        self.assertEqual(self.po.status, "partially_received")
+
+    def test_batch_delete_endpoint(self):
+        self.receive(Decimal("5"), Decimal("3"))
+        stock = Stock.objects.get(source_purchase_order_line=self.flat_bar)
+        cost_line = CostLine.objects.get(cost_set__job=self.job)
+        staff = Staff.objects.create_user(
+            email="buyer@example.com",
+            password="x",
+            first_name="Bea",
+            last_name="Buyer",
+            is_office_staff=True,
+        )
+        api = APIClient()
+        api.force_authenticate(staff)
+
+        response = api.post(
+            reverse("purchasing:allocation_batch_delete_rest", args=[str(self.po.id)]),
+            {
+                "allocations": [
+                    {"allocation_type": "stock", "allocation_id": str(stock.id)},
+                    {"allocation_type": "job", "allocation_id": str(cost_line.id)},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["deleted"]), 2)
+        self.assertEqual(response.json()["po_status"], "submitted")
+
+
+class ConcurrentReceiptTests(ReceivedPurchaseOrderMixin, BaseTransactionTestCase):
+    @skipUnlessDBFeature("has_select_for_update")
+    def test_two_users_receiving_the_same_po_do_not_deadlock(self):
+        errors = []
+        barrier = threading.Barrier(2)
+
+        def receive(box_section):
+            try:
+                barrier.wait()
+                self.receive(Decimal("1"), Decimal("1"), box_section=box_section)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=receive, args=(Decimal(n),)) for n in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        self.assertEqual(errors, [])
+        self.flat_bar.refresh_from_db()
+        self.box_section.refresh_from_db()
+        self.assertEqual(self.flat_bar.received_quantity, Decimal("4"))
+        self.assertEqual(self.box_section.received_quantity, Decimal("3"))
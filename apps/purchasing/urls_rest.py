@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from apps.purchasing.views.purchasing_rest_views import (
     AllJobsAPIView,
+    AllocationBatchDeleteAPIView,
     AllocationDeleteAPIView,
     AllocationDetailsAPIView,
     DeliveryReceiptRestView,
@@ -59,6 +60,11 @@ urlpatterns = [
         PurchaseOrderAllocationsAPIView.as_view(),
         name="purchase_order_allocations_rest",
     ),
+    path(
+        "purchase-orders/<uuid:po_id>/allocations/delete/",
+        AllocationBatchDeleteAPIView.as_view(),
+        name="allocation_batch_delete_rest",
+    ),
     path(
         "purchase-orders/<uuid:po_id>/lines/<uuid:line_id>/allocations/delete/",
         AllocationDeleteAPIView.as_view(),
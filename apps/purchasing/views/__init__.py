@@ -2,6 +2,7 @@
 
 from .purchasing_rest_views import (
     AllJobsAPIView,
+    AllocationBatchDeleteAPIView,
     AllocationDeleteAPIView,
     AllocationDetailsAPIView,
     DeliveryReceiptRestView,
@@ -32,6 +33,7 @@ except (ImportError, RuntimeError):
 
 __all__ = [
     "AllJobsAPIView",
+    "AllocationBatchDeleteAPIView",
     "AllocationDeleteAPIView",
     "AllocationDetailsAPIView",
     "DeliveryReceiptRestView",
@@ -18,6 +18,8 @@ from apps.purchasing.etag import generate_po_etag, normalize_etag
 from apps.purchasing.models import PurchaseOrder, PurchaseOrderEvent, Stock
 from apps.purchasing.serializers import (
     AllJobsResponseSerializer,
+    AllocationBatchDeleteResponseSerializer,
+    AllocationBatchDeleteSerializer,
     AllocationDeleteResponseSerializer,
     AllocationDeleteSerializer,
     AllocationDetailsResponseSerializer,
@@ -821,6 +823,66 @@ class AllocationDeleteAPIView(APIView):
             )
 
 
+class AllocationBatchDeleteAPIView(APIView):
+    """
+    API endpoint to delete several allocations from a purchase order at once.
+
+    POST: Deletes the given Stock items and CostLines in one transaction.
+    Either all allocations are deleted or none are.
+    """
+
+    serializer_class = AllocationBatchDeleteResponseSerializer
+
+    @extend_schema(
+        request=AllocationBatchDeleteSerializer,
+        responses={
+            status.HTTP_200_OK: AllocationBatchDeleteResponseSerializer,
+            status.HTTP_400_BAD_REQUEST: AllocationBatchDeleteResponseSerializer,
+        },
+        operation_id="deleteAllocations",
+        description="Delete several allocations (Stock items or CostLines) from a purchase order.",
+    )
+    def post(self, request, po_id):
+        """Delete several allocations from a purchase order."""
+        try:
+            serializer = AllocationBatchDeleteSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Invalid input data",
+                        "details": serializer.errors,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            result = AllocationService.delete_allocations(
+                po_id=str(po_id),
+                allocations=serializer.validated_data["allocations"],
+            )
+
+            response_serializer = self.serializer_class(result)
+            return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+        except AllocationDeletionError as e:
+            logger.error(f"Allocation deletion error: {str(e)}")
+            response_data = {"success": False, "message": str(e)}
+            response_serializer = self.serializer_class(response_data)
+            return Response(
+                response_serializer.data, status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error deleting allocations: {str(e)}")
+            response_data = {
+                "success": False,
+                "message": f"An unexpected error occurred: {str(e)}",
+            }
+            response_serializer = self.serializer_class(response_data)
+            return Response(
+                response_serializer.data, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class AllocationDetailsAPIView(APIView):
     """
     API endpoint to get details about a specific allocation before deletion.
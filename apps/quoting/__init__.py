@@ -19,6 +19,7 @@ try:
         from .serializers import (
             ExtractSupplierPriceListErrorSerializer,
             ExtractSupplierPriceListResponseSerializer,
+            ImportErrorSerializer,
             ImportStatisticsSerializer,
             PriceListInfoSerializer,
             SupplierInfoSerializer,
@@ -52,6 +53,7 @@ __all__ = [
     "DjangoJobViewSet",
     "ExtractSupplierPriceListErrorSerializer",
     "ExtractSupplierPriceListResponseSerializer",
+    "ImportErrorSerializer",
     "ImportStatisticsSerializer",
     "PriceListInfoSerializer",
     "ProductParsingMapping",
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quoting', '0018_mark_404_products_as_discontinued'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceExtractionChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('provider', models.CharField(max_length=100)),
+                ('data', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Price Extraction Chunk',
+                'verbose_name_plural': 'Price Extraction Chunks',
+                'indexes': [models.Index(fields=['created_at'], name='quoting_pri_created_dfc2d4_idx')],
+            },
+        ),
+    ]
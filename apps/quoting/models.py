@@ -300,3 +300,25 @@ class ProductParsingMapping(models.Model):
 
     def __str__(self):
         return f"Mapping: {self.input_hash[:8]}... → {self.mapped_description or 'No description'}"
+
+
+class PriceExtractionChunk(models.Model):
+    """
+    Extracted price data for one page range of a supplier price list PDF.
+
+    Keyed by a hash of the provider, prompt and page bytes, so a retried
+    import skips the pages that already succeeded whichever worker runs it.
+    """
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    provider = models.CharField(max_length=100)
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Price Extraction Chunk"
+        verbose_name_plural = "Price Extraction Chunks"
+        indexes = [models.Index(fields=["created_at"])]
+
+    def __str__(self):
+        return f"{self.provider} chunk {self.content_hash[:12]}"
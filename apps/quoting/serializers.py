@@ -33,6 +33,14 @@ class PriceListInfoSerializer(serializers.Serializer):
     uploaded_at = serializers.DateTimeField()
 
 
+class ImportErrorSerializer(serializers.Serializer):
+    """A product that failed to import."""
+
+    index = serializers.IntegerField()
+    product_name = serializers.CharField(allow_blank=True)
+    message = serializers.CharField()
+
+
 class ImportStatisticsSerializer(serializers.Serializer):
     """Import statistics in response."""
 
@@ -42,6 +50,7 @@ class ImportStatisticsSerializer(serializers.Serializer):
     updated = serializers.IntegerField()
     skipped = serializers.IntegerField()
     failed = serializers.IntegerField()
+    errors = ImportErrorSerializer(many=True, required=False)
 
 
 class ValidationInfoSerializer(serializers.Serializer):
@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional, Tuple
 
 from apps.workflow.enums import AIProviderTypes
 
+from .chunked_price_extraction import ChunkedPriceExtractor
 from .providers.gemini_provider import GeminiPriceExtractionProvider
 
 # from .providers.claude_provider import ClaudePriceExtractionProvider
@@ -81,6 +82,10 @@ def get_prioritized_active_providers():
     return sorted_providers
 
 
+def _is_pdf(file_path: str, content_type: Optional[str]) -> bool:
+    return content_type == "application/pdf" or file_path.lower().endswith(".pdf")
+
+
 def extract_price_data(
     file_path: str, content_type: Optional[str] = None
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
@@ -124,6 +129,9 @@ def extract_price_data(
         logger.info(f"Provider created successfully: {provider.get_provider_name()}")
 
         logger.info(f"Starting extraction with {provider.get_provider_name()}")
+        if _is_pdf(file_path, content_type):
+            # Long price lists are extracted a few pages per request
+            provider = ChunkedPriceExtractor(provider)
         result = provider.extract_price_data(file_path, content_type)
         logger.info(f"Extraction completed with {provider.get_provider_name()}")
         return result
@@ -0,0 +1,262 @@
+"""
+Chunked Price Extraction
+
+Long supplier price lists are too big for a single LLM request: the response
+hits the output-token limit, is truncated or times out, and the whole PDF
+has to be sent again. ``ChunkedPriceExtractor`` wraps any price extraction
+provider and instead:
+
+1. splits the PDF into page ranges of ``pages_per_chunk`` pages,
+2. extracts the chunks concurrently on a bounded thread pool,
+3. merges the chunk results, dropping rows repeated across pages, and
+4. stores each successful chunk as a PriceExtractionChunk keyed by a hash of
+   its PDF bytes, so retrying an import, in any worker process, only
+   re-extracts the pages that failed.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PyPDF2 import PdfReader, PdfWriter
+
+from apps.quoting.models import PriceExtractionChunk
+
+from .providers.common import create_extraction_prompt
+
+logger = logging.getLogger(__name__)
+
+PAGES_PER_CHUNK = 5
+MAX_WORKERS = 4
+CHUNK_CACHE_TIMEOUT = 60 * 60 * 24
+
+UNKNOWN_SUPPLIER = "Unknown Supplier"
+
+
+@dataclass
+class PdfChunk:
+    """A page range of a PDF, as a standalone PDF document."""
+
+    first_page: int  # 1-based, inclusive
+    last_page: int
+    content: bytes
+
+    @property
+    def label(self) -> str:
+        if self.first_page == self.last_page:
+            return f"page {self.first_page}"
+        return f"pages {self.first_page}-{self.last_page}"
+
+
+@dataclass
+class ChunkResult:
+    chunk: PdfChunk
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def split_pdf(file_path: str, pages_per_chunk: int = PAGES_PER_CHUNK) -> List[PdfChunk]:
+    """Split a PDF into consecutive page ranges of at most ``pages_per_chunk`` pages."""
+    reader = PdfReader(file_path)
+    num_pages = len(reader.pages)
+    chunks = []
+    for start in range(0, num_pages, pages_per_chunk):
+        end = min(start + pages_per_chunk, num_pages)
+        writer = PdfWriter()
+        for page_num in range(start, end):
+            writer.add_page(reader.pages[page_num])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        chunks.append(PdfChunk(start + 1, end, buffer.getvalue()))
+    return chunks
+
+
+def merge_chunk_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge extracted chunk data into a single result, in page order.
+
+    The first named supplier wins. Items repeated across chunks (e.g. a row
+    split over a page break and picked up on both pages) are kept once.
+    """
+    supplier: Dict[str, Any] = {}
+    items = []
+    seen = set()
+    for data in results:
+        chunk_supplier = data.get("supplier") or {}
+        if not supplier.get("name") or supplier["name"] == UNKNOWN_SUPPLIER:
+            if chunk_supplier.get("name"):
+                supplier = chunk_supplier
+        for item in data.get("items") or []:
+            key = _item_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append(item)
+    return {"supplier": supplier or {"name": UNKNOWN_SUPPLIER}, "items": items}
+
+
+def _item_key(item: Dict[str, Any]) -> Tuple:
+    def text(field: str) -> str:
+        return str(item.get(field) or "").strip().lower()
+
+    return (
+        text("item_no"),
+        text("variant_id"),
+        text("product_name") or text("description"),
+        text("unit_price"),
+    )
+
+
+class ChunkedPriceExtractor:
+    """Extract price data from a PDF chunk by chunk with any provider."""
+
+    def __init__(
+        self,
+        provider,
+        pages_per_chunk: int = PAGES_PER_CHUNK,
+        max_workers: int = MAX_WORKERS,
+        cache_timeout: int = CHUNK_CACHE_TIMEOUT,
+    ):
+        self.provider = provider
+        self.pages_per_chunk = pages_per_chunk
+        self.max_workers = max_workers
+        self.cache_timeout = cache_timeout
+
+    def extract_price_data(
+        self, file_path: str, content_type: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Extract price data from a PDF, returning the provider's (data, error) shape.
+
+        If any chunk fails the import is not attempted with partial data:
+        an error naming the failed pages is returned, and the chunks that
+        succeeded are already stored for the retry.
+        """
+        try:
+            chunks = split_pdf(file_path, self.pages_per_chunk)
+        except Exception as e:
+            logger.exception(f"Could not split PDF {file_path}: {e}")
+            return None, f"Could not read PDF: {e}"
+        if not chunks:
+            return None, "PDF has no pages"
+
+        logger.info(
+            f"Extracting {len(chunks)} chunk(s) of up to {self.pages_per_chunk} pages "
+            f"from {os.path.basename(file_path)} with "
+            f"{self.provider.get_provider_name()}"
+        )
+        stored = self._stored_chunks(chunks)
+        by_index: Dict[int, ChunkResult] = {}
+        for index, chunk in enumerate(chunks):
+            data = stored.get(self.content_hash(chunk))
+            if data is not None:
+                logger.info(f"Using stored extraction for {chunk.label}")
+                by_index[index] = ChunkResult(chunk, data=data, cached=True)
+
+        missing = [i for i in range(len(chunks)) if i not in by_index]
+        if missing:
+            workers = max(1, min(self.max_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._extract_chunk, chunks[i]): i for i in missing
+                }
+                # Store each chunk as it finishes so a crash keeps the rest
+                for future in as_completed(futures):
+                    result = future.result()
+                    by_index[futures[future]] = result
+                    if not result.error:
+                        self._store_chunk(result)
+        results = [by_index[i] for i in range(len(chunks))]
+
+        failed = [result for result in results if result.error]
+        if failed:
+            details = "; ".join(f"{r.chunk.label}: {r.error}" for r in failed)
+            return None, (
+                f"Extraction failed for {len(failed)} of {len(results)} chunk(s) "
+                f"({details}). Completed pages are saved; retry to re-extract "
+                "only the failed pages."
+            )
+
+        merged = merge_chunk_results([result.data for result in results])
+        if not merged["items"]:
+            return None, "No items extracted from any page"
+
+        merged["parsing_stats"] = {
+            "items_found": len(merged["items"]),
+            "pages_processed": chunks[-1].last_page,
+            "chunks": len(chunks),
+            "cached_chunks": sum(1 for result in results if result.cached),
+            "extraction_method": (
+                f"{self.provider.get_provider_name()} (chunked, "
+                f"{self.pages_per_chunk} pages per request)"
+            ),
+        }
+        logger.info(
+            f"Extracted {len(merged['items'])} items from "
+            f"{chunks[-1].last_page} pages in {len(chunks)} chunk(s)"
+        )
+        return merged, None
+
+    def content_hash(self, chunk: PdfChunk) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.provider.get_provider_name().encode())
+        digest.update(create_extraction_prompt().encode())
+        digest.update(chunk.content)
+        return digest.hexdigest()
+
+    def _stored_chunks(self, chunks: List[PdfChunk]) -> Dict[str, Dict[str, Any]]:
+        """Data of the chunks extracted within cache_timeout, by content hash."""
+        cutoff = timezone.now() - timedelta(seconds=self.cache_timeout)
+        PriceExtractionChunk.objects.filter(created_at__lt=cutoff).delete()
+        return dict(
+            PriceExtractionChunk.objects.filter(
+                content_hash__in=[self.content_hash(chunk) for chunk in chunks]
+            ).values_list("content_hash", "data")
+        )
+
+    def _store_chunk(self, result: ChunkResult) -> None:
+        content_hash = self.content_hash(result.chunk)
+        with transaction.atomic():
+            PriceExtractionChunk.objects.filter(content_hash=content_hash).delete()
+            # Another import of the same pages may have stored it meanwhile
+            PriceExtractionChunk.objects.bulk_create(
+                [
+                    PriceExtractionChunk(
+                        content_hash=content_hash,
+                        provider=self.provider.get_provider_name(),
+                        data=result.data,
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+
+    def _extract_chunk(self, chunk: PdfChunk) -> ChunkResult:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+            temp_file.write(chunk.content)
+            chunk_path = temp_file.name
+        try:
+            data, error = self.provider.extract_price_data(
+                chunk_path, "application/pdf"
+            )
+        except Exception as e:
+            logger.exception(f"Extraction raised for {chunk.label}: {e}")
+            data, error = None, str(e)
+        finally:
+            os.unlink(chunk_path)
+            # Providers may touch the database from this worker thread
+            close_old_connections()
+
+        if error or data is None:
+            logger.warning(f"Extraction failed for {chunk.label}: {error}")
+            return ChunkResult(chunk, error=error or "No data returned")
+
+        return ChunkResult(chunk, data=data)
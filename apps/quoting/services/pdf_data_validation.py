@@ -2,7 +2,7 @@ import logging
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
-from apps.client.models import Client
+from apps.client.services.supplier_matching_service import supplier_matcher
 from apps.quoting.models import SupplierProduct
 
 logger = logging.getLogger(__name__)
@@ -282,9 +282,8 @@ class PDFDataValidationService:
         Returns:
             Dictionary with 'duplicates' and 'new' product lists
         """
-        try:
-            supplier = Client.objects.get(name=supplier_name)
-        except Client.DoesNotExist:
+        supplier = supplier_matcher.find(supplier_name)
+        if supplier is None:
             # If supplier doesn't exist, all products are new
             return {"duplicates": [], "new": products}
 
@@ -1,15 +1,133 @@
 import logging
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
+from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
 
 from apps.client.models import Client
+from apps.client.services.supplier_matching_service import supplier_matcher
 from apps.quoting.models import SupplierPriceList, SupplierProduct
-from apps.quoting.services.product_parser import create_mapping_record
+from apps.quoting.services.product_parser import prepare_mapping_records
 
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 500
+
+# Fields a duplicate_strategy="update" import rewrites on an existing product
+UPDATE_FIELDS = [
+    "description",
+    "specifications",
+    "variant_price",
+    "price_unit",
+    "updated_at",
+    "mapping_hash",
+]
+
+# Fields needed to match and report on a supplier's existing products
+INDEX_FIELDS = [
+    "id",
+    "supplier_id",
+    "price_list_id",
+    "product_name",
+    "item_no",
+    "variant_id",
+    "created_at",
+    *UPDATE_FIELDS,
+]
+
+
+@dataclass
+class ProductImportError:
+    """A product that could not be imported."""
+
+    index: int
+    product_name: str
+    message: str
+
+
+@dataclass
+class ProductImportResult:
+    """Outcome of a price list product import."""
+
+    imported: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[ProductImportError] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def add_error(self, index: int, product_data: Dict, message: str) -> None:
+        logger.error(f"Failed to import product {index}: {message}")
+        self.errors.append(
+            ProductImportError(
+                index=index,
+                product_name=product_data.get("product_name") or "",
+                message=message,
+            )
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "imported": self.imported,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": [
+                {
+                    "index": error.index,
+                    "product_name": error.product_name,
+                    "message": error.message,
+                }
+                for error in self.errors
+            ],
+        }
+
+
+class _ExistingProductIndex:
+    """In-memory lookup of a supplier's products by item_no, variant_id and name."""
+
+    def __init__(self, products=()):
+        self.by_item_no: Dict[str, SupplierProduct] = {}
+        self.by_variant_id: Dict[str, SupplierProduct] = {}
+        self.by_name: Dict[str, SupplierProduct] = {}
+        for product in products:
+            self.add(product)
+
+    @classmethod
+    def for_supplier(cls, supplier: Client) -> "_ExistingProductIndex":
+        return cls(
+            SupplierProduct.objects.filter(supplier=supplier)
+            .only(*INDEX_FIELDS)
+            .order_by("created_at")
+            .iterator(chunk_size=2000)
+        )
+
+    def add(self, product: SupplierProduct) -> None:
+        # The oldest product wins when several share a key
+        if product.item_no:
+            self.by_item_no.setdefault(product.item_no.strip(), product)
+        if product.variant_id:
+            self.by_variant_id.setdefault(product.variant_id.strip(), product)
+        if product.product_name:
+            self.by_name.setdefault(product.product_name.strip().lower(), product)
+
+    def find(self, product_data: Dict) -> Optional[SupplierProduct]:
+        """Find a matching product by item_no, then variant_id, then product name."""
+        item_no = (product_data.get("item_no") or "").strip()
+        if item_no and item_no in self.by_item_no:
+            return self.by_item_no[item_no]
+        variant_id = (product_data.get("variant_id") or "").strip()
+        if variant_id and variant_id in self.by_variant_id:
+            return self.by_variant_id[variant_id]
+        product_name = (product_data.get("product_name") or "").strip().lower()
+        if product_name:
+            return self.by_name.get(product_name)
+        return None
+
 
 class PDFImportService:
     """
@@ -38,18 +156,13 @@ class PDFImportService:
         Returns:
             Tuple of (Client instance, was_created boolean)
         """
-        try:
-            supplier = Client.objects.get(name=supplier_name)
-            logger.info(f"Found existing supplier: {supplier.name} (ID: {supplier.id})")
-            return supplier, False
-        except Client.DoesNotExist:
-            # Create new supplier
-            supplier = Client.objects.create(
-                name=supplier_name, is_supplier=True, xero_last_modified=timezone.now()
-            )
+        supplier, created = supplier_matcher.get_or_create_supplier(supplier_name)
+        if created:
             logger.info(f"Created new supplier: {supplier.name} (ID: {supplier.id})")
             self.import_stats["supplier_created"] = True
-            return supplier, True
+        else:
+            logger.info(f"Found existing supplier: {supplier.name} (ID: {supplier.id})")
+        return supplier, created
 
     def create_price_list(self, supplier: Client, filename: str) -> SupplierPriceList:
         """
@@ -76,274 +189,158 @@ class PDFImportService:
         supplier: Client,
         price_list: SupplierPriceList,
         duplicate_strategy: str = "skip",
-    ) -> Dict[str, int]:
+        batch_size: int = BATCH_SIZE,
+    ) -> ProductImportResult:
         """
         Import products to database with atomic transaction.
 
+        The supplier's existing products are loaded in one query and every
+        product is matched against that index in memory (by item_no, then
+        variant_id, then product name), so the work is one read plus chunked
+        bulk_create/bulk_update calls however long the price list is.
+        Products that fail validation are reported in the result rather than
+        aborting the import.
+
         Args:
             products: List of sanitized product dictionaries
             supplier: Supplier client instance
             price_list: Price list instance
             duplicate_strategy: How to handle duplicates ("skip", "update", "create_new")
+            batch_size: Rows per bulk insert/update statement
 
         Returns:
-            Dictionary with import statistics
+            ProductImportResult with counts and per-product errors
         """
-        imported_count = 0
-        failed_count = 0
-        updated_count = 0
-        skipped_count = 0
-
         logger.info(f"Starting import of {len(products)} products for {supplier.name}")
         logger.info(
             f"Sample product data: {products[0] if products else 'No products'}"
         )
 
+        result = ProductImportResult()
+        index = _ExistingProductIndex.for_supplier(supplier)
+        to_create: List[SupplierProduct] = []
+        to_update: Dict = {}
+        now = timezone.now()
+
         for idx, product_data in enumerate(products):
-            try:
-                logger.debug(
-                    f"Processing product {idx}: {product_data.get('product_name', 'Unknown')}"
-                )
-                result = self._import_single_product(
-                    product_data, supplier, price_list, duplicate_strategy, idx
-                )
+            existing = index.find(product_data)
+            if existing is not None and duplicate_strategy != "create_new":
+                if duplicate_strategy != "update":
+                    if duplicate_strategy != "skip":
+                        logger.warning(
+                            f"Unknown duplicate strategy '{duplicate_strategy}', "
+                            f"skipping product {idx}"
+                        )
+                    result.skipped += 1
+                    continue
+                error = self._apply_update(existing, product_data, now)
+                if error:
+                    result.add_error(idx, product_data, error)
+                    continue
+                # Products created earlier in this import are saved by the insert
+                if not existing._state.adding:
+                    to_update[existing.pk] = existing
+                result.updated += 1
+                continue
 
-                if result == "imported":
-                    imported_count += 1
-                elif result == "updated":
-                    updated_count += 1
-                elif result == "skipped":
-                    skipped_count += 1
-
-                # Log progress every 50 items
-                if (imported_count + updated_count + skipped_count) % 50 == 0:
-                    logger.info(
-                        f"Import progress: {imported_count + updated_count + skipped_count}/{len(products)} processed"
-                    )
-
-            except Exception as e:
-                failed_count += 1
-                error_msg = f"Failed to import product {idx}: {str(e)}"
-                logger.error(error_msg)
-                self.import_stats["errors"].append(error_msg)
-
-                # Continue with other products rather than failing entire import
+            variant_id = product_data.get("variant_id")
+            if existing is not None and variant_id:
+                # Modified variant_id avoids clashing with the existing product
+                variant_id = f"{variant_id}-NEW-{idx}"
+            product = SupplierProduct(
+                supplier=supplier,
+                price_list=price_list,
+                product_name=product_data.get("product_name"),
+                item_no=product_data.get("item_no", ""),
+                description=product_data.get("description", ""),
+                specifications=product_data.get("specifications", ""),
+                variant_id=variant_id,
+                variant_price=product_data.get("unit_price"),
+                price_unit=product_data.get("price_unit", "each"),
+                variant_available_stock=0,  # PDF doesn't have stock info
+                url="",  # PDF doesn't have URLs
+            )
+            error = self._validate_product(product)
+            if error:
+                result.add_error(idx, product_data, error)
                 continue
+            index.add(product)
+            to_create.append(product)
+            result.imported += 1
+
+        prepare_mapping_records(to_create + list(to_update.values()))
+        SupplierProduct.objects.bulk_create(to_create, batch_size=batch_size)
+        SupplierProduct.objects.bulk_update(
+            list(to_update.values()), UPDATE_FIELDS, batch_size=batch_size
+        )
 
-        # Update import statistics
+        for error in result.errors:
+            self.import_stats["errors"].append(
+                f"Failed to import product {error.index}: {error.message}"
+            )
         self.import_stats.update(
             {
-                "products_imported": imported_count,
-                "products_updated": updated_count,
-                "products_skipped": skipped_count,
-                "products_failed": failed_count,
+                "products_imported": result.imported,
+                "products_updated": result.updated,
+                "products_skipped": result.skipped,
+                "products_failed": result.failed,
             }
         )
 
         logger.info(
-            f"Import completed: {imported_count} imported, {updated_count} updated, "
-            f"{skipped_count} skipped, {failed_count} failed"
+            f"Import completed: {result.imported} imported, {result.updated} updated, "
+            f"{result.skipped} skipped, {result.failed} failed"
         )
+        return result
 
-        return {
-            "imported": imported_count,
-            "updated": updated_count,
-            "skipped": skipped_count,
-            "failed": failed_count,
-        }
-
-    def _import_single_product(
-        self,
-        product_data: Dict,
-        supplier: Client,
-        price_list: SupplierPriceList,
-        duplicate_strategy: str,
-        index: int,
-    ) -> str:
+    def _apply_update(
+        self, product: SupplierProduct, product_data: Dict, now
+    ) -> Optional[str]:
         """
-        Import a single product with duplicate handling.
+        Update an existing product with new data, preserving created_at.
 
-        Args:
-            product_data: Sanitized product data dictionary
-            supplier: Supplier client instance
-            price_list: Price list instance
-            duplicate_strategy: How to handle duplicates
-            index: Product index for logging
-
-        Returns:
-            String indicating the action taken ("imported", "updated", "skipped")
-        """
-        # Check for existing product
-        existing_product = self._find_existing_product(product_data, supplier)
-
-        if existing_product:
-            return self._handle_duplicate_product(
-                existing_product, product_data, duplicate_strategy, index
-            )
-        else:
-            # Create new product
-            return self._create_new_product(product_data, supplier, price_list, index)
-
-    def _find_existing_product(
-        self, product_data: Dict, supplier: Client
-    ) -> SupplierProduct:
+        Returns a validation error message, leaving the product unchanged, or None.
         """
-        Find existing product by item_no or product_name.
-
-        Args:
-            product_data: Product data dictionary
-            supplier: Supplier client instance
-
-        Returns:
-            Existing SupplierProduct instance or None
-        """
-        item_no = product_data.get("item_no", "").strip()
-        product_name = product_data.get("product_name", "").strip()
-
-        # First try to find by item_no (more specific)
-        if item_no:
-            try:
-                return SupplierProduct.objects.get(supplier=supplier, item_no=item_no)
-            except SupplierProduct.DoesNotExist:
-                pass
-
-        # Then try by product_name (case-insensitive)
-        if product_name:
-            try:
-                return SupplierProduct.objects.get(
-                    supplier=supplier, product_name__iexact=product_name
-                )
-            except SupplierProduct.DoesNotExist:
-                pass
-
-        return None
-
-    def _handle_duplicate_product(
-        self,
-        existing_product: SupplierProduct,
-        product_data: Dict,
-        strategy: str,
-        index: int,
-    ) -> str:
-        """
-        Handle duplicate product based on strategy.
-
-        Args:
-            existing_product: Existing SupplierProduct instance
-            product_data: New product data
-            strategy: Duplicate handling strategy
-            index: Product index for logging
-
-        Returns:
-            String indicating action taken
-        """
-        if strategy == "skip":
-            logger.debug(
-                f"Skipping duplicate product {index}: {existing_product.product_name}"
-            )
-            return "skipped"
-
-        elif strategy == "update":
-            # Update existing product with new data
-            self._update_existing_product(existing_product, product_data)
-            logger.info(
-                f"Updated existing product {index}: {existing_product.product_name}"
-            )
-            return "updated"
-
-        elif strategy == "create_new":
-            # Create new product with modified variant_id to avoid conflicts
-            product_data["variant_id"] = f"{product_data['variant_id']}-NEW-{index}"
-            return self._create_new_product(
-                product_data,
-                existing_product.supplier,
-                existing_product.price_list,
-                index,
-            )
-
-        else:
-            logger.warning(
-                f"Unknown duplicate strategy '{strategy}', skipping product {index}"
-            )
-            return "skipped"
-
-    def _update_existing_product(
-        self, existing_product: SupplierProduct, product_data: Dict
-    ):
-        """
-        Update existing product with new data.
-
-        Args:
-            existing_product: Existing SupplierProduct instance
-            product_data: New product data dictionary
-        """
-        # Update fields but preserve created_at timestamp
-        existing_product.description = product_data.get(
-            "description", existing_product.description
-        )
-        existing_product.specifications = product_data.get(
-            "specifications", existing_product.specifications
-        )
-        existing_product.variant_price = product_data.get(
-            "unit_price", existing_product.variant_price
+        original = {name: getattr(product, name) for name in UPDATE_FIELDS}
+        product.description = product_data.get("description", product.description)
+        product.specifications = product_data.get(
+            "specifications", product.specifications
         )
-        existing_product.price_unit = product_data.get(
-            "price_unit", existing_product.price_unit
-        )
-
-        # Update timestamp
-        existing_product.updated_at = timezone.now()
-        existing_product.save()
-
-        # Create new mapping record for updated product
-        create_mapping_record(existing_product)
-
-    def _create_new_product(
-        self,
-        product_data: Dict,
-        supplier: Client,
-        price_list: SupplierPriceList,
-        index: int,
-    ) -> str:
-        """
-        Create a new product record.
-
-        Args:
-            product_data: Product data dictionary
-            supplier: Supplier client instance
-            price_list: Price list instance
-            index: Product index for logging
-
-        Returns:
-            String indicating action taken ("imported")
-        """
-        # Create the product
-        logger.debug(f"Creating product with data: {product_data}")
+        product.variant_price = product_data.get("unit_price", product.variant_price)
+        product.price_unit = product_data.get("price_unit", product.price_unit)
+        # bulk_update skips auto_now, so stamp it explicitly
+        product.updated_at = now
+
+        error = self._validate_product(product)
+        if error:
+            for name, value in original.items():
+                setattr(product, name, value)
+        return error
+
+    @staticmethod
+    def _validate_product(product: SupplierProduct) -> Optional[str]:
+        """Validate field values in Python so one bad row cannot fail a bulk insert."""
+        if not product.product_name:
+            return "Missing product_name"
+        if not product.variant_id:
+            return "Missing variant_id"
         try:
-            product = SupplierProduct.objects.create(
-                supplier=supplier,
-                price_list=price_list,
-                product_name=product_data["product_name"],
-                item_no=product_data.get("item_no", ""),
-                description=product_data.get("description", ""),
-                specifications=product_data.get("specifications", ""),
-                variant_id=product_data["variant_id"],
-                variant_price=product_data.get("unit_price"),
-                price_unit=product_data.get("price_unit", "each"),
-                variant_available_stock=0,  # PDF doesn't have stock info
-                url="",  # PDF doesn't have URLs
+            # Deferred fields of prefetched products are left alone rather
+            # than loaded one query at a time
+            product.clean_fields(
+                exclude=[
+                    "supplier",
+                    "price_list",
+                    "url",
+                    *product.get_deferred_fields(),
+                ]
             )
-            logger.debug(f"Successfully created product: {product.id}")
-        except Exception as create_error:
-            logger.error(f"Failed to create product: {create_error}")
-            logger.error(f"Product data: {product_data}")
-            raise
-
-        # Create mapping record for LLM processing
-        create_mapping_record(product)
-
-        logger.debug(f"Created new product {index}: {product.product_name}")
-        return "imported"
+        except ValidationError as exc:
+            return "; ".join(
+                f"{field}: {' '.join(messages)}"
+                for field, messages in exc.message_dict.items()
+            )
+        return None
 
     def handle_duplicates(
         self, products: List[Dict], supplier_name: str, strategy: str = "skip"
@@ -359,9 +356,8 @@ class PDFImportService:
         Returns:
             Dictionary with duplicate analysis results
         """
-        try:
-            supplier = Client.objects.get(name=supplier_name)
-        except Client.DoesNotExist:
+        supplier = supplier_matcher.find(supplier_name)
+        if supplier is None:
             # No supplier exists, so no duplicates possible
             return {
                 "duplicates_found": 0,
@@ -369,11 +365,12 @@ class PDFImportService:
                 "action": "all_new",
             }
 
+        index = _ExistingProductIndex.for_supplier(supplier)
         duplicates = []
         new_products = []
 
         for product in products:
-            existing = self._find_existing_product(product, supplier)
+            existing = index.find(product)
             if existing:
                 duplicates.append(
                     {
@@ -465,6 +465,52 @@ def create_mapping_record(instance):
         logging.info(f"Updated some shite:  {ppm}")
 
 
+def prepare_mapping_records(products, batch_size: int = 500) -> int:
+    """
+    Bulk counterpart of create_mapping_record for unsaved products.
+
+    Sets mapping_hash on each instance (the caller saves it along with the
+    rest of the product) and creates the missing ProductParsingMapping
+    records with one existence query and one insert per batch.
+
+    Returns:
+        Number of mapping records created
+    """
+    inputs = {}
+    for product in products:
+        product.mapping_hash = calculate_supplier_product_hash(product)
+        inputs.setdefault(
+            product.mapping_hash,
+            {
+                "input_description": product.description or product.product_name or "",
+                "input_product_name": product.product_name or "",
+                "input_specifications": product.specifications or "",
+            },
+        )
+
+    hashes = list(inputs)
+    created = 0
+    for start in range(0, len(hashes), batch_size):
+        batch = hashes[start : start + batch_size]
+        existing = set(
+            ProductParsingMapping.objects.filter(input_hash__in=batch).values_list(
+                "input_hash", flat=True
+            )
+        )
+        missing = [
+            ProductParsingMapping(
+                input_hash=input_hash,
+                input_data=json.dumps(inputs[input_hash], indent=2),
+                created_at=timezone.now(),
+            )
+            for input_hash in batch
+            if input_hash not in existing
+        ]
+        ProductParsingMapping.objects.bulk_create(missing, ignore_conflicts=True)
+        created += len(missing)
+    return created
+
+
 def populate_all_mappings_with_llm():
     """Batch process all unpopulated ProductParsingMapping records with LLM."""
     # Find all unpopulated mappings
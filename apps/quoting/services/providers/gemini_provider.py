@@ -90,7 +90,7 @@ class GeminiPriceExtractionProvider:
         if not supplier_info.get("name"):
             # Try to extract supplier name from filename - if it matches our company, it's us not the supplier
             filename = os.path.basename(file_path).lower()
-            company = CompanyDefaults.get_instance()
+            company = CompanyDefaults.get_cached()
             company_name_lower = company.company_name.lower()
             # Check if filename contains our company name (we're the customer, not the supplier)
             if company_name_lower in filename or any(
@@ -371,6 +371,7 @@ class GeminiPriceExtractionProvider:
             logger.info(f"Processing {num_pages} pages individually...")
             all_items = []
             supplier_info = {}
+            failed_pages = []
 
             # Process each page
             for page_num in range(num_pages):
@@ -403,6 +404,7 @@ class GeminiPriceExtractionProvider:
                         logger.warning(
                             f"Page {page_num + 1}: Extraction failed - {error}"
                         )
+                        failed_pages.append(f"page {page_num + 1}: {error}")
 
                 finally:
                     # Clean up temporary file
@@ -412,24 +414,26 @@ class GeminiPriceExtractionProvider:
                         # FIXME: All erros must always be logged
                         pass  # Ignore cleanup errors
 
+            # A failed page fails the whole document so callers can retry it;
+            # pages that simply have no prices (covers, terms) are not failures
+            if failed_pages:
+                return None, "; ".join(failed_pages)
+
             # Create final result
-            if all_items:
-                result = {
-                    "supplier": supplier_info,
-                    "items": all_items,
-                    "parsing_stats": {
-                        "total_lines": len(str(all_items).split("\n")),
-                        "items_found": len(all_items),
-                        "pages_processed": num_pages,
-                        "extraction_method": "Gemini 2.5 Flash (Page-by-page)",
-                    },
-                }
-                logger.info(
-                    f"Successfully extracted {len(all_items)} items from {num_pages} pages"
-                )
-                return result, None
-            else:
-                return None, "No items extracted from any page"
+            result = {
+                "supplier": supplier_info,
+                "items": all_items,
+                "parsing_stats": {
+                    "total_lines": len(str(all_items).split("\n")),
+                    "items_found": len(all_items),
+                    "pages_processed": num_pages,
+                    "extraction_method": "Gemini 2.5 Flash (Page-by-page)",
+                },
+            }
+            logger.info(
+                f"Successfully extracted {len(all_items)} items from {num_pages} pages"
+            )
+            return result, None
 
         except Exception as e:
             logger.exception(f"Error in multi-page extraction: {e}")
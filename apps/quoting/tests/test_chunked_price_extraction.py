@@ -0,0 +1,144 @@
+import os
+import tempfile
+import threading
+from datetime import timedelta
+
+import pdfplumber
+from django.utils import timezone
+from reportlab.pdfgen import canvas
+
+from apps.quoting.models import PriceExtractionChunk
+from apps.quoting.services.chunked_price_extraction import (
+    ChunkedPriceExtractor,
+    merge_chunk_results,
+    split_pdf,
+)
+from apps.testing import BaseTestCase
+
+
+class StubPriceExtractionProvider:
+    """Provider that 'extracts' one item per page from the page's text."""
+
+    def __init__(self, failing_pages=()):
+        self.failing_pages = set(failing_pages)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_provider_name(self):
+        return "Stub"
+
+    def extract_price_data(self, file_path, content_type=None):
+        with pdfplumber.open(file_path) as pdf:
+            texts = [page.extract_text().strip() for page in pdf.pages]
+        with self._lock:
+            self.calls.append(texts)
+        failed = [text for text in texts if text in self.failing_pages]
+        if failed:
+            return None, f"timed out on {', '.join(failed)}"
+        items = [
+            {
+                "product_name": f"Product {text}",
+                "item_no": text,
+                "variant_id": text,
+                "unit_price": 10.0,
+            }
+            for text in texts
+        ]
+        # Every chunk repeats the document's first row, like a running header
+        items.insert(
+            0,
+            {
+                "product_name": "Product P1",
+                "item_no": "P1",
+                "variant_id": "P1",
+                "unit_price": 10.0,
+            },
+        )
+        return {"supplier": {"name": "Stub Metals"}, "items": items}, None
+
+
+class ChunkedPriceExtractorTest(BaseTestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
+            self.pdf_path = pdf_file.name
+        self.addCleanup(os.unlink, self.pdf_path)
+        pdf = canvas.Canvas(self.pdf_path)
+        for page in range(1, 24):
+            pdf.drawString(100, 700, f"P{page}")
+            pdf.showPage()
+        pdf.save()
+
+    def test_split_pdf_into_page_ranges(self):
+        chunks = split_pdf(self.pdf_path, pages_per_chunk=5)
+
+        self.assertEqual(
+            [(chunk.first_page, chunk.last_page) for chunk in chunks],
+            [(1, 5), (6, 10), (11, 15), (16, 20), (21, 23)],
+        )
+
+    def test_chunks_are_extracted_and_merged_in_page_order(self):
+        provider = StubPriceExtractionProvider()
+
+        data, error = ChunkedPriceExtractor(
+            provider, pages_per_chunk=5, max_workers=3
+        ).extract_price_data(self.pdf_path, "application/pdf")
+
+        self.assertIsNone(error)
+        self.assertEqual(len(provider.calls), 5)
+        self.assertEqual(
+            [item["item_no"] for item in data["items"]],
+            [f"P{page}" for page in range(1, 24)],
+        )
+        self.assertEqual(data["supplier"]["name"], "Stub Metals")
+        self.assertEqual(data["parsing_stats"]["pages_processed"], 23)
+
+    def test_retry_only_re_extracts_failed_chunks(self):
+        flaky = StubPriceExtractionProvider(failing_pages={"P12"})
+        extractor = ChunkedPriceExtractor(flaky, pages_per_chunk=5)
+
+        data, error = extractor.extract_price_data(self.pdf_path)
+
+        self.assertIsNone(data)
+        self.assertIn("pages 11-15", error)
+
+        healthy = StubPriceExtractionProvider()
+        data, error = ChunkedPriceExtractor(
+            healthy, pages_per_chunk=5
+        ).extract_price_data(self.pdf_path)
+
+        self.assertIsNone(error)
+        self.assertEqual(healthy.calls, [[f"P{page}" for page in range(11, 16)]])
+        self.assertEqual(data["parsing_stats"]["cached_chunks"], 4)
+        self.assertEqual(len(data["items"]), 23)
+
+    def test_chunks_older_than_the_timeout_are_re_extracted(self):
+        ChunkedPriceExtractor(
+            StubPriceExtractionProvider(), pages_per_chunk=5
+        ).extract_price_data(self.pdf_path)
+        self.assertEqual(PriceExtractionChunk.objects.count(), 5)
+        PriceExtractionChunk.objects.update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+
+        provider = StubPriceExtractionProvider()
+        data, error = ChunkedPriceExtractor(
+            provider, pages_per_chunk=5
+        ).extract_price_data(self.pdf_path)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(provider.calls), 5)
+        self.assertEqual(data["parsing_stats"]["cached_chunks"], 0)
+        self.assertEqual(PriceExtractionChunk.objects.count(), 5)
+
+    def test_merge_prefers_named_supplier_and_drops_repeated_rows(self):
+        row = {"item_no": "A1", "variant_id": "A1", "unit_price": "5.00"}
+
+        merged = merge_chunk_results(
+            [
+                {"supplier": {"name": "Unknown Supplier"}, "items": [row]},
+                {"supplier": {"name": "Real Supplier"}, "items": [dict(row)]},
+            ]
+        )
+
+        self.assertEqual(merged["supplier"]["name"], "Real Supplier")
+        self.assertEqual(merged["items"], [row])
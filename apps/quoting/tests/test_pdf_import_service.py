@@ -0,0 +1,147 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.client.models import Client
+from apps.quoting.models import (
+    ProductParsingMapping,
+    SupplierPriceList,
+    SupplierProduct,
+)
+from apps.quoting.services.pdf_import_service import PDFImportService
+from apps.testing import BaseTestCase
+
+
+class PDFImportServiceTest(BaseTestCase):
+    def setUp(self):
+        self.supplier = Client.objects.create(
+            name="Import Supplier",
+            is_supplier=True,
+            xero_last_modified=timezone.now(),
+        )
+        self.old_list = SupplierPriceList.objects.create(
+            supplier=self.supplier, file_name="old.pdf"
+        )
+        self.price_list = SupplierPriceList.objects.create(
+            supplier=self.supplier, file_name="new.pdf"
+        )
+        self.existing = SupplierProduct.objects.create(
+            supplier=self.supplier,
+            price_list=self.old_list,
+            product_name="Flat Bar 30x10",
+            item_no="FB-3010",
+            variant_id="FB-3010-6M",
+            variant_price=Decimal("10.00"),
+            price_unit="each",
+            url="",
+        )
+        self.service = PDFImportService()
+
+    def _product(self, n, **overrides):
+        product = {
+            "product_name": f"Angle {n}",
+            "item_no": f"ANG-{n}",
+            "variant_id": f"ANG-{n}-V",
+            "description": f"Aluminium angle {n}",
+            "unit_price": 12.5,
+            "price_unit": "per metre",
+        }
+        product.update(overrides)
+        return product
+
+    def test_query_count_does_not_grow_with_price_list_size(self):
+        with CaptureQueriesContext(connection) as small:
+            self.service.import_products(
+                [self._product(n) for n in range(5)],
+                self.supplier,
+                self.price_list,
+            )
+        with CaptureQueriesContext(connection) as large:
+            self.service.import_products(
+                [self._product(n) for n in range(100, 400)],
+                self.supplier,
+                self.price_list,
+            )
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(
+            SupplierProduct.objects.filter(price_list=self.price_list).count(), 305
+        )
+        # Mapping hashes are stored with the insert, not in a follow-up update
+        created = SupplierProduct.objects.get(item_no="ANG-100")
+        self.assertTrue(
+            ProductParsingMapping.objects.filter(
+                input_hash=created.mapping_hash
+            ).exists()
+        )
+
+    def test_update_strategy_updates_matches_by_item_no_variant_and_name(self):
+        result = self.service.import_products(
+            [
+                self._product(1, item_no="FB-3010", unit_price=11),
+                self._product(2, item_no="", variant_id="FB-3010-6M", unit_price=12),
+                self._product(
+                    3, item_no="", variant_id="", product_name="flat bar 30x10"
+                ),
+                self._product(4),
+            ],
+            self.supplier,
+            self.price_list,
+            duplicate_strategy="update",
+        )
+
+        self.assertEqual((result.imported, result.updated, result.failed), (1, 3, 0))
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.variant_price, Decimal("12.50"))
+        self.assertEqual(self.existing.price_unit, "per metre")
+        # Updates keep the product on its original price list
+        self.assertEqual(self.existing.price_list, self.old_list)
+
+    def test_skip_and_create_new_strategies(self):
+        duplicate = self._product(1, item_no="FB-3010", variant_id="FB-3010-6M")
+
+        skipped = self.service.import_products(
+            [duplicate], self.supplier, self.price_list, duplicate_strategy="skip"
+        )
+        created = self.service.import_products(
+            [dict(duplicate)],
+            self.supplier,
+            self.price_list,
+            duplicate_strategy="create_new",
+        )
+
+        self.assertEqual(skipped.skipped, 1)
+        self.assertEqual(created.imported, 1)
+        self.assertTrue(
+            SupplierProduct.objects.filter(variant_id="FB-3010-6M-NEW-0").exists()
+        )
+
+    def test_duplicates_within_one_price_list_are_detected(self):
+        result = self.service.import_products(
+            [self._product(1), self._product(1, unit_price=99)],
+            self.supplier,
+            self.price_list,
+        )
+
+        self.assertEqual((result.imported, result.skipped), (1, 1))
+        self.assertEqual(SupplierProduct.objects.filter(item_no="ANG-1").count(), 1)
+
+    def test_invalid_products_are_reported_without_failing_the_import(self):
+        result = self.service.import_products(
+            [
+                self._product(1),
+                self._product(2, product_name=""),
+                self._product(3, unit_price="not a price"),
+                self._product(4, variant_id="V" * 101),
+            ],
+            self.supplier,
+            self.price_list,
+        )
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual([error.index for error in result.errors], [1, 2, 3])
+        self.assertIn("variant_price", result.errors[1].message)
+        self.assertEqual(result.to_dict()["failed"], 3)
+        self.assertEqual(self.service.get_import_stats()["products_failed"], 3)
@@ -223,10 +223,10 @@ def extract_supplier_price_list_data_view(request):
                 # Import products
                 logger.info("Importing products...")
                 duplicate_strategy = request.POST.get("duplicate_strategy", "skip")
-                import_stats = import_service.import_products(
+                import_result = import_service.import_products(
                     products, supplier, price_list, duplicate_strategy
                 )
-                logger.info(f"Import stats: {import_stats}")
+                logger.info(f"Import stats: {import_result.to_dict()}")
 
         except Exception as db_error:
             logger.exception(f"Database import failed: {db_error}")
@@ -256,10 +256,11 @@ def extract_supplier_price_list_data_view(request):
             "statistics": {
                 "total_extracted": len(extracted_data.get("items", [])),
                 "total_valid": len(products),
-                "imported": import_stats.get("imported", 0),
-                "updated": import_stats.get("updated", 0),
-                "skipped": import_stats.get("skipped", 0),
-                "failed": import_stats.get("failed", 0),
+                "imported": import_result.imported,
+                "updated": import_result.updated,
+                "skipped": import_result.skipped,
+                "failed": import_result.failed,
+                "errors": import_result.to_dict()["errors"],
             },
             "validation": {
                 "warnings": validation_warnings,
@@ -268,7 +269,7 @@ def extract_supplier_price_list_data_view(request):
             "import_stats": import_service.get_import_stats(),
         }
 
-        logger.info(f"Processing completed successfully: {import_stats}")
+        logger.info(f"Processing completed successfully: {import_result.to_dict()}")
         return JsonResponse(results)
 
     except AlreadyLoggedException as exc:
@@ -9,7 +9,22 @@ from django.test import TestCase, TransactionTestCase
 from rest_framework.test import APITestCase
 
 
-class BaseTestCase(TestCase):
+class CompanyDefaultsCacheMixin:
+    """
+    Drops the process copy of CompanyDefaults before each test. The database
+    is rolled back between tests but the cached copy is not, so a copy loaded
+    by an earlier test could otherwise leak into the next one.
+    """
+
+    @classmethod
+    def _pre_setup(cls):
+        from apps.workflow.models import CompanyDefaults
+
+        super()._pre_setup()
+        CompanyDefaults.invalidate_cache()
+
+
+class BaseTestCase(CompanyDefaultsCacheMixin, TestCase):
     """
     Base test case that loads required fixtures.
 
@@ -21,7 +36,7 @@ class BaseTestCase(TestCase):
     fixtures = ["company_defaults"]
 
 
-class BaseTransactionTestCase(TransactionTestCase):
+class BaseTransactionTestCase(CompanyDefaultsCacheMixin, TransactionTestCase):
     """
     Base transaction test case that loads required fixtures.
 
@@ -32,7 +47,7 @@ class BaseTransactionTestCase(TransactionTestCase):
     fixtures = ["company_defaults"]
 
 
-class BaseAPITestCase(APITestCase):
+class BaseAPITestCase(CompanyDefaultsCacheMixin, APITestCase):
     """
     Base API test case that loads required fixtures.
 
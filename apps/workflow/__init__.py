@@ -16,10 +16,12 @@ try:
         from .context_processors import debug_mode
         from .middleware import (
             AccessLoggingMiddleware,
+            CompanyDefaultsMemoMiddleware,
             DisallowedHostMiddleware,
             FrontendRedirectMiddleware,
             LoginRequiredMiddleware,
             PasswordStrengthMiddleware,
+            RequestProfilingMiddleware,
         )
         from .middleware_bearer import BearerIdentityMiddleware
         from .permissions import F
@@ -27,17 +29,22 @@ try:
         from .scheduler_jobs import (
             xero_30_day_sync_job,
             xero_heartbeat_job,
+            xero_outbox_job,
             xero_regular_sync_job,
         )
         from .serializers import (
             AIProviderCreateUpdateSerializer,
             AIProviderSerializer,
-            AWSInstanceStatusResponseSerializer,
             AppErrorDetailResponseSerializer,
+            AppErrorGroupSerializer,
             AppErrorListResponseSerializer,
             AppErrorSerializer,
+            AWSInstanceStatusResponseSerializer,
             CompanyDefaultsSchemaSerializer,
             CompanyDefaultsSerializer,
+            EndpointStatsResponseSerializer,
+            EndpointStatsSerializer,
+            RepeatedQuerySerializer,
             SettingsFieldSerializer,
             SettingsSectionSerializer,
             XeroAccountSerializer,
@@ -52,6 +59,8 @@ try:
             XeroPingResponseSerializer,
             XeroQuoteCreateSerializer,
             XeroSseEventSerializer,
+            XeroSubmissionCreateSerializer,
+            XeroSubmissionSerializer,
             XeroSyncInfoResponseSerializer,
             XeroSyncStartResponseSerializer,
             XeroTokenSerializer,
@@ -83,16 +92,22 @@ __all__ = [
     "AccessLoggingMiddleware",
     "AlreadyLoggedException",
     "AppErrorDetailResponseSerializer",
+    "AppErrorGroupSerializer",
     "AppErrorListResponseSerializer",
     "AppErrorSerializer",
     "BearerIdentityMiddleware",
+    "CompanyDefaultsMemoMiddleware",
     "CompanyDefaultsSchemaSerializer",
     "CompanyDefaultsSerializer",
     "DisallowedHostMiddleware",
+    "EndpointStatsResponseSerializer",
+    "EndpointStatsSerializer",
     "F",
     "FrontendRedirectMiddleware",
     "LoginRequiredMiddleware",
     "PasswordStrengthMiddleware",
+    "RepeatedQuerySerializer",
+    "RequestProfilingMiddleware",
     "ServiceAPIKeyAuthentication",
     "SettingsFieldSerializer",
     "SettingsSectionSerializer",
@@ -109,6 +124,8 @@ __all__ = [
     "XeroPingResponseSerializer",
     "XeroQuoteCreateSerializer",
     "XeroSseEventSerializer",
+    "XeroSubmissionCreateSerializer",
+    "XeroSubmissionSerializer",
     "XeroSyncInfoResponseSerializer",
     "XeroSyncStartResponseSerializer",
     "XeroTokenSerializer",
@@ -131,5 +148,6 @@ __all__ = [
     "validate_webhook_signature",
     "xero_30_day_sync_job",
     "xero_heartbeat_job",
+    "xero_outbox_job",
     "xero_regular_sync_job",
 ]
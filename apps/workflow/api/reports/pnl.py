@@ -1,13 +1,12 @@
 from datetime import datetime, timedelta
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import Sum
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.workflow.models import XeroJournalLineItem
+from apps.workflow.services.journal_rollup_service import JournalRollupService
 
 
 class CompanyProfitAndLossReport(APIView):
@@ -42,20 +41,7 @@ class CompanyProfitAndLossReport(APIView):
         """
         Roll up line items for all document types into a single dictionary.
         """
-        journal_rollup = (
-            XeroJournalLineItem.objects.filter(
-                journal__journal_date__range=[period_start, period_end]
-            )
-            .values("account__account_type", "account__account_name")
-            .annotate(total=Sum("net_amount"))
-        )
-
-        consolidated_rollup = {}
-        for item in journal_rollup:
-            key = (item["account__account_type"], item["account__account_name"])
-            consolidated_rollup[key] = consolidated_rollup.get(key, 0) + item["total"]
-
-        return consolidated_rollup
+        return JournalRollupService.period_totals([(period_start, period_end)])[0]
 
     def calculate_totals(self, report, compare_periods, period_index):
         """
@@ -133,9 +119,12 @@ class CompanyProfitAndLossReport(APIView):
             },
         }
 
-        for period_index, (period_start, period_end) in enumerate(date_ranges):
-            consolidated_rollup = self.rollup_line_items(period_start, period_end)
+        # All periods are answered together from the monthly rollup table
+        period_rollups = JournalRollupService.period_totals(
+            [(start.date(), end.date()) for start, end in date_ranges]
+        )
 
+        for period_index, consolidated_rollup in enumerate(period_rollups):
             for (account_type, account_name), total in consolidated_rollup.items():
                 self.categorize_transaction(
                     account_name,
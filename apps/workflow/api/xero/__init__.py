@@ -32,6 +32,8 @@ try:
             validate_pay_items_for_week,
         )
         from .reprocess_xero import (
+            ReprocessResult,
+            XeroReprocessor,
             reprocess_all,
             reprocess_bills,
             reprocess_clients,
@@ -43,11 +45,14 @@ try:
             set_journal_fields,
         )
         from .stock_sync import (
+            build_item_payload,
             fetch_all_xero_items,
             fix_long_item_codes,
             generate_item_code,
             get_xero_item_by_code_from_lookup,
+            resolve_stock_accounts,
             sync_all_local_stock_to_xero,
+            sync_stock_items_to_xero,
             sync_stock_to_xero,
             update_stock_item_codes,
             validate_stock_for_xero,
@@ -117,6 +122,9 @@ except (ImportError, RuntimeError):
     pass
 
 __all__ = [
+    "ReprocessResult",
+    "XeroReprocessor",
+    "build_item_payload",
     "bulk_create_contacts_in_xero",
     "clean_json",
     "create_client_contact_in_xero",
@@ -173,6 +181,7 @@ __all__ = [
     "reprocess_credit_notes",
     "reprocess_invoices",
     "reprocess_journals",
+    "resolve_stock_accounts",
     "seed_clients_to_xero",
     "seed_jobs_to_xero",
     "serialize_xero_object",
@@ -193,6 +202,7 @@ __all__ = [
     "sync_single_contact",
     "sync_single_invoice",
     "sync_single_pay_run",
+    "sync_stock_items_to_xero",
     "sync_stock_to_xero",
     "sync_time_entries_bulk",
     "sync_xero_data",
@@ -1,8 +1,14 @@
 # workflow/xero/reprocess_xero.py
 import logging
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
 from decimal import Decimal
+from itertools import batched
+from typing import Dict, Optional, Set
 
+from django.db import close_old_connections, transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
@@ -15,44 +21,120 @@ from apps.accounting.models import (
     InvoiceLineItem,
 )
 from apps.client.models import Client, ClientContact, SupplierPickupAddress
-from apps.workflow.models import XeroAccount, XeroJournal, XeroJournalLineItem
-from apps.workflow.services.error_persistence import persist_and_raise
+from apps.workflow.models import (
+    XeroAccount,
+    XeroJournal,
+    XeroJournalLineItem,
+    XeroReprocessCheckpoint,
+)
+from apps.workflow.services.error_persistence import (
+    persist_and_raise,
+    persist_app_error,
+)
 
 logger = logging.getLogger("xero")
 
-
-def set_invoice_or_bill_fields(document, document_type, new_from_xero=False):
+CHUNK_SIZE = 500
+MAX_WORKERS = 4
+BULK_BATCH_SIZE = 500
+
+# document_type -> (document model, line item model, line item FK field)
+DOCUMENT_MODELS = {
+    "INVOICE": (Invoice, InvoiceLineItem, "invoice"),
+    "BILL": (Bill, BillLineItem, "bill"),
+    "CREDIT_NOTE": (CreditNote, CreditNoteLineItem, "credit_note"),
+}
+
+JSON_DOCUMENT_TYPES = {
+    "ACCREC": "INVOICE",
+    "ACCPAY": "BILL",
+    "ACCRECCREDIT": "CREDIT_NOTE",
+    "ACCPAYCREDIT": "CREDIT_NOTE",
+}
+
+DOCUMENT_FIELDS = [
+    "xero_id",
+    "number",
+    "date",
+    "due_date",
+    "status",
+    "tax",
+    "total_excl_tax",
+    "total_incl_tax",
+    "amount_due",
+    "xero_last_modified",
+    "xero_last_synced",
+    "client",
+]
+
+LINE_ITEM_FIELDS = [
+    "quantity",
+    "unit_price",
+    "description",
+    "account",
+    "tax_amount",
+    "line_amount_excl_tax",
+    "line_amount_incl_tax",
+]
+
+JOURNAL_FIELDS = [
+    "journal_date",
+    "created_date_utc",
+    "journal_number",
+    "reference",
+    "source_id",
+    "source_type",
+    "xero_last_modified",
+]
+
+JOURNAL_LINE_FIELDS = [
+    "account",
+    "description",
+    "net_amount",
+    "gross_amount",
+    "tax_amount",
+    "tax_type",
+    "tax_name",
+    "raw_json",
+    "django_updated_at",
+]
+
+
+def _account_ids() -> Dict[Optional[str], uuid.UUID]:
+    """Map account_code to XeroAccount id, first account wins like .first()."""
+    account_ids = {}
+    for code, account_id in XeroAccount.objects.order_by("pk").values_list(
+        "account_code", "id"
+    ):
+        account_ids.setdefault(code, account_id)
+    return account_ids
+
+
+def _client_ids() -> Dict[str, uuid.UUID]:
+    """Map xero_contact_id to Client id, first client wins like .first()."""
+    client_ids = {}
+    for contact_id, client_id in Client.objects.filter(
+        xero_contact_id__isnull=False
+    ).values_list("xero_contact_id", "id"):
+        client_ids.setdefault(contact_id, client_id)
+    return client_ids
+
+
+def _apply_document_fields(document, document_type) -> Optional[str]:
     """
-    Process either an invoice or bill from Xero.
+    Copy header fields from raw_json onto an invoice, bill or credit note.
 
-    Args:
-        document: Instance of XeroInvoiceOrBill
-        document_type: String either "INVOICE" or "BILL"
+    Returns:
+        The Xero contact id the document belongs to
     """
-
     if not document.raw_json:
         raise ValueError(
             f"{document_type.title()} raw_json is empty. "
             "We better not try to process it"
         )
 
-    if new_from_xero:
-        logger.info(
-            f"[XERO-WEBHOOK] Setting fields for new {document_type.lower()} "
-            f"from Xero data: {document.number}"
-            f"[XERO-WEBHOOK] Document ID: {document.xero_id}"
-        )
-
-    is_invoice = document.raw_json.get("_type") == "ACCREC"
-    is_bill = document.raw_json.get("_type") == "ACCPAY"
-    is_credit_note = document.raw_json.get("_type") in ["ACCRECCREDIT", "ACCPAYCREDIT"]
-
-    if is_invoice:
-        json_document_type = "INVOICE"
-    elif is_bill:
-        json_document_type = "BILL"
-    elif is_credit_note:
-        json_document_type = "CREDIT_NOTE"
+    raw_data = document.raw_json
+    json_document_type = JSON_DOCUMENT_TYPES.get(raw_data.get("_type"))
 
     # Validate the document matches the type
     if document_type != json_document_type:
@@ -61,10 +143,8 @@ def set_invoice_or_bill_fields(document, document_type, new_from_xero=False):
             f"but document appears to be a {json_document_type}"
         )
 
-    raw_data = document.raw_json
-
     # Common fields that are identical between invoices and bills
-    if is_credit_note:
+    if document_type == "CREDIT_NOTE":
         document.xero_id = raw_data.get("_credit_note_id")
         document.number = raw_data.get("_credit_note_number")
     else:
@@ -83,35 +163,16 @@ def set_invoice_or_bill_fields(document, document_type, new_from_xero=False):
     document.xero_last_modified = raw_data.get("_updated_date_utc")
     document.xero_last_synced = timezone.now()
 
-    # Set or create the client/supplier
     contact_data = raw_data.get("_contact", {})
-    contact_id = contact_data.get("_contact_id")
-    client = Client.objects.filter(xero_contact_id=contact_id).first()
-    if not client:
-        raise ValueError(
-            f"Client not found for {document_type.lower()} {document.number}"
-        )
-    document.client = client
+    return contact_data.get("_contact_id")
 
-    document.save()
 
-    # Handle line items
-    line_items_data = raw_data.get("_line_items", [])
+def _document_line_values(raw_data, account_ids) -> Dict[uuid.UUID, dict]:
+    """Line item field values from a document's raw_json, keyed by xero_line_id."""
+    line_values = {}
     amount_type = raw_data.get("_line_amount_types", {}).get("_value_")
 
-    # Determine which line item model to use
-    LineItemModel = (
-        InvoiceLineItem
-        if is_invoice
-        else BillLineItem if is_bill else CreditNoteLineItem if is_credit_note else None
-    )
-    document_field = (
-        "invoice"
-        if is_invoice
-        else "bill" if is_bill else "credit_note" if is_credit_note else None
-    )
-
-    for line_item_data in line_items_data:
+    for line_item_data in raw_data.get("_line_items", []):
         line_item_id = line_item_data.get("_line_item_id")
         xero_line_id = uuid.UUID(line_item_id)
         description = line_item_data.get("_description") or "No description provided"
@@ -133,28 +194,51 @@ def set_invoice_or_bill_fields(document, document_type, new_from_xero=False):
             line_amount_excl_tax = line_amount
             line_amount_incl_tax = line_amount + tax_amount
 
-        # Fetch the account
-        account_code = line_item_data.get("_account_code")
-        account = XeroAccount.objects.filter(account_code=account_code).first()
+        line_values[xero_line_id] = {
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "description": description,
+            "account_id": account_ids.get(line_item_data.get("_account_code")),
+            "tax_amount": tax_amount,
+            "line_amount_excl_tax": line_amount_excl_tax,
+            "line_amount_incl_tax": line_amount_incl_tax,
+        }
+    return line_values
 
-        # Sync the line item using dynamic field name
-        kwargs = {document_field: document, "xero_line_id": xero_line_id}
-        line_item, created = LineItemModel.objects.update_or_create(
-            **kwargs,
-            defaults={
-                "quantity": quantity,
-                "unit_price": unit_price,
-                "description": description,
-                "account": account,
-                "tax_amount": tax_amount,
-                "line_amount_excl_tax": line_amount_excl_tax,
-                "line_amount_incl_tax": line_amount_incl_tax,
-            },
+
+def set_invoice_or_bill_fields(document, document_type, new_from_xero=False):
+    """
+    Process either an invoice or bill from Xero.
+
+    Args:
+        document: Instance of XeroInvoiceOrBill
+        document_type: String "INVOICE", "BILL" or "CREDIT_NOTE"
+    """
+    if new_from_xero:
+        logger.info(
+            f"[XERO-WEBHOOK] Setting fields for new {document_type.lower()} "
+            f"from Xero data: {document.number}"
+            f"[XERO-WEBHOOK] Document ID: {document.xero_id}"
+        )
+
+    contact_id = _apply_document_fields(document, document_type)
+
+    # Set or create the client/supplier
+    client = Client.objects.filter(xero_contact_id=contact_id).first()
+    if not client:
+        raise ValueError(
+            f"Client not found for {document_type.lower()} {document.number}"
         )
-        # print(f"{'Created' if created else 'Updated'} Line Item: "
-        #       f"Amount Excl. Tax: {line_item.line_amount_excl_tax}, "
-        #       f"Tax Amount: {line_item.tax_amount}, "
-        #       f"Total Incl. Tax: {line_item.line_amount_incl_tax}")
+    document.client = client
+
+    document.save()
+
+    # Sync the line items using the dynamic field name
+    _, LineItemModel, document_field = DOCUMENT_MODELS[document_type]
+    line_values = _document_line_values(document.raw_json, _account_ids())
+    for xero_line_id, defaults in line_values.items():
+        kwargs = {document_field: document, "xero_line_id": xero_line_id}
+        LineItemModel.objects.update_or_create(**kwargs, defaults=defaults)
 
 
 def set_client_fields(client, new_from_xero=False):
@@ -391,11 +475,11 @@ def set_client_fields(client, new_from_xero=False):
     else:
         # Compare old and new values to report changes
         changes = []
-        for field in tracked_fields:
-            old_val = old_values.get(field)
-            new_val = getattr(client, field, None)
+        for name in tracked_fields:
+            old_val = old_values.get(name)
+            new_val = getattr(client, name, None)
             if old_val != new_val:
-                changes.append(f"{field}: {old_val!r} → {new_val!r}")
+                changes.append(f"{name}: {old_val!r} → {new_val!r}")
 
         if changes:
             logger.info(
@@ -408,11 +492,8 @@ def set_client_fields(client, new_from_xero=False):
             )
 
 
-def set_journal_fields(journal: XeroJournal):
-    """
-    Read the raw_json from a XeroJournal record and set all fields and line items.
-    Similar to set_invoice_or_bill_fields, but for journals.
-    """
+def _apply_journal_fields(journal: XeroJournal) -> None:
+    """Copy header fields from raw_json onto a journal."""
     raw_data = journal.raw_json
     if not raw_data:
         raise ValueError("Journal raw_json is empty. Cannot process fields.")
@@ -420,15 +501,6 @@ def set_journal_fields(journal: XeroJournal):
     # Adjust keys to match the underscore-prefixed structure you provided
     xero_id = raw_data.get("_journal_id")
     created_date_utc = raw_data.get("_created_date_utc")
-    journal_number = raw_data.get("_journal_number")
-    journal_date = raw_data.get("_journal_date")
-    reference = raw_data.get("_reference")
-    source_id = raw_data.get("_source_id")
-    source_type = raw_data.get("_source_type")
-
-    # Use created_date_utc as xero_last_modified if no separate field
-    # Keeping consistent with other models
-    xero_last_modified = created_date_utc
 
     # Verify xero_id matches the journal's stored xero_id
     if xero_id and str(journal.xero_id) != str(xero_id):
@@ -438,87 +510,382 @@ def set_journal_fields(journal: XeroJournal):
             f"but raw_json has {xero_id}."
         )
 
-    journal.journal_date = journal_date
+    journal.journal_date = raw_data.get("_journal_date")
     journal.created_date_utc = created_date_utc
-    journal.journal_number = journal_number
-    journal.reference = reference
-    journal.source_id = source_id
-    journal.source_type = source_type
-    journal.xero_last_modified = xero_last_modified
+    journal.journal_number = raw_data.get("_journal_number")
+    journal.reference = raw_data.get("_reference")
+    journal.source_id = raw_data.get("_source_id")
+    journal.source_type = raw_data.get("_source_type")
+    # Use created_date_utc as xero_last_modified if no separate field
+    # Keeping consistent with other models
+    journal.xero_last_modified = created_date_utc
+
+
+def _journal_line_values(raw_data, account_ids) -> Dict[uuid.UUID, dict]:
+    """Line item field values from a journal's raw_json, keyed by xero_line_id."""
+    line_values = {}
+    for line_item_data in raw_data.get("_journal_lines", []):
+        line_id = uuid.UUID(str(line_item_data.get("_journal_line_id")))
+        line_values[line_id] = {
+            "account_id": account_ids.get(line_item_data.get("_account_code")),
+            "description": line_item_data.get("_description"),
+            # Amounts arrive as strings
+            "net_amount": Decimal(line_item_data.get("_net_amount", "0")),
+            "gross_amount": Decimal(line_item_data.get("_gross_amount", "0")),
+            "tax_amount": Decimal(line_item_data.get("_tax_amount", "0")),
+            "tax_type": line_item_data.get("_tax_type"),
+            "tax_name": line_item_data.get("_tax_name"),
+            "raw_json": line_item_data,
+        }
+    return line_values
+
+
+def set_journal_fields(journal: XeroJournal):
+    """
+    Read the raw_json from a XeroJournal record and set all fields and line items.
+    Similar to set_invoice_or_bill_fields, but for journals.
+    """
+    _apply_journal_fields(journal)
 
     # Save changes to the journal before processing line items
     journal.save()
 
-    # Handle JournalLines
-    line_items_data = raw_data.get("_journal_lines", [])
+    line_values = _journal_line_values(journal.raw_json, _account_ids())
+    for line_id, defaults in line_values.items():
+        XeroJournalLineItem.objects.update_or_create(
+            xero_line_id=line_id, journal=journal, defaults=defaults
+        )
+
 
-    for line_item_data in line_items_data:
-        line_id = line_item_data.get("_journal_line_id")
+def _saved_dates(model, date_field, instances) -> list[date]:
+    """Read dates back after a bulk_update; raw_json holds them as strings."""
+    return list(
+        model.objects.filter(
+            pk__in=[instance.pk for instance in instances]
+        ).values_list(date_field, flat=True)
+    )
 
-        # Convert amounts from strings to Decimal
-        net_amount_str = line_item_data.get("_net_amount", "0")
-        gross_amount_str = line_item_data.get("_gross_amount", "0")
-        tax_amount_str = line_item_data.get("_tax_amount", "0")
 
-        # Convert to Decimal
-        net_amount = Decimal(net_amount_str)
-        gross_amount = Decimal(gross_amount_str)
-        tax_amount = Decimal(tax_amount_str)
+@dataclass
+class ReprocessResult:
+    """Outcome of reprocessing one model."""
 
-        account_code = line_item_data.get("_account_code")
-        description = line_item_data.get("_description")
-        tax_type = line_item_data.get("_tax_type")
-        tax_name = line_item_data.get("_tax_name")
+    model: str
+    processed: int = 0
+    line_items_created: int = 0
+    line_items_updated: int = 0
+    # Document identifier -> error
+    failed: Dict[str, str] = field(default_factory=dict)
+    # False when a chunk failed; the next run resumes from the checkpoint
+    completed: bool = False
+    # Months whose invoice/journal totals were touched, including any
+    # left on the checkpoint by an earlier run
+    months: Set[date] = field(default_factory=set, repr=False)
 
-        # Fetch the account if available
-        account = XeroAccount.objects.filter(account_code=account_code).first()
 
-        XeroJournalLineItem.objects.update_or_create(
-            xero_line_id=line_id,
-            journal=journal,
-            defaults={
-                "account": account,
-                "description": description,
-                "net_amount": net_amount,
-                "gross_amount": gross_amount,
-                "tax_amount": tax_amount,
-                "tax_type": tax_type,
-                "tax_name": tax_name,
-                "raw_json": line_item_data,
-            },
+@dataclass
+class _ChunkOutcome:
+    processed: int = 0
+    line_items_created: int = 0
+    line_items_updated: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    months: Set[date] = field(default_factory=set)
+    error: Optional[str] = None
+
+
+class XeroReprocessor:
+    """
+    Re-derive stored invoices, bills, credit notes and journals from raw_json.
+
+    The contact -> client and code -> account maps are loaded once per run.
+    Documents are processed in primary-key chunks, each in one transaction:
+    headers are written with bulk_update and line items are upserted with
+    one read, one bulk_update and one bulk_create. Chunks run on a thread
+    pool and progress is kept in a XeroReprocessCheckpoint per model.
+
+    With changed_only, only documents saved since the last completed run are
+    reprocessed. Documents that fail (e.g. an unknown contact) are reported
+    in the result; a full run picks them up again.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        max_workers: int = MAX_WORKERS,
+        changed_only: bool = False,
+    ):
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.changed_only = changed_only
+        self.account_ids: Optional[Dict[Optional[str], uuid.UUID]] = None
+        self.client_ids: Optional[Dict[str, uuid.UUID]] = None
+
+    def _load_maps(self) -> None:
+        """Load the lookup maps once, before any workers start."""
+        if self.account_ids is None:
+            self.account_ids = _account_ids()
+        if self.client_ids is None:
+            self.client_ids = _client_ids()
+
+    def run(self) -> list[ReprocessResult]:
+        """Reprocess every document type and then the journals."""
+        results = [
+            self.reprocess_documents(document_type) for document_type in DOCUMENT_MODELS
+        ]
+        results.append(self.reprocess_journals())
+        return results
+
+    def reprocess_documents(self, document_type: str) -> ReprocessResult:
+        """Reprocess invoices, bills or credit notes ("INVOICE", "BILL", ...)."""
+        model = DOCUMENT_MODELS[document_type][0]
+        self._load_maps()
+        result = self._run(model, lambda pks: self._document_chunk(document_type, pks))
+        if document_type == "INVOICE":
+            from apps.accounting.services.sales_forecast_service import (
+                invalidate_sales_forecast_months,
+            )
+
+            invalidate_sales_forecast_months(*result.months)
+        self._rollups_refreshed(result)
+        return result
+
+    def reprocess_journals(self) -> ReprocessResult:
+        """Reprocess journals and refresh the rollups for the months touched."""
+        from apps.workflow.services.journal_rollup_service import (
+            JournalRollupService,
         )
 
+        self._load_maps()
+        result = self._run(XeroJournal, self._journal_chunk)
+        JournalRollupService.refresh_months(result.months)
+        self._rollups_refreshed(result)
+        return result
 
-def reprocess_invoices():
-    """Reprocess all existing invoices to set fields based on raw JSON."""
-    for invoice in Invoice.objects.all():
-        try:
-            set_invoice_or_bill_fields(invoice, "INVOICE")
-            logger.info(f"Reprocessed invoice: {invoice.number}")
-        except Exception as e:
-            logger.error(f"Error reprocessing invoice {invoice.number}: {str(e)}")
+    @staticmethod
+    def _rollups_refreshed(result: ReprocessResult) -> None:
+        XeroReprocessCheckpoint.objects.filter(model=result.model).update(
+            pending_months=[]
+        )
 
+    def _run(self, model, process_chunk) -> ReprocessResult:
+        label = model._meta.label
+        checkpoint, _ = XeroReprocessCheckpoint.objects.get_or_create(model=label)
+        documents = model.objects.order_by("pk")
+        if checkpoint.in_progress:
+            logger.info(f"Resuming {label} reprocess after {checkpoint.resume_after}")
+            if checkpoint.resume_after:
+                documents = documents.filter(pk__gt=checkpoint.resume_after)
+        else:
+            checkpoint.run_started_at = timezone.now()
+            checkpoint.resume_after = None
+            checkpoint.processed = checkpoint.failed = 0
+            checkpoint.save()
+        if self.changed_only and checkpoint.processed_through:
+            documents = documents.filter(
+                django_updated_at__gt=checkpoint.processed_through
+            )
 
-def reprocess_bills():
-    """Reprocess all existing bills to set fields based on raw JSON."""
-    for bill in Bill.objects.all():
-        try:
-            set_invoice_or_bill_fields(bill, "BILL")
-            logger.info(f"Reprocessed bill: {bill.number}")
-        except Exception as e:
-            logger.error(f"Error reprocessing bill {bill.number}: {str(e)}")
+        # Months left by a run that stopped before refreshing its rollups
+        result = ReprocessResult(
+            label, months={date.fromisoformat(m) for m in checkpoint.pending_months}
+        )
+        chunks = enumerate(
+            batched(
+                documents.values_list("pk", flat=True).iterator(self.chunk_size),
+                self.chunk_size,
+            )
+        )
+        # Chunks can finish out of order; the checkpoint only moves past a
+        # chunk once every chunk before it has been written
+        finished = {}
+        next_index = 0
+        blocked = False
+
+        def record(index, last_pk, outcome: _ChunkOutcome):
+            nonlocal next_index, blocked
+            result.processed += outcome.processed
+            result.line_items_created += outcome.line_items_created
+            result.line_items_updated += outcome.line_items_updated
+            result.failed.update(outcome.failed)
+            result.months |= outcome.months
+            checkpoint.pending_months = sorted(
+                {month.replace(day=1).isoformat() for month in result.months}
+            )
+            checkpoint.processed += outcome.processed
+            checkpoint.failed += len(outcome.failed)
+            if outcome.error is not None:
+                blocked = True
+            finished[index] = last_pk
+            while not blocked and next_index in finished:
+                checkpoint.resume_after = str(finished.pop(next_index))
+                next_index += 1
+            checkpoint.save()
+
+        if self.max_workers <= 1:
+            for index, pks in chunks:
+                record(index, pks[-1], self._process(process_chunk, pks))
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = {}
+                for index, pks in chunks:
+                    future = executor.submit(
+                        self._process_on_worker, process_chunk, pks
+                    )
+                    pending[future] = (index, pks[-1])
+                    if len(pending) >= self.max_workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(*pending.pop(future), future.result())
+                for future in wait(pending).done:
+                    record(*pending[future], future.result())
+
+        if not blocked:
+            checkpoint.processed_through = checkpoint.run_started_at
+            checkpoint.run_started_at = None
+            checkpoint.resume_after = None
+            checkpoint.save()
+            result.completed = True
 
+        logger.info(
+            f"Reprocessed {result.processed} {label} records "
+            f"({result.line_items_created} line items created, "
+            f"{result.line_items_updated} updated, {len(result.failed)} failed)"
+            + ("" if result.completed else "; run incomplete, will resume")
+        )
+        return result
 
-def reprocess_credit_notes():
-    """Reprocess all existing credit notes to set fields based on raw JSON."""
-    for credit_note in CreditNote.objects.all():
+    def _process(self, process_chunk, pks) -> _ChunkOutcome:
         try:
-            set_invoice_or_bill_fields(credit_note, "CREDIT NOTE")
-            logger.info(f"Reprocessed credit note: {credit_note.number}")
-        except Exception as e:
-            logger.error(
-                f"Error reprocessing credit note {credit_note.number}: {str(e)}"
+            with transaction.atomic():
+                return process_chunk(pks)
+        except Exception as exc:
+            logger.exception(f"Reprocess chunk starting at {pks[0]} failed")
+            persist_app_error(exc)
+            return _ChunkOutcome(error=str(exc))
+
+    def _process_on_worker(self, process_chunk, pks) -> _ChunkOutcome:
+        try:
+            return self._process(process_chunk, pks)
+        finally:
+            close_old_connections()
+
+    def _document_chunk(self, document_type, pks) -> _ChunkOutcome:
+        model, line_model, document_field = DOCUMENT_MODELS[document_type]
+        outcome = _ChunkOutcome()
+        documents = []
+        line_values = {}
+        for document in model.objects.filter(pk__in=pks):
+            loaded_date = document.date
+            try:
+                contact_id = _apply_document_fields(document, document_type)
+                client_id = self.client_ids.get(contact_id)
+                if client_id is None:
+                    raise ValueError(
+                        f"Client not found for {document_type.lower()} "
+                        f"{document.number}"
+                    )
+                document.client_id = client_id
+                line_values[document.pk] = _document_line_values(
+                    document.raw_json, self.account_ids
+                )
+            except Exception as exc:
+                logger.error(
+                    f"Error reprocessing {document_type.lower()} "
+                    f"{document.number}: {exc}"
+                )
+                outcome.failed[str(document.number or document.pk)] = str(exc)
+                continue
+            documents.append(document)
+            outcome.months.add(loaded_date)
+
+        model.objects.bulk_update(
+            documents, DOCUMENT_FIELDS, batch_size=BULK_BATCH_SIZE
+        )
+        self._upsert_lines(
+            line_model, document_field, line_values, LINE_ITEM_FIELDS, outcome
+        )
+        outcome.months.update(_saved_dates(model, "date", documents))
+        outcome.processed = len(documents)
+        return outcome
+
+    def _journal_chunk(self, pks) -> _ChunkOutcome:
+        outcome = _ChunkOutcome()
+        journals = []
+        line_values = {}
+        for journal in XeroJournal.objects.filter(pk__in=pks):
+            outcome.months.add(journal.journal_date)
+            try:
+                _apply_journal_fields(journal)
+                line_values[journal.pk] = _journal_line_values(
+                    journal.raw_json, self.account_ids
+                )
+            except Exception as exc:
+                name = journal.journal_number or journal.xero_id
+                logger.error(f"Error reprocessing journal {name}: {exc}")
+                outcome.failed[str(name)] = str(exc)
+                continue
+            journals.append(journal)
+
+        XeroJournal.objects.bulk_update(
+            journals, JOURNAL_FIELDS, batch_size=BULK_BATCH_SIZE
+        )
+        now = timezone.now()
+        for lines in line_values.values():
+            for values in lines.values():
+                # bulk_update skips auto_now
+                values["django_updated_at"] = now
+        self._upsert_lines(
+            XeroJournalLineItem, "journal", line_values, JOURNAL_LINE_FIELDS, outcome
+        )
+        outcome.months.update(_saved_dates(XeroJournal, "journal_date", journals))
+        outcome.processed = len(journals)
+        return outcome
+
+    def _upsert_lines(self, line_model, parent_field, line_values, fields, outcome):
+        """Update existing line items and create new ones for a chunk."""
+        existing = {
+            (getattr(item, f"{parent_field}_id"), item.xero_line_id): item
+            for item in line_model.objects.filter(
+                **{f"{parent_field}_id__in": list(line_values)}
             )
+        }
+        to_update = []
+        to_create = []
+        for parent_id, lines in line_values.items():
+            for xero_line_id, values in lines.items():
+                item = existing.get((parent_id, xero_line_id))
+                if item is None:
+                    to_create.append(
+                        line_model(
+                            **{f"{parent_field}_id": parent_id},
+                            xero_line_id=xero_line_id,
+                            **values,
+                        )
+                    )
+                    continue
+                for name, value in values.items():
+                    setattr(item, name, value)
+                to_update.append(item)
+
+        line_model.objects.bulk_update(to_update, fields, batch_size=BULK_BATCH_SIZE)
+        line_model.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+        outcome.line_items_updated += len(to_update)
+        outcome.line_items_created += len(to_create)
+
+
+def reprocess_invoices(changed_only=False) -> ReprocessResult:
+    """Reprocess existing invoices to set fields based on raw JSON."""
+    return XeroReprocessor(changed_only=changed_only).reprocess_documents("INVOICE")
+
+
+def reprocess_bills(changed_only=False) -> ReprocessResult:
+    """Reprocess existing bills to set fields based on raw JSON."""
+    return XeroReprocessor(changed_only=changed_only).reprocess_documents("BILL")
+
+
+def reprocess_credit_notes(changed_only=False) -> ReprocessResult:
+    """Reprocess existing credit notes to set fields based on raw JSON."""
+    return XeroReprocessor(changed_only=changed_only).reprocess_documents("CREDIT_NOTE")
 
 
 def reprocess_clients():
@@ -531,31 +898,18 @@ def reprocess_clients():
             logger.error(f"Error reprocessing client {client.name}: {str(e)}")
 
 
-def reprocess_journals():
+def reprocess_journals(changed_only=False) -> ReprocessResult:
     """
-    Iterate over all XeroJournal records and re-run the set_journal_fields().
+    Re-derive journal fields and line items from the stored raw_json.
     Useful if we've tweaked mapping logic and want to re-derive fields from stored
     raw_json.
     """
-    from apps.workflow.models import XeroJournal
-
-    for jrnl in XeroJournal.objects.all():
-        try:
-            set_journal_fields(jrnl)
-            logger.info(f"Reprocessed journal: {jrnl.journal_number or jrnl.xero_id}")
-        except Exception as e:
-            logger.error(
-                f"Error reprocessing journal "
-                f"{jrnl.journal_number or jrnl.xero_id}: {str(e)}"
-            )
+    return XeroReprocessor(changed_only=changed_only).reprocess_journals()
 
 
-def reprocess_all():
+def reprocess_all(changed_only=False):
     """Reprocesses all data to set fields based on raw JSON."""
     # NOte, we don't have a reprocess accounts because it just feels too weird.
     # If you break accounts, you probably want to handle it manually
     reprocess_clients()
-    reprocess_invoices()
-    reprocess_bills()
-    reprocess_credit_notes()
-    reprocess_journals()
+    return XeroReprocessor(changed_only=changed_only).run()
@@ -1,6 +1,7 @@
 import logging
 import time
-from typing import Any, Dict, Optional
+from itertools import batched
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from django.db import models
 from django.utils import timezone
@@ -12,6 +13,8 @@ from apps.workflow.models import XeroAccount
 
 logger = logging.getLogger("xero")
 SLEEP_TIME = 1  # Sleep after every API call to avoid hitting rate limits
+BATCH_SIZE = 100  # Items per create_items/update_or_create_items request
+XERO_LINK_FIELDS = ["xero_id", "xero_last_modified", "xero_last_synced"]
 
 
 def fetch_all_xero_items(api: AccountingApi, tenant_id: str) -> Dict[str, Any]:
@@ -123,62 +126,8 @@ def validate_stock_for_xero(stock_item: Stock) -> bool:
     return True
 
 
-def _ensure_unique_xero_link(
-    stock_item: Stock,
-    *,
-    xero_item_id: str,
-    item_code: Optional[str],
-    operation: str,
-) -> bool:
-    """
-    Guard against assigning the same Xero item to multiple stock records.
-    """
-    code_display = item_code or "<missing>"
-    duplicate = (
-        Stock.objects.filter(xero_id=xero_item_id).exclude(id=stock_item.id).first()
-    )
-
-    if not duplicate:
-        return True
-
-    message = (
-        f"Cannot link stock {stock_item.id} to Xero item {xero_item_id}: "
-        f"stock {duplicate.id} already has this xero_id. "
-        f"Both have item_code '{code_display}'. This indicates duplicate stock items."
-    )
-    logger.warning(message)
-    return False
-
-
-def sync_stock_to_xero(
-    stock_item: Stock, xero_items_lookup: Optional[Dict[str, Any]] = None
-) -> bool:
-    """
-    Push a stock item to Xero as an inventory item.
-
-    Args:
-        stock_item: Stock instance to sync
-        xero_items_lookup: Pre-fetched dict of code -> Xero item for efficient lookup.
-                          If None, will be fetched (less efficient for batch operations).
-
-    Returns:
-        bool: True if successful
-    """
-    # Initial validation to fail fast
-    if not validate_stock_for_xero(stock_item):
-        logger.error(f"Stock item {stock_item.id} failed validation for Xero sync")
-        return False
-
-    if not (stock_item.item_code and stock_item.item_code.strip()):
-        stock_item.item_code = generate_item_code(stock_item)
-        stock_item.save(update_fields=["item_code"])
-        logger.info(
-            f"Generated item_code '{stock_item.item_code}' for stock {stock_item.id}"
-        )
-
-    api = AccountingApi(api_client)
-    tenant_id = get_tenant_id()
-
+def resolve_stock_accounts() -> Tuple[Optional[XeroAccount], Optional[XeroAccount]]:
+    """Return the (purchase, sales) accounts used for stock items in Xero."""
     purchase_account = (
         XeroAccount.objects.filter(account_code="300").first()
         or XeroAccount.objects.filter(
@@ -191,7 +140,15 @@ def sync_stock_to_xero(
             account_type__in=["REVENUE", "OTHERINCOME"]
         ).first()
     )
+    return purchase_account, sales_account
+
 
+def build_item_payload(
+    stock_item: Stock,
+    purchase_account: Optional[XeroAccount],
+    sales_account: Optional[XeroAccount],
+) -> Dict[str, Any]:
+    """Build the Xero Items payload for a stock item."""
     item_data = {
         "Code": stock_item.item_code,
         "Name": (stock_item.description or "")[:50],
@@ -221,123 +178,271 @@ def sync_stock_to_xero(
             f"unit_revenue={stock_item.unit_revenue}, sales_account={sales_account}"
         )
 
-    logger.info(f"Sending item data to Xero: {item_data}")
+    if stock_item.xero_id:
+        item_data["ItemID"] = stock_item.xero_id
+    return item_data
 
-    # Fetch lookup if not provided (less efficient for batch operations)
-    if xero_items_lookup is None:
-        xero_items_lookup = fetch_all_xero_items(api, tenant_id)
 
-    try:
-        # 1) If we don't have xero_id, try to find by Code first
-        if not stock_item.xero_id:
-            existing = get_xero_item_by_code_from_lookup(
-                stock_item.item_code, xero_items_lookup
-            )
-            if existing:
-                if not _ensure_unique_xero_link(
-                    stock_item,
-                    xero_item_id=existing.item_id,
-                    item_code=stock_item.item_code,
-                    operation="sync_stock_to_xero_duplicate_check",
-                ):
-                    return False
-
-                stock_item.xero_id = existing.item_id
-                stock_item.xero_last_modified = timezone.now()
-                stock_item.xero_last_synced = timezone.now()
-                stock_item.save(
-                    update_fields=["xero_id", "xero_last_modified", "xero_last_synced"]
-                )
-                logger.info(
-                    f"Linked local stock {stock_item.id} to existing Xero item {stock_item.xero_id} by Code"
-                )
+def _is_duplicate_code_error(message: str) -> bool:
+    return "already exists" in message and "code" in message.lower()
 
-        # 2) If we already have xero_id -> update; else -> create
-        if stock_item.xero_id:
-            item_data["ItemID"] = stock_item.xero_id
-            api.update_item(
-                tenant_id, item_id=stock_item.xero_id, items={"Items": [item_data]}
-            )
-            time.sleep(SLEEP_TIME)
-            stock_item.xero_last_synced = timezone.now()
-            stock_item.save(update_fields=["xero_last_synced"])
-            logger.info(f"Updated stock item {stock_item.id} in Xero")
-            return True
 
-        # Still no xero_id → create
-        resp = api.create_items(tenant_id, items={"Items": [item_data]})
-        time.sleep(SLEEP_TIME)
+def _assign_item_codes(stock_items: List[Stock], failed: Dict[str, str]) -> List[Stock]:
+    """Generate missing item codes, skipping codes another stock row holds."""
+    missing = [
+        stock
+        for stock in stock_items
+        if not (stock.item_code and stock.item_code.strip())
+    ]
+    if not missing:
+        return stock_items
 
-        created = getattr(resp, "items", None) or getattr(resp, "Items", None) or []
-        if not created:
-            logger.error("Xero create_items returned empty response")
-            return False
-
-        xero_item = created[0]
-        stock_item.xero_id = xero_item.item_id
-        stock_item.xero_last_modified = timezone.now()
-        stock_item.xero_last_synced = timezone.now()
-        stock_item.save(
-            update_fields=["xero_id", "xero_last_modified", "xero_last_synced"]
+    generated = {stock.id: generate_item_code(stock) for stock in missing}
+    taken = set(
+        Stock.objects.filter(item_code__in=set(generated.values())).values_list(
+            "item_code", flat=True
         )
+    )
+    assigned = []
+    for stock in missing:
+        code = generated[stock.id]
+        if code in taken:
+            failed[str(stock.id)] = (
+                f"Generated item_code '{code}' is already used by another stock item"
+            )
+            continue
+        taken.add(code)
+        stock.item_code = code
+        assigned.append(stock)
+        logger.info(f"Generated item_code '{code}' for stock {stock.id}")
+    Stock.objects.bulk_update(assigned, ["item_code"])
+
+    return [
+        stock
+        for stock in stock_items
+        if str(stock.id) not in failed and stock.item_code
+    ]
+
+
+def _link_by_code(
+    stock_items: List[Stock], xero_items_lookup: Dict[str, Any], failed: Dict[str, str]
+) -> Tuple[List[Stock], List[Stock]]:
+    """
+    Link stock rows without a xero_id to existing Xero items with their code.
+
+    A Xero item already linked to another stock row is never linked twice;
+    such rows are reported as failed.
+
+    Returns:
+        (linked, not_found) stock rows
+    """
+    matches = {
+        stock.id: xero_items_lookup[stock.item_code]
+        for stock in stock_items
+        if stock.item_code in xero_items_lookup
+    }
+    claimed = dict(
+        Stock.objects.filter(
+            xero_id__in=[str(item.item_id) for item in matches.values()]
+        ).values_list("xero_id", "id")
+    )
+
+    now = timezone.now()
+    linked = []
+    not_found = []
+    for stock in stock_items:
+        xero_item = matches.get(stock.id)
+        if xero_item is None:
+            not_found.append(stock)
+            continue
+        xero_id = str(xero_item.item_id)
+        if claimed.get(xero_id, stock.id) != stock.id:
+            message = (
+                f"Cannot link stock {stock.id} to Xero item {xero_id}: "
+                f"stock {claimed[xero_id]} already has this xero_id. "
+                f"Both have item_code '{stock.item_code}'. "
+                "This indicates duplicate stock items."
+            )
+            logger.warning(message)
+            failed[str(stock.id)] = message
+            continue
+        claimed[xero_id] = stock.id
+        stock.xero_id = xero_id
+        stock.xero_last_modified = now
+        stock.xero_last_synced = now
+        linked.append(stock)
         logger.info(
-            f"Created stock item {stock_item.id} in Xero with ID {stock_item.xero_id}"
+            f"Linked local stock {stock.id} to existing Xero item {xero_id} by Code"
         )
-        return True
+    Stock.objects.bulk_update(linked, XERO_LINK_FIELDS)
+    return linked, not_found
 
-    except Exception as e:
-        msg = str(e)
 
-        # 3) If error is "already exists" by Code, refresh lookup and try to link
-        # Note: this should be rare due to the initial lookup by Code above
-        if "already exists" in msg and "Code" in msg:
-            logger.warning(
-                f"Create failed due to duplicate Code. Refreshing lookup for {stock_item.item_code}"
+def _push_items(
+    send, tenant_id: str, stock_items: List[Stock], payloads: Dict[Any, Dict]
+) -> List[Tuple[Stock, Optional[Any], Optional[str]]]:
+    """
+    Send stock items to Xero in chunks of BATCH_SIZE.
+
+    Xero answers with one item per request item, in order, each carrying its
+    own validation errors when summarize_errors is off.
+
+    Returns:
+        (stock, xero_item, error) per stock item; xero_item is None on error
+    """
+    results = []
+    for chunk in batched(stock_items, BATCH_SIZE):
+        try:
+            resp = send(
+                tenant_id,
+                items={"Items": [payloads[stock.id] for stock in chunk]},
+                summarize_errors=False,
             )
-            # Refresh the lookup in case item was created since we fetched
-            xero_items_lookup = fetch_all_xero_items(api, tenant_id)
-            existing = get_xero_item_by_code_from_lookup(
-                stock_item.item_code, xero_items_lookup
+        except Exception as exc:
+            logger.error(f"Xero rejected a batch of {len(chunk)} items: {exc}")
+            results.extend((stock, None, str(exc)) for stock in chunk)
+            continue
+        finally:
+            time.sleep(SLEEP_TIME)
+
+        returned = getattr(resp, "items", None) or getattr(resp, "Items", None) or []
+        for index, stock in enumerate(chunk):
+            if index >= len(returned):
+                results.append((stock, None, "Xero returned no item for this row"))
+                continue
+            xero_item = returned[index]
+            errors = getattr(xero_item, "validation_errors", None)
+            if errors:
+                message = "; ".join(getattr(e, "message", str(e)) for e in errors)
+                results.append((stock, None, message))
+            else:
+                results.append((stock, xero_item, None))
+    return results
+
+
+def sync_stock_items_to_xero(
+    stock_items: Iterable[Stock],
+    xero_items_lookup: Optional[Dict[str, Any]] = None,
+    api: Optional[AccountingApi] = None,
+    tenant_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Push stock items to Xero as inventory items in batched requests.
+
+    Accounts are resolved once. Rows without a xero_id are linked to an
+    existing Xero item with the same code, or created; linked rows are
+    updated. Creates that fail because the code already exists in Xero are
+    linked and updated after a single refresh of the item lookup.
+
+    Args:
+        stock_items: Stock instances to sync
+        xero_items_lookup: Pre-fetched dict of code -> Xero item. Fetched if None.
+        api: AccountingApi to use, defaults to the shared client
+        tenant_id: Xero tenant, defaults to the connected tenant
+
+    Returns:
+        Dict with "synced" (stock ids) and "failed" (stock id -> reason)
+    """
+    failed: Dict[str, str] = {}
+    valid = []
+    for stock_item in stock_items:
+        if validate_stock_for_xero(stock_item):
+            valid.append(stock_item)
+        else:
+            logger.error(f"Stock item {stock_item.id} failed validation for Xero sync")
+            failed[str(stock_item.id)] = "Validation failed"
+    valid = _assign_item_codes(valid, failed)
+    if not valid:
+        return {"synced": [], "failed": failed}
+
+    api = api or AccountingApi(api_client)
+    tenant_id = tenant_id or get_tenant_id()
+    if xero_items_lookup is None:
+        xero_items_lookup = fetch_all_xero_items(api, tenant_id)
+    purchase_account, sales_account = resolve_stock_accounts()
+
+    unlinked = [stock for stock in valid if not stock.xero_id]
+    _, to_create = _link_by_code(unlinked, xero_items_lookup, failed)
+    to_update = [stock for stock in valid if stock.xero_id]
+
+    synced = []
+    conflicts = []
+    now = timezone.now()
+    payloads = {
+        stock.id: build_item_payload(stock, purchase_account, sales_account)
+        for stock in to_create
+    }
+    created = []
+    for stock, xero_item, error in _push_items(
+        api.create_items, tenant_id, to_create, payloads
+    ):
+        if xero_item is not None:
+            stock.xero_id = str(xero_item.item_id)
+            stock.xero_last_modified = now
+            stock.xero_last_synced = now
+            created.append(stock)
+            logger.info(
+                f"Created stock item {stock.id} in Xero with ID {stock.xero_id}"
             )
-            if not existing:
-                logger.error(
-                    f"Duplicate reported for code '{stock_item.item_code}', "
-                    f"but item not found in refreshed lookup — aborting"
-                )
-                return False
-
-            if not _ensure_unique_xero_link(
-                stock_item,
-                xero_item_id=existing.item_id,
-                item_code=stock_item.item_code,
-                operation="sync_stock_to_xero_duplicate_recovery",
-            ):
-                return False
-
-            stock_item.xero_id = existing.item_id
-            stock_item.xero_last_modified = timezone.now()
-            stock_item.xero_last_synced = timezone.now()
-            stock_item.save(
-                update_fields=["xero_id", "xero_last_modified", "xero_last_synced"]
+        elif _is_duplicate_code_error(error):
+            conflicts.append(stock)
+        else:
+            logger.error(f"Failed to sync stock item {stock.id} to Xero: {error}")
+            failed[str(stock.id)] = error
+    Stock.objects.bulk_update(created, XERO_LINK_FIELDS)
+    synced.extend(created)
+
+    if conflicts:
+        # Created since the lookup was fetched; one refresh covers them all
+        logger.warning(
+            f"{len(conflicts)} creates failed due to duplicate Code. Refreshing lookup"
+        )
+        xero_items_lookup.update(fetch_all_xero_items(api, tenant_id))
+        linked, not_found = _link_by_code(conflicts, xero_items_lookup, failed)
+        to_update.extend(linked)
+        for stock in not_found:
+            failed[str(stock.id)] = (
+                f"Duplicate reported for code '{stock.item_code}', "
+                "but item not found in refreshed lookup"
             )
 
-            try:
-                item_data["ItemID"] = stock_item.xero_id
-                api.update_item(
-                    tenant_id, item_id=stock_item.xero_id, items={"Items": [item_data]}
-                )
-                time.sleep(SLEEP_TIME)
-                logger.info(
-                    f"Recovered by linking and updating stock item {stock_item.id} -> Xero {stock_item.xero_id}"
-                )
-                return True
-            except Exception as e2:
-                logger.error(f"Failed to update after linking by Code: {e2}")
-                return False
+    payloads = {
+        stock.id: build_item_payload(stock, purchase_account, sales_account)
+        for stock in to_update
+    }
+    updated = []
+    for stock, xero_item, error in _push_items(
+        api.update_or_create_items, tenant_id, to_update, payloads
+    ):
+        if xero_item is None:
+            logger.error(f"Failed to update stock item {stock.id} in Xero: {error}")
+            failed[str(stock.id)] = error
+            continue
+        stock.xero_last_synced = now
+        updated.append(stock)
+        logger.info(f"Updated stock item {stock.id} in Xero")
+    Stock.objects.bulk_update(updated, ["xero_last_synced"])
+    synced.extend(updated)
+
+    return {"synced": [str(stock.id) for stock in synced], "failed": failed}
 
-        # Other errors: log and fail
-        logger.error(f"Failed to sync stock item {stock_item.id} to Xero: {msg}")
-        return False
+
+def sync_stock_to_xero(
+    stock_item: Stock, xero_items_lookup: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    Push a stock item to Xero as an inventory item.
+
+    Args:
+        stock_item: Stock instance to sync
+        xero_items_lookup: Pre-fetched dict of code -> Xero item for efficient lookup.
+                          If None, will be fetched (less efficient for batch operations).
+
+    Returns:
+        bool: True if successful
+    """
+    result = sync_stock_items_to_xero([stock_item], xero_items_lookup)
+    return str(stock_item.id) in result["synced"]
 
 
 def sync_all_local_stock_to_xero(limit: Optional[int] = None) -> Dict[str, Any]:
@@ -360,43 +465,24 @@ def sync_all_local_stock_to_xero(limit: Optional[int] = None) -> Dict[str, Any]:
     if limit:
         queryset = queryset[:limit]
 
-    total_items = queryset.count()
-    synced_count = 0
-    failed_count = 0
-    failed_items = []
+    stock_items = list(queryset)
+    total_items = len(stock_items)
 
     logger.info(f"Found {total_items} stock items to sync to Xero")
 
-    # Fetch all Xero items once for efficient lookup
-    api = AccountingApi(api_client)
-    tenant_id = get_tenant_id()
-    xero_items_lookup = fetch_all_xero_items(api, tenant_id)
-
-    for stock_item in queryset:
-        try:
-            if sync_stock_to_xero(stock_item, xero_items_lookup):
-                synced_count += 1
-                logger.info(f"Successfully synced stock item {stock_item.id}")
-            else:
-                failed_count += 1
-                failed_items.append(
-                    {
-                        "id": str(stock_item.id),
-                        "description": stock_item.description,
-                        "reason": "Validation failed or API error",
-                    }
-                )
-                logger.warning(f"Failed to sync stock item {stock_item.id}")
-        except Exception as e:
-            failed_count += 1
-            failed_items.append(
-                {
-                    "id": str(stock_item.id),
-                    "description": stock_item.description,
-                    "reason": str(e),
-                }
-            )
-            logger.error(f"Exception syncing stock item {stock_item.id}: {str(e)}")
+    outcome = sync_stock_items_to_xero(stock_items)
+    synced_count = len(outcome["synced"])
+    failed = outcome["failed"]
+    failed_items = [
+        {
+            "id": str(stock_item.id),
+            "description": stock_item.description,
+            "reason": failed[str(stock_item.id)],
+        }
+        for stock_item in stock_items
+        if str(stock_item.id) in failed
+    ]
+    failed_count = len(failed_items)
 
     # Clamp success_rate to 0-100 range for valid progress bar display
     raw_rate = (synced_count / total_items * 100) if total_items > 0 else 0
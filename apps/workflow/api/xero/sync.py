@@ -158,7 +158,12 @@ def get_or_fetch_client(contact_id, reference=None):
 
 
 def sync_entities(
-    items, model_class, xero_id_attr, transform_func, delete_orphans=False
+    items,
+    model_class,
+    xero_id_attr,
+    transform_func,
+    delete_orphans=False,
+    on_synced=None,
 ):
     """Persist a batch of Xero objects.
 
@@ -169,6 +174,8 @@ def sync_entities(
         transform_func: Callable returning (instance, status) tuple or None.
         delete_orphans: If True, delete local records not in the fetched set.
             Use for cache-only entities where Xero is the master.
+        on_synced: Optional callable receiving the list of synced instances
+            once the whole batch has been persisted.
 
     Returns:
         int: Number of items successfully synced.
@@ -182,7 +189,7 @@ def sync_entities(
         if deleted:
             logger.info(f"Deleted {deleted} orphaned {model_class.__name__} records")
 
-    synced = 0
+    synced_instances = []
     for item in items_list:
         xero_id = getattr(item, xero_id_attr)
 
@@ -197,8 +204,25 @@ def sync_entities(
         instance, status = result
         identifier = getattr(instance, "number", getattr(instance, "name", xero_id))
         logger.info(f"Synced {model_class.__name__}: {identifier} ({status})")
-        synced += 1
-    return synced
+        synced_instances.append(instance)
+
+    if on_synced and synced_instances:
+        on_synced(synced_instances)
+    return len(synced_instances)
+
+
+def refresh_client_activity(documents):
+    """Refresh activity rollups for the clients of synced invoices."""
+    from apps.client.services.client_activity_service import ClientActivityService
+
+    ClientActivityService.refresh_clients(doc.client_id for doc in documents)
+
+
+def refresh_journal_rollups(journals):
+    """Recompute the P&L monthly rollups for months touched by synced journals."""
+    from apps.workflow.services.journal_rollup_service import JournalRollupService
+
+    JournalRollupService.refresh_for_journals(journals)
 
 
 # Transform functions
@@ -1144,7 +1168,13 @@ ENTITY_CONFIGS = {
         "invoices",
         Invoice,
         "get_invoices",
-        lambda items: sync_entities(items, Invoice, "invoice_id", transform_invoice),
+        lambda items: sync_entities(
+            items,
+            Invoice,
+            "invoice_id",
+            transform_invoice,
+            on_synced=refresh_client_activity,
+        ),
         {"where": 'Type=="ACCREC"'},
         "page",
     ),
@@ -1227,7 +1257,11 @@ ENTITY_CONFIGS = {
         XeroJournal,
         "get_journals",
         lambda items: sync_entities(
-            items, XeroJournal, "journal_id", transform_journal
+            items,
+            XeroJournal,
+            "journal_id",
+            transform_journal,
+            on_synced=refresh_journal_rollups,
         ),
         None,
         "offset",
@@ -2144,6 +2178,7 @@ def sync_single_invoice(sync_service, invoice_id):
             },
         )
         set_invoice_or_bill_fields(invoice, "INVOICE", new_from_xero=created)
+        refresh_client_activity([invoice])
         logger.info(f"Synced invoice {invoice_id} from webhook")
     else:
         raise ValueError(f"Unknown invoice type {xero_invoice.type} for {invoice_id}")
@@ -11,6 +11,7 @@ from apps.workflow.scheduler import get_scheduler
 from apps.workflow.scheduler_jobs import (
     xero_30_day_sync_job,
     xero_heartbeat_job,
+    xero_outbox_job,
     xero_regular_sync_job,
 )
 
@@ -90,6 +91,19 @@ class WorkflowConfig(AppConfig):
         )
         logger.info("Added 'xero_regular_sync' job to shared scheduler.")
 
+        # Xero Outbox: Retry queued document submissions every minute
+        scheduler.add_job(
+            xero_outbox_job,
+            trigger="interval",
+            minutes=1,
+            id="xero_outbox",
+            max_instances=1,
+            replace_existing=True,
+            misfire_grace_time=60,
+            coalesce=True,
+        )
+        logger.info("Added 'xero_outbox' job to shared scheduler.")
+
         # Xero 30-Day Sync: Perform full Xero synchronization on Saturday morning
         # every ~30 days
         scheduler.add_job(
@@ -0,0 +1,39 @@
+# This file is autogenerated by update_init.py script
+
+# Conditional imports (only when Django is ready)
+try:
+    from django.apps import apps
+
+    if apps.ready:
+        from .dataset import BenchmarkDataset, Scale, SeededData
+        from .runner import (
+            BenchmarkCase,
+            BenchmarkResult,
+            Regression,
+            baseline_for,
+            compare_to_baseline,
+            count_queries,
+            install_sqlite_functions,
+            load_baselines,
+            run_benchmarks,
+            save_baselines,
+        )
+except (ImportError, RuntimeError):
+    # Django not ready or circular import, skip conditional imports
+    pass
+
+__all__ = [
+    "BenchmarkCase",
+    "BenchmarkDataset",
+    "BenchmarkResult",
+    "Regression",
+    "Scale",
+    "SeededData",
+    "baseline_for",
+    "compare_to_baseline",
+    "count_queries",
+    "install_sqlite_functions",
+    "load_baselines",
+    "run_benchmarks",
+    "save_baselines",
+]
@@ -0,0 +1,521 @@
+"""
+Benchmark Dataset
+
+Seeds a deterministic, production-shaped dataset for the endpoint benchmarks:
+clients and staff, jobs with estimate/quote/actual cost sets and their cost
+lines, Xero accounts and journals (with the monthly rollups the P&L reads),
+purchase orders and stock.
+
+Everything is drawn from one `random.Random(seed)`, including primary keys,
+and dates are anchored to ANCHOR_DATE rather than today, so the same scale and
+seed always produce the same rows and the same URLs. Rows are written with
+bulk_create, which skips model save() hooks; the denormalised values those
+hooks maintain (cost set summaries, latest_* pointers, the job number
+sequence, journal rollups) are filled in here instead.
+"""
+
+import logging
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import CostLine, CostSet, Job, JobNumberSequence
+from apps.purchasing.models import PurchaseOrder, PurchaseOrderLine, Stock
+from apps.workflow.models import (
+    CompanyDefaults,
+    XeroAccount,
+    XeroJournal,
+    XeroJournalLineItem,
+    XeroPayItem,
+)
+from apps.workflow.services.journal_rollup_service import JournalRollupService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 20250630
+# A Monday, so it also starts the benchmarked timesheet week
+ANCHOR_DATE = date(2025, 6, 30)
+BATCH_SIZE = 2000
+BENCHMARK_EMAIL = "benchmark.admin@example.com"
+
+JOB_STATUS_WEIGHTS = {
+    "draft": 10,
+    "awaiting_approval": 8,
+    "approved": 8,
+    "in_progress": 20,
+    "unusual": 3,
+    "recently_completed": 10,
+    "special": 2,
+    "archived": 39,
+}
+PO_STATUS_WEIGHTS = {
+    "draft": 15,
+    "submitted": 30,
+    "partially_received": 15,
+    "fully_received": 35,
+    "deleted": 5,
+}
+# Share of jobs booked against the shop client (internal, no revenue)
+SHOP_JOB_SHARE = 0.05
+# (code, name, type): the P&L groups lines by account type
+ACCOUNTS = [
+    ("200", "Sales", "AccountType.REVENUE"),
+    ("260", "Other Revenue", "AccountType.REVENUE"),
+    ("310", "Cost of Goods Sold", "AccountType.DIRECTCOSTS"),
+    ("320", "Subcontractors", "AccountType.DIRECTCOSTS"),
+    ("400", "Advertising", "AccountType.OVERHEADS"),
+    ("429", "General Expenses", "AccountType.OVERHEADS"),
+    ("445", "Light, Power, Heating", "AccountType.OVERHEADS"),
+    ("477", "Wages and Salaries", "AccountType.EXPENSE"),
+    ("493", "Travel - National", "AccountType.EXPENSE"),
+    ("090", "Business Bank Account", "AccountType.BANK"),
+]
+
+
+@dataclass(frozen=True)
+class Scale:
+    clients: int
+    staff: int
+    jobs: int
+    time_lines_per_job: int
+    material_lines_per_job: int
+    journals: int
+    lines_per_journal: int
+    purchase_orders: int
+    lines_per_po: int
+    stock_items: int
+    # Activity is spread over this many days before ANCHOR_DATE
+    history_days: int
+
+
+SCALES: Dict[str, Scale] = {
+    # Fast enough for the test suite; query counts only
+    "small": Scale(
+        clients=25,
+        staff=8,
+        jobs=80,
+        time_lines_per_job=8,
+        material_lines_per_job=3,
+        journals=200,
+        lines_per_journal=4,
+        purchase_orders=40,
+        lines_per_po=3,
+        stock_items=60,
+        history_days=90,
+    ),
+    # Production-like volumes: ~270k cost lines, ~120k journal lines
+    "large": Scale(
+        clients=3000,
+        staff=40,
+        jobs=6000,
+        time_lines_per_job=30,
+        material_lines_per_job=10,
+        journals=30000,
+        lines_per_journal=4,
+        purchase_orders=4000,
+        lines_per_po=5,
+        stock_items=8000,
+        history_days=730,
+    ),
+}
+
+
+@dataclass
+class SeededData:
+    """What the benchmark cases need to know about the seeded rows."""
+
+    scale: str
+    seed: int
+    admin: Staff
+    # The job with the most cost lines, used for the job detail case
+    busiest_job_id: uuid.UUID
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class BenchmarkDataset:
+    """Builds the dataset for one scale. Call build() once on an empty database."""
+
+    def __init__(self, scale: str = "small", seed: int = DEFAULT_SEED):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale {scale!r}; expected one of {list(SCALES)}")
+        self.scale_name = scale
+        self.scale = SCALES[scale]
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.modified = timezone.make_aware(datetime.combine(ANCHOR_DATE, time(9)))
+
+    def build(self) -> SeededData:
+        if Job.objects.exists():
+            raise ValueError("Benchmark data must be seeded into an empty database")
+
+        with transaction.atomic():
+            self._ensure_reference_data()
+            admin = self._create_admin()
+            staff = self._create_staff()
+            clients = self._create_clients()
+            jobs = self._create_jobs(clients)
+            busiest_job_id, cost_lines = self._create_costing(jobs, staff)
+            journal_lines = self._create_journals()
+            po_lines = self._create_purchasing(clients, jobs)
+            stock = self._create_stock()
+            JobNumberSequence.reseed()
+
+        rollups = JournalRollupService.rebuild()
+        counts = {
+            "staff": len(staff),
+            "clients": len(clients),
+            "jobs": len(jobs),
+            "cost_lines": cost_lines,
+            "journal_lines": journal_lines,
+            "journal_rollups": rollups,
+            "purchase_order_lines": po_lines,
+            "stock": stock,
+        }
+        logger.info("Seeded %s benchmark dataset: %s", self.scale_name, counts)
+        return SeededData(
+            scale=self.scale_name,
+            seed=self.seed,
+            admin=admin,
+            busiest_job_id=busiest_job_id,
+            counts=counts,
+        )
+
+    # Helpers
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _money(self, low: float, high: float) -> Decimal:
+        return Decimal(str(round(self.rng.uniform(low, high), 2)))
+
+    def _day(self, history_days: int | None = None) -> date:
+        days = history_days or self.scale.history_days
+        return ANCHOR_DATE - timedelta(days=self.rng.randrange(days))
+
+    def _weighted(self, weights: Dict[str, int]) -> str:
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    # Builders
+
+    def _ensure_reference_data(self) -> None:
+        if not CompanyDefaults.objects.exists():
+            call_command("loaddata", "company_defaults", verbosity=0)
+        self.pay_item, _ = XeroPayItem.objects.get_or_create(
+            name="Ordinary Time",
+            uses_leave_api=False,
+            defaults={
+                "xero_id": "benchmark-ordinary-time",
+                "xero_tenant_id": "benchmark",
+                "multiplier": Decimal("1.00"),
+            },
+        )
+        company_defaults = CompanyDefaults.get_instance()
+        self.charge_out_rate = company_defaults.charge_out_rate
+        self.shop_client_name = company_defaults.shop_client_name
+
+    def _create_admin(self) -> Staff:
+        return Staff.objects.create_user(
+            email=BENCHMARK_EMAIL,
+            password="benchmark",
+            first_name="Benchmark",
+            last_name="Admin",
+            is_office_staff=True,
+            is_superuser=True,
+        )
+
+    def _create_staff(self) -> List[Staff]:
+        staff = [
+            Staff(
+                id=self._uuid(),
+                email=f"benchmark.staff{n:04d}@example.com",
+                password="!",
+                first_name="Staff",
+                last_name=f"{n:04d}",
+                wage_rate=self._money(28, 45),
+                is_office_staff=n % 5 == 0,
+            )
+            for n in range(self.scale.staff)
+        ]
+        return Staff.objects.bulk_create(staff, batch_size=BATCH_SIZE)
+
+    def _create_clients(self) -> List[Client]:
+        """Customers and suppliers, plus the shop client if one is configured."""
+        clients = [
+            Client(
+                id=self._uuid(),
+                name=f"Benchmark Client {n:05d}",
+                email=f"accounts{n:05d}@example.com",
+                is_account_customer=n % 3 == 0,
+                is_supplier=n % 4 == 0,
+                xero_contact_id=str(self._uuid()),
+                xero_last_modified=self.modified,
+            )
+            for n in range(self.scale.clients)
+        ]
+        self.shop_client = None
+        if self.shop_client_name:
+            self.shop_client = Client(
+                id=self._uuid(),
+                name=self.shop_client_name,
+                xero_last_modified=self.modified,
+            )
+            clients.append(self.shop_client)
+        return Client.objects.bulk_create(clients, batch_size=BATCH_SIZE)
+
+    def _create_jobs(self, clients: List[Client]) -> List[Job]:
+        first_number = JobNumberSequence.initial_number()
+        customers = [client for client in clients if client is not self.shop_client]
+        jobs = [
+            Job(
+                id=self._uuid(),
+                name=f"Benchmark Job {n:05d}",
+                job_number=first_number + n,
+                client=(
+                    self.shop_client
+                    if self.shop_client and self.rng.random() < SHOP_JOB_SHARE
+                    else self.rng.choice(customers)
+                ),
+                status=self._weighted(JOB_STATUS_WEIGHTS),
+                pricing_methodology=self.rng.choice(["time_materials", "fixed_price"]),
+                charge_out_rate=self.charge_out_rate,
+                default_xero_pay_item=self.pay_item,
+                priority=float(n + 1) * 100,
+                description=f"Benchmark job {n}",
+            )
+            for n in range(self.scale.jobs)
+        ]
+        return Job.objects.bulk_create(jobs, batch_size=BATCH_SIZE)
+
+    def _create_costing(self, jobs: List[Job], staff: List[Staff]):
+        """
+        Give every job an estimate, quote and actual cost set and fill them.
+
+        Returns (busiest job id, cost lines written). Lines are flushed in
+        batches so the large scale never holds every line in memory.
+        """
+        cost_sets: List[CostSet] = []
+        pending: List[CostLine] = []
+        written = 0
+        busiest = (0, jobs[0].id)
+
+        def flush():
+            nonlocal pending, written
+            CostLine.objects.bulk_create(pending, batch_size=BATCH_SIZE)
+            written += len(pending)
+            pending = []
+
+        for job in jobs:
+            sets = {
+                kind: CostSet(id=self._uuid(), job=job, kind=kind, rev=1)
+                for kind in ("estimate", "quote", "actual")
+            }
+            CostSet.objects.bulk_create(sets.values())
+            cost_sets.extend(sets.values())
+            job.latest_estimate = sets["estimate"]
+            job.latest_quote = sets["quote"]
+            job.latest_actual = sets["actual"]
+
+            # Shop jobs are internal: never billable, no revenue
+            shop = self.shop_client is not None and job.client is self.shop_client
+            # Actual lines vary per job so one stands out as the busiest
+            time_lines = self.rng.randint(1, self.scale.time_lines_per_job * 2)
+            lines = [
+                self._time_line(sets["actual"], staff, shop) for _ in range(time_lines)
+            ]
+            lines += [
+                self._material_line(sets["actual"], shop)
+                for _ in range(self.scale.material_lines_per_job)
+            ]
+            for kind in ("estimate", "quote"):
+                lines.append(self._time_line(sets[kind], staff, shop))
+                lines.append(self._material_line(sets[kind], shop))
+            if len(lines) > busiest[0]:
+                busiest = (len(lines), job.id)
+
+            self._summarise(sets.values(), lines)
+            pending.extend(lines)
+            if len(pending) >= BATCH_SIZE * 5:
+                flush()
+        flush()
+
+        CostSet.objects.bulk_update(cost_sets, ["summary"], batch_size=BATCH_SIZE)
+        Job.objects.bulk_update(
+            jobs,
+            ["latest_estimate", "latest_quote", "latest_actual"],
+            batch_size=BATCH_SIZE,
+        )
+        return busiest[1], written
+
+    def _time_line(self, cost_set: CostSet, staff: List[Staff], shop: bool) -> CostLine:
+        member = self.rng.choice(staff)
+        day = self._day()
+        billable = not shop and self.rng.random() < 0.85
+        return CostLine(
+            id=self._uuid(),
+            cost_set=cost_set,
+            kind="time",
+            desc="Workshop time",
+            quantity=Decimal(self.rng.randint(2, 32)) / 4,
+            unit_cost=member.wage_rate,
+            unit_rev=self.charge_out_rate if billable else Decimal("0.00"),
+            accounting_date=day,
+            xero_pay_item=self.pay_item,
+            meta={
+                "staff_id": str(member.id),
+                "date": day.isoformat(),
+                "is_billable": billable,
+                "wage_rate_multiplier": 1.0,
+                "wage_rate": float(member.wage_rate),
+                "charge_out_rate": float(self.charge_out_rate),
+                "created_from_timesheet": True,
+            },
+        )
+
+    def _material_line(self, cost_set: CostSet, shop: bool) -> CostLine:
+        unit_cost = self._money(5, 400)
+        markup = Decimal("0") if shop else Decimal("1.2")
+        return CostLine(
+            id=self._uuid(),
+            cost_set=cost_set,
+            kind="material",
+            desc=f"Material {self.rng.randrange(1000):03d}",
+            quantity=Decimal(self.rng.randint(1, 20)),
+            unit_cost=unit_cost,
+            unit_rev=(unit_cost * markup).quantize(Decimal("0.01")),
+            accounting_date=self._day(),
+            meta={"retail_rate": 0.2},
+        )
+
+    @staticmethod
+    def _summarise(cost_sets, lines: List[CostLine]) -> None:
+        """Mirror CostLine._update_cost_set_summary for lines saved in bulk."""
+        for cost_set in cost_sets:
+            own = [line for line in lines if line.cost_set is cost_set]
+            cost_set.summary = {
+                "cost": float(sum(line.quantity * line.unit_cost for line in own)),
+                "rev": float(sum(line.quantity * line.unit_rev for line in own)),
+                "hours": sum(
+                    float(line.quantity) for line in own if line.kind == "time"
+                ),
+            }
+
+    def _create_journals(self) -> int:
+        accounts = XeroAccount.objects.bulk_create(
+            [
+                XeroAccount(
+                    xero_id=self._uuid(),
+                    account_code=code,
+                    account_name=name,
+                    account_type=account_type,
+                    xero_last_modified=self.modified,
+                    raw_json={},
+                )
+                for code, name, account_type in ACCOUNTS
+            ]
+        )
+        bank = accounts[-1]
+        trading = accounts[:-1]
+
+        journals = []
+        for n in range(self.scale.journals):
+            # Two years back so the P&L comparison periods have data
+            day = self._day(max(self.scale.history_days, 730))
+            journals.append(
+                XeroJournal(
+                    xero_id=self._uuid(),
+                    journal_date=day,
+                    created_date_utc=timezone.make_aware(datetime.combine(day, time())),
+                    journal_number=n + 1,
+                    raw_json={},
+                    xero_last_modified=self.modified,
+                )
+            )
+        XeroJournal.objects.bulk_create(journals, batch_size=BATCH_SIZE)
+
+        # Balanced pairs: each trading line is offset against the bank
+        items = []
+        for journal in journals:
+            for _ in range(self.scale.lines_per_journal // 2):
+                net = self._money(20, 5000)
+                for account, amount in (
+                    (self.rng.choice(trading), net),
+                    (bank, -net),
+                ):
+                    tax = (amount * Decimal("0.15")).quantize(Decimal("0.01"))
+                    items.append(
+                        XeroJournalLineItem(
+                            journal=journal,
+                            xero_line_id=self._uuid(),
+                            account=account,
+                            net_amount=amount,
+                            tax_amount=tax,
+                            gross_amount=amount + tax,
+                            raw_json={},
+                        )
+                    )
+        XeroJournalLineItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+        return len(items)
+
+    def _create_purchasing(self, clients: List[Client], jobs: List[Job]) -> int:
+        suppliers = [client for client in clients if client.is_supplier] or clients
+        orders = []
+        for n in range(self.scale.purchase_orders):
+            order_date = self._day()
+            orders.append(
+                PurchaseOrder(
+                    id=self._uuid(),
+                    supplier=self.rng.choice(suppliers),
+                    po_number=f"BM{n + 1:06d}",
+                    status=self._weighted(PO_STATUS_WEIGHTS),
+                    order_date=order_date,
+                    expected_delivery=order_date + timedelta(days=7),
+                )
+            )
+        PurchaseOrder.objects.bulk_create(orders, batch_size=BATCH_SIZE)
+
+        lines = []
+        for order in orders:
+            for _ in range(self.scale.lines_per_po):
+                quantity = Decimal(self.rng.randint(1, 50))
+                received = quantity if order.status == "fully_received" else 0
+                lines.append(
+                    PurchaseOrderLine(
+                        id=self._uuid(),
+                        purchase_order=order,
+                        job=self.rng.choice(jobs),
+                        description=f"Sheet {self.rng.randrange(1000):03d}",
+                        quantity=quantity,
+                        received_quantity=Decimal(received),
+                        unit_cost=self._money(5, 400),
+                    )
+                )
+        PurchaseOrderLine.objects.bulk_create(lines, batch_size=BATCH_SIZE)
+        return len(lines)
+
+    def _create_stock(self) -> int:
+        stock = []
+        for n in range(self.scale.stock_items):
+            unit_cost = self._money(2, 300)
+            stock.append(
+                Stock(
+                    id=self._uuid(),
+                    item_code=f"BM-{n + 1:06d}",
+                    description=f"Stock item {n + 1}",
+                    quantity=Decimal(self.rng.randint(1, 200)),
+                    unit_cost=unit_cost,
+                    unit_revenue=(unit_cost * Decimal("1.2")).quantize(Decimal("0.01")),
+                    source="manual",
+                    location="Rack " + self.rng.choice("ABCDEFGH"),
+                )
+            )
+        Stock.objects.bulk_create(stock, batch_size=BATCH_SIZE)
+        return len(stock)
@@ -0,0 +1,273 @@
+"""
+Benchmark Runner
+
+Requests each hot endpoint against a seeded BenchmarkDataset and records its
+query count and median wall time, then compares them with the committed
+baselines in baselines.json.
+
+Query counts are deterministic for a given dataset and the ORM issues the
+same statements on every backend, so they are stored once per scale and held
+to a tight tolerance. Wall times depend on the machine and the database, so
+they are stored per scale and vendor, get a wide tolerance plus a small
+absolute allowance, and should be refreshed (run_benchmarks
+--update-baselines) on the machine that does the comparing. Without wall
+times for the current vendor only query counts are checked.
+"""
+
+import json
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.workflow.benchmarks.dataset import ANCHOR_DATE, SeededData
+from apps.workflow.services.request_profiling_service import QueryProfiler
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+QUERY_TOLERANCE = 0.10
+TIME_TOLERANCE = 0.50
+# Wall time may always grow by this much; it keeps fast endpoints from flapping
+TIME_ALLOWANCE_MS = 10.0
+# Not counted: whether atomic() issues these depends on the caller's transaction
+_SAVEPOINT_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    url_name: str
+    params: Dict[str, str] = field(default_factory=dict)
+    # Builds the URL kwargs from the seeded data
+    url_kwargs: Callable[[SeededData], dict] = lambda data: {}
+
+    def url(self, data: SeededData) -> str:
+        return reverse(self.url_name, kwargs=self.url_kwargs(data))
+
+
+BENCHMARK_CASES: List[BenchmarkCase] = [
+    BenchmarkCase("kanban_all_jobs", "jobs:api_fetch_all_jobs"),
+    BenchmarkCase(
+        "kanban_in_progress",
+        "jobs:api_fetch_jobs",
+        url_kwargs=lambda data: {"status": "in_progress"},
+    ),
+    BenchmarkCase(
+        "job_detail",
+        "jobs:job_detail_rest",
+        url_kwargs=lambda data: {"job_id": data.busiest_job_id},
+    ),
+    BenchmarkCase(
+        "weekly_timesheet",
+        "timesheet:api_weekly_timesheet",
+        params={"start_date": ANCHOR_DATE.isoformat()},
+    ),
+    BenchmarkCase(
+        "daily_timesheet",
+        "timesheet:api_daily_summary",
+        url_kwargs=lambda data: {"target_date": ANCHOR_DATE.isoformat()},
+    ),
+    BenchmarkCase(
+        "weekly_metrics",
+        "jobs:weekly_metrics_rest",
+        params={"week": ANCHOR_DATE.isoformat()},
+    ),
+    BenchmarkCase(
+        "kpi_calendar",
+        "accounting:api_kpi_calendar",
+        params={"year": str(ANCHOR_DATE.year), "month": str(ANCHOR_DATE.month)},
+    ),
+    BenchmarkCase(
+        "profit_and_loss",
+        "accounting:api_profit_and_loss",
+        params={
+            "start_date": "2024-07-01",
+            "end_date": ANCHOR_DATE.isoformat(),
+            "compare": "1",
+            "period_type": "year",
+        },
+    ),
+    BenchmarkCase("purchase_orders", "purchasing:purchase_orders_rest"),
+    BenchmarkCase("stock_list", "purchasing:stock-list"),
+    BenchmarkCase("client_list", "clients:client_list_all_rest"),
+]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    status_code: int
+    queries: int
+    # Median over the measured runs
+    wall_ms: float
+    # Some SELECT ran at least N_PLUS_ONE_THRESHOLD times in one request
+    n_plus_one: bool = False
+
+
+@dataclass
+class Regression:
+    case: str
+    metric: str
+    baseline: float
+    actual: float
+    allowed: float
+
+    def __str__(self):
+        if self.metric == "status_code":
+            return f"{self.case}: returned HTTP {self.actual:.0f}"
+        return (
+            f"{self.case}: {self.metric} {self.actual:g} exceeds baseline "
+            f"{self.baseline:g} (allowed up to {self.allowed:g})"
+        )
+
+
+def run_benchmarks(
+    data: SeededData,
+    repeat: int = 5,
+    cases: List[BenchmarkCase] | None = None,
+) -> List[BenchmarkResult]:
+    """
+    Request every case as the seeded admin.
+
+    Each case gets one unmeasured warm-up request (so per-process caches such
+    as CompanyDefaults are filled), then `repeat` measured requests.
+    """
+    if connection.vendor == "sqlite":
+        install_sqlite_functions()
+    client = APIClient()
+    client.force_authenticate(data.admin)
+
+    results = []
+    for case in cases or BENCHMARK_CASES:
+        url = case.url(data)
+        client.get(url, case.params)
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            profiler = QueryProfiler()
+            with connection.execute_wrapper(profiler):
+                start = time.perf_counter()
+                response = client.get(url, case.params)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries = max(queries, count_queries(profiler))
+        results.append(
+            BenchmarkResult(
+                name=case.name,
+                status_code=response.status_code,
+                queries=queries,
+                wall_ms=round(statistics.median(timings), 1),
+                n_plus_one=profiler.has_n_plus_one,
+            )
+        )
+    return results
+
+
+def count_queries(profiler: QueryProfiler) -> int:
+    return sum(
+        count
+        for sql, count in profiler.statements.items()
+        if not sql.startswith(_SAVEPOINT_PREFIXES)
+    )
+
+
+def install_sqlite_functions() -> None:
+    """
+    Stand in for the MySQL JSON functions the timesheet and purchasing
+    queries use. SQLite's JSON_EXTRACT already returns scalars unquoted, so
+    JSON_UNQUOTE has nothing left to do.
+    """
+    connection.ensure_connection()
+    connection.connection.create_function(
+        "JSON_UNQUOTE", 1, lambda value: value, deterministic=True
+    )
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def baseline_for(scale: str, path: Path = BASELINES_PATH) -> Dict[str, dict]:
+    """
+    Baselines per case for one scale: its query count, plus its wall time
+    when one was recorded on the current database vendor.
+    """
+    stored = load_baselines(path).get(scale, {})
+    wall_ms = stored.get("wall_ms", {}).get(connection.vendor, {})
+    baseline: Dict[str, dict] = {}
+    for name, queries in stored.get("queries", {}).items():
+        baseline[name] = {"queries": queries}
+        if name in wall_ms:
+            baseline[name]["wall_ms"] = wall_ms[name]
+    return baseline
+
+
+def has_wall_times(scale: str, path: Path = BASELINES_PATH) -> bool:
+    """Whether wall times were recorded for the scale on this vendor."""
+    stored = load_baselines(path).get(scale, {})
+    return bool(stored.get("wall_ms", {}).get(connection.vendor))
+
+
+def save_baselines(
+    results: List[BenchmarkResult], scale: str, path: Path = BASELINES_PATH
+) -> None:
+    """Replace the query counts and this vendor's wall times for one scale."""
+    baselines = load_baselines(path)
+    stored = baselines.setdefault(scale, {})
+    stored["queries"] = {result.name: result.queries for result in results}
+    stored.setdefault("wall_ms", {})[connection.vendor] = {
+        result.name: result.wall_ms for result in results
+    }
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, dict],
+    query_tolerance: float = QUERY_TOLERANCE,
+    time_tolerance: float | None = TIME_TOLERANCE,
+) -> List[Regression]:
+    """
+    Regressions beyond tolerance. Pass time_tolerance=None to check queries only.
+
+    Cases without a baseline are not regressions; they appear once baselines
+    are updated. Wall time is only checked for cases that have one.
+    """
+    regressions = []
+    for result in results:
+        if result.status_code != 200:
+            regressions.append(
+                Regression(result.name, "status_code", 200, result.status_code, 200)
+            )
+            continue
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+
+        allowed = int(expected["queries"] * (1 + query_tolerance))
+        if result.queries > allowed:
+            regressions.append(
+                Regression(
+                    result.name, "queries", expected["queries"], result.queries, allowed
+                )
+            )
+        if time_tolerance is not None and "wall_ms" in expected:
+            allowed_ms = round(
+                expected["wall_ms"] * (1 + time_tolerance) + TIME_ALLOWANCE_MS, 1
+            )
+            if result.wall_ms > allowed_ms:
+                regressions.append(
+                    Regression(
+                        result.name,
+                        "wall_ms",
+                        expected["wall_ms"],
+                        result.wall_ms,
+                        allowed_ms,
+                    )
+                )
+    return regressions
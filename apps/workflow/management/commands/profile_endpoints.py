@@ -0,0 +1,80 @@
+"""
+List the worst endpoints recorded by RequestProfilingMiddleware.
+
+Usage:
+    python manage.py profile_endpoints
+    python manage.py profile_endpoints --hours 4 --sort queries --limit 10
+    python manage.py profile_endpoints --show-sql
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.workflow.services.request_profiling_service import (
+    SORT_KEYS,
+    endpoint_stats,
+    profile_buffer,
+)
+
+
+class Command(BaseCommand):
+    help = "Show per-endpoint latency percentiles, query counts and N+1 flags"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=24,
+            help="Window to aggregate, in hours (default: 24)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of endpoints to list (default: 20)",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=sorted(SORT_KEYS),
+            default="p95",
+            help="Column to rank endpoints by (default: p95)",
+        )
+        parser.add_argument(
+            "--show-sql",
+            action="store_true",
+            help="Print the most repeated statements under each endpoint",
+        )
+
+    def handle(self, *args, **options):
+        if options["hours"] <= 0 or options["limit"] <= 0:
+            raise CommandError("--hours and --limit must be positive")
+
+        # Samples taken by this process are still in memory
+        profile_buffer.flush()
+        stats = endpoint_stats(
+            hours=options["hours"], limit=options["limit"], sort=options["sort"]
+        )
+        if not stats:
+            self.stdout.write(
+                "No profiled requests in this window. "
+                "Is REQUEST_PROFILING enabled on the web server?"
+            )
+            return
+
+        self.stdout.write(
+            f"{'endpoint':<45} {'reqs':>6} {'p50ms':>8} {'p95ms':>8} "
+            f"{'p99ms':>8} {'queries':>8} {'max':>5} {'dbms':>8} {'dupes':>6} "
+            f"{'N+1':>5}"
+        )
+        for s in stats:
+            line = (
+                f"{s.url_name[:45]:<45} {s.requests:>6} {s.p50_ms:>8.1f} "
+                f"{s.p95_ms:>8.1f} {s.p99_ms:>8.1f} {s.avg_queries:>8.1f} "
+                f"{s.max_queries:>5} {s.avg_db_ms:>8.1f} "
+                f"{s.avg_duplicate_queries:>6.1f} {s.n_plus_one_requests:>5}"
+            )
+            if s.n_plus_one_requests:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
+            if options["show_sql"]:
+                for query in s.top_repeated_queries:
+                    self.stdout.write(f"    {query['count']:>6}x  {query['sql'][:160]}")
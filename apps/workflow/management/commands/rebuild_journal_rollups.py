@@ -0,0 +1,45 @@
+"""
+Rebuild the monthly journal rollups used by the P&L report.
+
+Usage:
+    python manage.py rebuild_journal_rollups
+    python manage.py rebuild_journal_rollups --month 2025-03-01 --month 2025-04-01
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.workflow.services.journal_rollup_service import JournalRollupService
+
+
+class Command(BaseCommand):
+    help = "Rebuild (account, month) journal rollups from Xero journal line items"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--month",
+            action="append",
+            default=[],
+            help="Only recompute the month containing this date (YYYY-MM-DD). "
+            "May be repeated. Rebuilds every month if omitted.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            months = [date.fromisoformat(value) for value in options["month"]]
+        except ValueError as exc:
+            raise CommandError(f"Invalid --month value: {exc}")
+
+        if months:
+            rows = JournalRollupService.refresh_months(months)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Recomputed {len(set(m.replace(day=1) for m in months))} "
+                    f"months ({rows} rollup rows)"
+                )
+            )
+            return
+
+        rows = JournalRollupService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} journal rollup rows"))
@@ -0,0 +1,85 @@
+"""
+Re-derive stored Xero invoices, bills, credit notes and journals from raw_json.
+
+Use after fixing the mapping logic in reprocess_xero. Progress is checkpointed
+per model, so an interrupted run resumes where it stopped.
+
+Usage:
+    python manage.py reprocess_xero                       # Everything
+    python manage.py reprocess_xero --model journals      # One model
+    python manage.py reprocess_xero --changed-only        # Only new raw_json
+    python manage.py reprocess_xero --workers 1           # No thread pool
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.workflow.api.xero.reprocess_xero import (
+    CHUNK_SIZE,
+    MAX_WORKERS,
+    XeroReprocessor,
+)
+
+MODELS = {
+    "invoices": "INVOICE",
+    "bills": "BILL",
+    "credit_notes": "CREDIT_NOTE",
+    "journals": None,
+}
+
+
+class Command(BaseCommand):
+    help = "Reprocess stored Xero documents and journals from their raw_json"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=list(MODELS),
+            default=[],
+            help="Only reprocess this model. May be repeated. Default: all.",
+        )
+        parser.add_argument(
+            "--changed-only",
+            action="store_true",
+            help="Only reprocess records saved since the last completed run",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=MAX_WORKERS,
+            help=f"Chunks processed concurrently (default {MAX_WORKERS})",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"Records per chunk and transaction (default {CHUNK_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        reprocessor = XeroReprocessor(
+            chunk_size=options["chunk_size"],
+            max_workers=options["workers"],
+            changed_only=options["changed_only"],
+        )
+        results = []
+        for name in options["model"] or MODELS:
+            document_type = MODELS[name]
+            if document_type is None:
+                results.append(reprocessor.reprocess_journals())
+            else:
+                results.append(reprocessor.reprocess_documents(document_type))
+
+        for result in results:
+            style = self.style.SUCCESS if result.completed else self.style.WARNING
+            self.stdout.write(
+                style(
+                    f"{result.model}: {result.processed} reprocessed, "
+                    f"{result.line_items_created} line items created, "
+                    f"{result.line_items_updated} updated, "
+                    f"{len(result.failed)} failed"
+                    + ("" if result.completed else " (incomplete, will resume)")
+                )
+            )
+            for name, error in result.failed.items():
+                self.stdout.write(self.style.ERROR(f"  {name}: {error}"))
@@ -0,0 +1,177 @@
+"""
+Benchmark the hot endpoints against a seeded dataset and check the baselines.
+
+Seeds a throwaway test database (never the configured one), so it runs offline
+against a local MySQL server, or SQLite with jobs_manager.settings_sqlite.
+Exits non-zero when an endpoint's query count or wall time regresses beyond
+tolerance, or when the scale has no baselines at all.
+
+Usage:
+    python manage.py run_benchmarks
+    python manage.py run_benchmarks --scale large --repeat 3
+    python manage.py run_benchmarks --scale large --update-baselines
+    python manage.py run_benchmarks --queries-only
+    DJANGO_SETTINGS_MODULE=jobs_manager.settings_sqlite \\
+        python manage.py run_benchmarks
+"""
+
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from apps.workflow.benchmarks.dataset import DEFAULT_SEED, SCALES, BenchmarkDataset
+from apps.workflow.benchmarks.runner import (
+    QUERY_TOLERANCE,
+    TIME_TOLERANCE,
+    baseline_for,
+    compare_to_baseline,
+    has_wall_times,
+    run_benchmarks,
+    save_baselines,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark hot endpoints on a seeded dataset against committed baselines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            choices=sorted(SCALES),
+            default="small",
+            help="Dataset size to seed (default: small)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=DEFAULT_SEED,
+            help="Random seed; baselines are only comparable for the default seed",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Measured requests per endpoint (default: 5)",
+        )
+        parser.add_argument(
+            "--query-tolerance",
+            type=float,
+            default=QUERY_TOLERANCE,
+            help=f"Allowed query count growth (default: {QUERY_TOLERANCE})",
+        )
+        parser.add_argument(
+            "--time-tolerance",
+            type=float,
+            default=TIME_TOLERANCE,
+            help=f"Allowed wall time growth (default: {TIME_TOLERANCE})",
+        )
+        parser.add_argument(
+            "--queries-only",
+            action="store_true",
+            help="Ignore wall time, e.g. on a machine other than the baseline one",
+        )
+        parser.add_argument(
+            "--update-baselines",
+            action="store_true",
+            help="Write this run's numbers as the new baselines instead of comparing",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] <= 0:
+            raise CommandError("--repeat must be positive")
+
+        scale = options["scale"]
+        if not options["update_baselines"] and not baseline_for(scale):
+            raise CommandError(
+                f"No {scale} baselines; run with --update-baselines to record them"
+            )
+        old_name = connection.settings_dict["NAME"]
+        setup_test_environment()
+        self._create_test_db()
+        try:
+            # Errors raised by the endpoints must be written before the
+            # database is dropped, not flushed afterwards
+            with override_settings(APP_ERROR_BUFFERING=False):
+                started = time.perf_counter()
+                data = BenchmarkDataset(scale, options["seed"]).build()
+                self.stdout.write(
+                    f"Seeded {scale} dataset in "
+                    f"{time.perf_counter() - started:.1f}s: "
+                    + ", ".join(f"{k}={v}" for k, v in data.counts.items())
+                )
+                results = run_benchmarks(data, repeat=options["repeat"])
+            vendor = connection.vendor
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        baseline = baseline_for(scale)
+        self.stdout.write(
+            f"{'endpoint':<22} {'status':>6} {'queries':>8} {'base':>6} "
+            f"{'wall ms':>9} {'base':>9} {'N+1':>4}"
+        )
+        for result in results:
+            expected = baseline.get(result.name, {})
+            line = (
+                f"{result.name:<22} {result.status_code:>6} {result.queries:>8} "
+                f"{expected.get('queries', '-'):>6} {result.wall_ms:>9.1f} "
+                f"{expected.get('wall_ms', '-'):>9} "
+                f"{'yes' if result.n_plus_one else '':>4}"
+            )
+            if result.n_plus_one:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
+
+        if options["update_baselines"]:
+            failed = [r.name for r in results if r.status_code != 200]
+            if failed:
+                raise CommandError(
+                    f"Not saving baselines; these endpoints failed: {', '.join(failed)}"
+                )
+            save_baselines(results, scale)
+            self.stdout.write(self.style.SUCCESS(f"Updated {scale}/{vendor} baselines"))
+            return
+
+        if not options["queries_only"] and not has_wall_times(scale):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No {scale}/{vendor} wall times yet, checking query counts "
+                    "only; run with --update-baselines to record them"
+                )
+            )
+        regressions = compare_to_baseline(
+            results,
+            baseline,
+            query_tolerance=options["query_tolerance"],
+            time_tolerance=(
+                None if options["queries_only"] else options["time_tolerance"]
+            ),
+        )
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(str(regression)))
+            raise CommandError(f"{len(regressions)} benchmark regression(s)")
+        self.stdout.write(self.style.SUCCESS("All endpoints within baseline"))
+
+    def _create_test_db(self):
+        """
+        Create the throwaway database. Several migrations use MySQL-only SQL,
+        so other backends get the schema straight from the models instead.
+        """
+        if connection.vendor == "mysql":
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            return
+        no_migrations = {config.label: None for config in apps.get_app_configs()}
+        with override_settings(MIGRATION_MODULES=no_migrations):
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
@@ -1,16 +1,23 @@
 import logging
+import random
+import time
 from datetime import datetime
 from typing import Callable
 
 from django.conf import settings
 from django.contrib import messages
-from django.core.exceptions import DisallowedHost
+from django.core.exceptions import DisallowedHost, MiddlewareNotUsed
+from django.db import connection
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 
+from apps.workflow.models import CompanyDefaults
 from apps.workflow.services.error_persistence import persist_and_raise
-from jobs_manager.authentication import JWTAuthentication
+from apps.workflow.services.request_profiling_service import (
+    QueryProfiler,
+    profile_buffer,
+)
 
 # Get access logger configured in Django settings
 access_logger = logging.getLogger("access")
@@ -48,44 +55,62 @@ class DisallowedHostMiddleware:
         return None
 
 
-class AccessLoggingMiddleware:
+class CompanyDefaultsMemoMiddleware:
+    """
+    Memoises CompanyDefaults.get_cached() per request, so every read within
+    one request sees the same values and the shared cache is checked once.
+    """
+
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
         self.get_response = get_response
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        # Try to authenticate with JWT if not already authenticated
-        if not request.user.is_authenticated:
-            jwt_auth = JWTAuthentication()
-            try:
-                auth_result = jwt_auth.authenticate(request)
-                if auth_result:
-                    request.user, _ = auth_result
-            except Exception:
-                # If JWT authentication fails, continue with anonymous user
-                pass
-
-        # Fallback: token query param (for SSE where cookies don't work)
-        if not request.user.is_authenticated:
-            token = request.GET.get("token")
-            if token:
-                try:
-                    import jwt
-                    from django.contrib.auth import get_user_model
-                    from django.core.exceptions import ObjectDoesNotExist
-
-                    payload = jwt.decode(
-                        token,
-                        settings.BEARER_TOKEN_SECRET,
-                        algorithms=["HS256"],
-                        options={"verify_exp": True},
-                    )
-                    if payload.get("user_id"):
-                        request.user = get_user_model().objects.get(
-                            id=payload["user_id"]
-                        )
-                except (jwt.InvalidTokenError, ObjectDoesNotExist):
-                    pass
+        with CompanyDefaults.request_memo():
+            return self.get_response(request)
+
+
+class RequestProfilingMiddleware:
+    """
+    Records query count, DB time and repeated SQL of each request against its
+    URL name. Opt-in with REQUEST_PROFILING; when off Django drops it from
+    the chain at startup, so it costs nothing.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if random.random() >= settings.REQUEST_PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profiler = QueryProfiler()
+        start = time.perf_counter()
+        with connection.execute_wrapper(profiler):
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        # Unresolved paths (404s, static files) have no endpoint to report
+        if request.resolver_match is not None:
+            profile_buffer.add(
+                profiler.to_profile(
+                    url_name=request.resolver_match.view_name[:200],
+                    method=request.method,
+                    path=request.path[:255],
+                    status_code=response.status_code,
+                    duration_ms=duration_ms,
+                )
+            )
+        return response
+
 
+class AccessLoggingMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        # Identity was resolved once by BearerIdentityMiddleware
         # Handle unhappy case first - unauthenticated users
         if not request.user.is_authenticated:
             return self.get_response(request)
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:10
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_journal_rollups(apps, schema_editor):
+    XeroJournalLineItem = apps.get_model("workflow", "XeroJournalLineItem")
+    XeroJournalMonthlyRollup = apps.get_model("workflow", "XeroJournalMonthlyRollup")
+    totals = (
+        XeroJournalLineItem.objects.annotate(month=TruncMonth("journal__journal_date"))
+        .values("month", "account_id")
+        .annotate(total=Sum("net_amount"))
+    )
+    XeroJournalMonthlyRollup.objects.bulk_create(
+        (
+            XeroJournalMonthlyRollup(
+                month=row["month"],
+                account_id=row["account_id"],
+                net_amount=row["total"],
+            )
+            for row in totals
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow', '0199_populate_shared_drive_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XeroJournalMonthlyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('month', models.DateField()),
+                ('net_amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('django_updated_at', models.DateTimeField(auto_now=True)),
+                ('account', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='workflow.xeroaccount')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month', 'account'], name='journal_rollup_month_idx')],
+            },
+        ),
+        migrations.RunPython(populate_journal_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:23
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflow", "0200_journal_monthly_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="XeroReprocessCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("model", models.CharField(max_length=100, unique=True)),
+                ("processed_through", models.DateTimeField(blank=True, null=True)),
+                ("run_started_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "resume_after",
+                    models.CharField(blank=True, max_length=36, null=True),
+                ),
+                ("processed", models.PositiveIntegerField(default=0)),
+                ("failed", models.PositiveIntegerField(default=0)),
+                ("django_updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:02
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_last_seen(apps, schema_editor):
+    """Existing rows are single occurrences: last seen when first seen."""
+    AppError = apps.get_model("workflow", "AppError")
+    AppError.objects.update(last_seen=F("timestamp"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflow", "0202_xero_submission"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apperror",
+            name="fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="apperror",
+            name="last_seen",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="apperror",
+            name="occurrence_count",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name="apperror",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.RunPython(backfill_last_seen, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="apperror",
+            index=models.Index(
+                fields=["fingerprint", "resolved"],
+                name="workflow_ap_fingerp_8caa4a_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflow", "0203_app_error_grouping"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "recorded_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("url_name", models.CharField(max_length=200)),
+                ("method", models.CharField(max_length=10)),
+                ("path", models.CharField(max_length=255)),
+                ("status_code", models.PositiveSmallIntegerField()),
+                ("duration_ms", models.FloatField()),
+                ("query_count", models.PositiveIntegerField()),
+                ("db_time_ms", models.FloatField()),
+                ("duplicate_query_count", models.PositiveIntegerField(default=0)),
+                ("n_plus_one", models.BooleanField(default=False)),
+                ("repeated_queries", models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                "db_table": "workflow_request_profile",
+                "ordering": ["-recorded_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["recorded_at"], name="workflow_re_recorde_b7a866_idx"
+                    ),
+                    models.Index(
+                        fields=["url_name", "recorded_at"],
+                        name="workflow_re_url_nam_55aeed_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
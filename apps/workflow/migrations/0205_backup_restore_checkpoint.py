@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-19 00:06
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow', '0204_request_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackupRestoreCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('backup_path', models.CharField(max_length=500, unique=True)),
+                ('records', models.PositiveIntegerField(default=0)),
+                ('model_counts', models.JSONField(default=dict)),
+                ('django_updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
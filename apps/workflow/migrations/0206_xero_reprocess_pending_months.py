@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow', '0205_backup_restore_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xeroreprocesscheckpoint',
+            name='pending_months',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -2,25 +2,34 @@
 
 from .ai_provider import AIProvider
 from .app_error import AppError, XeroError
+from .backup_restore_checkpoint import BackupRestoreCheckpoint
 from .company_defaults import CompanyDefaults
+from .request_profile import RequestProfile
 from .service_api_key import ServiceAPIKey
 from .xero_account import XeroAccount
-from .xero_journal import XeroJournal, XeroJournalLineItem
+from .xero_journal import XeroJournal, XeroJournalLineItem, XeroJournalMonthlyRollup
 from .xero_pay_item import XeroPayItem
 from .xero_payroll import XeroPayRun, XeroPaySlip
+from .xero_reprocess import XeroReprocessCheckpoint
+from .xero_submission import XeroSubmission
 from .xero_token import XeroToken
 
 __all__ = [
     "AIProvider",
     "AppError",
+    "BackupRestoreCheckpoint",
     "CompanyDefaults",
+    "RequestProfile",
     "ServiceAPIKey",
     "XeroAccount",
     "XeroError",
     "XeroJournal",
     "XeroJournalLineItem",
+    "XeroJournalMonthlyRollup",
     "XeroPayItem",
     "XeroPayRun",
     "XeroPaySlip",
+    "XeroReprocessCheckpoint",
+    "XeroSubmission",
     "XeroToken",
 ]
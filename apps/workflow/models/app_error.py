@@ -6,10 +6,21 @@ from django.utils import timezone
 
 
 class AppError(models.Model):
-    """Persistent record of an application error."""
+    """
+    Persistent record of an application error.
+
+    Repeats of the same error (same fingerprint) are merged into one row while
+    it is unresolved: ``occurrence_count`` and ``last_seen`` track them and
+    ``timestamp`` is the first occurrence.
+    """
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # First occurrence; set explicitly when buffered errors are written later
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+    last_seen = models.DateTimeField(default=timezone.now, editable=False)
+    occurrence_count = models.PositiveIntegerField(default=1)
+    # Hash of exception type, normalised message and top frames
+    fingerprint = models.CharField(max_length=64, blank=True, default="")
     message = models.TextField()
     data = models.JSONField(blank=True, null=True)
 
@@ -57,6 +68,7 @@ class AppError(models.Model):
                 fields=["resolved", "timestamp"]
             ),  # Common: unresolved errors chronologically
             models.Index(fields=["app", "severity"]),  # Common: errors by app section
+            models.Index(fields=["fingerprint", "resolved"]),  # Grouping repeats
         ]
 
 
@@ -0,0 +1,25 @@
+import uuid
+
+from django.db import models
+
+
+class BackupRestoreCheckpoint(models.Model):
+    """
+    Progress of a streaming backup restore.
+
+    Saved in the same transaction as each restored batch, so `records` is
+    always exactly the number of backup lines whose rows are committed and
+    an interrupted restore resumes without re-inserting any of them.
+    Deleted when the restore completes.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Absolute path of the backup file being restored
+    backup_path = models.CharField(max_length=500, unique=True)
+    records = models.PositiveIntegerField(default=0)
+    # Records restored so far per model label
+    model_counts = models.JSONField(default=dict)
+    django_updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Restore checkpoint {self.backup_path}: {self.records} records"
@@ -1,7 +1,23 @@
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from decimal import Decimal
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+
+# Version token in the shared cache, replaced whenever the row changes
+VERSION_CACHE_KEY = "company_defaults_version"
+# Backstop for processes that cannot see each other's version bumps (e.g. a
+# per-process LocMemCache): the process copy is reloaded at least this often
+MAX_AGE_SECONDS = 60
+
+_process_copy = {"instance": None, "version": None, "loaded_at": 0.0}
+_process_lock = threading.Lock()
+_request_memo = contextvars.ContextVar("company_defaults_request_memo", default=None)
 
 
 class CompanyDefaults(models.Model):
@@ -284,6 +300,11 @@ class CompanyDefaults(models.Model):
         if loading_changed:
             self._recompute_all_staff_wage_rates()
 
+        # Now, so this process sees its own write, and again on commit, so no
+        # process keeps a copy it read before the transaction committed
+        CompanyDefaults.invalidate_cache()
+        transaction.on_commit(CompanyDefaults.invalidate_cache)
+
         return result
 
     def _recompute_all_staff_wage_rates(self):
@@ -300,11 +321,71 @@ class CompanyDefaults(models.Model):
     @classmethod
     def get_instance(cls) -> "CompanyDefaults":
         """
-        Get the singleton instance.
-        This is the preferred way to get the CompanyDefaults instance.
+        Get the singleton instance from the database.
+        Use this when the instance is going to be modified and saved;
+        read-only callers should use get_cached().
         """
         return cls.objects.get()
 
+    @classmethod
+    def get_cached(cls) -> "CompanyDefaults":
+        """
+        Get the singleton instance from process memory, for read-only use.
+
+        The process copy is reused while the version token in the shared
+        cache is unchanged. Inside request_memo() the first instance returned
+        is reused for the rest of the request, so all reads agree.
+        """
+        memo = _request_memo.get()
+        if memo is not None and "instance" in memo:
+            return memo["instance"]
+
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            # Never set or evicted: start a new version so every process reloads
+            cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(VERSION_CACHE_KEY)
+
+        with _process_lock:
+            instance = _process_copy["instance"]
+            fresh = (
+                instance is not None
+                and _process_copy["version"] == version
+                and time.monotonic() - _process_copy["loaded_at"] < MAX_AGE_SECONDS
+            )
+        if not fresh:
+            # The version was read before loading, so a save that lands
+            # meanwhile bumps it again and the next call reloads
+            instance = cls.objects.get()
+            with _process_lock:
+                _process_copy.update(
+                    instance=instance, version=version, loaded_at=time.monotonic()
+                )
+
+        if memo is not None:
+            memo["instance"] = instance
+        return instance
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Make every process reload the instance on its next get_cached()."""
+        cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        with _process_lock:
+            _process_copy["instance"] = None
+        memo = _request_memo.get()
+        if memo is not None:
+            memo.clear()
+
+    @classmethod
+    @contextmanager
+    def request_memo(cls):
+        """Memoise get_cached() for the duration of the block (one request)."""
+        token = _request_memo.set({})
+        try:
+            yield
+        finally:
+            _request_memo.reset(token)
+
     @property
     def llm_api_key(self):
         """
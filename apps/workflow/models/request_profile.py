@@ -0,0 +1,41 @@
+from django.db import models
+from django.utils import timezone
+
+
+class RequestProfile(models.Model):
+    """
+    Query and latency sample for one profiled request.
+
+    Written in batches by RequestProfilingMiddleware when REQUEST_PROFILING is
+    on, aggregated per URL name by request_profiling_service.endpoint_stats,
+    and pruned after REQUEST_PROFILING_RETENTION_DAYS.
+    """
+
+    recorded_at = models.DateTimeField(default=timezone.now)
+    # Resolved view name, e.g. "jobs:job_rest"
+    url_name = models.CharField(max_length=200)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    db_time_ms = models.FloatField()
+    # Queries beyond the first run of each statement
+    duplicate_query_count = models.PositiveIntegerField(default=0)
+    n_plus_one = models.BooleanField(default=False)
+    # [{"sql": normalised statement, "count": runs}], most repeated first
+    repeated_queries = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        db_table = "workflow_request_profile"
+        ordering = ["-recorded_at"]
+        indexes = [
+            models.Index(fields=["recorded_at"]),
+            models.Index(fields=["url_name", "recorded_at"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.method} {self.url_name}: {self.duration_ms:.0f}ms, "
+            f"{self.query_count} queries"
+        )
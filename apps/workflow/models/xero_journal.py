@@ -55,3 +55,31 @@ class XeroJournalLineItem(models.Model):
 
     def __str__(self):
         return f"JournalLineItem {self.xero_line_id}"
+
+
+class XeroJournalMonthlyRollup(models.Model):
+    """
+    Net journal amount per (account, calendar month).
+
+    Derived from XeroJournalLineItem so P&L reports can aggregate whole
+    months without scanning every line. Months touched by a journal sync are
+    recomputed by JournalRollupService; `rebuild_journal_rollups` rebuilds all.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # First day of the month the journal_date falls in
+    month = models.DateField()
+    # Null for line items whose account is unknown, matching the line items
+    account = models.ForeignKey(
+        "XeroAccount", on_delete=models.SET_NULL, null=True, blank=True
+    )
+    net_amount = models.DecimalField(max_digits=14, decimal_places=2)
+    django_updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["month", "account"], name="journal_rollup_month_idx")
+        ]
+
+    def __str__(self):
+        return f"Rollup {self.month:%Y-%m} {self.account_id}: {self.net_amount}"
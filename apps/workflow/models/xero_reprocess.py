@@ -0,0 +1,36 @@
+import uuid
+
+from django.db import models
+
+
+class XeroReprocessCheckpoint(models.Model):
+    """
+    Progress of bulk reprocessing for one stored Xero model.
+
+    `processed_through` is when the last completed run started; documents
+    updated after it have new raw_json that has not been reprocessed yet.
+    While a run is in progress, `resume_after` holds the highest primary key
+    below which every chunk has been written, so an interrupted run can pick
+    up where it stopped. `pending_months` holds the months touched by written
+    chunks whose rollups have not been refreshed yet; it survives a crash
+    and is only cleared once the refresh has run.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # app_label.ModelName, e.g. "accounting.Invoice"
+    model = models.CharField(max_length=100, unique=True)
+    processed_through = models.DateTimeField(null=True, blank=True)
+    run_started_at = models.DateTimeField(null=True, blank=True)
+    resume_after = models.CharField(max_length=36, null=True, blank=True)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    # First-of-month ISO dates
+    pending_months = models.JSONField(default=list, blank=True)
+    django_updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Reprocess checkpoint {self.model}: {self.processed_through}"
+
+    @property
+    def in_progress(self) -> bool:
+        return self.run_started_at is not None
@@ -0,0 +1,83 @@
+import uuid
+
+from django.db import models
+
+
+class XeroSubmission(models.Model):
+    """
+    Outbox row for a document that has to be sent to Xero.
+
+    Rows are written in the same transaction as the local change that needs
+    the document, and a worker performs the Xero call afterwards. The
+    idempotency key is generated once and sent with every attempt, so a retry
+    after a timeout returns the document Xero already created instead of a
+    duplicate.
+    """
+
+    class DocumentType(models.TextChoices):
+        INVOICE = "invoice", "Invoice"
+        QUOTE = "quote", "Quote"
+        PURCHASE_ORDER = "purchase_order", "Purchase Order"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        IN_PROGRESS = "in_progress", "In Progress"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    OPEN_STATUSES = (Status.PENDING, Status.IN_PROGRESS)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    document_type = models.CharField(max_length=20, choices=DocumentType.choices)
+    job = models.ForeignKey(
+        "job.Job",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="xero_submissions",
+    )
+    purchase_order = models.ForeignKey(
+        "purchasing.PurchaseOrder",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="xero_submissions",
+    )
+    # Extra arguments for the document manager, e.g. {"breakdown": true}
+    options = models.JSONField(default=dict, blank=True)
+    idempotency_key = models.UUIDField(default=uuid.uuid4, unique=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    created_by = models.ForeignKey(
+        "accounts.Staff",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="xero_submission_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        target = self.job_id or self.purchase_order_id
+        return f"Xero {self.document_type} submission for {target}: {self.status}"
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in self.OPEN_STATUSES
@@ -81,3 +81,21 @@ def xero_30_day_sync_job() -> None:
         logger.error(f"Error during Xero 30-Day Sync job: {exc}", exc_info=True)
         app_error = persist_app_error(exc)
         raise AlreadyLoggedException(exc, app_error.id)
+
+
+def xero_outbox_job() -> None:
+    """
+    Submits queued Xero documents whose retry time has come.
+    """
+    try:
+        close_old_connections()
+        # Import models/services here to avoid AppRegistryNotReady errors during Django startup
+        from apps.workflow.services.xero_outbox_service import XeroOutboxService
+
+        XeroOutboxService.run_in_background()
+    except Exception as exc:
+        from apps.workflow.services.error_persistence import persist_app_error
+
+        logger.error(f"Error during Xero outbox job: {exc}", exc_info=True)
+        app_error = persist_app_error(exc)
+        raise AlreadyLoggedException(exc, app_error.id)
@@ -8,6 +8,7 @@ from .models import (
     XeroAccount,
     XeroError,
     XeroPayItem,
+    XeroSubmission,
     XeroToken,
 )
 from .models.settings_metadata import COMPANY_DEFAULTS_READ_ONLY_FIELDS
@@ -221,6 +222,58 @@ class XeroDocumentErrorResponseSerializer(serializers.Serializer):
     )
 
 
+class XeroSubmissionCreateSerializer(serializers.Serializer):
+    """
+    Request serializer for queueing a document for submission to Xero.
+    Invoices and quotes need a job_id, purchase orders a purchase_order_id.
+    """
+
+    document_type = serializers.ChoiceField(choices=XeroSubmission.DocumentType)
+    job_id = serializers.UUIDField(required=False)
+    purchase_order_id = serializers.UUIDField(required=False)
+    breakdown = serializers.BooleanField(
+        required=False,
+        default=True,
+        help_text="Quotes only: send detailed line items rather than a single total.",
+    )
+
+    def validate(self, attrs):
+        if attrs["document_type"] == XeroSubmission.DocumentType.PURCHASE_ORDER:
+            if not attrs.get("purchase_order_id"):
+                raise serializers.ValidationError(
+                    {"purchase_order_id": "Required for purchase orders."}
+                )
+        elif not attrs.get("job_id"):
+            raise serializers.ValidationError(
+                {"job_id": "Required for invoices and quotes."}
+            )
+        return attrs
+
+
+class XeroSubmissionSerializer(serializers.ModelSerializer):
+    """
+    Status of a queued Xero submission. `result` holds the document
+    manager's response once the submission has succeeded or failed.
+    """
+
+    class Meta:
+        model = XeroSubmission
+        fields = [
+            "id",
+            "document_type",
+            "job",
+            "purchase_order",
+            "status",
+            "attempts",
+            "next_attempt_at",
+            "last_error",
+            "result",
+            "created_at",
+            "completed_at",
+        ]
+        read_only_fields = fields
+
+
 class XeroSseEventSerializer(serializers.Serializer):
     """Serializer for Xero SSE event data."""
 
@@ -306,6 +359,22 @@ class AppErrorListResponseSerializer(serializers.Serializer):
     results = AppErrorSerializer(many=True)
 
 
+class AppErrorGroupSerializer(serializers.Serializer):
+    """Serializer for AppErrors grouped by fingerprint."""
+
+    fingerprint = serializers.CharField()
+    occurrences = serializers.IntegerField()
+    unresolved_count = serializers.IntegerField()
+    first_seen = serializers.DateTimeField(source="first_occurrence")
+    last_seen = serializers.DateTimeField(source="last_occurrence")
+    latest_error_id = serializers.UUIDField()
+    message = serializers.CharField(source="latest_message")
+    app = serializers.CharField(source="latest_app", allow_null=True)
+    file = serializers.CharField(source="latest_file", allow_null=True)
+    function = serializers.CharField(source="latest_function", allow_null=True)
+    severity = serializers.IntegerField(source="max_severity")
+
+
 class AppErrorDetailResponseSerializer(serializers.Serializer):
     """Serializer for single AppError detail response."""
 
@@ -322,6 +391,45 @@ class AppErrorDetailResponseSerializer(serializers.Serializer):
     resolved = serializers.BooleanField()
     resolved_by = serializers.UUIDField(allow_null=True)
     resolved_timestamp = serializers.DateTimeField(allow_null=True)
+    fingerprint = serializers.CharField()
+    occurrence_count = serializers.IntegerField()
+    last_seen = serializers.DateTimeField()
+
+
+# ---------------------------------------------------------------------------
+# Request Profiling Serializers
+# ---------------------------------------------------------------------------
+
+
+class RepeatedQuerySerializer(serializers.Serializer):
+    """A normalised SQL statement and how often it was repeated."""
+
+    sql = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class EndpointStatsSerializer(serializers.Serializer):
+    """Profiling statistics for one URL name."""
+
+    url_name = serializers.CharField()
+    requests = serializers.IntegerField()
+    p50_ms = serializers.FloatField()
+    p95_ms = serializers.FloatField()
+    p99_ms = serializers.FloatField()
+    avg_queries = serializers.FloatField()
+    max_queries = serializers.IntegerField()
+    avg_db_ms = serializers.FloatField()
+    avg_duplicate_queries = serializers.FloatField()
+    n_plus_one_requests = serializers.IntegerField()
+    top_repeated_queries = RepeatedQuerySerializer(many=True)
+
+
+class EndpointStatsResponseSerializer(serializers.Serializer):
+    """Worst endpoints over the requested window."""
+
+    hours = serializers.IntegerField()
+    sort = serializers.CharField()
+    results = EndpointStatsSerializer(many=True)
 
 
 # ---------------------------------------------------------------------------
@@ -6,16 +6,46 @@ try:
 
     if apps.ready:
         from .aws_service import AWSService
+        from .data_backup_service import (
+            BackupAnonymizer,
+            BackupExporter,
+            BackupRestorer,
+            is_streaming_backup,
+            open_backup,
+        )
         from .error_persistence import (
+            AppErrorBuffer,
+            PendingError,
+            error_fingerprint,
             extract_job_context,
             extract_request_context,
+            flush_app_errors,
+            group_app_errors,
             list_app_errors,
+            normalise_message,
             persist_and_raise,
             persist_app_error,
             persist_xero_error,
         )
+        from .journal_rollup_service import JournalRollupService, split_period
         from .llm_service import LLMService, quick_completion, quick_json_completion
+        from .request_profiling_service import (
+            EndpointStats,
+            QueryProfiler,
+            RequestProfileBuffer,
+            endpoint_stats,
+            normalise_sql,
+            percentile,
+            prune_request_profiles,
+        )
         from .validation import validate_required_fields
+        from .xero_outbox_service import (
+            XeroOutboxResult,
+            XeroOutboxService,
+            backoff_delay,
+            is_retryable,
+            is_transient_error,
+        )
         from .xero_sync_service import XeroSyncService
 except (ImportError, RuntimeError):
     # Django not ready or circular import, skip conditional imports
@@ -23,15 +53,40 @@ except (ImportError, RuntimeError):
 
 __all__ = [
     "AWSService",
+    "AppErrorBuffer",
+    "BackupAnonymizer",
+    "BackupExporter",
+    "BackupRestorer",
+    "EndpointStats",
+    "JournalRollupService",
     "LLMService",
+    "PendingError",
+    "QueryProfiler",
+    "RequestProfileBuffer",
+    "XeroOutboxResult",
+    "XeroOutboxService",
     "XeroSyncService",
+    "backoff_delay",
+    "endpoint_stats",
+    "error_fingerprint",
     "extract_job_context",
     "extract_request_context",
+    "flush_app_errors",
+    "group_app_errors",
+    "is_retryable",
+    "is_streaming_backup",
+    "is_transient_error",
     "list_app_errors",
+    "normalise_message",
+    "normalise_sql",
+    "open_backup",
+    "percentile",
     "persist_and_raise",
     "persist_app_error",
     "persist_xero_error",
+    "prune_request_profiles",
     "quick_completion",
     "quick_json_completion",
+    "split_period",
     "validate_required_fields",
 ]
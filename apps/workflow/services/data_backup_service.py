@@ -0,0 +1,491 @@
+"""
+Data Backup Service
+
+Streams anonymised backups of production data and restores them.
+
+Backups are gzip-compressed, newline-delimited JSON: one Django fixture
+record ({"model", "pk", "fields"}) per line, written model by model in
+dependency order. Each model is read with ``.iterator(chunk_size=...)`` and
+anonymised a chunk at a time, so memory use is bounded by the chunk size
+rather than the size of the database.
+
+Restores read the file line by line and bulk-insert each model in batches.
+Every batch is committed together with a BackupRestoreCheckpoint, so an
+interrupted restore can be resumed from the last committed batch. Content
+types that post_migrate already seeded after a flush are matched by natural
+key instead of inserted.
+"""
+
+import gzip
+import json
+import logging
+import os
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from django.apps import apps
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from faker import Faker
+
+from apps.accounts.staff_anonymization import create_staff_profile
+from apps.workflow.models import BackupRestoreCheckpoint
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+MIGRATION_MODEL = "migrations.migration"
+
+# Parents before children, so a restore inserts referenced rows first
+BACKUP_MODELS = [
+    "contenttypes.ContentType",
+    "accounts.Staff",
+    "client.Client",
+    "client.ClientContact",
+    "client.SupplierPickupAddress",
+    "job.Job",
+    "job.CostSet",
+    "job.CostLine",
+    "job.JobEvent",
+    "job.JobFile",
+    "job.JobQuoteChat",
+    "job.QuoteSpreadsheet",
+    "purchasing.PurchaseOrder",  # Include production POs for restore to UAT
+    "purchasing.PurchaseOrderLine",  # Include PO lines with material details
+    "purchasing.Stock",  # Include stock items - will be synced to Xero after restore
+    "quoting.SupplierPriceList",
+    "quoting.SupplierProduct",
+    "quoting.ScrapeJob",
+]
+
+# Rows post_migrate seeds into a freshly flushed database. The backup's copies
+# are matched to them by natural key rather than inserted, since the seeded
+# rows may hold different primary keys.
+POST_MIGRATE_MODELS = {"contenttypes.contenttype"}
+
+ProgressCallback = Callable[[str, int], None]
+
+
+def open_backup(path: str, mode: str):
+    """Open a backup file for text I/O, decompressing .gz files."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def is_streaming_backup(path: str) -> bool:
+    """True for newline-delimited backups, False for legacy JSON-array dumps."""
+    with open_backup(path, "r") as f:
+        while True:
+            char = f.read(1)
+            if not char or not char.isspace():
+                return char == "{"
+
+
+class BackupAnonymizer:
+    """Replaces PII in serialized fixture records with fake values."""
+
+    # Configuration: model -> field -> replacement type
+    # Replacement types: "name", "email", "phone", "text", "number", "date", "address"
+    # Note: accounts.staff is handled separately in _anonymize_staff() for coherent profiles
+    PII_CONFIG = {
+        "client.client": {
+            "name": "company",
+            "primary_contact_name": "name",
+            "primary_contact_email": "email",
+            "email": "email",
+            "phone": "phone",
+            "raw_json._name": "name",
+            "raw_json._email_address": "email",
+            "raw_json._bank_account_details": "iban",
+            "raw_json._phones[]._phone_number": "phone",
+            "raw_json._batch_payments._bank_account_number": "iban",
+            "raw_json._batch_payments._bank_account_name": "name",
+        },
+        "client.clientcontact": {
+            "name": "name",
+            "email": "email",
+            "phone": "phone",
+        },
+    }
+
+    def __init__(
+        self,
+        preserved_client_names: Optional[Set[str]] = None,
+        fake: Optional[Faker] = None,
+    ):
+        self.preserved_client_names = preserved_client_names or set()
+        self.fake = fake or Faker()
+        # Track unique values to avoid duplicates
+        self._used_company_names: Set[str] = set()
+
+    @classmethod
+    def for_company(cls) -> "BackupAnonymizer":
+        """Anonymizer preserving the shop, test and scraper supplier clients."""
+        from apps.quoting.management.commands.run_scrapers import Command as ScraperCmd
+        from apps.workflow.models import CompanyDefaults
+
+        preserved_names = set()
+        company_defaults = CompanyDefaults.objects.get()
+        if company_defaults.shop_client_name:
+            preserved_names.add(company_defaults.shop_client_name)
+        if company_defaults.test_client_name:
+            preserved_names.add(company_defaults.test_client_name)
+
+        # Preserve names of scraper suppliers (declared on each scraper class)
+        for scraper_info in ScraperCmd().get_available_scrapers():
+            supplier_name = getattr(scraper_info["class_obj"], "SUPPLIER_NAME", None)
+            if supplier_name:
+                preserved_names.add(supplier_name)
+
+        return cls(preserved_names)
+
+    def anonymize_item(self, item: dict) -> None:
+        """Anonymize PII fields in the serialized item using configuration"""
+        model = item["model"]
+        fields = item["fields"]
+
+        # Special case: preserve shop and test clients by name
+        if (
+            model == "client.client"
+            and fields.get("name") in self.preserved_client_names
+        ):
+            return
+
+        # Special case: staff uses coherent profiles (preferred_name matches first_name)
+        if model == "accounts.staff":
+            self._anonymize_staff(fields)
+            return
+
+        if model not in self.PII_CONFIG:
+            return  # No PII configuration for this model
+
+        # Process each field path in the configuration
+        for field_path, replacement_type in self.PII_CONFIG[model].items():
+            value = self._get_replacement_value(replacement_type)
+            self._set_field_by_path(fields, field_path, value)
+
+    def _anonymize_staff(self, fields: dict) -> None:
+        """Anonymize staff with coherent profile (preferred_name/email match first_name)."""
+        profile = create_staff_profile()
+        fields["first_name"] = profile["first_name"]
+        fields["last_name"] = profile["last_name"]
+        fields["preferred_name"] = profile["preferred_name"]
+        fields["email"] = profile["email"]
+
+    def _get_replacement_value(self, replacement_type: str):
+        """Get replacement value based on type"""
+        fake = self.fake
+        if replacement_type == "first_name":
+            return fake.first_name()
+        elif replacement_type == "last_name":
+            return fake.last_name()
+        elif replacement_type == "name":
+            return fake.name()
+        elif replacement_type == "email":
+            return fake.email()
+        elif replacement_type == "phone":
+            return fake.phone_number()
+        elif replacement_type == "company":
+            # Ensure unique company names - FAIL EARLY if can't find unique
+            max_attempts = 1000
+            for _ in range(max_attempts):
+                company_name = fake.company()
+                if company_name not in self._used_company_names:
+                    self._used_company_names.add(company_name)
+                    return company_name
+            # FAIL EARLY - couldn't generate unique name
+            raise ValueError(
+                f"Failed to generate unique company name after {max_attempts} attempts. "
+                f"Already used {len(self._used_company_names)} company names."
+            )
+        elif replacement_type == "address":
+            return fake.street_address()
+        elif replacement_type == "city":
+            return fake.city()
+        elif replacement_type == "postcode":
+            return fake.postcode()
+        elif replacement_type == "iban":
+            return fake.iban()
+        elif replacement_type == "number":
+            return str(fake.random_int(min=10000000, max=99999999))
+        elif replacement_type == "date":
+            return fake.date_between(start_date="-30y", end_date="today").isoformat()
+        else:
+            return fake.text(max_nb_chars=100)
+
+    def _set_field_by_path(self, data: dict, path: str, value) -> None:
+        """Set a value in nested data structure using dot notation path"""
+        parts = path.split(".")
+
+        # Handle simple top-level field
+        if len(parts) == 1:
+            if parts[0] in data:
+                data[parts[0]] = value
+            return
+
+        # Handle nested path
+        current = data
+        for i, part in enumerate(parts[:-1]):
+            # Handle array notation like "_phones[]"
+            if "[]" in part:
+                field_name = part.replace("[]", "")
+                if field_name in current and current[field_name]:
+                    # Apply to all items in array
+                    for item in current[field_name]:
+                        self._set_field_by_path(item, ".".join(parts[i + 1 :]), value)
+                return
+            else:
+                # Navigate to nested object
+                if part in current and current[part]:
+                    current = current[part]
+                else:
+                    return  # Path doesn't exist
+
+        # Set the final field
+        final_field = parts[-1]
+        if final_field in current:
+            current[final_field] = value
+
+
+class BackupExporter:
+    """Writes an anonymised, streaming backup of BACKUP_MODELS."""
+
+    def __init__(
+        self,
+        anonymizer: Optional[BackupAnonymizer] = None,
+        models: Optional[List[str]] = None,
+        chunk_size: int = CHUNK_SIZE,
+        include_migrations: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        self.anonymizer = anonymizer
+        self.models = models or BACKUP_MODELS
+        self.chunk_size = chunk_size
+        self.include_migrations = include_migrations
+        self.progress = progress
+
+    def export(self, output_path: str) -> Dict[str, int]:
+        """Write the backup to output_path and return the record count per model."""
+        counts: Dict[str, int] = {}
+        with open_backup(output_path, "w") as out:
+            for label in self.models:
+                model = apps.get_model(label)
+                count = 0
+                for record in self.iter_records(model):
+                    self._write(out, record)
+                    count += 1
+                counts[model._meta.label_lower] = count
+                self._report(model._meta.label_lower, count)
+
+            if self.include_migrations:
+                count = 0
+                for record in self.iter_migration_records():
+                    self._write(out, record)
+                    count += 1
+                counts[MIGRATION_MODEL] = count
+                self._report(MIGRATION_MODEL, count)
+        return counts
+
+    def iter_records(self, model) -> Iterator[dict]:
+        """Yield anonymised fixture records for a model, one chunk at a time."""
+        queryset = model._default_manager.order_by("pk")
+        m2m_names = [m2m.name for m2m in model._meta.many_to_many]
+        if m2m_names:
+            queryset = queryset.prefetch_related(*m2m_names)
+        # Generated columns are recomputed by the database on restore
+        generated = [f.name for f in model._meta.concrete_fields if f.generated]
+        serializer = serializers.get_serializer("python")()
+        rows = queryset.iterator(chunk_size=self.chunk_size)
+        while chunk := list(islice(rows, self.chunk_size)):
+            for record in serializer.serialize(chunk):
+                for name in generated:
+                    record["fields"].pop(name, None)
+                if self.anonymizer:
+                    self.anonymizer.anonymize_item(record)
+                yield record
+
+    def iter_migration_records(self) -> Iterator[dict]:
+        """Yield django_migrations rows, which dumpdata can't serialize."""
+        recorder = MigrationRecorder(connections[DEFAULT_DB_ALIAS])
+        if not recorder.has_table():
+            return
+        rows = (
+            recorder.migration_qs.order_by("id")
+            .values_list("id", "app", "name", "applied")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for pk, app, name, applied in rows:
+            yield {
+                "model": MIGRATION_MODEL,
+                "pk": pk,
+                "fields": {
+                    "app": app,
+                    "name": name,
+                    "applied": applied.isoformat() if applied else None,
+                },
+            }
+
+    def _write(self, out, record: dict) -> None:
+        out.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False))
+        out.write("\n")
+
+    def _report(self, label: str, count: int) -> None:
+        logger.info(f"Backed up {count} {label} records")
+        if self.progress:
+            self.progress(label, count)
+
+
+class BackupRestorer:
+    """Bulk-loads a streaming backup, model by model, resumably."""
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        using: str = DEFAULT_DB_ALIAS,
+    ):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.using = using
+
+    def checkpoint(self, backup_path: str) -> Optional[BackupRestoreCheckpoint]:
+        """The committed progress of an interrupted restore of this file, if any."""
+        return (
+            BackupRestoreCheckpoint.objects.using(self.using)
+            .filter(backup_path=os.path.abspath(backup_path))
+            .first()
+        )
+
+    def restore(self, backup_path: str, resume: bool = False) -> Dict[str, int]:
+        """
+        Load every record in the backup and return the count restored per model.
+
+        With resume=True, records committed by an earlier, interrupted run are
+        skipped. The checkpoint is removed once the restore completes.
+        """
+        checkpoints = BackupRestoreCheckpoint.objects.using(self.using)
+        backup_key = os.path.abspath(backup_path)
+        if not resume:
+            checkpoints.filter(backup_path=backup_key).delete()
+        checkpoint, _ = checkpoints.get_or_create(backup_path=backup_key)
+        if checkpoint.records:
+            logger.info(f"Resuming restore after {checkpoint.records} records")
+
+        connection = connections[self.using]
+        tables = set()
+        with connection.constraint_checks_disabled():
+            for label, records in self._batches(backup_path, checkpoint.records):
+                model = self._model_for(label)
+                # The checkpoint commits with the rows, so a crash between
+                # the two can't make a resume insert the batch again
+                with transaction.atomic(using=self.using):
+                    if model is not None:
+                        self._insert(model, records)
+                        tables.add(model._meta.db_table)
+                    checkpoint.records += len(records)
+                    checkpoint.model_counts[label] = checkpoint.model_counts.get(
+                        label, 0
+                    ) + len(records)
+                    checkpoint.save(using=self.using)
+                if self.progress:
+                    self.progress(label, checkpoint.model_counts[label])
+        # Rows went in with constraint checks off; verify them now
+        connection.check_constraints(table_names=sorted(tables))
+
+        checkpoint.delete(using=self.using)
+        return checkpoint.model_counts
+
+    def _batches(self, backup_path: str, skip: int) -> Iterator[tuple]:
+        """Yield (model label, records) batches of a single model each."""
+        label, batch = None, []
+        with open_backup(backup_path, "r") as f:
+            for line in islice(f, skip, None):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if batch and (
+                    record["model"] != label or len(batch) >= self.chunk_size
+                ):
+                    yield label, batch
+                    batch = []
+                label = record["model"]
+                batch.append(record)
+        if batch:
+            yield label, batch
+
+    def _model_for(self, label: str):
+        if label == MIGRATION_MODEL:
+            # Migration state comes from running migrate on the target database
+            return None
+        try:
+            return apps.get_model(label)
+        except LookupError:
+            logger.warning(f"Skipping records for unknown model {label}")
+            return None
+
+    def _insert(self, model, records: List[dict]) -> None:
+        """Insert one batch as raw rows, bypassing save() and auto_now, like loaddata."""
+        objects = list(
+            serializers.deserialize(
+                "python", records, using=self.using, ignorenonexistent=True
+            )
+        )
+        instances = [obj.object for obj in objects]
+        moved = []
+        if model._meta.label_lower in POST_MIGRATE_MODELS:
+            instances, moved = self._reconcile(model, instances)
+        fields = [f for f in model._meta.local_concrete_fields if not f.generated]
+        ops = connections[self.using].ops
+        batch_size = ops.bulk_batch_size(fields, instances) or len(instances) or 1
+        for start in range(0, len(instances), batch_size):
+            model._base_manager.using(self.using)._insert(
+                instances[start : start + batch_size],
+                fields=fields,
+                raw=True,
+                using=self.using,
+            )
+        # After the raw rows, so the ids assigned here can't collide with them
+        model._base_manager.using(self.using).bulk_create(moved)
+        self._insert_m2m(model, objects)
+
+    def _reconcile(self, model, instances: List) -> tuple:
+        """
+        Split records against rows post_migrate seeded: (insert as is, insert
+        under a new id). Records whose natural key already exists are dropped;
+        those whose primary key a different seeded row holds get a new id.
+        """
+        existing = {
+            obj.natural_key(): obj.pk
+            for obj in model._base_manager.using(self.using).all()
+        }
+        taken = set(existing.values())
+        keep, moved = [], []
+        for obj in instances:
+            if obj.natural_key() in existing:
+                continue
+            if obj.pk in taken:
+                logger.info(f"Restoring {model._meta.label} {obj} under a new id")
+                obj.pk = None
+                moved.append(obj)
+            else:
+                keep.append(obj)
+        return keep, moved
+
+    def _insert_m2m(self, model, objects: Iterable) -> None:
+        for m2m in model._meta.many_to_many:
+            through = m2m.remote_field.through
+            if not through._meta.auto_created:
+                continue
+            source = f"{m2m.m2m_field_name()}_id"
+            target = f"{m2m.m2m_reverse_field_name()}_id"
+            rows = [
+                through(**{source: obj.object.pk, target: related_pk})
+                for obj in objects
+                for related_pk in (obj.m2m_data or {}).get(m2m.name, [])
+            ]
+            through.objects.using(self.using).bulk_create(
+                rows, batch_size=self.chunk_size, ignore_conflicts=True
+            )
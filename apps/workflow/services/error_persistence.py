@@ -1,16 +1,60 @@
+"""
+Error Persistence
+
+Records application errors as AppError rows.
+
+Errors are fingerprinted by exception type, normalised message and top stack
+frames. Repeats of one fingerprint share a row while it is unresolved. The
+id handed back is that open row's, looked up by fingerprint, or the id the
+row will be created with, so it always names a row once written. With APP_ERROR_BUFFERING on, occurrences are collected in memory and
+a background thread writes them in batches every APP_ERROR_FLUSH_SECONDS,
+so an error storm costs one update per distinct error per flush instead of
+one insert per failure inside already-failing requests.
+"""
+
+import atexit
+import hashlib
 import inspect
 import logging
+import re
+import threading
 import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 from uuid import UUID
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Q, QuerySet, Subquery, Sum
 from django.http import HttpRequest
+from django.utils import timezone
 
 from apps.workflow.exceptions import AlreadyLoggedException, XeroValidationError
 from apps.workflow.models import AppError, XeroError
 
+logger = logging.getLogger(__name__)
+
+# Stack frames (innermost first) that make up a fingerprint
+FINGERPRINT_FRAMES = 3
+# Wake the flusher early once this many distinct errors are waiting
+MAX_PENDING = 200
+# Flushes an error may fail before it is dropped
+MAX_WRITE_ATTEMPTS = 3
+
+_VOLATILE_PATTERNS = (
+    (
+        re.compile(
+            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I
+        ),
+        "<uuid>",
+    ),
+    (re.compile(r"0x[0-9a-f]+", re.I), "<hex>"),
+    (re.compile(r"\d+"), "<n>"),
+)
+
 
 def _make_json_serializable(obj: Any) -> Any:
     """Convert non-JSON-serializable objects (like UUIDs) to strings."""
@@ -58,6 +102,197 @@ def _extract_caller_context():
         del frame
 
 
+def normalise_message(message: str) -> str:
+    """Replace ids and numbers so repeats of one error compare equal."""
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message
+
+
+def error_fingerprint(exception: Exception, location: Dict[str, Any]) -> str:
+    """Hash of exception type, normalised message and top frames."""
+    exc_type = type(exception)
+    parts = [
+        f"{exc_type.__module__}.{exc_type.__qualname__}",
+        normalise_message(str(exception)),
+    ]
+    frames = traceback.extract_tb(exception.__traceback__)[-FINGERPRINT_FRAMES:]
+    if frames:
+        parts.extend(f"{Path(f.filename).name}:{f.name}" for f in frames)
+    else:
+        # Never raised, e.g. RuntimeError(...) built to report a failure
+        parts.append(f"{location['file']}:{location['function']}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+@dataclass
+class PendingError:
+    """Occurrences of one fingerprint waiting to be written."""
+
+    # Row they are counted in: the open row, or the one to create
+    id: UUID
+    fingerprint: str
+    fields: Dict[str, Any]  # From the latest occurrence
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    # Failed flushes so far
+    attempts: int = 0
+
+    def merge(self, other: "PendingError") -> None:
+        self.count += other.count
+        self.attempts = max(self.attempts, other.attempts)
+        self.first_seen = min(self.first_seen, other.first_seen)
+        if other.last_seen >= self.last_seen:
+            self.last_seen = other.last_seen
+            self.fields = other.fields
+
+
+class AppErrorBuffer:
+    """Collects error occurrences in memory and writes them in batches."""
+
+    def __init__(self, flush_seconds: float | None = None):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[str, PendingError] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def group_id(fingerprint: str) -> UUID:
+        """
+        Id of the open row for a fingerprint (the oldest if several), or a
+        new id for write() to create the row with.
+        """
+        open_id = (
+            AppError.objects.filter(fingerprint=fingerprint, resolved=False)
+            .order_by("timestamp")
+            .values_list("id", flat=True)
+            .first()
+        )
+        return open_id or uuid.uuid4()
+
+    def add(self, fingerprint: str, fields: Dict[str, Any]) -> UUID:
+        """Queue one occurrence and return the id of the row it will count towards."""
+        now = timezone.now()
+        with self._lock:
+            pending = self._pending.get(fingerprint)
+            error_id = pending.id if pending is not None else None
+        # Only the first occurrence per flush needs the lookup
+        occurrence = PendingError(
+            error_id or self.group_id(fingerprint), fingerprint, fields, 1, now, now
+        )
+        with self._lock:
+            pending = self._pending.setdefault(fingerprint, occurrence)
+            if pending is not occurrence:
+                pending.merge(occurrence)
+            full = len(self._pending) >= MAX_PENDING
+        if full:
+            self._wake.set()
+        self.start()
+        return pending.id
+
+    def flush(self) -> int:
+        """Write everything queued so far. Returns the number of occurrences."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            self.write(pending.values())
+            return sum(entry.count for entry in pending.values())
+        except Exception:
+            logger.exception("Failed to write %s buffered app errors", len(pending))
+
+        # One bad entry (e.g. a job_id for a deleted job) must not block the rest
+        written = 0
+        for fingerprint, entry in pending.items():
+            try:
+                self.write([entry])
+                written += entry.count
+            except Exception:
+                entry.attempts += 1
+                if entry.attempts >= MAX_WRITE_ATTEMPTS:
+                    logger.exception(
+                        "Dropping app error after %s failed writes: %s",
+                        entry.attempts,
+                        entry.fields.get("message"),
+                    )
+                    continue
+                with self._lock:
+                    queued = self._pending.setdefault(fingerprint, entry)
+                    if queued is not entry:
+                        queued.merge(entry)
+        return written
+
+    @staticmethod
+    def write(entries: Iterable[PendingError]) -> None:
+        """
+        Add occurrences to the row their id was handed out for, creating the
+        rows that do not exist yet. The id is never changed, so callers that
+        kept it find the row even if it was resolved before the write.
+        """
+        entries = list(entries)
+        with transaction.atomic():
+            existing = set(
+                AppError.objects.filter(id__in=[e.id for e in entries]).values_list(
+                    "id", flat=True
+                )
+            )
+
+            new_rows = []
+            for entry in entries:
+                if entry.id in existing:
+                    AppError.objects.filter(id=entry.id).update(
+                        occurrence_count=F("occurrence_count") + entry.count,
+                        last_seen=entry.last_seen,
+                        message=entry.fields["message"],
+                        data=entry.fields["data"],
+                    )
+                else:
+                    new_rows.append(
+                        AppError(
+                            id=entry.id,
+                            fingerprint=entry.fingerprint,
+                            occurrence_count=entry.count,
+                            timestamp=entry.first_seen,
+                            last_seen=entry.last_seen,
+                            **entry.fields,
+                        )
+                    )
+            AppError.objects.bulk_create(new_rows)
+
+    def start(self) -> None:
+        """Start the flusher thread unless it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="app-error-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds or settings.APP_ERROR_FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+_buffer = AppErrorBuffer()
+atexit.register(_buffer.flush)
+
+
+def flush_app_errors() -> int:
+    """Write buffered errors now (e.g. before a command exits)."""
+    return _buffer.flush()
+
+
 def extract_request_context(request: HttpRequest) -> Dict[str, Any]:
     """Extract context from Django request object."""
     return {
@@ -114,7 +349,8 @@ def persist_app_error(
         additional_context: Additional context data to store in JSON field
 
     Returns:
-        Created AppError instance
+        The AppError the occurrence is counted against. With buffering on it
+        is not written until the next flush, but its id is the row's.
     """
     # Auto-extract caller context if not provided
     caller_context = _extract_caller_context()
@@ -123,16 +359,28 @@ def persist_app_error(
     if additional_context:
         context_data.update(_make_json_serializable(additional_context))
 
-    return AppError.objects.create(
-        message=str(exception),
-        data=context_data,
-        app=app or caller_context["app"],
-        file=file or caller_context["file"],
-        function=function or caller_context["function"],
-        severity=severity,
-        job_id=job_id,
-        user_id=user_id,
-    )
+    fields = {
+        "message": str(exception),
+        "data": context_data,
+        "app": app or caller_context["app"],
+        "file": file or caller_context["file"],
+        "function": function or caller_context["function"],
+        "severity": severity,
+        "job_id": job_id,
+        "user_id": user_id,
+    }
+    fingerprint = error_fingerprint(exception, fields)
+
+    if settings.APP_ERROR_BUFFERING:
+        error_id = _buffer.add(fingerprint, fields)
+    else:
+        now = timezone.now()
+        entry = PendingError(
+            AppErrorBuffer.group_id(fingerprint), fingerprint, fields, 1, now, now
+        )
+        AppErrorBuffer.write([entry])
+        error_id = entry.id
+    return AppError(id=error_id, fingerprint=fingerprint, **fields)
 
 
 def list_app_errors(
@@ -182,6 +430,35 @@ def list_app_errors(
     }
 
 
+def group_app_errors(queryset: QuerySet[AppError]) -> QuerySet:
+    """
+    Collapse AppError rows into one entry per fingerprint, most recent first.
+
+    Rows recorded before errors were fingerprinted are left out.
+    """
+    latest = AppError.objects.filter(fingerprint=OuterRef("fingerprint")).order_by(
+        "-last_seen"
+    )
+    return (
+        queryset.exclude(fingerprint="")
+        .order_by()
+        .values("fingerprint")
+        .annotate(
+            occurrences=Sum("occurrence_count"),
+            first_occurrence=Min("timestamp"),
+            last_occurrence=Max("last_seen"),
+            unresolved_count=Count("id", filter=Q(resolved=False)),
+            latest_error_id=Subquery(latest.values("id")[:1]),
+            latest_message=Subquery(latest.values("message")[:1]),
+            latest_app=Subquery(latest.values("app")[:1]),
+            latest_file=Subquery(latest.values("file")[:1]),
+            latest_function=Subquery(latest.values("function")[:1]),
+            max_severity=Max("severity"),
+        )
+        .order_by("-last_occurrence")
+    )
+
+
 def persist_and_raise(exception: Exception, **context: Any) -> None:
     """
     Persist the exception via ``persist_app_error`` and raise AlreadyLoggedException.
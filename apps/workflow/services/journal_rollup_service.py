@@ -0,0 +1,198 @@
+"""
+Journal Rollup Service
+
+Maintains XeroJournalMonthlyRollup, the (account, month) -> net amount table
+behind the P&L report, and answers period totals from it.
+
+Months are always recomputed whole from the journal line items, so refreshing
+a month is idempotent and safe to repeat after a partial sync.
+"""
+
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from typing import Iterable
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth
+
+from apps.workflow.models import (
+    XeroJournal,
+    XeroJournalLineItem,
+    XeroJournalMonthlyRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _month_end(month: date) -> date:
+    return month + relativedelta(months=1) - timedelta(days=1)
+
+
+def split_period(period_start: date, period_end: date):
+    """
+    Split an inclusive date range into whole months and partial edge ranges.
+
+    Returns:
+        (months, partial_ranges): first-of-month dates fully covered by the
+        period, and (start, end) ranges for any leftover days at either end.
+    """
+    first_full = _month_start(period_start)
+    if first_full < period_start:
+        first_full += relativedelta(months=1)
+    if first_full > period_end:
+        return [], [(period_start, period_end)]
+
+    partial_ranges = []
+    if period_start < first_full:
+        partial_ranges.append((period_start, first_full - timedelta(days=1)))
+
+    months = []
+    month = first_full
+    while _month_end(month) <= period_end:
+        months.append(month)
+        month += relativedelta(months=1)
+    if month <= period_end:
+        partial_ranges.append((month, period_end))
+    return months, partial_ranges
+
+
+def _ranges_q(ranges, field: str) -> Q:
+    return reduce(or_, (Q(**{f"{field}__range": r}) for r in ranges))
+
+
+class JournalRollupService:
+    """Maintain and query monthly journal rollups."""
+
+    @staticmethod
+    def refresh_months(months: Iterable[date]) -> int:
+        """
+        Recompute the rollup rows for the given months.
+
+        Args:
+            months: Any dates; each is normalised to its month
+
+        Returns:
+            Number of rollup rows written
+        """
+        months = sorted({_month_start(month) for month in months})
+        if not months:
+            return 0
+
+        totals = (
+            XeroJournalLineItem.objects.filter(
+                _ranges_q(
+                    [(month, _month_end(month)) for month in months],
+                    "journal__journal_date",
+                )
+            )
+            .annotate(month=TruncMonth("journal__journal_date"))
+            .values("month", "account_id")
+            .annotate(total=Sum("net_amount"))
+        )
+        rows = [
+            XeroJournalMonthlyRollup(
+                month=row["month"],
+                account_id=row["account_id"],
+                net_amount=row["total"] or Decimal("0.00"),
+            )
+            for row in totals
+        ]
+
+        with transaction.atomic():
+            XeroJournalMonthlyRollup.objects.filter(month__in=months).delete()
+            XeroJournalMonthlyRollup.objects.bulk_create(rows, batch_size=1000)
+
+        logger.info(
+            f"Refreshed journal rollups for {len(months)} months ({len(rows)} rows)"
+        )
+        return len(rows)
+
+    @staticmethod
+    def refresh_for_journals(journals) -> int:
+        """Recompute the months touched by a batch of synced journals."""
+        # Read dates back from the DB: set_journal_fields assigns the raw
+        # string from Xero, so the in-memory value may not be a date.
+        dates = XeroJournal.objects.filter(
+            pk__in=[journal.pk for journal in journals]
+        ).values_list("journal_date", flat=True)
+        return JournalRollupService.refresh_months(dates)
+
+    @staticmethod
+    def rebuild() -> int:
+        """Rebuild the whole rollup table from the journal line items."""
+        months = (
+            XeroJournalLineItem.objects.annotate(
+                month=TruncMonth("journal__journal_date")
+            )
+            .values_list("month", flat=True)
+            .distinct()
+        )
+        with transaction.atomic():
+            XeroJournalMonthlyRollup.objects.all().delete()
+            return JournalRollupService.refresh_months(list(months))
+
+    @staticmethod
+    def period_totals(date_ranges) -> list[dict]:
+        """
+        Net amount per (account_type, account_name) for each period.
+
+        Whole months come from the rollup table in one query. Days at the
+        edges of periods that do not start/end on month boundaries are read
+        from the line items in one further query.
+
+        Args:
+            date_ranges: List of inclusive (start, end) dates
+
+        Returns:
+            One {(account_type, account_name): total} dict per period
+        """
+        splits = [split_period(start, end) for start, end in date_ranges]
+        results = [{} for _ in date_ranges]
+
+        def add(index, key, total):
+            results[index][key] = results[index].get(key, 0) + total
+
+        months_by_period = [set(months) for months, _ in splits]
+        all_months = set().union(*months_by_period)
+        if all_months:
+            month_rows = (
+                XeroJournalMonthlyRollup.objects.filter(month__in=all_months)
+                .values("month", "account__account_type", "account__account_name")
+                .annotate(total=Sum("net_amount"))
+            )
+            for row in month_rows:
+                key = (row["account__account_type"], row["account__account_name"])
+                for index, months in enumerate(months_by_period):
+                    if row["month"] in months:
+                        add(index, key, row["total"])
+
+        partial_ranges = [r for _, ranges in splits for r in ranges]
+        if partial_ranges:
+            day_rows = (
+                XeroJournalLineItem.objects.filter(
+                    _ranges_q(partial_ranges, "journal__journal_date")
+                )
+                .values(
+                    "journal__journal_date",
+                    "account__account_type",
+                    "account__account_name",
+                )
+                .annotate(total=Sum("net_amount"))
+            )
+            for row in day_rows:
+                key = (row["account__account_type"], row["account__account_name"])
+                day = row["journal__journal_date"]
+                for index, (_, ranges) in enumerate(splits):
+                    if any(start <= day <= end for start, end in ranges):
+                        add(index, key, row["total"])
+
+        return results
@@ -0,0 +1,245 @@
+"""
+Request Profiling Service
+
+Per-request query and latency profiling, switched on with REQUEST_PROFILING.
+
+`QueryProfiler` is installed with `connection.execute_wrapper` for the
+duration of a request and counts queries, DB time and repeats of each SQL
+statement (with literals and IN-lists collapsed). A statement repeated at
+least N_PLUS_ONE_THRESHOLD times in one request is flagged as an N+1.
+
+Samples are buffered in memory and written in batches by a background
+thread, then aggregated per URL name over a rolling window by
+`endpoint_stats`, which backs the admin API and `profile_endpoints` command.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.workflow.models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+# A SELECT repeated this often in one request is reported as an N+1
+N_PLUS_ONE_THRESHOLD = 10
+# Repeated statements kept with each sample
+TOP_REPEATED = 5
+FLUSH_SECONDS = 10
+# Flush early once this many samples are waiting
+MAX_PENDING = 500
+PRUNE_INTERVAL = timedelta(hours=1)
+
+SORT_KEYS = {
+    "p95": lambda s: s.p95_ms,
+    "queries": lambda s: s.avg_queries,
+    "db_time": lambda s: s.avg_db_ms,
+    "n_plus_one": lambda s: s.n_plus_one_requests,
+    "requests": lambda s: s.requests,
+}
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def normalise_sql(sql: str) -> str:
+    """Collapse literals and IN-lists so repeats of one statement compare equal."""
+    return _LITERALS.sub("?", _IN_LIST.sub("(...)", sql))
+
+
+class QueryProfiler:
+    """`connection.execute_wrapper` callable recording every query it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.count += 1
+            self.statements[normalise_sql(sql)] += 1
+
+    @property
+    def repeated(self) -> List[tuple]:
+        """(statement, count) for statements run more than once, most frequent first."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n > 1]
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(n - 1 for _, n in self.repeated)
+
+    @property
+    def has_n_plus_one(self) -> bool:
+        return any(
+            n >= N_PLUS_ONE_THRESHOLD and sql.lstrip().upper().startswith("SELECT")
+            for sql, n in self.repeated
+        )
+
+    def to_profile(self, **fields) -> RequestProfile:
+        return RequestProfile(
+            query_count=self.count,
+            db_time_ms=self.db_seconds * 1000,
+            duplicate_query_count=self.duplicate_count,
+            n_plus_one=self.has_n_plus_one,
+            repeated_queries=[
+                {"sql": sql, "count": n} for sql, n in self.repeated[:TOP_REPEATED]
+            ],
+            **fields,
+        )
+
+
+class RequestProfileBuffer:
+    """Collects samples in memory and bulk-inserts them from a daemon thread."""
+
+    def __init__(self):
+        self._pending: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pruned_at = 0.0
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._pending.append(profile)
+            full = len(self._pending) >= MAX_PENDING
+        if full:
+            self._wake.set()
+        self.start()
+
+    def flush(self) -> int:
+        """Write waiting samples and prune expired ones. Returns rows written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            try:
+                RequestProfile.objects.bulk_create(pending)
+            except Exception:
+                # Profiling must never take the site down; drop the batch
+                logger.exception("Failed to write %s request profiles", len(pending))
+                return 0
+        if time.monotonic() - self._pruned_at > PRUNE_INTERVAL.total_seconds():
+            self._pruned_at = time.monotonic()
+            prune_request_profiles()
+        return len(pending)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="request-profile-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+profile_buffer = RequestProfileBuffer()
+
+
+def prune_request_profiles() -> int:
+    """Delete samples older than REQUEST_PROFILING_RETENTION_DAYS."""
+    cutoff = timezone.now() - timedelta(days=settings.REQUEST_PROFILING_RETENTION_DAYS)
+    deleted, _ = RequestProfile.objects.filter(recorded_at__lt=cutoff).delete()
+    return deleted
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+@dataclass
+class EndpointStats:
+    url_name: str
+    requests: int = 0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    avg_queries: float = 0.0
+    max_queries: int = 0
+    avg_db_ms: float = 0.0
+    avg_duplicate_queries: float = 0.0
+    n_plus_one_requests: int = 0
+    # Most often repeated statements across the window
+    top_repeated_queries: List[dict] = field(default_factory=list)
+
+
+def endpoint_stats(
+    hours: int = 24, limit: int = 20, sort: str = "p95"
+) -> List[EndpointStats]:
+    """Aggregate samples from the last `hours` per URL name, worst first."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort {sort!r}; expected one of {sorted(SORT_KEYS)}")
+
+    rows = RequestProfile.objects.filter(
+        recorded_at__gte=timezone.now() - timedelta(hours=hours)
+    ).values_list(
+        "url_name",
+        "duration_ms",
+        "query_count",
+        "db_time_ms",
+        "duplicate_query_count",
+        "n_plus_one",
+        "repeated_queries",
+    )
+
+    samples: Dict[str, list] = defaultdict(list)
+    for row in rows.iterator():
+        samples[row[0]].append(row[1:])
+
+    stats = []
+    for url_name, entries in samples.items():
+        durations = sorted(e[0] for e in entries)
+        repeated: Counter = Counter()
+        for entry in entries:
+            for query in entry[5]:
+                repeated[query["sql"]] += query["count"]
+        n = len(entries)
+        stats.append(
+            EndpointStats(
+                url_name=url_name,
+                requests=n,
+                p50_ms=percentile(durations, 50),
+                p95_ms=percentile(durations, 95),
+                p99_ms=percentile(durations, 99),
+                avg_queries=sum(e[1] for e in entries) / n,
+                max_queries=max(e[1] for e in entries),
+                avg_db_ms=sum(e[2] for e in entries) / n,
+                avg_duplicate_queries=sum(e[3] for e in entries) / n,
+                n_plus_one_requests=sum(1 for e in entries if e[4]),
+                top_repeated_queries=[
+                    {"sql": sql, "count": count}
+                    for sql, count in repeated.most_common(TOP_REPEATED)
+                ],
+            )
+        )
+    stats.sort(key=SORT_KEYS[sort], reverse=True)
+    return stats[:limit]
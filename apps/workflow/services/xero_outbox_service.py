@@ -0,0 +1,333 @@
+"""
+Xero Outbox Service
+
+Sends invoices, quotes and purchase orders to Xero outside the HTTP request.
+
+Views call `XeroOutboxService.enqueue` inside the transaction that makes the
+local change; the submission row commits (or rolls back) with it, and the
+worker is started once the transaction commits. The worker claims due rows
+with a conditional UPDATE, so two workers never submit the same row, and
+runs the existing document manager with the row's idempotency key.
+
+Each attempt runs in one transaction with the row's success update, so the
+local Invoice/Quote/PO changes and the outbox row commit together. If the
+process dies after Xero accepted the document, the local changes roll back,
+the claim goes stale and the retry replays the same idempotency key: Xero
+returns the document it already created and the local record is rebuilt
+from that response. The history note and attachments sent after it use keys
+derived from the same one, so they are replayed rather than added twice.
+Rate limits, server errors and network failures are retried with
+exponential backoff; validation errors and errors raised by our own code
+(e.g. a ValueError building the payload) fail immediately.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import requests
+import urllib3
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from xero_python.exceptions import ApiException
+
+from apps.workflow.models import XeroSubmission
+from apps.workflow.services.error_persistence import persist_app_error
+
+logger = logging.getLogger("xero")
+
+MAX_ATTEMPTS = 6
+BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 60 * 30
+# A claim older than this belongs to a worker that died mid-attempt
+CLAIM_TIMEOUT = timedelta(minutes=10)
+BATCH_SIZE = 20
+WORKER_LOCK_KEY = "xero_outbox_worker_running"
+WORKER_LOCK_TIMEOUT = 60 * 30
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+# Manager error types that will fail the same way on every attempt
+PERMANENT_ERROR_TYPES = {"validation_error", "contact_error"}
+
+
+@dataclass
+class XeroOutboxResult:
+    succeeded: int = 0
+    retrying: int = 0
+    failed: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.retrying + self.failed
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Delay before the next attempt, doubling with each failed attempt."""
+    seconds = BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, MAX_BACKOFF_SECONDS))
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """Whether an exception is a Xero, network or database failure worth retrying."""
+    if isinstance(exc, ApiException):
+        # No status means the request never got a response
+        return exc.status is None or exc.status in RETRYABLE_STATUSES
+    return isinstance(
+        exc,
+        (
+            urllib3.exceptions.HTTPError,
+            requests.RequestException,
+            ConnectionError,
+            TimeoutError,
+            DatabaseError,
+        ),
+    )
+
+
+def is_retryable(result: dict) -> bool:
+    """
+    Whether a failed manager result is worth another attempt.
+
+    Managers that catch unexpected exceptions report them as status 500 with
+    a "retryable" flag from is_transient_error; the flag wins over the status.
+    """
+    if result.get("error_type") in PERMANENT_ERROR_TYPES:
+        return False
+    if "retryable" in result:
+        return result["retryable"]
+    return result.get("status", 500) in RETRYABLE_STATUSES
+
+
+class XeroOutboxService:
+    """Enqueues Xero document submissions and works through due ones."""
+
+    @staticmethod
+    def enqueue(
+        document_type: str,
+        *,
+        job=None,
+        purchase_order=None,
+        options: dict | None = None,
+        user=None,
+    ) -> XeroSubmission:
+        """
+        Record a submission in the caller's transaction.
+
+        An open submission for the same document is returned instead of a
+        new one, so a repeated click does not send the document twice.
+        """
+        if document_type == XeroSubmission.DocumentType.PURCHASE_ORDER:
+            if purchase_order is None:
+                raise ValueError("Purchase order submissions need a purchase_order")
+        elif job is None:
+            raise ValueError(f"{document_type} submissions need a job")
+
+        with transaction.atomic():
+            existing = (
+                XeroSubmission.objects.select_for_update()
+                .filter(
+                    document_type=document_type,
+                    job=job,
+                    purchase_order=purchase_order,
+                    status__in=XeroSubmission.OPEN_STATUSES,
+                )
+                .first()
+            )
+            if existing:
+                return existing
+
+            submission = XeroSubmission.objects.create(
+                document_type=document_type,
+                job=job,
+                purchase_order=purchase_order,
+                options=options or {},
+                created_by=user if user and user.is_authenticated else None,
+                next_attempt_at=timezone.now(),
+            )
+            transaction.on_commit(XeroOutboxService.run_in_background)
+        logger.info(
+            "Queued Xero %s submission %s", submission.document_type, submission.id
+        )
+        return submission
+
+    def process_due(self, limit: int | None = None) -> XeroOutboxResult:
+        """Claim and submit due rows until none are left (or `limit` is hit)."""
+        result = XeroOutboxResult()
+        while limit is None or result.processed < limit:
+            now = timezone.now()
+            batch = BATCH_SIZE if limit is None else limit - result.processed
+            ids = list(
+                self._due(now)
+                .order_by("next_attempt_at")
+                .values_list("id", flat=True)[:batch]
+            )
+            if not ids:
+                break
+            for submission_id in ids:
+                if not self._claim(submission_id, now):
+                    continue
+                outcome = self.submit(XeroSubmission.objects.get(pk=submission_id))
+                if outcome == XeroSubmission.Status.SUCCEEDED:
+                    result.succeeded += 1
+                elif outcome == XeroSubmission.Status.FAILED:
+                    result.failed += 1
+                else:
+                    result.retrying += 1
+        return result
+
+    @staticmethod
+    def _due(now: datetime):
+        return XeroSubmission.objects.filter(
+            Q(status=XeroSubmission.Status.PENDING, next_attempt_at__lte=now)
+            | Q(
+                status=XeroSubmission.Status.IN_PROGRESS,
+                claimed_at__lt=now - CLAIM_TIMEOUT,
+            )
+        )
+
+    def _claim(self, submission_id, now: datetime) -> bool:
+        claimed = (
+            self._due(now)
+            .filter(pk=submission_id)
+            .update(
+                status=XeroSubmission.Status.IN_PROGRESS,
+                claimed_at=now,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+        )
+        return claimed == 1
+
+    def submit(self, submission: XeroSubmission) -> str:
+        """Run one claimed attempt and record its outcome. Returns the new status."""
+        try:
+            with transaction.atomic():
+                result = self._call_manager(submission)
+                if result.get("success"):
+                    self._finish(submission, XeroSubmission.Status.SUCCEEDED, result)
+                    return submission.status
+                # Undo any partial local writes; the retry starts clean
+                transaction.set_rollback(True)
+        except Exception as exc:
+            logger.exception("Xero submission %s raised", submission.id)
+            result = {
+                "success": False,
+                "error": str(exc),
+                "status": 500,
+                "retryable": is_transient_error(exc),
+            }
+
+        if is_retryable(result) and submission.attempts < MAX_ATTEMPTS:
+            submission.status = XeroSubmission.Status.PENDING
+            submission.next_attempt_at = timezone.now() + backoff_delay(
+                submission.attempts
+            )
+            submission.last_error = result.get("error") or ""
+            submission.claimed_at = None
+            submission.save(
+                update_fields=[
+                    "status",
+                    "next_attempt_at",
+                    "last_error",
+                    "claimed_at",
+                    "updated_at",
+                ]
+            )
+            logger.warning(
+                "Xero submission %s attempt %s failed, retrying at %s: %s",
+                submission.id,
+                submission.attempts,
+                submission.next_attempt_at,
+                submission.last_error,
+            )
+            return submission.status
+
+        self._finish(submission, XeroSubmission.Status.FAILED, result)
+        persist_app_error(
+            RuntimeError(f"Xero submission failed: {submission.last_error}"),
+            job_id=str(submission.job_id) if submission.job_id else None,
+            additional_context={
+                "xero_submission_id": str(submission.id),
+                "document_type": submission.document_type,
+                "purchase_order_id": (
+                    str(submission.purchase_order_id)
+                    if submission.purchase_order_id
+                    else None
+                ),
+                "attempts": submission.attempts,
+                "result": result,
+            },
+        )
+        return submission.status
+
+    @staticmethod
+    def _finish(submission: XeroSubmission, status: str, result: dict) -> None:
+        submission.status = status
+        submission.result = result
+        submission.last_error = (
+            "" if result.get("success") else result.get("error") or ""
+        )
+        submission.completed_at = timezone.now()
+        submission.claimed_at = None
+        submission.save(
+            update_fields=[
+                "status",
+                "result",
+                "last_error",
+                "completed_at",
+                "claimed_at",
+                "updated_at",
+            ]
+        )
+
+    @staticmethod
+    def _call_manager(submission: XeroSubmission) -> dict:
+        # Imported here: the managers live in the views package
+        from apps.workflow.views.xero.xero_invoice_manager import XeroInvoiceManager
+        from apps.workflow.views.xero.xero_po_manager import XeroPurchaseOrderManager
+        from apps.workflow.views.xero.xero_quote_manager import XeroQuoteManager
+
+        DocumentType = XeroSubmission.DocumentType
+        if submission.document_type == DocumentType.PURCHASE_ORDER:
+            manager = XeroPurchaseOrderManager(purchase_order=submission.purchase_order)
+            manager.idempotency_key = submission.idempotency_key
+            return manager.sync_to_xero()
+
+        job = submission.job
+        if submission.document_type == DocumentType.INVOICE:
+            manager = XeroInvoiceManager(client=job.client, job=job)
+            manager.idempotency_key = submission.idempotency_key
+            return manager.create_document()
+        if submission.document_type == DocumentType.QUOTE:
+            manager = XeroQuoteManager(client=job.client, job=job)
+            manager.idempotency_key = submission.idempotency_key
+            return manager.create_document(
+                breakdown=submission.options.get("breakdown", True)
+            )
+        raise ValueError(f"Unknown Xero document type: {submission.document_type}")
+
+    @classmethod
+    def run_in_background(cls) -> bool:
+        """Start the worker on a daemon thread unless one is already running."""
+        if not cache.add(WORKER_LOCK_KEY, True, timeout=WORKER_LOCK_TIMEOUT):
+            logger.debug("Xero outbox worker already running")
+            return False
+        thread = threading.Thread(target=cls._run_background, daemon=True)
+        thread.start()
+        return True
+
+    @classmethod
+    def _run_background(cls) -> None:
+        try:
+            result = cls().process_due()
+            if result.processed:
+                logger.info("Xero outbox worker finished: %s", result)
+        except Exception as exc:
+            logger.exception("Xero outbox worker failed")
+            persist_app_error(exc)
+        finally:
+            cache.delete(WORKER_LOCK_KEY)
+            close_old_connections()
@@ -0,0 +1,163 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Staff
+from apps.testing import BaseTestCase
+from apps.workflow.models import AppError
+from apps.workflow.services.error_persistence import (
+    MAX_WRITE_ATTEMPTS,
+    AppErrorBuffer,
+    error_fingerprint,
+    flush_app_errors,
+    persist_app_error,
+)
+
+LOCATION = {"file": "workflow/api/xero/sync.py", "function": "sync_job"}
+
+
+def record_failure(job_number, exc_type=ValueError):
+    try:
+        raise exc_type(f"Xero rejected job {job_number}")
+    except Exception as exc:
+        return persist_app_error(exc)
+
+
+class AppErrorPersistenceTests(BaseTestCase):
+    def test_fingerprint_ignores_ids_and_numbers_in_the_message(self):
+        first = error_fingerprint(
+            ValueError("Job 1001 (9b2f0f5e-1c2d-4e5f-8a9b-0c1d2e3f4a5b) failed"),
+            LOCATION,
+        )
+        second = error_fingerprint(
+            ValueError("Job 2417 (0e6a7c1d-2b3c-4d5e-9f0a-1b2c3d4e5f6a) failed"),
+            LOCATION,
+        )
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(
+            first, error_fingerprint(KeyError("Job 1001 failed"), LOCATION)
+        )
+
+    def test_repeats_are_merged_into_one_row(self):
+        first = record_failure(1001)
+        second = record_failure(1002)
+
+        self.assertEqual(first.id, second.id)
+        error = AppError.objects.get()
+        self.assertEqual(error.occurrence_count, 2)
+        self.assertEqual(error.message, "Xero rejected job 1002")
+        self.assertGreaterEqual(error.last_seen, error.timestamp)
+        self.assertNotEqual(record_failure(1003, exc_type=KeyError).id, first.id)
+
+    @override_settings(APP_ERROR_BUFFERING=True)
+    @patch.object(AppErrorBuffer, "start")
+    def test_buffered_errors_are_written_in_one_batch(self, _):
+        # One lookup of the open row, then the id is reused until the flush
+        with self.assertNumQueries(1):
+            ids = {record_failure(n).id for n in range(50)}
+        record_failure(7, exc_type=KeyError)
+
+        self.assertEqual(AppError.objects.count(), 0)
+        self.assertEqual(flush_app_errors(), 51)
+
+        self.assertEqual(len(ids), 1)
+        error = AppError.objects.get(id=ids.pop())
+        self.assertEqual(error.occurrence_count, 50)
+        self.assertEqual(AppError.objects.count(), 2)
+        self.assertEqual(flush_app_errors(), 0)
+
+    @override_settings(APP_ERROR_BUFFERING=True)
+    @patch.object(AppErrorBuffer, "start")
+    def test_an_entry_that_cannot_be_written_is_dropped_without_blocking_others(
+        self, _
+    ):
+        write = AppErrorBuffer.write
+
+        def reject_job_1002(entries):
+            entries = list(entries)
+            if any("1002" in e.fields["message"] for e in entries):
+                raise ValueError("Cannot write this error")
+            write(entries)
+
+        record_failure(1001)
+        record_failure(1002, exc_type=KeyError)
+        with patch.object(AppErrorBuffer, "write", side_effect=reject_job_1002):
+            self.assertEqual(flush_app_errors(), 1)
+            for _ in range(MAX_WRITE_ATTEMPTS - 1):
+                self.assertEqual(flush_app_errors(), 0)
+
+        self.assertEqual(
+            list(AppError.objects.values_list("message", flat=True)),
+            ["Xero rejected job 1001"],
+        )
+        # Dropped rather than retried forever
+        self.assertEqual(flush_app_errors(), 0)
+        self.assertEqual(AppError.objects.count(), 1)
+
+    def test_repeats_merge_into_the_open_row_found_by_fingerprint(self):
+        first = record_failure(1001)
+
+        second = record_failure(1002)
+
+        self.assertEqual(second.id, first.id)
+        self.assertEqual(AppError.objects.get().occurrence_count, 2)
+
+    @override_settings(APP_ERROR_BUFFERING=True)
+    @patch.object(AppErrorBuffer, "start")
+    def test_returned_id_is_a_row_once_flushed(self, _):
+        first = record_failure(1001)
+        flush_app_errors()
+        open_row = AppError.objects.get(id=first.id)
+        queued = record_failure(1002)
+        self.assertEqual(queued.id, open_row.id)
+        # Resolved, e.g. by another process, before the flush
+        open_row.mark_resolved(None)
+        new = record_failure(1003, exc_type=KeyError)
+
+        flush_app_errors()
+
+        open_row.refresh_from_db()
+        self.assertEqual(open_row.occurrence_count, 2)
+        self.assertEqual(AppError.objects.get(id=new.id).message, new.message)
+
+    def test_occurrence_after_resolution_starts_a_new_row(self):
+        resolved = AppError.objects.get(id=record_failure(1001).id)
+        resolved.mark_resolved(None)
+
+        reopened = record_failure(1002)
+
+        self.assertNotEqual(reopened.id, resolved.id)
+        resolved.refresh_from_db()
+        self.assertEqual(resolved.occurrence_count, 1)
+
+    def test_groups_endpoint_lists_counts_per_fingerprint(self):
+        for n in range(3):
+            record_failure(n)
+        AppError.objects.get().mark_resolved(None)
+        record_failure(4)
+        record_failure(5, exc_type=KeyError)
+        staff = Staff.objects.create_user(
+            email="office@example.com",
+            password="x",
+            first_name="Olive",
+            last_name="Office",
+            is_office_staff=True,
+        )
+        api = APIClient()
+        api.force_authenticate(staff)
+
+        response = api.get(reverse("app-error-groups"))
+
+        self.assertEqual(response.status_code, 200)
+        groups = {g["occurrences"]: g for g in response.data["results"]}
+        self.assertEqual(sorted(groups), [1, 4])
+        # Three resolved occurrences plus one in a new, open row
+        self.assertEqual(groups[4]["unresolved_count"], 1)
+        self.assertEqual(groups[4]["message"], "Xero rejected job 4")
+        self.assertEqual(
+            groups[4]["latest_error_id"],
+            str(AppError.objects.get(resolved=False, message__endswith="4").id),
+        )
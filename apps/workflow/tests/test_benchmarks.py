@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.db import connection
+
+from apps.job.models import CostLine, Job
+from apps.testing import BaseTestCase
+from apps.workflow.benchmarks.dataset import SCALES, BenchmarkDataset
+from apps.workflow.benchmarks.runner import (
+    BenchmarkResult,
+    baseline_for,
+    compare_to_baseline,
+    run_benchmarks,
+    save_baselines,
+)
+
+
+class BenchmarkBaselineTests(BaseTestCase):
+    def test_small_dataset_stays_within_query_baselines(self):
+        baseline = baseline_for("small")
+        self.assertTrue(baseline, "No small baselines recorded")
+
+        data = BenchmarkDataset("small").build()
+        self.assertEqual(Job.objects.count(), SCALES["small"].jobs)
+        self.assertEqual(CostLine.objects.count(), data.counts["cost_lines"])
+
+        # Wall time is machine dependent; run_benchmarks checks it
+        results = run_benchmarks(data, repeat=1)
+        regressions = compare_to_baseline(results, baseline, time_tolerance=None)
+        self.assertEqual([str(r) for r in regressions], [])
+
+
+class BaselineStorageTests(BaseTestCase):
+    def test_query_counts_are_shared_and_wall_times_are_per_vendor(self):
+        path = Path(self.enterContext(TemporaryDirectory())) / "baselines.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "small": {
+                        "queries": {"kanban": 20, "job_detail": 10},
+                        "wall_ms": {"other": {"kanban": 100.0}},
+                    }
+                }
+            )
+        )
+
+        self.assertEqual(
+            baseline_for("small", path),
+            {"kanban": {"queries": 20}, "job_detail": {"queries": 10}},
+        )
+
+        save_baselines(
+            [BenchmarkResult("kanban", 200, queries=18, wall_ms=90.0)], "small", path
+        )
+
+        stored = json.loads(path.read_text())["small"]
+        self.assertEqual(stored["queries"], {"kanban": 18})
+        self.assertEqual(
+            stored["wall_ms"],
+            {"other": {"kanban": 100.0}, connection.vendor: {"kanban": 90.0}},
+        )
+        self.assertEqual(
+            baseline_for("small", path), {"kanban": {"queries": 18, "wall_ms": 90.0}}
+        )
+
+
+class CompareToBaselineTests(BaseTestCase):
+    baseline = {
+        "kanban": {"queries": 20, "wall_ms": 100.0},
+        "job_detail": {"queries": 10, "wall_ms": 40.0},
+    }
+
+    def test_growth_within_tolerance_passes(self):
+        results = [
+            BenchmarkResult("kanban", 200, queries=22, wall_ms=150.0),
+            BenchmarkResult("job_detail", 200, queries=9, wall_ms=20.0),
+            BenchmarkResult("new_endpoint", 200, queries=500, wall_ms=900.0),
+        ]
+
+        self.assertEqual(compare_to_baseline(results, self.baseline), [])
+
+    def test_regressions_beyond_tolerance_are_reported(self):
+        results = [
+            BenchmarkResult("kanban", 200, queries=23, wall_ms=161.0),
+            BenchmarkResult("job_detail", 500, queries=1, wall_ms=1.0),
+        ]
+
+        regressions = compare_to_baseline(results, self.baseline)
+
+        self.assertEqual(
+            [(r.case, r.metric) for r in regressions],
+            [
+                ("kanban", "queries"),
+                ("kanban", "wall_ms"),
+                ("job_detail", "status_code"),
+            ],
+        )
+        queries_only = compare_to_baseline(
+            results[:1], self.baseline, time_tolerance=None
+        )
+        self.assertEqual([r.metric for r in queries_only], ["queries"])
+
+    def test_cases_without_wall_time_check_queries_only(self):
+        results = [BenchmarkResult("kanban", 200, queries=23, wall_ms=900.0)]
+
+        regressions = compare_to_baseline(results, {"kanban": {"queries": 20}})
+
+        self.assertEqual([r.metric for r in regressions], ["queries"])
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Staff
+from apps.testing import BaseTestCase
+from apps.workflow.models import CompanyDefaults
+from apps.workflow.models.company_defaults import VERSION_CACHE_KEY
+
+
+class CompanyDefaultsCacheTests(BaseTestCase):
+    def test_repeat_reads_are_served_from_the_process_copy(self):
+        first = CompanyDefaults.get_cached()
+
+        with self.assertNumQueries(0):
+            second = CompanyDefaults.get_cached()
+
+        self.assertIs(first, second)
+
+    def test_save_makes_the_next_read_reload(self):
+        CompanyDefaults.get_cached()
+        defaults = CompanyDefaults.get_instance()
+        defaults.charge_out_rate = Decimal("123.45")
+        defaults.save()
+
+        with self.assertNumQueries(1):
+            cached = CompanyDefaults.get_cached()
+
+        self.assertEqual(cached.charge_out_rate, Decimal("123.45"))
+
+    def test_version_bump_from_another_process_is_picked_up(self):
+        CompanyDefaults.get_cached()
+        # Another process saved the row and replaced the version token
+        CompanyDefaults.objects.update(wage_rate=Decimal("41.00"))
+        cache.set(VERSION_CACHE_KEY, "changed-elsewhere", timeout=None)
+
+        self.assertEqual(CompanyDefaults.get_cached().wage_rate, Decimal("41.00"))
+
+    def test_request_memo_returns_one_instance_for_the_whole_request(self):
+        with CompanyDefaults.request_memo():
+            first = CompanyDefaults.get_cached()
+            cache.set(VERSION_CACHE_KEY, "changed-mid-request", timeout=None)
+
+            with self.assertNumQueries(0):
+                self.assertIs(CompanyDefaults.get_cached(), first)
+
+        with self.assertNumQueries(1):
+            self.assertIsNot(CompanyDefaults.get_cached(), first)
+
+    def test_settings_endpoint_returns_the_stored_row(self):
+        staff = Staff.objects.create_user(
+            email="office@example.com",
+            password="x",
+            first_name="Olive",
+            last_name="Office",
+        )
+        api = APIClient()
+        api.force_authenticate(staff)
+        CompanyDefaults.get_cached()
+        # Saved by another process whose version bump this one has not seen
+        CompanyDefaults.objects.update(charge_out_rate=Decimal("150.00"))
+
+        response = api.get(reverse("api_company_defaults"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(response.json()["charge_out_rate"]), Decimal("150"))
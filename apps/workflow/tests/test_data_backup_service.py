@@ -0,0 +1,182 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.accounts.models import Staff
+from apps.client.models import Client, ClientContact
+from apps.testing import BaseTestCase, BaseTransactionTestCase
+from apps.workflow.services.data_backup_service import (
+    BackupAnonymizer,
+    BackupExporter,
+    BackupRestorer,
+)
+
+CLIENT_MODELS = ["client.Client", "client.ClientContact"]
+
+
+class DataBackupServiceTests(BaseTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.path = os.path.join(tmp_dir, "backup.ndjson.gz")
+
+        modified = timezone.now() - timedelta(days=30)
+        for n in range(5):
+            client = Client.objects.create(
+                name=f"Client {n}",
+                email=f"client{n}@example.com",
+                xero_last_modified=modified,
+            )
+            ClientContact.objects.create(
+                client=client, name=f"Contact {n}", email=f"c{n}@example.com"
+            )
+        Client.objects.create(name="Shop Client", xero_last_modified=modified)
+        # Rows restored from a backup must keep their original timestamps
+        Client.objects.update(django_created_at=modified, django_updated_at=modified)
+        ClientContact.objects.update(created_at=modified, updated_at=modified)
+
+    def _lines(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def _snapshot(self):
+        def rows(model):
+            # Fixture JSON stores datetimes to the millisecond
+            return [
+                {
+                    key: (
+                        value.replace(microsecond=value.microsecond // 1000 * 1000)
+                        if isinstance(value, datetime)
+                        else value
+                    )
+                    for key, value in row.items()
+                }
+                for row in model.objects.order_by("pk").values()
+            ]
+
+        return rows(Client), rows(ClientContact)
+
+    def test_export_writes_anonymised_ndjson_in_model_order(self):
+        staff = Staff.objects.create_user(
+            email="real.person@example.com",
+            password="x",
+            first_name="Real",
+            last_name="Person",
+        )
+        staff.groups.add(Group.objects.create(name="Office"))
+        exporter = BackupExporter(
+            anonymizer=BackupAnonymizer({"Shop Client"}),
+            models=["accounts.Staff"] + CLIENT_MODELS,
+            chunk_size=2,
+        )
+
+        counts = exporter.export(self.path)
+
+        records = self._lines()
+        self.assertEqual(counts["client.client"], 6)
+        self.assertEqual(counts["client.clientcontact"], 5)
+        self.assertEqual(len(records), sum(counts.values()))
+        models = [record["model"] for record in records]
+        self.assertEqual(
+            models[: 1 + 6 + 5],
+            ["accounts.staff"] + ["client.client"] * 6 + ["client.clientcontact"] * 5,
+        )
+        self.assertLessEqual(set(models[12:]), {"migrations.migration"})
+
+        names = {r["fields"]["name"] for r in records if r["model"] == "client.client"}
+        self.assertIn("Shop Client", names)
+        self.assertFalse(names & {f"Client {n}" for n in range(5)})
+        staff_record = records[0]
+        self.assertNotEqual(staff_record["fields"]["email"], staff.email)
+        self.assertEqual(len(staff_record["fields"]["groups"]), 1)
+
+    def test_restore_round_trips_rows_unchanged(self):
+        before = self._snapshot()
+        BackupExporter(models=CLIENT_MODELS, chunk_size=4).export(self.path)
+        Client.objects.all().delete()
+
+        counts = BackupRestorer(chunk_size=4).restore(self.path)
+
+        self.assertEqual(counts["client.client"], 6)
+        self.assertEqual(self._snapshot(), before)
+
+    def test_interrupted_restore_resumes_after_last_committed_batch(self):
+        before = self._snapshot()
+        BackupExporter(
+            models=CLIENT_MODELS, chunk_size=2, include_migrations=False
+        ).export(self.path)
+        Client.objects.all().delete()
+
+        def interrupt(label, count):
+            if count >= 4:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            BackupRestorer(chunk_size=2, progress=interrupt).restore(self.path)
+
+        restorer = BackupRestorer(chunk_size=2)
+        self.assertEqual(restorer.checkpoint(self.path).records, 4)
+        self.assertEqual(Client.objects.count(), 4)
+
+        restorer.restore(self.path, resume=True)
+
+        self.assertEqual(self._snapshot(), before)
+        self.assertIsNone(restorer.checkpoint(self.path))
+
+    def test_failed_batch_leaves_checkpoint_at_last_committed_batch(self):
+        BackupExporter(
+            models=CLIENT_MODELS, chunk_size=2, include_migrations=False
+        ).export(self.path)
+        Client.objects.all().delete()
+        restorer = BackupRestorer(chunk_size=2)
+        insert = restorer._insert
+
+        def crash_on_third_batch(model, records):
+            if Client.objects.count() >= 4:
+                raise RuntimeError("connection lost")
+            insert(model, records)
+
+        with patch.object(restorer, "_insert", side_effect=crash_on_third_batch):
+            with self.assertRaises(RuntimeError):
+                restorer.restore(self.path)
+
+        self.assertEqual(restorer.checkpoint(self.path).records, 4)
+        restorer.restore(self.path, resume=True)
+        self.assertEqual(Client.objects.count(), 6)
+        self.assertEqual(ClientContact.objects.count(), 5)
+
+
+class BackupRestoreAfterFlushTests(BaseTransactionTestCase):
+    def test_restore_after_flush_matches_seeded_content_types(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "backup.ndjson.gz")
+        Client.objects.create(name="Restored", xero_last_modified=timezone.now())
+        # A model removed since the backup was taken
+        retired = ContentType.objects.create(app_label="legacy", model="retired")
+        BackupExporter(
+            models=["contenttypes.ContentType", "client.Client"],
+            include_migrations=False,
+        ).export(path)
+
+        call_command("flush", "--noinput", verbosity=0)
+        seeded = {ct.natural_key(): ct.pk for ct in ContentType.objects.all()}
+        # post_migrate seeded something else into the retired type's id
+        ContentType.objects.create(pk=retired.pk, app_label="new", model="model")
+
+        BackupRestorer().restore(path)
+
+        restored = {ct.natural_key(): ct.pk for ct in ContentType.objects.all()}
+        self.assertEqual(restored, {**restored, **seeded})
+        self.assertTrue(ContentType.objects.filter(app_label="legacy").exists())
+        self.assertEqual(ContentType.objects.get(pk=retired.pk).app_label, "new")
+        self.assertEqual(Client.objects.get().name, "Restored")
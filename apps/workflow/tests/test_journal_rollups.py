@@ -0,0 +1,188 @@
+"""Tests for the monthly journal rollups behind the P&L report."""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from dateutil.relativedelta import relativedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.workflow.api.reports.pnl import CompanyProfitAndLossReport
+from apps.workflow.models import (
+    XeroAccount,
+    XeroJournal,
+    XeroJournalLineItem,
+    XeroJournalMonthlyRollup,
+)
+from apps.workflow.services.journal_rollup_service import (
+    JournalRollupService,
+    split_period,
+)
+
+REVENUE = ("AccountType.REVENUE", "Sales")
+EXPENSE = ("AccountType.EXPENSE", "Rent")
+
+
+class TestSplitPeriod(TestCase):
+    def test_month_aligned_period_has_no_partial_days(self):
+        months, partial = split_period(date(2025, 1, 1), date(2025, 3, 31))
+
+        self.assertEqual(months, [date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)])
+        self.assertEqual(partial, [])
+
+    def test_unaligned_period_keeps_edges(self):
+        months, partial = split_period(date(2025, 1, 15), date(2025, 3, 10))
+
+        self.assertEqual(months, [date(2025, 2, 1)])
+        self.assertEqual(
+            partial,
+            [
+                (date(2025, 1, 15), date(2025, 1, 31)),
+                (date(2025, 3, 1), date(2025, 3, 10)),
+            ],
+        )
+
+    def test_period_inside_one_month(self):
+        months, partial = split_period(date(2025, 1, 5), date(2025, 1, 20))
+
+        self.assertEqual(months, [])
+        self.assertEqual(partial, [(date(2025, 1, 5), date(2025, 1, 20))])
+
+
+class TestJournalRollupService(TestCase):
+    def setUp(self):
+        self.accounts = {
+            key: XeroAccount.objects.create(
+                xero_id=uuid.uuid4(),
+                account_name=key[1],
+                account_type=key[0],
+                xero_last_modified=timezone.now(),
+                raw_json={},
+            )
+            for key in (REVENUE, EXPENSE)
+        }
+        self.journal_number = 0
+
+    def _journal(self, journal_date, lines):
+        self.journal_number += 1
+        journal = XeroJournal.objects.create(
+            xero_id=uuid.uuid4(),
+            journal_date=journal_date,
+            created_date_utc=timezone.now(),
+            journal_number=self.journal_number,
+            raw_json={},
+            xero_last_modified=timezone.now(),
+        )
+        for key, amount in lines:
+            XeroJournalLineItem.objects.create(
+                journal=journal,
+                xero_line_id=uuid.uuid4(),
+                account=self.accounts[key],
+                net_amount=Decimal(amount),
+                gross_amount=Decimal(amount),
+                tax_amount=Decimal("0"),
+                raw_json={},
+            )
+        return journal
+
+    def test_refresh_for_journals_rolls_up_touched_months(self):
+        january = self._journal(date(2025, 1, 10), [(REVENUE, "100"), (EXPENSE, "40")])
+        february = self._journal(date(2025, 2, 3), [(REVENUE, "250")])
+        self._journal(date(2025, 1, 28), [(REVENUE, "50")])
+
+        JournalRollupService.refresh_for_journals([january, february])
+
+        rollups = {
+            (row.month, row.account.account_name): row.net_amount
+            for row in XeroJournalMonthlyRollup.objects.select_related("account")
+        }
+        self.assertEqual(
+            rollups,
+            {
+                (date(2025, 1, 1), "Sales"): Decimal("150.00"),
+                (date(2025, 1, 1), "Rent"): Decimal("40.00"),
+                (date(2025, 2, 1), "Sales"): Decimal("250.00"),
+            },
+        )
+
+    def test_refresh_is_idempotent(self):
+        journal = self._journal(date(2025, 1, 10), [(REVENUE, "100")])
+
+        JournalRollupService.refresh_for_journals([journal])
+        JournalRollupService.refresh_for_journals([journal])
+
+        self.assertEqual(XeroJournalMonthlyRollup.objects.count(), 1)
+
+    def test_period_totals_match_line_items(self):
+        self._journal(date(2025, 1, 10), [(REVENUE, "100"), (EXPENSE, "40")])
+        self._journal(date(2025, 2, 3), [(REVENUE, "250")])
+        self._journal(date(2025, 3, 20), [(EXPENSE, "60")])
+        JournalRollupService.rebuild()
+
+        aligned, unaligned = JournalRollupService.period_totals(
+            [
+                (date(2025, 1, 1), date(2025, 2, 28)),
+                (date(2025, 1, 15), date(2025, 3, 20)),
+            ]
+        )
+
+        self.assertEqual(
+            aligned, {REVENUE: Decimal("350.00"), EXPENSE: Decimal("40.00")}
+        )
+        self.assertEqual(
+            unaligned, {REVENUE: Decimal("250.00"), EXPENSE: Decimal("60.00")}
+        )
+
+    def test_month_comparisons_use_one_query(self):
+        self._journal(date(2025, 1, 10), [(REVENUE, "100")])
+        JournalRollupService.rebuild()
+        start = date(2025, 1, 1)
+        date_ranges = [
+            (start - relativedelta(months=i), start - relativedelta(months=i - 1))
+            for i in range(24)
+        ]
+        date_ranges = [(s, e - relativedelta(days=1)) for s, e in date_ranges]
+
+        with CaptureQueriesContext(connection) as queries:
+            totals = JournalRollupService.period_totals(date_ranges)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(totals[0], {REVENUE: Decimal("100.00")})
+        self.assertEqual(totals[1], {})
+
+
+class TestProfitAndLossReport(TestCase):
+    def test_compare_periods_answered_from_rollups(self):
+        account = XeroAccount.objects.create(
+            xero_id=uuid.uuid4(),
+            account_name="Sales",
+            account_type="AccountType.REVENUE",
+            xero_last_modified=timezone.now(),
+            raw_json={},
+        )
+        XeroJournalMonthlyRollup.objects.create(
+            month=date(2025, 5, 1), account=account, net_amount=Decimal("500.00")
+        )
+        XeroJournalMonthlyRollup.objects.create(
+            month=date(2025, 4, 1), account=account, net_amount=Decimal("300.00")
+        )
+        request = SimpleNamespace(
+            query_params={
+                "start_date": "2025-05-01",
+                "end_date": "2025-05-31",
+                "compare": "1",
+            }
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = CompanyProfitAndLossReport().get(request)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            response.data["Trading Income"]["Sales"],
+            [Decimal("500.00"), Decimal("300.00")],
+        )
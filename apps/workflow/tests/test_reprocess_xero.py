@@ -0,0 +1,276 @@
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounting.models import Bill, BillLineItem, Invoice, InvoiceLineItem
+from apps.client.models import Client
+from apps.testing import BaseTestCase
+from apps.workflow.api.xero.reprocess_xero import (
+    XeroReprocessor,
+    set_invoice_or_bill_fields,
+)
+from apps.workflow.models import (
+    XeroAccount,
+    XeroJournal,
+    XeroJournalLineItem,
+    XeroJournalMonthlyRollup,
+    XeroReprocessCheckpoint,
+)
+from apps.workflow.services.journal_rollup_service import JournalRollupService
+
+
+def invoice_json(invoice_id, number, contact_id, lines, type_="ACCREC"):
+    return {
+        "_type": type_,
+        "_invoice_id": str(invoice_id),
+        "_invoice_number": number,
+        "_date": "2025-03-14",
+        "_due_date": "2025-04-20",
+        "_status": "AUTHORISED",
+        "_sub_total": "100.00",
+        "_total_tax": "15.00",
+        "_total": "115.00",
+        "_amount_due": "115.00",
+        "_updated_date_utc": "2025-03-14T10:00:00+00:00",
+        "_contact": {"_contact_id": contact_id},
+        "_line_amount_types": {"_value_": "Exclusive"},
+        "_line_items": [
+            {
+                "_line_item_id": str(line_id),
+                "_description": f"Line {n}",
+                "_quantity": 2,
+                "_unit_amount": 25,
+                "_line_amount": "50.00",
+                "_tax_amount": "7.50",
+                "_account_code": code,
+            }
+            for n, (line_id, code) in enumerate(lines)
+        ],
+    }
+
+
+class XeroReprocessorTests(BaseTestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.sales, self.other = (
+            XeroAccount.objects.create(
+                xero_id=uuid.uuid4(),
+                account_code=code,
+                account_name=name,
+                account_type="AccountType.REVENUE",
+                xero_last_modified=now,
+                raw_json={},
+            )
+            for code, name in (("200", "Sales"), ("260", "Other Revenue"))
+        )
+        self.client_obj = Client.objects.create(
+            name="Reprocess Client",
+            xero_contact_id=str(uuid.uuid4()),
+            xero_last_modified=now,
+        )
+
+    def _invoice(self, n, code="200", line_count=2, type_="ACCREC", model=Invoice):
+        xero_id = uuid.uuid4()
+        lines = [(uuid.uuid4(), code) for _ in range(line_count)]
+        return model.objects.create(
+            xero_id=xero_id,
+            number=f"INV-{n:04d}",
+            client=self.client_obj,
+            date=date(2025, 1, 1),
+            total_excl_tax=0,
+            tax=0,
+            total_incl_tax=0,
+            amount_due=0,
+            xero_last_modified=timezone.now(),
+            raw_json=invoice_json(
+                xero_id, f"INV-{n:04d}", self.client_obj.xero_contact_id, lines, type_
+            ),
+        )
+
+    def _journal(self, number, code="200"):
+        xero_id = uuid.uuid4()
+        return XeroJournal.objects.create(
+            xero_id=xero_id,
+            journal_date=date(2025, 1, 1),
+            created_date_utc=timezone.now(),
+            journal_number=number,
+            xero_last_modified=timezone.now(),
+            raw_json={
+                "_journal_id": str(xero_id),
+                "_journal_number": number,
+                "_journal_date": "2025-02-10",
+                "_created_date_utc": "2025-02-10T09:00:00+00:00",
+                "_journal_lines": [
+                    {
+                        "_journal_line_id": str(uuid.uuid4()),
+                        "_account_code": code,
+                        "_net_amount": "-40.00",
+                        "_gross_amount": "-46.00",
+                        "_tax_amount": "-6.00",
+                    }
+                ],
+            },
+        )
+
+    def test_documents_are_rebuilt_with_a_constant_number_of_queries(self):
+        invoices = [self._invoice(n) for n in range(12)]
+        reprocessor = XeroReprocessor(chunk_size=5, max_workers=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = reprocessor.reprocess_documents("INVOICE")
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.processed, 12)
+        self.assertEqual(result.line_items_created, 24)
+        # Maps and checkpoint, then a fixed handful of queries per chunk
+        self.assertLess(len(queries), 60)
+        invoices[3].refresh_from_db()
+        self.assertEqual(invoices[3].total_incl_tax, Decimal("115.00"))
+        self.assertEqual(invoices[3].date, date(2025, 3, 14))
+        line = invoices[3].line_items.first()
+        self.assertEqual(line.account, self.sales)
+        self.assertEqual(line.line_amount_incl_tax, Decimal("57.50"))
+
+    def test_batch_matches_the_single_document_path(self):
+        single, batched = self._invoice(1), self._invoice(2)
+        set_invoice_or_bill_fields(single, "INVOICE")
+
+        XeroReprocessor(max_workers=1).reprocess_documents("INVOICE")
+
+        fields = ["quantity", "unit_price", "account_id", "line_amount_excl_tax"]
+        self.assertEqual(
+            list(single.line_items.order_by("description").values(*fields)),
+            list(batched.line_items.order_by("description").values(*fields)),
+        )
+
+    def test_existing_line_items_are_remapped_in_place(self):
+        bill = self._invoice(1, type_="ACCPAY", model=Bill)
+        XeroReprocessor(max_workers=1).reprocess_documents("BILL")
+        ids = set(BillLineItem.objects.values_list("id", flat=True))
+        for line in bill.raw_json["_line_items"]:
+            line["_account_code"] = "260"
+        Bill.objects.filter(pk=bill.pk).update(raw_json=bill.raw_json)
+
+        result = XeroReprocessor(max_workers=1).reprocess_documents("BILL")
+
+        self.assertEqual(result.line_items_updated, 2)
+        self.assertEqual(set(BillLineItem.objects.values_list("id", flat=True)), ids)
+        self.assertEqual(
+            set(BillLineItem.objects.values_list("account", flat=True)),
+            {self.other.id},
+        )
+
+    def test_unknown_contact_is_reported_without_stopping_the_run(self):
+        invoice = self._invoice(1)
+        invoice.raw_json["_contact"]["_contact_id"] = str(uuid.uuid4())
+        invoice.save()
+        self._invoice(2)
+
+        result = XeroReprocessor(max_workers=1).reprocess_documents("INVOICE")
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.processed, 1)
+        self.assertIn("INV-0001", result.failed)
+
+    def test_changed_only_skips_documents_saved_before_the_last_run(self):
+        first, second = self._invoice(1), self._invoice(2)
+        XeroReprocessor(max_workers=1).reprocess_documents("INVOICE")
+        checkpoint = XeroReprocessCheckpoint.objects.get(model="accounting.Invoice")
+        self.assertIsNotNone(checkpoint.processed_through)
+
+        Invoice.objects.filter(pk=first.pk).update(
+            django_updated_at=checkpoint.processed_through - timedelta(seconds=1)
+        )
+        second.raw_json["_total"] = "120.00"
+        second.save()
+
+        result = XeroReprocessor(max_workers=1, changed_only=True).reprocess_documents(
+            "INVOICE"
+        )
+
+        self.assertEqual(result.processed, 1)
+        second.refresh_from_db()
+        self.assertEqual(second.total_incl_tax, Decimal("120.00"))
+
+    def test_failed_chunk_leaves_a_checkpoint_to_resume_from(self):
+        invoices = sorted((self._invoice(n) for n in range(6)), key=lambda i: i.pk)
+        original = XeroReprocessor._document_chunk
+
+        def fail_third_chunk(reprocessor, document_type, pks):
+            if invoices[4].pk in pks:
+                raise RuntimeError("database went away")
+            return original(reprocessor, document_type, pks)
+
+        with patch.object(XeroReprocessor, "_document_chunk", fail_third_chunk):
+            result = XeroReprocessor(chunk_size=2, max_workers=1).reprocess_documents(
+                "INVOICE"
+            )
+
+        self.assertFalse(result.completed)
+        checkpoint = XeroReprocessCheckpoint.objects.get(model="accounting.Invoice")
+        self.assertTrue(checkpoint.in_progress)
+        self.assertEqual(checkpoint.resume_after, str(invoices[3].pk))
+        self.assertFalse(InvoiceLineItem.objects.filter(invoice=invoices[4]).exists())
+
+        result = XeroReprocessor(chunk_size=2, max_workers=1).reprocess_documents(
+            "INVOICE"
+        )
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.processed, 2)
+        checkpoint.refresh_from_db()
+        self.assertFalse(checkpoint.in_progress)
+        self.assertEqual(InvoiceLineItem.objects.count(), 12)
+
+    def test_journals_are_rebuilt_and_their_rollups_refreshed(self):
+        journals = [self._journal(n) for n in range(1, 4)]
+        XeroJournalLineItem.objects.create(
+            journal=journals[0],
+            xero_line_id=journals[0].raw_json["_journal_lines"][0]["_journal_line_id"],
+            account=self.other,
+            net_amount=0,
+            gross_amount=0,
+            tax_amount=0,
+            raw_json={},
+        )
+
+        result = XeroReprocessor(chunk_size=2, max_workers=1).reprocess_journals()
+
+        self.assertEqual(result.processed, 3)
+        self.assertEqual((result.line_items_created, result.line_items_updated), (2, 1))
+        self.assertEqual(
+            set(XeroJournalLineItem.objects.values_list("account", flat=True)),
+            {self.sales.id},
+        )
+        journals[0].refresh_from_db()
+        self.assertEqual(journals[0].journal_date, date(2025, 2, 10))
+        rollup = XeroJournalMonthlyRollup.objects.get()
+        self.assertEqual(rollup.month, date(2025, 2, 1))
+        self.assertEqual(rollup.net_amount, Decimal("-120.00"))
+
+    def test_touched_months_survive_a_failed_rollup_refresh(self):
+        self._journal(1)
+        with patch.object(
+            JournalRollupService,
+            "refresh_months",
+            side_effect=RuntimeError("lost connection"),
+        ):
+            with self.assertRaises(RuntimeError):
+                XeroReprocessor(max_workers=1).reprocess_journals()
+
+        checkpoint = XeroReprocessCheckpoint.objects.get(model="workflow.XeroJournal")
+        self.assertEqual(checkpoint.pending_months, ["2025-01-01", "2025-02-01"])
+        self.assertFalse(XeroJournalMonthlyRollup.objects.exists())
+
+        # Nothing changed since, but the months are still refreshed
+        result = XeroReprocessor(max_workers=1, changed_only=True).reprocess_journals()
+
+        self.assertEqual(result.processed, 0)
+        self.assertEqual(XeroJournalMonthlyRollup.objects.get().month, date(2025, 2, 1))
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.pending_months, [])
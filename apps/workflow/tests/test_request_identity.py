@@ -0,0 +1,73 @@
+"""Tests that token identity is resolved once per request and cached."""
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import Staff
+from apps.workflow.middleware import AccessLoggingMiddleware
+from apps.workflow.middleware_bearer import BearerIdentityMiddleware
+from jobs_manager.authentication import JWTAuthentication
+
+
+@override_settings(ENABLE_JWT_AUTH=True, ALLOW_BEARER_TOKEN_AUTHENTICATION=False)
+class TestRequestIdentity(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = Staff.objects.create_user(
+            email="identity@example.com",
+            password="testpassword123",
+            first_name="Identity",
+            last_name="User",
+        )
+        self.token = str(AccessToken.for_user(self.staff))
+
+    def tearDown(self):
+        cache.clear()
+
+    def _run_request(self):
+        """Run a cookie-authenticated request through the auth middleware and DRF."""
+        request = RequestFactory().get("/job/rest/jobs/")
+        request.COOKIES["access_token"] = self.token
+        request.user = AnonymousUser()
+        result = {}
+
+        def view(request):
+            result["drf"] = JWTAuthentication().authenticate(Request(request))
+            return HttpResponse()
+
+        chain = BearerIdentityMiddleware(AccessLoggingMiddleware(view))
+        with CaptureQueriesContext(connection) as queries:
+            chain(request)
+        staff_queries = [q for q in queries if "workflow_staff" in q["sql"]]
+        return result["drf"], staff_queries
+
+    def test_identity_resolved_with_one_query(self):
+        (user, token), staff_queries = self._run_request()
+
+        self.assertEqual(user.pk, self.staff.pk)
+        self.assertIsNotNone(token)
+        self.assertEqual(len(staff_queries), 1)
+
+    def test_repeat_request_served_from_cache(self):
+        self._run_request()
+
+        (user, _), staff_queries = self._run_request()
+
+        self.assertEqual(user.pk, self.staff.pk)
+        self.assertEqual(len(staff_queries), 0)
+
+    def test_staff_change_invalidates_cache(self):
+        self._run_request()
+        self.staff.password_needs_reset = True
+        self.staff.save()
+
+        (user, _), staff_queries = self._run_request()
+
+        self.assertTrue(user.password_needs_reset)
+        self.assertEqual(len(staff_queries), 1)
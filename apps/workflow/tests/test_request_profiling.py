@@ -0,0 +1,142 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Staff
+from apps.testing import BaseTestCase
+from apps.workflow.middleware import RequestProfilingMiddleware
+from apps.workflow.models import RequestProfile
+from apps.workflow.services.request_profiling_service import (
+    N_PLUS_ONE_THRESHOLD,
+    QueryProfiler,
+    RequestProfileBuffer,
+    endpoint_stats,
+    normalise_sql,
+    profile_buffer,
+)
+
+
+def profile(url_name, duration_ms, **fields):
+    defaults = {
+        "method": "GET",
+        "path": f"/{url_name}/",
+        "status_code": 200,
+        "query_count": 5,
+        "db_time_ms": 2.0,
+    }
+    return RequestProfile(
+        url_name=url_name, duration_ms=duration_ms, **{**defaults, **fields}
+    )
+
+
+class QueryProfilerTests(BaseTestCase):
+    def test_repeated_selects_are_flagged_as_n_plus_one(self):
+        staff = [
+            Staff.objects.create_user(
+                email=f"fitter{n}@example.com",
+                password="x",
+                first_name="Fitter",
+                last_name=str(n),
+            )
+            for n in range(N_PLUS_ONE_THRESHOLD)
+        ]
+        profiler = QueryProfiler()
+
+        with connection.execute_wrapper(profiler):
+            for member in staff:
+                Staff.objects.filter(pk=member.pk).exists()
+
+        self.assertEqual(profiler.count, N_PLUS_ONE_THRESHOLD)
+        self.assertEqual(profiler.duplicate_count, N_PLUS_ONE_THRESHOLD - 1)
+        self.assertTrue(profiler.has_n_plus_one)
+        self.assertGreater(profiler.db_seconds, 0)
+
+    def test_normalise_sql_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            normalise_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND n = 42"),
+            normalise_sql("SELECT * FROM t WHERE id IN (%s, %s) AND n = 7"),
+        )
+
+
+@patch.object(RequestProfileBuffer, "start")
+class RequestProfilingTests(BaseTestCase):
+    def setUp(self):
+        self.staff = Staff.objects.create_user(
+            email="admin@example.com",
+            password="x",
+            first_name="Ada",
+            last_name="Admin",
+            is_office_staff=True,
+            is_superuser=True,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.staff)
+
+    def test_middleware_is_dropped_when_profiling_is_off(self, _):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(lambda request: None)
+
+    @override_settings(REQUEST_PROFILING=True)
+    def test_requests_are_recorded_against_their_url_name(self, _):
+        self.api.get(reverse("api_company_defaults"))
+        self.api.get("/no-such-page/")
+        profile_buffer.flush()
+
+        sample = RequestProfile.objects.get()
+        self.assertEqual(sample.url_name, "api_company_defaults")
+        self.assertEqual(sample.status_code, 200)
+        self.assertGreater(sample.query_count, 0)
+        self.assertGreater(sample.duration_ms, 0)
+
+    def test_stats_are_ranked_by_the_requested_column(self, _):
+        RequestProfile.objects.bulk_create(
+            [profile("jobs:job_list", float(ms)) for ms in range(1, 101)]
+            + [
+                profile(
+                    "purchasing:po_list",
+                    10.0,
+                    query_count=40,
+                    n_plus_one=True,
+                    repeated_queries=[{"sql": "SELECT ? FROM line", "count": 30}],
+                )
+            ]
+        )
+
+        slowest = endpoint_stats(sort="p95")
+        self.assertEqual(slowest[0].url_name, "jobs:job_list")
+        self.assertEqual(slowest[0].requests, 100)
+        self.assertEqual((slowest[0].p50_ms, slowest[0].p95_ms), (50.0, 95.0))
+
+        chattiest = endpoint_stats(sort="n_plus_one")[0]
+        self.assertEqual(chattiest.url_name, "purchasing:po_list")
+        self.assertEqual(chattiest.n_plus_one_requests, 1)
+        self.assertEqual(chattiest.top_repeated_queries[0]["count"], 30)
+
+    def test_api_is_admin_only_and_lists_worst_endpoints(self, _):
+        RequestProfile.objects.bulk_create([profile("jobs:job_list", 120.0)])
+        url = reverse("request_profiling_endpoints")
+
+        response = self.api.get(url, {"sort": "queries"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["url_name"], "jobs:job_list")
+        self.assertEqual(self.api.get(url, {"sort": "slowest"}).status_code, 400)
+
+        self.staff.is_superuser = False
+        self.staff.save()
+        self.assertEqual(self.api.get(url).status_code, 403)
+
+    def test_command_lists_worst_endpoints(self, _):
+        RequestProfile.objects.bulk_create(
+            [profile("jobs:job_list", 120.0, n_plus_one=True)]
+        )
+        out = StringIO()
+
+        call_command("profile_endpoints", "--sort", "n_plus_one", stdout=out)
+
+        self.assertIn("jobs:job_list", out.getvalue())
@@ -0,0 +1,185 @@
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from apps.purchasing.models import Stock
+from apps.testing import BaseTestCase
+from apps.workflow.api.xero.stock_sync import (
+    sync_all_local_stock_to_xero,
+    sync_stock_items_to_xero,
+)
+from apps.workflow.models import XeroAccount
+
+
+def xero_item(code, item_id=None, errors=()):
+    return SimpleNamespace(
+        item_id=item_id or uuid.uuid4(),
+        code=code,
+        validation_errors=[SimpleNamespace(message=message) for message in errors],
+    )
+
+
+class FakeAccountingApi:
+    """Local stand-in for the Xero Items endpoints."""
+
+    def __init__(self, existing=(), created_elsewhere=(), rejected=()):
+        self.items = {code: xero_item(code) for code in existing}
+        # In Xero, but only visible from the second get_items call
+        self.late = {code: xero_item(code) for code in created_elsewhere}
+        self.rejected = set(rejected)
+        self.calls = []
+
+    def get_items(self, tenant_id):
+        self.calls.append(("get_items", 0))
+        items = list(self.items.values())
+        self.items.update(self.late)
+        return SimpleNamespace(items=items)
+
+    def create_items(self, tenant_id, items, summarize_errors=True):
+        payloads = items["Items"]
+        self.calls.append(("create_items", len(payloads)))
+        returned = []
+        for payload in payloads:
+            code = payload["Code"]
+            if code in self.items or code in self.late:
+                returned.append(
+                    xero_item(code, errors=[f"Item code '{code}' already exists."])
+                )
+            elif code in self.rejected:
+                returned.append(
+                    xero_item(code, errors=["Name must be 50 characters or less."])
+                )
+            else:
+                self.items[code] = xero_item(code)
+                returned.append(self.items[code])
+        return SimpleNamespace(items=returned)
+
+    def update_or_create_items(self, tenant_id, items, summarize_errors=True):
+        payloads = items["Items"]
+        self.calls.append(("update_or_create_items", len(payloads)))
+        return SimpleNamespace(
+            items=[xero_item(p["Code"], item_id=p["ItemID"]) for p in payloads]
+        )
+
+
+@patch("apps.workflow.api.xero.stock_sync.SLEEP_TIME", 0)
+class StockSyncBatchTests(BaseTestCase):
+    def setUp(self):
+        for code, name, account_type in (
+            ("300", "Purchases", "DIRECTCOSTS"),
+            ("200", "Sales", "REVENUE"),
+        ):
+            XeroAccount.objects.create(
+                xero_id=uuid.uuid4(),
+                account_code=code,
+                account_name=name,
+                account_type=account_type,
+                xero_last_modified=timezone.now(),
+                raw_json={},
+            )
+
+    def _stock(self, code, **kwargs):
+        return Stock.objects.create(
+            item_code=code,
+            description=f"Flat bar {code}",
+            quantity=Decimal("5"),
+            unit_cost=Decimal("10.00"),
+            unit_revenue=Decimal("15.00"),
+            source="manual",
+            **kwargs,
+        )
+
+    def _sync(self, api, stock_items):
+        return sync_stock_items_to_xero(stock_items, api=api, tenant_id="tenant")
+
+    def test_new_items_are_created_in_chunks_of_one_hundred(self):
+        stock_items = [self._stock(f"FB-{n:03d}") for n in range(250)]
+        api = FakeAccountingApi()
+
+        result = self._sync(api, stock_items)
+
+        self.assertEqual(len(result["synced"]), 250)
+        self.assertEqual(result["failed"], {})
+        self.assertEqual(
+            api.calls,
+            [
+                ("get_items", 0),
+                ("create_items", 100),
+                ("create_items", 100),
+                ("create_items", 50),
+            ],
+        )
+        self.assertFalse(Stock.objects.filter(xero_id__isnull=True).exists())
+        stock = Stock.objects.get(item_code="FB-007")
+        self.assertEqual(stock.xero_id, str(api.items["FB-007"].item_id))
+
+    def test_validation_errors_are_mapped_to_their_stock_rows(self):
+        good, bad = self._stock("FB-1"), self._stock("FB-2")
+        api = FakeAccountingApi(rejected={"FB-2"})
+
+        result = self._sync(api, [good, bad])
+
+        self.assertEqual(result["synced"], [str(good.id)])
+        self.assertEqual(
+            result["failed"], {str(bad.id): "Name must be 50 characters or less."}
+        )
+        bad.refresh_from_db()
+        self.assertIsNone(bad.xero_id)
+
+    def test_existing_codes_are_linked_and_updated(self):
+        linked = self._stock("FB-1")
+        api = FakeAccountingApi(existing={"FB-1"})
+
+        result = self._sync(api, [linked, self._stock("FB-2")])
+
+        self.assertEqual(len(result["synced"]), 2)
+        self.assertIn(("update_or_create_items", 1), api.calls)
+        linked.refresh_from_db()
+        self.assertEqual(linked.xero_id, str(api.items["FB-1"].item_id))
+
+    def test_duplicate_code_conflicts_are_resolved_with_one_refresh(self):
+        stock_items = [self._stock(f"FB-{n}") for n in range(4)]
+        api = FakeAccountingApi(created_elsewhere={"FB-1", "FB-3"})
+
+        result = self._sync(api, stock_items)
+
+        self.assertEqual(len(result["synced"]), 4)
+        self.assertEqual(
+            api.calls,
+            [
+                ("get_items", 0),
+                ("create_items", 4),
+                ("get_items", 0),
+                ("update_or_create_items", 2),
+            ],
+        )
+        self.assertEqual(
+            Stock.objects.get(item_code="FB-3").xero_id,
+            str(api.late["FB-3"].item_id),
+        )
+
+    def test_xero_item_already_linked_elsewhere_is_not_linked_twice(self):
+        api = FakeAccountingApi(existing={"FB-1"})
+        owner = self._stock("OLD-FB-1", xero_id=str(api.items["FB-1"].item_id))
+        duplicate = self._stock("FB-1")
+
+        result = self._sync(api, [duplicate])
+
+        self.assertIn(str(owner.id), result["failed"][str(duplicate.id)])
+        self.assertEqual(api.calls, [("get_items", 0)])
+
+    @patch("apps.workflow.api.xero.stock_sync.get_tenant_id", return_value="tenant")
+    def test_sync_all_reports_failures_per_stock_row(self, _):
+        self._stock("FB-1")
+        rejected = self._stock("FB-2")
+        api = FakeAccountingApi(rejected={"FB-2"})
+
+        with patch("apps.workflow.api.xero.stock_sync.AccountingApi", return_value=api):
+            result = sync_all_local_stock_to_xero()
+
+        self.assertEqual(result["synced_count"], 1)
+        self.assertEqual(result["failed_items"][0]["id"], str(rejected.id))
+        self.assertEqual(result["success_rate"], 50)
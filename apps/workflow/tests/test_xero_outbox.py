@@ -0,0 +1,264 @@
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from xero_python.exceptions import ApiException
+
+from apps.accounts.models import Staff
+from apps.client.models import Client
+from apps.job.models import Job
+from apps.purchasing.models import PurchaseOrder, PurchaseOrderLine
+from apps.testing import BaseTestCase
+from apps.workflow.models import AppError, XeroSubmission
+from apps.workflow.services.xero_outbox_service import (
+    BACKOFF_SECONDS,
+    XeroOutboxService,
+)
+from apps.workflow.views.xero.xero_invoice_manager import XeroInvoiceManager
+
+PURCHASE_ORDER = XeroSubmission.DocumentType.PURCHASE_ORDER
+
+
+class FakeAccountingApi:
+    """Local stand-in for the Xero PurchaseOrders endpoint."""
+
+    def __init__(self, failures=(), validation_errors=()):
+        # Raised (or returned, for validation errors) before succeeding
+        self.failures = list(failures)
+        self.validation_errors = list(validation_errors)
+        self.created = {}  # idempotency key -> purchase order
+        self.keys = []
+
+    def update_or_create_purchase_orders(
+        self,
+        tenant_id,
+        purchase_orders,
+        summarize_errors=True,
+        idempotency_key=None,
+        _return_http_data_only=True,
+    ):
+        self.keys.append(idempotency_key)
+        if self.failures:
+            raise self.failures.pop(0)
+        errors = [SimpleNamespace(message=m) for m in self.validation_errors]
+        # Xero replays the original response for a repeated key
+        po = self.created.get(idempotency_key) or SimpleNamespace(
+            purchase_order_id=uuid.uuid4(),
+            updated_date_utc=timezone.now(),
+            validation_errors=errors,
+            line_items=[],
+        )
+        if not errors:
+            self.created[idempotency_key] = po
+        return SimpleNamespace(purchase_orders=[po]), 200, {}
+
+    def create_invoice_history(
+        self, tenant_id, invoice_id, history_records, idempotency_key=None
+    ):
+        self.keys.append(idempotency_key)
+
+    def create_invoice_attachment_by_file_name(
+        self,
+        tenant_id,
+        invoice_id,
+        file_name,
+        body,
+        include_online=False,
+        idempotency_key=None,
+    ):
+        self.keys.append(idempotency_key)
+
+
+class XeroOutboxTests(BaseTestCase):
+    def setUp(self):
+        supplier = Client.objects.create(
+            name="Steel Supplier",
+            xero_contact_id=str(uuid.uuid4()),
+            xero_last_modified=timezone.now(),
+        )
+        self.po = PurchaseOrder.objects.create(
+            supplier=supplier, po_number="PO-OUTBOX-1", status="draft"
+        )
+        PurchaseOrderLine.objects.create(
+            purchase_order=self.po,
+            description="Flat bar",
+            quantity=Decimal("8"),
+            unit_cost=Decimal("10.00"),
+        )
+        self.api = FakeAccountingApi()
+        for target, value in (("AccountingApi", self.api), ("get_tenant_id", "t")):
+            patcher = patch(
+                f"apps.workflow.views.xero.xero_base_manager.{target}",
+                return_value=value,
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _enqueue(self):
+        return XeroOutboxService.enqueue(PURCHASE_ORDER, purchase_order=self.po)
+
+    def test_submission_is_written_in_the_callers_transaction(self):
+        with patch.object(XeroOutboxService, "run_in_background") as start:
+            with self.captureOnCommitCallbacks(execute=True):
+                submission = self._enqueue()
+            start.assert_called_once()
+
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    XeroOutboxService.enqueue(
+                        PURCHASE_ORDER,
+                        purchase_order=PurchaseOrder.objects.create(
+                            supplier=self.po.supplier, po_number="PO-OUTBOX-2"
+                        ),
+                    )
+                    raise RuntimeError("local change failed")
+
+        self.assertEqual(XeroSubmission.objects.get(), submission)
+        # A second click returns the open submission instead of queueing again
+        self.assertEqual(self._enqueue(), submission)
+
+    def test_worker_submits_with_the_idempotency_key_and_reconciles(self):
+        submission = self._enqueue()
+
+        result = XeroOutboxService().process_due()
+
+        self.assertEqual(result.succeeded, 1)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, XeroSubmission.Status.SUCCEEDED)
+        self.assertEqual(self.api.keys, [str(submission.idempotency_key)])
+        xero_po = self.api.created[str(submission.idempotency_key)]
+        self.po.refresh_from_db()
+        self.assertEqual(str(self.po.xero_id), str(xero_po.purchase_order_id))
+        self.assertEqual(submission.result["xero_id"], str(xero_po.purchase_order_id))
+
+    def test_transient_failures_are_retried_with_backoff_and_the_same_key(self):
+        self.api.failures = [ApiException(status=503, reason="Service Unavailable")]
+        submission = self._enqueue()
+
+        result = XeroOutboxService().process_due()
+
+        self.assertEqual(result.retrying, 1)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, XeroSubmission.Status.PENDING)
+        self.assertEqual(submission.attempts, 1)
+        self.assertGreater(
+            submission.next_attempt_at,
+            timezone.now() + timedelta(seconds=BACKOFF_SECONDS - 5),
+        )
+        self.assertIsNone(PurchaseOrder.objects.get(pk=self.po.pk).xero_id)
+        # Not due yet
+        self.assertEqual(XeroOutboxService().process_due().processed, 0)
+
+        XeroSubmission.objects.update(next_attempt_at=timezone.now())
+        result = XeroOutboxService().process_due()
+
+        self.assertEqual(result.succeeded, 1)
+        submission.refresh_from_db()
+        self.assertEqual(submission.attempts, 2)
+        self.assertEqual(self.api.keys, [str(submission.idempotency_key)] * 2)
+
+    def test_validation_errors_fail_without_retrying(self):
+        self.api.validation_errors = ["Contact is archived"]
+        submission = self._enqueue()
+
+        result = XeroOutboxService().process_due()
+
+        self.assertEqual(result.failed, 1)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, XeroSubmission.Status.FAILED)
+        self.assertIn("Contact is archived", submission.last_error)
+        self.assertEqual(len(self.api.keys), 1)
+        self.assertTrue(
+            AppError.objects.filter(
+                data__xero_submission_id=str(submission.id)
+            ).exists()
+        )
+
+    def test_errors_in_our_own_code_fail_without_retrying(self):
+        self.api.failures = [ValueError("Unit cost is not a number")]
+        submission = self._enqueue()
+
+        result = XeroOutboxService().process_due()
+
+        self.assertEqual(result.failed, 1)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, XeroSubmission.Status.FAILED)
+        self.assertEqual(submission.attempts, 1)
+        self.assertIn("Unit cost is not a number", submission.last_error)
+
+    @patch(
+        "apps.workflow.views.xero.xero_invoice_manager.create_workshop_pdf",
+        return_value=BytesIO(b"%PDF-1.4"),
+    )
+    def test_history_note_and_attachment_replay_with_derived_keys(self, _):
+        job = Job.objects.create(client=self.po.supplier, name="Outbox Job")
+        manager = XeroInvoiceManager(client=job.client, job=job)
+        manager.idempotency_key = key = uuid.uuid4()
+
+        manager._add_xero_history_note("xero-invoice")
+        manager._attach_workshop_pdf("xero-invoice")
+
+        # A retry sends the same keys, so Xero does not add them twice
+        self.assertEqual(self.api.keys, [f"{key}-history", f"{key}-workshop-pdf"])
+
+    def test_stale_claim_replays_the_key_instead_of_creating_a_duplicate(self):
+        submission = self._enqueue()
+        # A worker sent the PO, Xero accepted it, then the worker died before
+        # committing the local changes
+        self.api.update_or_create_purchase_orders(
+            "t", {}, idempotency_key=str(submission.idempotency_key)
+        )
+        XeroSubmission.objects.update(
+            status=XeroSubmission.Status.IN_PROGRESS,
+            attempts=1,
+            claimed_at=timezone.now() - timedelta(hours=1),
+        )
+
+        result = XeroOutboxService().process_due()
+
+        self.assertEqual(result.succeeded, 1)
+        self.assertEqual(len(self.api.created), 1)
+        xero_po = self.api.created[str(submission.idempotency_key)]
+        self.po.refresh_from_db()
+        self.assertEqual(str(self.po.xero_id), str(xero_po.purchase_order_id))
+
+    @patch(
+        "apps.workflow.views.xero.xero_view.ensure_xero_authentication",
+        return_value="t",
+    )
+    @patch.object(XeroOutboxService, "run_in_background")
+    def test_submit_endpoint_queues_and_status_endpoint_reports(self, *_):
+        staff = Staff.objects.create_user(
+            email="buyer@example.com",
+            password="x",
+            first_name="Bea",
+            last_name="Buyer",
+            is_office_staff=True,
+        )
+        api = APIClient()
+        api.force_authenticate(staff)
+
+        response = api.post(
+            reverse("submit_xero_document"),
+            {"document_type": "purchase_order", "purchase_order_id": str(self.po.id)},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "pending")
+        self.assertEqual(self.api.keys, [])
+
+        XeroOutboxService().process_due()
+        response = api.get(reverse("get_xero_submission", args=[response.data["id"]]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "succeeded")
+        self.po.refresh_from_db()
+        self.assertEqual(response.data["result"]["xero_id"], str(self.po.xero_id))
@@ -57,6 +57,7 @@ from apps.workflow.views.aws_instance_view import (
 )
 from apps.workflow.views.company_defaults_api import CompanyDefaultsAPIView
 from apps.workflow.views.company_defaults_schema_api import CompanyDefaultsSchemaAPIView
+from apps.workflow.views.request_profiling_view import EndpointStatsAPIView
 from apps.workflow.views.xero import xero_view
 from apps.workflow.views.xero_pay_item_viewset import XeroPayItemViewSet
 from apps.workflow.xero_webhooks import XeroWebhookView
@@ -141,6 +142,16 @@ urlpatterns = [
         xero_view.delete_xero_purchase_order,
         name="delete_xero_purchase_order",
     ),
+    path(
+        "api/xero/submissions/",
+        xero_view.submit_xero_document,
+        name="submit_xero_document",
+    ),
+    path(
+        "api/xero/submissions/<uuid:submission_id>/",
+        xero_view.get_xero_submission,
+        name="get_xero_submission",
+    ),
     path(
         "api/xero/sync/",
         xero_view.start_xero_sync,
@@ -192,6 +203,11 @@ urlpatterns = [
         CompanyDefaultsAPIView.as_view(),
         name="api_company_defaults",
     ),
+    path(
+        "api/profiling/endpoints/",
+        EndpointStatsAPIView.as_view(),
+        name="request_profiling_endpoints",
+    ),
     path(
         "api/company-defaults/schema/",
         CompanyDefaultsSchemaAPIView.as_view(),
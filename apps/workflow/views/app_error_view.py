@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema
 from rest_framework import filters, status
 from rest_framework.decorators import action
 from rest_framework.generics import ListAPIView, RetrieveAPIView
@@ -12,8 +13,12 @@ from rest_framework.viewsets import ReadOnlyModelViewSet
 from apps.job.permissions import IsOfficeStaff
 from apps.workflow.api.pagination import FiftyPerPagePagination
 from apps.workflow.models import AppError
-from apps.workflow.serializers import AppErrorListResponseSerializer, AppErrorSerializer
-from apps.workflow.services.error_persistence import list_app_errors
+from apps.workflow.serializers import (
+    AppErrorGroupSerializer,
+    AppErrorListResponseSerializer,
+    AppErrorSerializer,
+)
+from apps.workflow.services.error_persistence import group_app_errors, list_app_errors
 from apps.workflow.utils import parse_pagination_params
 
 
@@ -139,6 +144,7 @@ class AppErrorViewSet(ReadOnlyModelViewSet):
     Endpoints:
     - GET /api/app-errors/
     - GET /api/app-errors/<id>/
+    - GET /api/app-errors/groups/
     - POST /api/app-errors/<id>/mark_resolved/
     - POST /api/app-errors/<id>/mark_unresolved/
     """
@@ -166,6 +172,15 @@ class AppErrorViewSet(ReadOnlyModelViewSet):
     ordering = ["-timestamp"]
     permission_classes = [IsAuthenticated, IsOfficeStaff]
 
+    @extend_schema(responses=AppErrorGroupSerializer(many=True))
+    @action(detail=False, methods=["get"])
+    def groups(self, request):
+        """List errors grouped by fingerprint, with occurrence counts."""
+        groups = group_app_errors(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(groups)
+        serializer = AppErrorGroupSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=["post"])
     def mark_resolved(self, request, pk=None):
         """Mark an error as resolved."""
@@ -30,6 +30,7 @@ class CompanyDefaultsAPIView(APIView):
     serializer_class = CompanyDefaultsSerializer
 
     def get(self, request):
+        # The settings screen edits what is stored, so never show a process copy
         instance = CompanyDefaults.get_instance()
         serializer = CompanyDefaultsSerializer(instance)
         return Response(serializer.data)
@@ -0,0 +1,82 @@
+"""
+Request Profiling API Views
+"""
+
+from dataclasses import asdict
+
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.job.permissions import IsSuperUser
+from apps.workflow.serializers import EndpointStatsResponseSerializer
+from apps.workflow.services.request_profiling_service import (
+    SORT_KEYS,
+    endpoint_stats,
+)
+
+MAX_HOURS = 24 * 30
+MAX_LIMIT = 200
+
+
+class EndpointStatsAPIView(APIView):
+    """
+    Worst endpoints recorded by RequestProfilingMiddleware (admins only).
+
+    Endpoint: /api/profiling/endpoints/
+    """
+
+    serializer_class = EndpointStatsResponseSerializer
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="hours",
+                type=int,
+                description="Window to aggregate, in hours (default 24)",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                description="Number of endpoints to return (default 20)",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="sort",
+                description=f"One of {', '.join(SORT_KEYS)} (default p95)",
+                required=False,
+            ),
+        ],
+        responses=EndpointStatsResponseSerializer,
+    )
+    def get(self, request):
+        try:
+            hours = int(request.query_params.get("hours", 24))
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            return Response(
+                {"error": "hours and limit must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 0 < hours <= MAX_HOURS or not 0 < limit <= MAX_LIMIT:
+            return Response(
+                {"error": f"hours must be 1-{MAX_HOURS} and limit 1-{MAX_LIMIT}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        sort = request.query_params.get("sort", "p95")
+        if sort not in SORT_KEYS:
+            return Response(
+                {"error": f"sort must be one of {', '.join(SORT_KEYS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stats = endpoint_stats(hours=hours, limit=limit, sort=sort)
+        serializer = self.serializer_class(
+            {"hours": hours, "sort": sort, "results": [asdict(s) for s in stats]}
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -19,11 +19,13 @@ from .xero_view import (
     delete_xero_quote,
     ensure_xero_authentication,
     generate_xero_sync_events,
+    get_xero_submission,
     get_xero_sync_info,
     refresh_xero_data,
     refresh_xero_token,
     start_xero_sync,
     stream_xero_sync,
+    submit_xero_document,
     success_xero_connection,
     trigger_xero_sync,
     xero_authenticate,
@@ -65,6 +67,7 @@ __all__ = [
     "ensure_xero_authentication",
     "format_date",
     "generate_xero_sync_events",
+    "get_xero_submission",
     "get_xero_sync_info",
     "parse_xero_api_error_message",
     "refresh_xero_data",
@@ -72,6 +75,7 @@ __all__ = [
     "sanitize_for_xero",
     "start_xero_sync",
     "stream_xero_sync",
+    "submit_xero_document",
     "success_xero_connection",
     "trigger_xero_sync",
     "xero_authenticate",
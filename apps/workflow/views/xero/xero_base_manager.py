@@ -36,6 +36,8 @@ class XeroDocumentManager(ABC):
     client: Client
     xero_api: AccountingApi
     xero_tenant_id: str
+    # Set by the Xero outbox so retried submissions are not duplicated
+    idempotency_key: str | None = None
 
     def __init__(self, client, job=None):
         """
@@ -155,6 +157,21 @@ class XeroDocumentManager(ABC):
                 f"Client {self.client.name} does not have a valid Xero contact ID. Sync the client with Xero first."
             )
 
+    def _idempotency_kwargs(self, call: str | None = None) -> dict:
+        """
+        Returns the idempotency_key argument for Xero create/update calls.
+        Xero replays the original response for a repeated key, so a retry
+        after a timeout does not create a second document.
+
+        Follow-up calls for the same document (history note, attachments)
+        pass a `call` name, giving each its own key derived from the
+        document's, so a retry does not add them twice either.
+        """
+        if not self.idempotency_key:
+            return {}
+        key = str(self.idempotency_key)
+        return {"idempotency_key": f"{key}-{call}" if call else key}
+
     def get_xero_contact(self) -> Contact:
         """
         Returns a Xero Contact object for the client.
@@ -227,7 +244,10 @@ class XeroDocumentManager(ABC):
         try:
             logger.info(f"Attempting to call Xero API method: {api_method.__name__}")
             response, http_status, http_headers = api_method(
-                self.xero_tenant_id, **kwargs, _return_http_data_only=False
+                self.xero_tenant_id,
+                **kwargs,
+                **self._idempotency_kwargs(),
+                _return_http_data_only=False,
             )
 
             logger.debug(f"Xero API Response Content: {response}")
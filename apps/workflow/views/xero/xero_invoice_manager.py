@@ -18,10 +18,12 @@ from apps.accounting.enums import InvoiceStatus
 # Import models
 from apps.accounting.models import Invoice
 from apps.client.models import Client
+from apps.client.services.client_activity_service import ClientActivityService
 from apps.job.models import Job
 from apps.job.models.costing import CostSet
 from apps.job.services.workshop_pdf_service import create_workshop_pdf
 from apps.workflow.services.error_persistence import persist_app_error
+from apps.workflow.services.xero_outbox_service import is_transient_error
 
 # Import base class and helpers
 from .xero_base_manager import XeroDocumentManager
@@ -79,7 +81,10 @@ class XeroInvoiceManager(XeroDocumentManager):
 
     def _create_history_record(self, xero_document_id, history_records):
         self.xero_api.create_invoice_history(
-            self.xero_tenant_id, xero_document_id, history_records
+            self.xero_tenant_id,
+            xero_document_id,
+            history_records,
+            **self._idempotency_kwargs("history"),
         )
 
     def _attach_workshop_pdf(self, xero_invoice_id: str) -> str | None:
@@ -98,6 +103,7 @@ class XeroInvoiceManager(XeroDocumentManager):
                 file_name,
                 pdf_buffer.read(),
                 include_online=False,
+                **self._idempotency_kwargs("workshop-pdf"),
             )
             logger.info(f"Attached workshop PDF to invoice {xero_invoice_id}")
             return None
@@ -275,6 +281,7 @@ class XeroInvoiceManager(XeroDocumentManager):
                     online_url=invoice_url,
                     raw_json=invoice_json,
                 )
+                ClientActivityService.refresh_clients([invoice.client_id])
 
                 # Update job.updated_at to invalidate ETags and prevent 304 responses
                 self.job.save(update_fields=["updated_at"])
@@ -396,6 +403,7 @@ class XeroInvoiceManager(XeroDocumentManager):
                     with Xero. Please contact support to check the data sent.
                 """.strip(),
                 "status": 500,
+                "retryable": is_transient_error(e),
             }
 
     def delete_document(self):
@@ -411,9 +419,12 @@ class XeroInvoiceManager(XeroDocumentManager):
                 xero_invoice_id = getattr(xero_invoice_data, "invoice_id", None)
                 if status == "DELETED" and xero_invoice_id:
                     # Remove local Invoice if exists
-                    deleted_count = Invoice.objects.filter(
-                        xero_id=xero_invoice_id
-                    ).delete()[0]
+                    local_invoices = Invoice.objects.filter(xero_id=xero_invoice_id)
+                    client_ids = list(
+                        local_invoices.values_list("client_id", flat=True)
+                    )
+                    deleted_count = local_invoices.delete()[0]
+                    ClientActivityService.refresh_clients(client_ids)
                     logger.info(
                         f"Invoice {xero_invoice_id} deleted in Xero and {deleted_count} local record(s) removed."
                     )
@@ -9,6 +9,7 @@ from xero_python.accounting.models import PurchaseOrder as XeroPurchaseOrder
 
 from apps.purchasing.models import PurchaseOrder
 from apps.workflow.models import XeroAccount
+from apps.workflow.services.xero_outbox_service import is_transient_error
 
 from .xero_base_manager import XeroDocumentManager
 from .xero_helpers import clean_payload, convert_to_pascal_case, format_date
@@ -514,7 +515,7 @@ class XeroPurchaseOrderManager(XeroDocumentManager):
                     "has_xero_id": bool(self.get_xero_id()),
                 },
             )
-            xero_doc = self.get_xero_document(type=action)
+            xero_doc = self.get_xero_document(operation=action)
 
             raw_payload = xero_doc.to_dict()
             logger.info(
@@ -558,6 +559,7 @@ class XeroPurchaseOrderManager(XeroDocumentManager):
                 "error": f"Failed to prepare Xero document: {str(e)}",
                 "exception_type": type(e).__name__,
                 "status": 500,
+                "retryable": False,
             }
 
         try:
@@ -575,6 +577,7 @@ class XeroPurchaseOrderManager(XeroDocumentManager):
                 self.xero_tenant_id,
                 purchase_orders=payload,
                 summarize_errors=False,
+                **self._idempotency_kwargs(),
                 _return_http_data_only=False,
             )
 
@@ -628,6 +631,7 @@ class XeroPurchaseOrderManager(XeroDocumentManager):
                 "error": error_message,
                 "error_type": error_type,
                 "status": 500,
+                "retryable": is_transient_error(e),
             }
 
     def delete_document(self) -> dict:
@@ -4,7 +4,6 @@ import logging
 from datetime import timedelta
 from decimal import Decimal
 
-from django.http import JsonResponse
 from django.utils import timezone
 from xero_python.accounting.models import LineItem
 from xero_python.accounting.models import Quote as XeroQuote
@@ -18,6 +17,7 @@ from apps.accounting.enums import QuoteStatus
 # Import models
 from apps.accounting.models import Quote
 from apps.job.models.costing import CostSet
+from apps.workflow.services.xero_outbox_service import is_transient_error
 
 # Import base class and helpers
 from .xero_base_manager import XeroDocumentManager
@@ -62,7 +62,10 @@ class XeroQuoteManager(XeroDocumentManager):
 
     def _create_history_record(self, xero_document_id, history_records):
         self.xero_api.create_quote_history(
-            self.xero_tenant_id, xero_document_id, history_records
+            self.xero_tenant_id,
+            xero_document_id,
+            history_records,
+            **self._idempotency_kwargs("history"),
         )
 
     def _get_xero_update_method(self):
@@ -309,9 +312,7 @@ class XeroQuoteManager(XeroDocumentManager):
                     "quote creation. Please contact support."
                 ),
             )
-            return JsonResponse(
-                {"success": False, "error": error_message}, status=e.status
-            )
+            return {"success": False, "error": error_message, "status": e.status}
         except ApiException as e:
             logger.error(
                 f"Xero API Exception during quote creation for job {self.job.id if self.job else 'Unknown'}: {e.status} - {e.reason}",
@@ -336,6 +337,7 @@ class XeroQuoteManager(XeroDocumentManager):
                 "success": False,
                 "error": f"An unexpected error occurred ({str(e)}) while creating the quote with Xero. Please contact support.",
                 "status": 500,
+                "retryable": is_transient_error(e),
             }
 
     def delete_document(self):
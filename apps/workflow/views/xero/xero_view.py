@@ -7,6 +7,7 @@ import uuid
 from django.conf import settings
 from django.contrib import messages
 from django.core.cache import cache
+from django.db import transaction
 from django.http import (
     HttpRequest,
     HttpResponse,
@@ -43,7 +44,7 @@ from apps.workflow.api.xero.xero import (
     refresh_token,
 )
 from apps.workflow.exceptions import AlreadyLoggedException
-from apps.workflow.models import XeroError, XeroToken
+from apps.workflow.models import XeroError, XeroSubmission, XeroToken
 from apps.workflow.serializers import (
     XeroAuthenticationErrorResponseSerializer,
     XeroDocumentErrorResponseSerializer,
@@ -52,6 +53,8 @@ from apps.workflow.serializers import (
     XeroPingResponseSerializer,
     XeroQuoteCreateSerializer,
     XeroSseEventSerializer,
+    XeroSubmissionCreateSerializer,
+    XeroSubmissionSerializer,
     XeroSyncInfoResponseSerializer,
     XeroSyncStartResponseSerializer,
     XeroTriggerSyncResponseSerializer,
@@ -60,6 +63,7 @@ from apps.workflow.services.error_persistence import (
     persist_and_raise,
     persist_app_error,
 )
+from apps.workflow.services.xero_outbox_service import XeroOutboxService
 from apps.workflow.services.xero_sync_service import XeroSyncService
 
 from .xero_invoice_manager import XeroInvoiceManager
@@ -651,6 +655,107 @@ def create_xero_quote(request: Request, job_id: uuid.UUID) -> Response:
             return Response(error_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@csrf_exempt
+@extend_schema(
+    tags=["Xero"],
+    request=XeroSubmissionCreateSerializer,
+    responses={
+        202: XeroSubmissionSerializer,
+        400: XeroDocumentErrorResponseSerializer,
+        401: XeroAuthenticationErrorResponseSerializer,
+        404: XeroDocumentErrorResponseSerializer,
+        500: XeroDocumentErrorResponseSerializer,
+    },
+    description=(
+        "Queues an invoice, quote or purchase order for submission to Xero. "
+        "The document is sent in the background; poll the returned submission "
+        "until its status is 'succeeded' or 'failed'."
+    ),
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsOfficeStaff])
+def submit_xero_document(request: Request) -> Response:
+    """Queues a Xero document submission and returns it for polling."""
+    tenant_id = ensure_xero_authentication()
+    if isinstance(tenant_id, JsonResponse):
+        return Response(json.loads(tenant_id.content), status=tenant_id.status_code)
+
+    request_serializer = XeroSubmissionCreateSerializer(data=request.data)
+    if not request_serializer.is_valid():
+        error_data = {
+            "success": False,
+            "error": "Invalid request data.",
+            "messages": [str(request_serializer.errors)],
+        }
+        return Response(error_data, status=status.HTTP_400_BAD_REQUEST)
+
+    data = request_serializer.validated_data
+    document_type = data["document_type"]
+    try:
+        with transaction.atomic():
+            if document_type == XeroSubmission.DocumentType.PURCHASE_ORDER:
+                purchase_order = PurchaseOrder.objects.get(id=data["purchase_order_id"])
+                submission = XeroOutboxService.enqueue(
+                    document_type, purchase_order=purchase_order, user=request.user
+                )
+            else:
+                job = Job.objects.get(id=data["job_id"])
+                options = {}
+                if document_type == XeroSubmission.DocumentType.QUOTE:
+                    options["breakdown"] = data["breakdown"]
+                submission = XeroOutboxService.enqueue(
+                    document_type, job=job, options=options, user=request.user
+                )
+    except Job.DoesNotExist:
+        error_data = {
+            "success": False,
+            "error": f"Job with ID {data['job_id']} not found.",
+        }
+        return Response(error_data, status=status.HTTP_404_NOT_FOUND)
+    except PurchaseOrder.DoesNotExist:
+        error_data = {
+            "success": False,
+            "error": f"Purchase Order with ID {data['purchase_order_id']} not found.",
+        }
+        return Response(error_data, status=status.HTTP_404_NOT_FOUND)
+    except Exception as exc:
+        try:
+            persist_and_raise(
+                exc,
+                user_id=str(request.user.id),
+                additional_context={"request_data": request.data},
+            )
+        except AlreadyLoggedException as logged_exc:
+            error_data = _build_xero_error_payload(logged_exc)
+            return Response(error_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    serializer = XeroSubmissionSerializer(submission)
+    return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(
+    tags=["Xero"],
+    responses={
+        200: XeroSubmissionSerializer,
+        404: XeroDocumentErrorResponseSerializer,
+    },
+    description="Returns the status of a queued Xero document submission.",
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsOfficeStaff])
+def get_xero_submission(request: Request, submission_id: uuid.UUID) -> Response:
+    """Returns a Xero submission so the UI can poll for completion."""
+    try:
+        submission = XeroSubmission.objects.get(id=submission_id)
+    except XeroSubmission.DoesNotExist:
+        error_data = {
+            "success": False,
+            "error": f"Xero submission with ID {submission_id} not found.",
+        }
+        return Response(error_data, status=status.HTTP_404_NOT_FOUND)
+    return Response(XeroSubmissionSerializer(submission).data)
+
+
 @csrf_exempt
 @extend_schema(
     tags=["Xero"],
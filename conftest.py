@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def write_app_errors_immediately(settings):
+    """Persist AppErrors synchronously so tests can assert on them."""
+    settings.APP_ERROR_BUFFERING = False
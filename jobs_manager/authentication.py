@@ -1,18 +1,205 @@
+import hashlib
 import logging
 
+import jwt
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework import exceptions
 from rest_framework_simplejwt.authentication import (
     JWTAuthentication as BaseJWTAuthentication,
 )
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 
 logger = logging.getLogger(__name__)
 
+# Validated token -> user snapshots are reused for this long. Staff.save()/
+# delete() invalidate the user's entries, but the default cache is a
+# per-process LocMemCache: only the worker that made the change sees the
+# invalidation. Other workers keep serving the old snapshot (e.g. a user just
+# deactivated) for up to this many seconds, so keep it short.
+AUTH_CACHE_TIMEOUT = 10
+
+
+def _token_cache_key(raw_token) -> str:
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode("utf-8")
+    return f"auth_token:{hashlib.sha256(raw_token).hexdigest()}"
+
+
+def _user_version_key(user_id) -> str:
+    return f"auth_user_version:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Drop every cached token -> user entry for this user.
+
+    Immediate in processes that share this cache; elsewhere the entries
+    expire within AUTH_CACHE_TIMEOUT.
+    """
+    try:
+        cache.incr(_user_version_key(user_id))
+    except ValueError:
+        # No version stored yet, so nothing for this user is cached
+        pass
+
+
+def get_cached_user(raw_token, user_id):
+    """
+    Return the user for an already validated token, using the shared cache.
+
+    The cached entry is tagged with the user's cache version, so bumping the
+    version (invalidate_cached_user) orphans every token cached for that user.
+    Returns None if the user does not exist.
+    """
+    token_key = _token_cache_key(raw_token)
+    version_key = _user_version_key(user_id)
+    cached = cache.get_many([token_key, version_key])
+    version = cached.get(version_key)
+    entry = cached.get(token_key)
+    if entry is not None and version is not None and entry[0] == version:
+        return entry[1]
+
+    user = get_user_model().objects.filter(id=user_id).first()
+    if user is None:
+        return None
+    if version is None:
+        version = 1
+        cache.add(version_key, version, None)
+    cache.set(token_key, (version, user), AUTH_CACHE_TIMEOUT)
+    return user
+
+
+def _user_from_bearer_header(request):
+    """Dev bearer tokens (ALLOW_BEARER_TOKEN_AUTHENTICATION). Never raises."""
+    if not settings.ALLOW_BEARER_TOKEN_AUTHENTICATION:
+        return None
+
+    auth_header = request.META.get("HTTP_AUTHORIZATION", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+
+    token = auth_header[7:]
+    try:
+        payload = jwt.decode(
+            token,
+            settings.BEARER_TOKEN_SECRET,
+            algorithms=["HS256"],
+            options={"verify_exp": True},
+        )
+    except jwt.InvalidTokenError:
+        # Bearer token authentication failed; fall through to other methods.
+        return None
+
+    if payload.get("iss") != "dev" or not payload.get("user_id"):
+        return None
+
+    user = get_cached_user(token, payload["user_id"])
+    return (user, None) if user else None
+
+
+def _user_from_cookie(request):
+    """
+    httpOnly JWT cookie. Raises AuthenticationFailed for a bad token (outside
+    DEBUG) or an inactive user so DRF can report it.
+    """
+    if not getattr(settings, "ENABLE_JWT_AUTH", False):
+        return None
+
+    authenticator = JWTAuthentication()
+    raw_token = authenticator.get_raw_token_from_cookie(request)
+    if raw_token is None:
+        return None
+
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError) as e:
+        logger.info(f"JWT authentication failed: {str(e)}")
+        if settings.DEBUG:
+            return None
+        raise exceptions.AuthenticationFailed(str(e))
+
+    user = get_cached_user(raw_token, user_id)
+    if user is None or not user.is_active:
+        raise exceptions.AuthenticationFailed("User not found", code="user_not_found")
+    if not user.is_currently_active:
+        raise exceptions.AuthenticationFailed("User is inactive.", code="user_inactive")
+    if getattr(user, "password_needs_reset", False):
+        logger.warning(
+            f"User {getattr(user, 'email', user)} authenticated via JWT but needs to reset password."
+        )
+    return (user, validated_token)
+
+
+def _user_from_query_token(request):
+    """Fallback: token query param (for SSE where cookies don't work)."""
+    token = request.GET.get("token")
+    if not token:
+        return None
+
+    try:
+        payload = jwt.decode(
+            token,
+            settings.BEARER_TOKEN_SECRET,
+            algorithms=["HS256"],
+            options={"verify_exp": True},
+        )
+    except jwt.InvalidTokenError:
+        return None
+
+    if not payload.get("user_id"):
+        return None
+    user = get_cached_user(token, payload["user_id"])
+    return (user, None) if user else None
+
+
+def resolve_request_identity(request):
+    """
+    Resolve the token-authenticated identity of a request exactly once.
+
+    Tries the dev bearer header, the JWT cookie, then the ``token`` query
+    param. The result (``(user, token)`` or None) is memoised on the Django
+    request, together with any cookie authentication error, so middleware and
+    DRF share one lookup instead of each re-authenticating.
+    """
+    if hasattr(request, "_auth_identity"):
+        return request._auth_identity
+
+    request._auth_error = None
+
+    # Support DRF's force_authenticate for tests (APIClient sets this on the
+    # Django request before middleware runs)
+    if getattr(request, "_force_auth_user", None) is not None:
+        request._auth_identity = (request._force_auth_user, None)
+        return request._auth_identity
+
+    identity = None
+    for resolver in (_user_from_bearer_header, _user_from_cookie):
+        try:
+            identity = resolver(request)
+        except exceptions.AuthenticationFailed as e:
+            request._auth_error = e
+        if identity:
+            break
+
+    if identity is None:
+        identity = _user_from_query_token(request)
+    if identity is not None:
+        request._auth_error = None
+
+    request._auth_identity = identity
+    return identity
+
 
 class JWTAuthentication(BaseJWTAuthentication):
     """
     Custom JWT Authentication that supports both Authorization header and httpOnly cookies.
+
+    Identity is resolved once per request by resolve_request_identity(); this
+    class only hands that result to DRF.
     """
 
     def authenticate(self, request):
@@ -23,6 +210,9 @@ class JWTAuthentication(BaseJWTAuthentication):
         # Use underlying Django request to avoid triggering DRF's _authenticate() recursion
         django_request = getattr(request, "_request", request)
         if hasattr(django_request, "user") and django_request.user.is_authenticated:
+            identity = getattr(django_request, "_auth_identity", None)
+            if identity and identity[0] is django_request.user:
+                return identity
             return (django_request.user, None)
 
         # Support DRF's force_authenticate for tests
@@ -32,68 +222,18 @@ class JWTAuthentication(BaseJWTAuthentication):
         ):
             return (request._force_auth_user, None)
 
-        try:
-            # Debug logging for client create endpoint
-            if request.path_info == "/clients/create/":
-                logger.info(f"DEBUG: Authenticating request to {request.path_info}")
-                logger.info(f"DEBUG: Request method: {request.method}")
-                logger.info(
-                    f"DEBUG: User-Agent: {request.headers.get('User-Agent', 'None')}"
-                )
-                logger.info(f"DEBUG: Accept: {request.headers.get('Accept', 'None')}")
-                logger.info(
-                    f"DEBUG: Content-Type: {request.headers.get('Content-Type', 'None')}"
-                )
-
-            # Only look at cookies, not Authorization header
-            # Authorization: Bearer is handled by BearerIdentityMiddleware
-            raw_token = self.get_raw_token_from_cookie(request)
-            result = None
-            if raw_token is not None:
-                validated_token = self.get_validated_token(raw_token)
-                user = self.get_user(validated_token)
-                result = (user, validated_token)
-            if result is None:
-                cookie_name = getattr(settings, "SIMPLE_JWT", {}).get(
-                    "AUTH_COOKIE", "access_token"
-                )
-                has_cookie = cookie_name in request.COOKIES
-                if request.path_info == "/clients/create/":
-                    logger.info(
-                        f"DEBUG: JWT authentication failed for {request.path_info}"
-                    )
-                    logger.info(f"DEBUG: Cookie '{cookie_name}' present: {has_cookie}")
-                    if has_cookie:
-                        logger.info(
-                            f"DEBUG: Cookie value length: {len(request.COOKIES[cookie_name])}"
-                        )
-                logger.info(
-                    f"JWT authentication failed: no valid token found (cookie '{cookie_name}' present: {has_cookie})"
-                )
-                return None
-            user, token = result
-            if not user.is_currently_active:
-                raise exceptions.AuthenticationFailed(
-                    "User is inactive.", code="user_inactive"
-                )
-            if hasattr(user, "password_needs_reset") and user.password_needs_reset:
-                logger.warning(
-                    f"User {getattr(user, 'email', user)} authenticated via JWT but needs to reset password."
-                )
-            if request.path_info == "/clients/create/":
-                logger.info(
-                    f"DEBUG: JWT authentication SUCCESS for {request.path_info} - User: {user.email}"
-                )
-            return result
-        except (InvalidToken, TokenError) as e:
-            if request.path_info == "/clients/create/":
-                logger.info(
-                    f"DEBUG: JWT authentication EXCEPTION for {request.path_info}: {str(e)}"
-                )
-            logger.info(f"JWT authentication failed: {str(e)}")
-            if settings.DEBUG:
-                return None
-            raise exceptions.AuthenticationFailed(str(e))
+        identity = resolve_request_identity(django_request)
+        if identity is None:
+            if django_request._auth_error is not None:
+                raise django_request._auth_error
+            cookie_name = getattr(settings, "SIMPLE_JWT", {}).get(
+                "AUTH_COOKIE", "access_token"
+            )
+            has_cookie = cookie_name in request.COOKIES
+            logger.info(
+                f"JWT authentication failed: no valid token found (cookie '{cookie_name}' present: {has_cookie})"
+            )
+        return identity
 
     def get_raw_token_from_cookie(self, request):
         """
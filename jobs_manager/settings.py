@@ -203,10 +203,12 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.workflow.middleware.RequestProfilingMiddleware",
     "apps.workflow.middleware.DisallowedHostMiddleware",
     "django.middleware.gzip.GZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "apps.workflow.middleware.CompanyDefaultsMemoMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "apps.workflow.middleware_bearer.BearerIdentityMiddleware",
@@ -553,6 +555,17 @@ DATABASES = {
 # Test runner configuration
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
+# AppErrors are buffered and written in batches by a background thread.
+# The test suite turns this off (conftest.py) so errors can be asserted on.
+APP_ERROR_BUFFERING = os.getenv("APP_ERROR_BUFFERING", "True").lower() == "true"
+APP_ERROR_FLUSH_SECONDS = 5
+
+# Per-request query and latency profiling (RequestProfilingMiddleware).
+# Off by default; when off the middleware is removed from the chain.
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "False").lower() == "true"
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILING_SAMPLE_RATE", "1"))
+REQUEST_PROFILING_RETENTION_DAYS = 7
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
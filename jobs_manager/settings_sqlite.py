@@ -0,0 +1,20 @@
+"""
+Settings for running the endpoint benchmarks against SQLite.
+
+Everything comes from jobs_manager.settings (so the usual .env is still
+needed); only the database is swapped. run_benchmarks builds the schema from
+the models on this backend, since several migrations use MySQL-only SQL.
+
+    DJANGO_SETTINGS_MODULE=jobs_manager.settings_sqlite \\
+        python manage.py run_benchmarks
+"""
+
+from jobs_manager.settings import *  # noqa: F401,F403
+from jobs_manager.settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "benchmarks.sqlite3",
+    },
+}
@@ -2,13 +2,17 @@
 """
 Convert Django JSON backup to MySQL dump format.
 Takes the anonymized JSON backup and produces SQL INSERT statements.
+
+Accepts both newline-delimited backups (.ndjson, one record per line, read
+as a stream) and legacy JSON-array backups, optionally gzip-compressed.
 """
 
+import gzip
 import json
 import logging
 import sys
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from dateutil import parser
 
@@ -324,13 +328,26 @@ class JSONToMySQLConverter:
 
         return statements
 
+    def iter_records(self, input_file: str) -> Iterator[Dict]:
+        """Yield records from a newline-delimited or JSON-array backup."""
+        opener = gzip.open if input_file.endswith(".gz") else open
+        with opener(input_file, "rt", encoding="utf-8") as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            if first == "[":
+                f.seek(0)
+                yield from json.load(f)
+                return
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
     def convert_file(self, input_file: str, output_file: str):
         """Convert entire JSON file to SQL dump."""
         print(f"Converting {input_file} to {output_file}")
 
-        with open(input_file, "r") as f:
-            data = json.load(f)
-
         with open(output_file, "w") as f:
             # Write header
             f.write("-- MySQL dump converted from Django JSON backup\n")
@@ -340,10 +357,9 @@ class JSONToMySQLConverter:
             f.write("SET FOREIGN_KEY_CHECKS=0;\n\n")
 
             # Process each record
-            total_records = len(data)
-            for i, record in enumerate(data):
+            for i, record in enumerate(self.iter_records(input_file)):
                 if i % 1000 == 0:
-                    print(f"Processing record {i}/{total_records}")
+                    print(f"Processing record {i}")
 
                 statements = self.convert_record(record)
                 for statement in statements:
@@ -357,12 +373,17 @@ class JSONToMySQLConverter:
 
 def main():
     if len(sys.argv) != 2:
-        print("Usage: python json_to_mysql.py <input.json>")
+        print("Usage: python json_to_mysql.py <input.ndjson[.gz]|input.json[.gz]>")
         sys.exit(1)
 
     input_file = sys.argv[1]
     # Generate output filename from input filename
-    output_file = input_file.replace(".json", ".sql")
+    output_file = input_file.removesuffix(".gz")
+    for suffix in (".ndjson", ".json"):
+        if output_file.endswith(suffix):
+            output_file = output_file.removesuffix(suffix)
+            break
+    output_file += ".sql"
 
     converter = JSONToMySQLConverter()
     converter.convert_file(input_file, output_file)